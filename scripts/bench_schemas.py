@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Benchmark the cost of validating service input per request.
+
+Compares the compiled service schemas against the hand-written checks
+they replaced, for valid and invalid payloads.
+"""
+import os
+import re
+import sys
+import timeit
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.todo_api.test_settings')
+
+import django
+
+django.setup()
+
+from src.core.services.task_service import TaskService
+from src.core.services.user_service import UserService
+
+
+def legacy_create_task(data):
+    missing = [field for field in ['detail'] if field not in data or not data[field]]
+    if missing:
+        return False
+    return bool(data['detail'].strip())
+
+
+def legacy_register_user(data):
+    required = ['email', 'password', 'first_name', 'last_name']
+    missing = [field for field in required if field not in data or not data[field]]
+    if missing:
+        return False
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    if not re.match(pattern, data['email']):
+        return False
+    return len(data['password']) >= 8
+
+
+def legacy_update_status(data):
+    return data['status'] in ['pending', 'completed', 'cancelled']
+
+
+def legacy_search(data):
+    detail = data.get('detail', '').strip()
+    return detail, data.get('created_date')
+
+
+CASES = [
+    ('create_task', TaskService.CREATE_SCHEMA, legacy_create_task,
+     {'detail': '  Write the quarterly report  '}, {'detail': '   '}),
+    ('update_task_status', TaskService.STATUS_SCHEMA, legacy_update_status,
+     {'status': 'completed'}, {'status': 'done'}),
+    ('search_tasks', TaskService.SEARCH_SCHEMA, legacy_search,
+     {'detail': 'report', 'created_date': '2025-09-30'}, {'created_date': 'yesterday'}),
+    ('register_user', UserService.REGISTER_SCHEMA, legacy_register_user,
+     {'email': 'user@example.com', 'password': 'testpass123', 'first_name': 'John', 'last_name': 'Doe'},
+     {'email': 'invalid-email', 'password': 'short', 'first_name': '', 'last_name': 'Doe'}),
+]
+
+
+def per_call_ns(func, number, repeat):
+    """Return the best per-call time in nanoseconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark service input validation')
+    parser.add_argument('--number', '-n', type=int, default=100000, help='Calls per measurement')
+    parser.add_argument('--repeat', '-r', type=int, default=5, help='Measurements per case')
+    args = parser.parse_args()
+
+    print(f"{'case':<20} {'payload':<8} {'legacy ns':>10} {'schema ns':>10}")
+    print('-' * 52)
+    for name, schema, legacy, valid, invalid in CASES:
+        for label, payload in (('valid', valid), ('invalid', invalid)):
+            legacy_ns = per_call_ns(lambda: legacy(payload), args.number, args.repeat)
+            schema_ns = per_call_ns(lambda: schema.validate(payload), args.number, args.repeat)
+            print(f"{name:<20} {label:<8} {legacy_ns:>10.0f} {schema_ns:>10.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark typeahead suggestions against a large per-user task list.
+
+Seeds one user with --tasks tasks (random words, deterministic) in an
+in-memory SQLite database, builds the word index and then times
+TaskService.suggest_tasks for typed prefixes of one to four letters,
+comparing with the detail LIKE search the UI used before. Reports
+p50/p95/p99 in milliseconds.
+
+Examples:
+    python scripts/bench_suggest.py
+    python scripts/bench_suggest.py --tasks 20000 --queries 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.todo_api.test_settings')
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+from src.authentication.models import User
+from src.core.models import Task
+from src.core.repositories.task_token_repository import TaskTokenRepository
+from src.core.services.task_service import TaskService
+
+WORDS = (
+    'report', 'review', 'deploy', 'invoice', 'meeting', 'design', 'audit', 'backup', 'budget',
+    'client', 'contract', 'database', 'email', 'feature', 'hiring', 'incident', 'migration',
+    'onboarding', 'payroll', 'planning', 'release', 'roadmap', 'security', 'support', 'training',
+)
+
+
+def seed(task_count, rng):
+    """Create the user and tasks, then index them; return the user id."""
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    user = User.objects.create(email='suggest@example.com', first_name='Bench', last_name='Suggest')
+    tokens = TaskTokenRepository()
+    for start in range(0, task_count, 5000):
+        tasks = Task.objects.bulk_create([
+            Task(user=user, detail=' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 8))))
+            for _ in range(start, min(start + 5000, task_count))
+        ])
+        tokens.index_tasks(tasks, 'default', replace=False)
+    return user.id
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+    pick = lambda fraction: ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+    return pick(0.50), pick(0.95), pick(0.99)
+
+
+def measure(func, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        func(query)
+        samples.append((time.perf_counter() - started) * 1000)
+    return percentiles(samples)
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Benchmark typeahead suggestions')
+    parser.add_argument('--tasks', type=int, default=100000, help='Tasks of the benchmark user')
+    parser.add_argument('--queries', type=int, default=1000, help='Requests per endpoint')
+    parser.add_argument('--limit', type=int, default=10, help='Suggestions per request')
+    args = parser.parse_args()
+
+    rng = random.Random(40)
+    started = time.perf_counter()
+    user_id = seed(args.tasks, rng)
+    print(f'Seeded and indexed {args.tasks} tasks in {time.perf_counter() - started:.1f}s')
+
+    queries = []
+    for _ in range(args.queries):
+        word = rng.choice(WORDS)
+        queries.append(word[:rng.randint(1, 4)])
+
+    service = TaskService()
+    results = {
+        'suggest': measure(lambda q: service.suggest_tasks(user_id, {'q': q, 'limit': args.limit}), queries),
+        'search (LIKE)': measure(lambda q: service.search_tasks(user_id, {'detail': q}), queries[:50]),
+    }
+
+    print(f"{'endpoint':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    print('-' * 44)
+    for name, (p50, p95, p99) in results.items():
+        print(f'{name:<16} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+"""
+Compare the full settings with the API-only profile.
+
+Each profile runs in its own interpreter against an in-memory SQLite
+database. The script reports the middleware count, loaded modules, peak
+RSS after serving requests and the mean time per request through the
+Django handler for a dependency-free endpoint and an authenticated search.
+
+Examples:
+    python scripts/compare_settings_profiles.py
+    python scripts/compare_settings_profiles.py --requests 5000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROFILES = {
+    'full': 'src.todo_api.settings',
+    'api': 'src.todo_api.api_settings',
+}
+
+WORKER = r'''
+import json, os, resource, sys, time
+sys.path.insert(0, {root!r})
+os.environ['DJANGO_SETTINGS_MODULE'] = {module!r}
+from django.conf import settings
+settings.DATABASES = {{'default': {{'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}}}}
+settings.ALLOWED_HOSTS = ['*']
+settings.DEBUG = False
+settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+import django
+django.setup()
+from django.core.management import call_command
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.authentication.models import User
+from src.core.models import Task
+
+call_command('migrate', run_syncdb=True, verbosity=0)
+user = User.objects.create(email='profile@example.com')
+Task.objects.bulk_create([Task(user=user, detail=f'Task {{i}}') for i in range(20)])
+client = Client()
+auth = {{'HTTP_AUTHORIZATION': f'Bearer {{RefreshToken.for_user(user).access_token}}'}}
+
+def per_request(path, headers):
+    for _ in range(50):
+        client.get(path, **headers)
+    start = time.perf_counter()
+    for _ in range({requests}):
+        response = client.get(path, **headers)
+    assert response.status_code == 200, response.status_code
+    return (time.perf_counter() - start) / {requests} * 1e6
+
+result = {{
+    'middleware': len(settings.MIDDLEWARE),
+    'apps': len(settings.INSTALLED_APPS),
+    'live_us': per_request('/api/health/live/', {{}}),
+    'search_us': per_request('/api/tasks/search/', auth),
+    'modules': len(sys.modules),
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}}
+print(json.dumps(result))
+'''
+
+
+def run_profile(module, requests):
+    """Measure one settings module in a fresh interpreter."""
+    code = WORKER.format(root=ROOT, module=module, requests=requests)
+    env = {key: value for key, value in os.environ.items() if key != 'DJANGO_SETTINGS_MODULE'}
+    env['METRICS_DIR'] = ''
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, env=env, cwd=ROOT)
+    if output.returncode != 0:
+        raise SystemExit(f'{module} failed:\n{output.stderr}')
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Compare full and API-only settings profiles')
+    parser.add_argument('--requests', type=int, default=2000, help='Requests timed per endpoint')
+    parser.add_argument('--json', action='store_true', help='Print raw results as JSON')
+    args = parser.parse_args()
+
+    results = {name: run_profile(module, args.requests) for name, module in PROFILES.items()}
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    rows = (
+        ('middleware', 'middleware', '{:.0f}'),
+        ('installed apps', 'apps', '{:.0f}'),
+        ('loaded modules', 'modules', '{:.0f}'),
+        ('max RSS (KiB)', 'max_rss_kb', '{:.0f}'),
+        ('health/live (us/req)', 'live_us', '{:.1f}'),
+        ('tasks/search (us/req)', 'search_us', '{:.1f}'),
+    )
+    full, api = results['full'], results['api']
+    print(f"{'':<24} {'full':>10} {'api':>10} {'saved':>10}")
+    print('-' * 57)
+    for label, key, fmt in rows:
+        saved = full[key] - api[key]
+        print(f'{label:<24} {fmt.format(full[key]):>10} {fmt.format(api[key]):>10} {fmt.format(saved):>10}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+"""
+End-to-end load test against a running Todo API server.
+
+Seeds a dataset through the API, then drives register, login, create,
+status-update and search requests with either a fixed number of closed-loop
+workers or an open-loop arrival rate, and reports throughput and latency
+percentiles per endpoint as JSON. A stored report can be passed as a
+baseline to fail the run when an endpoint regresses.
+
+Examples:
+    python scripts/loadtest.py --users 50 --tasks-per-user 200 --duration 30
+    python scripts/loadtest.py --rate 200 --concurrency 64 --output run.json
+    python scripts/loadtest.py --rate 200 --baseline run.json --tolerance 0.15
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+ENDPOINTS = ('register', 'login', 'create', 'status_update', 'search')
+DEFAULT_MIX = 'register=1,login=4,create=20,status_update=15,search=60'
+PASSWORD = 'loadtest-password'
+STATUSES = ('pending', 'completed', 'cancelled')
+WORDS = (
+    'report', 'review', 'deploy', 'invoice', 'meeting', 'design', 'refactor',
+    'backup', 'release', 'budget', 'roadmap', 'hiring', 'migration', 'audit',
+)
+
+
+class ApiClient:
+    """Minimal JSON client built on urllib."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def call(self, method, path, payload=None, token=None):
+        """Return (status, body) for a request; network errors map to status 0."""
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = urllib.request.Request(self.base_url + path, data=data, method=method)
+        request.add_header('Content-Type', 'application/json')
+        if token:
+            request.add_header('Authorization', f'Bearer {token}')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return response.status, json.loads(response.read() or b'{}')
+        except urllib.error.HTTPError as error:
+            return error.code, {}
+        except (urllib.error.URLError, OSError, ValueError):
+            return 0, {}
+
+
+class Dataset:
+    """Users, their tokens and task ids created during seeding."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.users = []  # dicts with email, token, task_ids
+
+    def add_user(self, email, token):
+        with self.lock:
+            self.users.append({'email': email, 'token': token, 'task_ids': []})
+            return self.users[-1]
+
+    def pick(self, rng, skew):
+        """Pick a user, favouring low indexes when skew > 0 (Zipf-like)."""
+        count = len(self.users)
+        if skew <= 0:
+            return self.users[rng.randrange(count)]
+        index = min(int(rng.paretovariate(skew)) - 1, count - 1)
+        return self.users[index]
+
+
+def skewed_counts(users, tasks_per_user, skew, rng):
+    """Split users * tasks_per_user tasks across users with a Zipf distribution."""
+    total = users * tasks_per_user
+    if skew <= 0:
+        return [tasks_per_user] * users
+    weights = [1.0 / (rank ** skew) for rank in range(1, users + 1)]
+    scale = total / sum(weights)
+    counts = [max(1, int(weight * scale)) for weight in weights]
+    rng.shuffle(counts)
+    return counts
+
+
+def random_detail(rng):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(3, 12)))
+
+
+def register_and_login(client, email):
+    client.call('POST', '/api/auth/register/', {
+        'email': email, 'password': PASSWORD, 'first_name': 'Load', 'last_name': 'Test',
+    })
+    status, body = client.call('POST', '/api/auth/login/', {'email': email, 'password': PASSWORD})
+    if status != 200:
+        return None
+    return body['data']['access']
+
+
+def seed(client, args, rng):
+    """Create the dataset through the API using a thread pool."""
+    dataset = Dataset()
+    counts = skewed_counts(args.users, args.tasks_per_user, args.skew, rng)
+    run_id = uuid.uuid4().hex[:8]
+    started = time.perf_counter()
+
+    def seed_user(index):
+        token = register_and_login(client, f'load-{run_id}-{index}@example.com')
+        if token is None:
+            return 0
+        user = dataset.add_user(f'load-{run_id}-{index}@example.com', token)
+        local_rng = random.Random(args.seed + index)
+        for _ in range(counts[index]):
+            status, body = client.call('POST', '/api/tasks/', {'detail': random_detail(local_rng)}, token)
+            if status == 201:
+                user['task_ids'].append(body['data']['id'])
+        return len(user['task_ids'])
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        created = sum(pool.map(seed_user, range(args.users)))
+
+    elapsed = time.perf_counter() - started
+    print(f"Seeded {len(dataset.users)} users and {created} tasks in {elapsed:.1f}s", file=sys.stderr)
+    if not dataset.users:
+        raise SystemExit('Seeding failed: is the server running at ' + args.base_url + '?')
+    return dataset
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f'Unknown endpoint in mix: {name}')
+        mix[name] = float(weight)
+    return mix
+
+
+def run_operation(name, client, dataset, rng, args):
+    """Execute one operation and return whether it succeeded."""
+    if name == 'register':
+        email = f'load-{uuid.uuid4().hex}@example.com'
+        status, _ = client.call('POST', '/api/auth/register/', {
+            'email': email, 'password': PASSWORD, 'first_name': 'Load', 'last_name': 'Test',
+        })
+        return status == 201
+    user = dataset.pick(rng, args.skew)
+    if name == 'login':
+        status, _ = client.call('POST', '/api/auth/login/', {'email': user['email'], 'password': PASSWORD})
+        return status == 200
+    if name == 'create':
+        status, body = client.call('POST', '/api/tasks/', {'detail': random_detail(rng)}, user['token'])
+        if status == 201:
+            with dataset.lock:
+                user['task_ids'].append(body['data']['id'])
+        return status == 201
+    if name == 'status_update':
+        if not user['task_ids']:
+            return True
+        task_id = rng.choice(user['task_ids'])
+        status, _ = client.call('PUT', f'/api/tasks/{task_id}/status/',
+                                {'status': rng.choice(STATUSES)}, user['token'])
+        return status == 200
+    query = rng.random()
+    if query < 0.5:
+        path = f'/api/tasks/search/?detail={rng.choice(WORDS)}'
+    elif query < 0.7:
+        path = f'/api/tasks/search/?created_date={date.today().isoformat()}'
+    else:
+        path = '/api/tasks/search/'
+    status, _ = client.call('GET', path, token=user['token'])
+    return status == 200
+
+
+class Recorder:
+    """Thread-safe latency samples per endpoint."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {name: [] for name in ENDPOINTS}
+        self.errors = {name: 0 for name in ENDPOINTS}
+
+    def record(self, name, latency, ok):
+        with self.lock:
+            self.samples[name].append(latency)
+            if not ok:
+                self.errors[name] += 1
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def drive(client, dataset, args, rng):
+    """Generate load for args.duration seconds and return the recorder."""
+    recorder = Recorder()
+    mix = args.mix
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    deadline = time.perf_counter() + args.duration
+
+    def timed(name, scheduled, worker_rng):
+        ok = run_operation(name, client, dataset, worker_rng, args)
+        # Measured from the scheduled start so queueing delay counts (no coordinated omission).
+        recorder.record(name, time.perf_counter() - scheduled, ok)
+
+    if args.rate > 0:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            next_at = time.perf_counter()
+            sequence = 0
+            while next_at < deadline:
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                name = rng.choices(names, weights)[0]
+                sequence += 1
+                pool.submit(timed, name, next_at, random.Random(args.seed * 7919 + sequence))
+                next_at += rng.expovariate(args.rate)
+    else:
+        def worker(index):
+            worker_rng = random.Random(args.seed * 7919 + index)
+            while time.perf_counter() < deadline:
+                timed(worker_rng.choices(names, weights)[0], time.perf_counter(), worker_rng)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(args.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    return recorder
+
+
+def build_report(recorder, args, elapsed):
+    endpoints = {}
+    for name in ENDPOINTS:
+        values = sorted(recorder.samples[name])
+        if not values:
+            continue
+        endpoints[name] = {
+            'requests': len(values),
+            'errors': recorder.errors[name],
+            'throughput_rps': round(len(values) / elapsed, 2),
+            'mean_ms': round(sum(values) / len(values) * 1000, 3),
+            'p50_ms': round(percentile(values, 0.50) * 1000, 3),
+            'p95_ms': round(percentile(values, 0.95) * 1000, 3),
+            'p99_ms': round(percentile(values, 0.99) * 1000, 3),
+            'max_ms': round(values[-1] * 1000, 3),
+        }
+    total = sum(item['requests'] for item in endpoints.values())
+    return {
+        'config': {
+            'base_url': args.base_url,
+            'users': args.users,
+            'tasks_per_user': args.tasks_per_user,
+            'skew': args.skew,
+            'concurrency': args.concurrency,
+            'rate': args.rate,
+            'duration': args.duration,
+            'mix': args.mix,
+            'seed': args.seed,
+        },
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(total / elapsed, 2),
+        'endpoints': endpoints,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Return a list of regressions of report against baseline."""
+    regressions = []
+    for name, current in report['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            if current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {previous[metric]} -> {current[metric]}")
+        if current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f"{name} throughput_rps: {previous['throughput_rps']} -> {current['throughput_rps']}")
+    return regressions
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Load test the Todo API')
+    parser.add_argument('--base-url', default='http://localhost:8000', help='Server to test')
+    parser.add_argument('--users', type=int, default=20, help='Users to seed')
+    parser.add_argument('--tasks-per-user', type=int, default=50, help='Average tasks seeded per user')
+    parser.add_argument('--skew', type=float, default=1.1,
+                        help='Zipf exponent for tasks and traffic per user (0 = uniform)')
+    parser.add_argument('--concurrency', '-c', type=int, default=16, help='Worker threads')
+    parser.add_argument('--rate', type=float, default=0,
+                        help='Open-loop arrival rate in requests/s (0 = closed loop)')
+    parser.add_argument('--duration', '-d', type=float, default=30, help='Seconds of load')
+    parser.add_argument('--mix', type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f'Endpoint weights (default: {DEFAULT_MIX})')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--timeout', type=float, default=10, help='Per-request timeout in seconds')
+    parser.add_argument('--output', '-o', help='Write the JSON report to this file')
+    parser.add_argument('--baseline', help='Compare against a previous JSON report')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='Allowed regression ratio')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    client = ApiClient(args.base_url, args.timeout)
+    dataset = seed(client, args, rng)
+
+    started = time.perf_counter()
+    recorder = drive(client, dataset, args, rng)
+    report = build_report(recorder, args, time.perf_counter() - started)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as handle:
+            handle.write(output + '\n')
+    print(output)
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        if baseline.get('config') != report['config']:
+            print('Warning: baseline was recorded with a different configuration', file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print('Regressions against baseline:', file=sys.stderr)
+            for line in regressions:
+                print(f'  {line}', file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+"""
+Micro-benchmarks for the service and repository hot paths.
+
+Runs against an in-memory SQLite database configured like the test
+settings, with a deterministic dataset. For every benchmark it records
+operations per second (median of --rounds rounds, each the fastest of
+--repeats short batches, see time_rounds) and the peak memory allocated
+by one operation (tracemalloc), then compares them with a committed
+baseline and exits non-zero when a result regresses beyond the tolerance.
+
+Shared machines run the whole suite up to twice as fast or as slow from
+one run to the next, so every round also times a fixed standard-library
+workload (REFERENCE) and ops/sec are compared relative to it: the
+baseline's ops/sec are scaled by how fast the reference ran in each run.
+The default tolerance (15%) sits well above the run-to-run spread left
+after that (5% at most over repeated runs).
+
+Examples:
+    python scripts/microbench.py
+    python scripts/microbench.py --only search_tasks
+    python scripts/microbench.py --update-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.todo_api.test_settings')
+
+import django
+
+django.setup()
+
+from django.core.management import call_command
+from django.contrib.auth.hashers import make_password
+from src.authentication.models import User
+from src.core.models import Task
+from src.core.repositories.task_repository import TaskRepository
+from src.core.services.task_service import TaskService
+from src.core.services.user_service import UserService
+
+DEFAULT_BASELINE = os.path.join(ROOT, 'scripts', 'microbench_baseline.json')
+RESULT_SIZES = (10, 100, 1000)
+REFERENCE = 'reference'
+# Calls whose peak allocation is sampled per benchmark (the median is kept).
+MEMORY_SAMPLES = 25
+# Benchmarks that do more work on purpose than when the baseline was
+# recorded: (share of the baseline's ops/sec they keep, growth of their
+# bytes/op). Every other benchmark keeps all of both, within the tolerances.
+# Writes put the token index, the daily counts and the outbox event in the
+# task's transaction: five statements where there was one. Reads load
+# tasks of 16 columns instead of 6 (compressed details, due dates, labels,
+# ranks, paths), and list items carry the labels, parent and due date.
+ACCEPTED_SLOWDOWNS = {
+    'create_task': (0.3, 1.3),
+    'update_task_status': (0.55, 1.5),
+    'repo.update_status': (0.55, 1.5),
+    'repo.get_by_id_and_user': (0.8, 1.3),
+    'repo.get_by_user': (0.8, 1.2),
+    'repo.get_by_user_and_status': (0.75, 1.35),
+    'repo.search_by_created_date': (0.8, 1.2),
+    'repo.search_by_detail': (0.7, 1.2),
+    'repo.search_by_detail_and_date': (0.85, 1.2),
+    **{f'search_tasks[{size}]': (0.7, 1.3) for size in RESULT_SIZES},
+    **{f'search_tasks_detail[{size}]': (0.7, 1.35) for size in RESULT_SIZES},
+}
+PASSWORD = 'benchpass123'
+WORDS = ('report', 'review', 'deploy', 'invoice', 'meeting', 'design', 'audit', 'backup')
+
+
+def setup_database():
+    """Create the schema and a deterministic dataset; return fixture ids."""
+    call_command('migrate', run_syncdb=True, verbosity=0)
+    rng = random.Random(1234)
+    base = datetime(2025, 9, 30, 12, 0, tzinfo=timezone.utc)
+    fixtures = {}
+    for size in RESULT_SIZES:
+        user = User.objects.create(
+            email=f'bench{size}@example.com', password=make_password(PASSWORD),
+            first_name='Bench', last_name=str(size)
+        )
+        tasks = [
+            Task(
+                user=user,
+                detail=f"{' '.join(rng.choice(WORDS) for _ in range(6))} item {i}",
+                status=('pending', 'completed', 'cancelled')[i % 3],
+            )
+            for i in range(size)
+        ]
+        Task.objects.bulk_create(tasks)
+        # auto_now_add ignores provided values, so pin created_at afterwards.
+        Task.objects.filter(user=user).update(created_at=base)
+        fixtures[size] = {'user_id': user.id, 'task_id': Task.objects.filter(user=user).first().id}
+    # Writes go to their own user so they do not grow the read fixtures.
+    writer = User.objects.create(email='writer@example.com', password=make_password(PASSWORD))
+    fixtures['writer_id'] = writer.id
+    fixtures['date'] = base.date()
+    fixtures['email'] = 'bench100@example.com'
+    return fixtures
+
+
+def build_benchmarks(fixtures):
+    """Return a mapping of benchmark name to zero-argument callable."""
+    task_service = TaskService()
+    user_service = UserService()
+    repository = TaskRepository()
+    mid = fixtures[100]
+    day = fixtures['date']
+    cycle = ['completed', 'pending']
+    benchmarks = {}
+
+    for size in RESULT_SIZES:
+        user_id = fixtures[size]['user_id']
+        benchmarks[f'search_tasks[{size}]'] = (
+            lambda user_id=user_id: task_service.search_tasks(user_id, {}))
+        benchmarks[f'search_tasks_detail[{size}]'] = (
+            lambda user_id=user_id: task_service.search_tasks(user_id, {'detail': 'report'}))
+
+    counter = {'n': 0}
+
+    def next_status():
+        counter['n'] += 1
+        return cycle[counter['n'] % 2]
+
+    benchmarks['create_task'] = lambda: task_service.create_task(fixtures['writer_id'], {'detail': 'Benchmark task'})
+    benchmarks['update_task_status'] = lambda: task_service.update_task_status(
+        mid['user_id'], mid['task_id'], next_status())
+    benchmarks['repo.get_by_user'] = lambda: repository.get_by_user(mid['user_id'])
+    benchmarks['repo.get_by_user_and_status'] = lambda: repository.get_by_user_and_status(mid['user_id'], 'pending')
+    benchmarks['repo.search_by_detail'] = lambda: repository.search_by_detail(mid['user_id'], 'report')
+    benchmarks['repo.search_by_created_date'] = lambda: repository.search_by_created_date(mid['user_id'], day)
+    benchmarks['repo.search_by_detail_and_date'] = lambda: repository.search_by_detail_and_date(
+        mid['user_id'], 'report', day)
+    benchmarks['repo.update_status'] = lambda: repository.update_status(
+        mid['task_id'], mid['user_id'], next_status())
+    benchmarks['repo.get_by_id_and_user'] = lambda: repository.get_by_id_and_user(mid['task_id'], mid['user_id'])
+    benchmarks['authenticate_user'] = lambda: user_service.authenticate_user(fixtures['email'], PASSWORD)
+    return benchmarks
+
+
+def build_reference():
+    """
+    The REFERENCE workload: read 100 rows from an in-memory sqlite3 table
+    and parse their timestamps, with the standard library only, so its
+    speed follows the machine and not this code base.
+    """
+    db = sqlite3.connect(':memory:')
+    db.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, detail TEXT, status TEXT, created_at TEXT)')
+    db.executemany(
+        'INSERT INTO items (detail, status, created_at) VALUES (?, ?, ?)',
+        [(f'item {i}', 'pending', f'2025-09-30 12:00:{i % 60:02d}.000000') for i in range(100)]
+    )
+
+    def reference():
+        rows = db.execute('SELECT id, detail, status, created_at FROM items ORDER BY id')
+        return [(pk, detail, status, datetime.fromisoformat(created)) for pk, detail, status, created in rows]
+    return reference
+
+
+def calibrate(func, min_time):
+    """Return how many calls of func make a timed batch of at least min_time seconds."""
+    func()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return number
+        number *= 2
+
+
+def time_rounds(benchmarks, numbers, rounds, repeats):
+    """
+    Return each benchmark's median seconds per call over `rounds` rounds.
+    A round times `repeats` short batches of calls and keeps the fastest,
+    which drops the bursts where the machine runs everything slower; the
+    median over rounds then drops the odd round that was slow throughout.
+    Every round runs every benchmark, so a slow stretch lands in one round
+    of each benchmark rather than in all the rounds of one of them.
+    """
+    times = {name: [] for name in benchmarks}
+    for _ in range(rounds):
+        for name, func in benchmarks.items():
+            best = None
+            for _ in range(repeats):
+                gc.collect()
+                start = time.perf_counter()
+                for _ in range(numbers[name]):
+                    func()
+                elapsed = (time.perf_counter() - start) / numbers[name]
+                best = elapsed if best is None else min(best, elapsed)
+            times[name].append(best)
+    return {name: statistics.median(samples) for name, samples in times.items()}
+
+
+def peak_bytes(func, samples):
+    """Peak memory allocated while one call of func runs, median over samples."""
+    peaks = []
+    gc.collect()
+    tracemalloc.start()
+    for _ in range(samples):
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        func()
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    peaks.sort()
+    return peaks[len(peaks) // 2]
+
+
+def compare(document, baseline, tolerance, memory_tolerance):
+    """
+    Return regressions of a results document against baseline. The
+    baseline's ops/sec are scaled by the ratio of the two REFERENCE speeds
+    and both results by the benchmark's ACCEPTED_SLOWDOWNS.
+    """
+    speed = document[f'{REFERENCE}_ops_per_sec'] / baseline[f'{REFERENCE}_ops_per_sec']
+    regressions = []
+    for name, current in document['benchmarks'].items():
+        previous = baseline.get('benchmarks', {}).get(name)
+        if not previous:
+            continue
+        kept, growth = ACCEPTED_SLOWDOWNS.get(name, (1.0, 1.0))
+        expected = previous['ops_per_sec'] * speed * kept
+        if current['ops_per_sec'] < expected * (1 - tolerance):
+            regressions.append(f"{name} ops/sec: {expected:.1f} expected -> {current['ops_per_sec']}")
+        allowed = previous['bytes_per_op'] * growth
+        if current['bytes_per_op'] > allowed * (1 + memory_tolerance) + 1024:
+            regressions.append(f"{name} bytes/op: {allowed:.0f} expected -> {current['bytes_per_op']}")
+    return regressions
+
+
+def main():
+    """Main function."""
+    parser = argparse.ArgumentParser(description='Run service and repository micro-benchmarks')
+    parser.add_argument('--only', '-k', help='Run benchmarks whose name contains this text')
+    parser.add_argument('--min-time', type=float, default=0.02, help='Minimum seconds per timed batch')
+    parser.add_argument('--repeats', type=int, default=5, help='Batches per round (the fastest is kept)')
+    parser.add_argument('--rounds', type=int, default=7, help='Rounds per benchmark (the median is kept)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=0.15, help='Allowed ops/sec regression ratio')
+    parser.add_argument('--memory-tolerance', type=float, default=0.1, help='Allowed bytes/op growth ratio')
+    parser.add_argument('--update-baseline', action='store_true', help='Write results as the new baseline')
+    parser.add_argument('--output', '-o', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    fixtures = setup_database()
+    benchmarks = build_benchmarks(fixtures)
+
+    if args.only:
+        benchmarks = {name: func for name, func in benchmarks.items() if args.only in name}
+    numbers = {name: calibrate(func, args.min_time) for name, func in benchmarks.items()}
+    reference = build_reference()
+    numbers[REFERENCE] = calibrate(reference, args.min_time)
+    seconds = time_rounds({**benchmarks, REFERENCE: reference}, numbers, args.rounds, args.repeats)
+
+    results = {}
+    print(f"{'benchmark':<36} {'ops/sec':>12} {'bytes/op':>12}")
+    print('-' * 62)
+    for name, func in benchmarks.items():
+        ops, allocated = 1.0 / seconds[name], peak_bytes(func, MEMORY_SAMPLES)
+        results[name] = {'ops_per_sec': round(ops, 1), 'bytes_per_op': round(allocated)}
+        print(f"{name:<36} {ops:>12.1f} {allocated:>12.0f}")
+    print(f"{REFERENCE:<36} {1.0 / seconds[REFERENCE]:>12.1f}")
+
+    document = {
+        'tolerance': args.tolerance,
+        f'{REFERENCE}_ops_per_sec': round(1.0 / seconds[REFERENCE], 1),
+        'benchmarks': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+    if args.update_baseline:
+        with open(args.baseline, 'w') as handle:
+            json.dump(document, handle, indent=2, sort_keys=True)
+            handle.write('\n')
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to create one")
+        return 0
+    with open(args.baseline) as handle:
+        regressions = compare(document, json.load(handle), args.tolerance, args.memory_tolerance)
+    if regressions:
+        print('\nRegressions against baseline:')
+        for line in regressions:
+            print(f'  {line}')
+        return 1
+    print('\nNo regressions against baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
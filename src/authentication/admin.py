@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.contrib.admin import ShowFacets
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from src.core.pagination import EstimatedCountPaginator
+from src.core.repositories.user_repository import UserRepository
 from .models import User
 
 
@@ -7,17 +10,26 @@ from .models import User
 class UserAdmin(BaseUserAdmin):
     """
     Custom User admin configuration.
+    Deleting users schedules them for erase_users instead of cascading
+    over their tasks in the request. Lists are ordered by primary key
+    (newest first, like created_at), paginated without COUNT(*) and
+    searched by email prefix, which the unique email index serves.
     """
     list_display = ('email', 'first_name', 'last_name', 'is_staff', 'created_at')
-    list_filter = ('is_staff', 'is_superuser', 'created_at')
-    search_fields = ('email', 'first_name', 'last_name')
-    ordering = ('-created_at',)
+    list_filter = ('is_staff', 'is_superuser', 'created_at', 'erasure_requested_at')
+    search_fields = ('^email',)
+    search_help_text = 'Beginning of the email address'
+    ordering = ('-id',)
+    sortable_by = ('email',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = ShowFacets.NEVER
     
     fieldsets = (
         (None, {'fields': ('email', 'password')}),
         ('Personal info', {'fields': ('first_name', 'last_name')}),
         ('Permissions', {'fields': ('is_active', 'is_staff', 'is_superuser', 'groups', 'user_permissions')}),
-        ('Important dates', {'fields': ('last_login', 'created_at', 'updated_at')}),
+        ('Important dates', {'fields': ('last_login', 'created_at', 'updated_at', 'erasure_requested_at')}),
     )
     
     add_fieldsets = (
@@ -27,4 +39,12 @@ class UserAdmin(BaseUserAdmin):
         }),
     )
     
-    readonly_fields = ('created_at', 'updated_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at', 'erasure_requested_at')
+    
+    def delete_model(self, request, obj):
+        UserRepository().request_erasure(obj.pk)
+    
+    def delete_queryset(self, request, queryset):
+        repository = UserRepository()
+        for user_id in queryset.values_list('pk', flat=True):
+            repository.request_erasure(user_id)
\ No newline at end of file
@@ -0,0 +1,18 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+from src.core.routers import remember_task_shard, set_current_user
+
+
+class RoutedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that tells the database router who the request is
+    for: before the user is loaded, so that lookup can use a replica unless
+    the user has just written, and after, so the user's task shard is known
+    without another query.
+    """
+
+    def get_user(self, validated_token):
+        set_current_user(validated_token.get(api_settings.USER_ID_CLAIM))
+        user = super().get_user(validated_token)
+        remember_task_shard(user)
+        return user
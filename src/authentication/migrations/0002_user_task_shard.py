@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='task_shard',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
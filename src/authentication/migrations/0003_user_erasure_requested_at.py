@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_user_task_shard'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='erasure_requested_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
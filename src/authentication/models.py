@@ -13,6 +13,12 @@ class User(AbstractUser):
     last_name = models.CharField(max_length=150, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Database holding the user's tasks when it differs from the shard map
+    # (set while resharding; see src.core.sharding).
+    task_shard = models.CharField(max_length=64, null=True, blank=True)
+    # Set when the account is closed; erase_users deletes the user's data
+    # in batches and then the user.
+    erasure_requested_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
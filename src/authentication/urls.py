@@ -6,4 +6,5 @@ app_name = 'authentication'
 urlpatterns = [
     path('register/', views.register, name='register'),
     path('login/', views.login_view, name='login'),
+    path('account/', views.delete_account, name='delete_account'),
 ]
@@ -1,9 +1,10 @@
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
 from datetime import timedelta
+from src.authentication.models import User
 from src.core.services.user_service import UserService
 
 
@@ -49,12 +50,8 @@ def login_view(request):
     )
     
     if result['success']:
-        # Get user and create JWT tokens
-        from src.authentication.models import User
-        user = User.objects.get(email=request.data.get('email'))
-        
-        # Create JWT tokens
-        refresh = RefreshToken.for_user(user)
+        # Tokens only need the user id; the user was just loaded by authenticate()
+        refresh = RefreshToken.for_user(User(id=result['data']['id']))
         access_token = refresh.access_token
         
         # Set token expiration to 1 hour
@@ -68,3 +65,18 @@ def login_view(request):
     else:
         return Response(result, status=status.HTTP_401_UNAUTHORIZED)
 
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def delete_account(request):
+    """
+    Close the authenticated user's account.
+    The account is disabled at once; its data is erased in the background.
+    """
+    user_service = UserService()
+    result = user_service.request_erasure(request.user.id)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_202_ACCEPTED)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
@@ -1,3 +1,142 @@
+from collections import defaultdict
 from django.contrib import admin
+from django.contrib.admin import ShowFacets
+from django.contrib.admin.views.main import ChangeList
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Q
+from django.http import QueryDict
+from src.core.models import Task
+from src.core.pagination import EstimatedCountPaginator
+from src.core.repositories.task_repository import TaskRepository
+from src.core.repositories.user_repository import UserRepository
+from src.core.sharding import get_shard_map
 
-# Register your models here.
+EDITABLE_FIELDS = ('detail', 'status', 'due_at')
+
+
+def selected_shard(request) -> str:
+    """
+    Task shard picked with the changelist's shard filter; the change pages
+    keep it in _changelist_filters. The first shard of the map by default.
+    """
+    params = request.GET
+    if '_changelist_filters' in params:
+        params = QueryDict(params['_changelist_filters'])
+    shards = get_shard_map().shards
+    alias = params.get(ShardFilter.parameter_name)
+    return alias if alias in shards else shards[0]
+
+
+class ShardFilter(admin.SimpleListFilter):
+    """Lists the tasks of one shard at a time; shown only when tasks are sharded."""
+    title = 'shard'
+    parameter_name = 'shard'
+
+    def lookups(self, request, model_admin):
+        shard_map = get_shard_map()
+        if not shard_map.is_sharded:
+            return []
+        return [(alias, alias) for alias in shard_map.shards]
+
+    def queryset(self, request, queryset):
+        # TaskAdmin.get_queryset already reads from the selected shard.
+        return queryset
+
+    def choices(self, changelist):
+        # No "All" choice: a list reads from a single shard.
+        current = self.value() or self.lookup_choices[0][0]
+        for alias, title in self.lookup_choices:
+            yield {
+                'selected': alias == current,
+                'query_string': changelist.get_query_string({self.parameter_name: alias}),
+                'display': title,
+            }
+
+
+class TaskChangeList(ChangeList):
+    """Lists tasks without loading their full (possibly compressed) details."""
+
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).defer(*Task.LIST_DEFERRED_FIELDS)
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    """
+    Task admin for tables with millions of rows.
+    Lists read in primary key order from one shard, are paginated without
+    COUNT(*) and search only indexed columns: a task id, a user id or a
+    user's exact email. Saves and deletes go through TaskRepository so the
+    typeahead index, the daily counts and the outbox stay in step.
+    """
+    list_display = ('id', 'short_detail', 'status', 'user', 'created_at', 'updated_at')
+    list_filter = (ShardFilter, 'status')
+    list_select_related = ('user',)
+    # Shows the search box; get_search_results does the (indexed) lookups.
+    search_fields = ('=id',)
+    search_help_text = 'Task id, user id or user email'
+    ordering = ('-id',)
+    sortable_by = ('id',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = ShowFacets.NEVER
+    raw_id_fields = ('user',)
+    fields = ('user', 'detail', 'status', 'due_at', 'reminded_at', 'created_at', 'updated_at', 'status_changed_at')
+    readonly_fields = ('reminded_at', 'created_at', 'updated_at', 'status_changed_at')
+
+    @admin.display(description='Detail')
+    def short_detail(self, obj):
+        return obj.detail_preview
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).using(selected_shard(request))
+
+    def get_changelist(self, request, **kwargs):
+        return TaskChangeList
+
+    def get_list_display(self, request):
+        # Users live on the primary; other shards cannot join them, so show
+        # the id rather than load each user.
+        if selected_shard(request) == DEFAULT_DB_ALIAS:
+            return self.list_display
+        return tuple('user_id' if name == 'user' else name for name in self.list_display)
+
+    def get_list_select_related(self, request):
+        return self.list_select_related if selected_shard(request) == DEFAULT_DB_ALIAS else ()
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a task to another user would move it to another shard.
+        if obj is not None:
+            return ('user',) + self.readonly_fields
+        return self.readonly_fields
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        if term.isdigit():
+            return queryset.filter(Q(pk=int(term)) | Q(user_id=int(term))), False
+        user = UserRepository().get_by_email(term)
+        if user is None:
+            return queryset.none(), False
+        return queryset.filter(user_id=user.pk), False
+
+    def save_model(self, request, obj, form, change):
+        repository = TaskRepository()
+        changes = {field: form.cleaned_data[field] for field in EDITABLE_FIELDS if field in form.changed_data}
+        if not change:
+            created = repository.create(user_id=obj.user_id, detail=obj.detail, status=obj.status, due_at=obj.due_at)
+            obj.pk, obj._state = created.pk, created._state
+        elif changes:
+            repository.update_by_id_and_user(obj.pk, obj.user_id, **changes)
+
+    def delete_model(self, request, obj):
+        TaskRepository().delete_by_id_and_user(obj.pk, obj.user_id)
+
+    def delete_queryset(self, request, queryset):
+        ids_by_user = defaultdict(list)
+        for task_id, user_id in queryset.values_list('pk', 'user_id'):
+            ids_by_user[user_id].append(task_id)
+        repository = TaskRepository()
+        for user_id, task_ids in ids_by_user.items():
+            repository.delete_many_by_user(task_ids, user_id)
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.core'
-    verbose_name = 'Core'
\ No newline at end of file
+    verbose_name = 'Core'
+    
+    def ready(self):
+        from src.core.routers import check_pin_cache
+        check_pin_cache()
@@ -0,0 +1,121 @@
+"""
+Storage for long task details.
+
+Details larger than TASK_DETAIL_COMPRESS_BYTES (UTF-8) are stored
+zlib-compressed in a binary column and the text column is left empty.
+Every row also keeps a short preview and the detail length, so list
+queries can skip both detail columns. The stored columns are derived from
+the model's `detail` attribute when rows are written (save and
+bulk_create), and TaskDetailStorage rebuilds `detail` when rows are
+loaded, so callers only ever see the full text. QuerySet.update() does not
+run these fields; change details through save().
+"""
+import zlib
+from typing import Optional, Tuple
+from django.conf import settings
+from django.db import models
+
+PREVIEW_LENGTH = 200
+ELLIPSIS = '…'
+
+
+def compress_threshold() -> int:
+    return getattr(settings, 'TASK_DETAIL_COMPRESS_BYTES', 4096)
+
+
+def pack_detail(text: str) -> Tuple[str, Optional[bytes]]:
+    """Return the (text column, blob column) values for a detail."""
+    encoded = text.encode('utf-8')
+    if len(encoded) <= compress_threshold():
+        return text, None
+    blob = zlib.compress(encoded, 6)
+    if len(blob) >= len(encoded):
+        return text, None
+    return '', blob
+
+
+def unpack_detail(text: str, blob: Optional[bytes]) -> str:
+    """Inverse of pack_detail."""
+    if blob is None:
+        return text
+    return zlib.decompress(bytes(blob)).decode('utf-8')
+
+
+def make_preview(text: str) -> str:
+    """Whitespace-collapsed start of a detail, at most PREVIEW_LENGTH characters."""
+    window = text[:PREVIEW_LENGTH * 4]
+    preview = ' '.join(window.split())
+    if len(preview) > PREVIEW_LENGTH or len(window) < len(text):
+        return preview[:PREVIEW_LENGTH - 1] + ELLIPSIS
+    return preview
+
+
+def _packed(instance, source: str) -> Tuple[str, Optional[bytes]]:
+    # Text and blob columns are written one after the other; compress once.
+    text = getattr(instance, source)
+    cached = instance.__dict__.get('_packed_detail')
+    if cached is None or cached[0] is not text:
+        cached = (text, pack_detail(text))
+        instance.__dict__['_packed_detail'] = cached
+    return cached[1]
+
+
+class DetailTextField(models.TextField):
+    """Holds the detail as plain text, or '' when it is stored compressed."""
+
+    def pre_save(self, model_instance, add):
+        return _packed(model_instance, self.attname)[0]
+
+
+class _DerivedFromDetail:
+    """Mixin for columns computed from another field on write."""
+
+    def __init__(self, *args, source: str = 'detail', **kwargs):
+        self.source = source
+        kwargs['editable'] = False
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs.pop('editable', None)
+        if self.source != 'detail':
+            kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        if self.source not in model_instance.__dict__:
+            # Detail not loaded (deferred), so it is not being changed.
+            return getattr(model_instance, self.attname)
+        value = self.derive(getattr(model_instance, self.source), model_instance)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class DetailBlobField(_DerivedFromDetail, models.BinaryField):
+    """zlib-compressed detail, or NULL when the detail is small."""
+
+    def derive(self, text, instance):
+        return _packed(instance, self.source)[1]
+
+
+class DetailPreviewField(_DerivedFromDetail, models.CharField):
+    """Whitespace-collapsed prefix of the detail for list views."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('max_length', PREVIEW_LENGTH)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def derive(self, text, instance):
+        return make_preview(text)
+
+
+class DetailLengthField(_DerivedFromDetail, models.PositiveIntegerField):
+    """Length of the full detail in characters."""
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('default', 0)
+        super().__init__(*args, **kwargs)
+
+    def derive(self, text, instance):
+        return len(text)
@@ -0,0 +1,125 @@
+"""
+Dependency checks behind the readiness probe.
+
+Results are cached for HEALTH_CHECK_CACHE_SECONDS. Once a result is stale
+the next caller still gets it immediately while a single background
+thread refreshes it, so a burst of probe traffic costs at most one round
+of database and cache pings per interval.
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def check_database() -> Tuple[bool, str]:
+    """Run a trivial query on the default database."""
+    with connections[DEFAULT_DB_ALIAS].cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+    return True, 'ok'
+
+
+def check_migrations() -> Tuple[bool, str]:
+    """Report unapplied migrations on the default database."""
+    # Loads the migration graph machinery; only the readiness probe needs it.
+    from django.db.migrations.executor import MigrationExecutor
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        return False, f'{len(plan)} unapplied migration(s)'
+    return True, 'ok'
+
+
+def check_cache() -> Tuple[bool, str]:
+    """Round-trip a value through the default cache."""
+    cache = caches['default']
+    if isinstance(cache, DummyCache):
+        return True, 'disabled'
+    cache.set('health:readiness', '1', 10)
+    if cache.get('health:readiness') != '1':
+        return False, 'cache round-trip failed'
+    return True, 'ok'
+
+
+class ReadinessChecker:
+    """
+    Runs the readiness checks and caches the outcome.
+    The migration check is skipped once it has passed, since applied
+    migrations do not become unapplied in a running process.
+    """
+
+    def __init__(self, checks: Optional[Dict[str, Callable[[], Tuple[bool, str]]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.checks = checks or {
+            'database': check_database,
+            'migrations': check_migrations,
+            'cache': check_cache,
+        }
+        self.clock = clock
+        self._result: Optional[Dict] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self._first_check = threading.Lock()
+        self._refreshing = False
+        self._thread: Optional[threading.Thread] = None
+        self._migrations_ok = False
+
+    @property
+    def max_age(self) -> float:
+        return getattr(settings, 'HEALTH_CHECK_CACHE_SECONDS', 5.0)
+
+    def run_checks(self) -> Dict:
+        checks = {}
+        for name, check in self.checks.items():
+            if name == 'migrations' and self._migrations_ok:
+                checks[name] = {'ok': True, 'detail': 'ok'}
+                continue
+            try:
+                ok, detail = check()
+            except Exception as error:
+                ok, detail = False, str(error)
+            checks[name] = {'ok': ok, 'detail': detail}
+            if name == 'migrations' and ok:
+                self._migrations_ok = True
+        return {'ready': all(item['ok'] for item in checks.values()), 'checks': checks}
+
+    def _refresh(self) -> Dict:
+        result = self.run_checks()
+        with self._lock:
+            self._result = result
+            self._checked_at = self.clock()
+        return result
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self._refresh()
+        finally:
+            self._refreshing = False
+            # Connections are per thread; do not leak this thread's.
+            connections.close_all()
+
+    def status(self) -> Dict:
+        """Return the cached readiness, refreshing it when stale."""
+        with self._lock:
+            result = self._result
+            age = self.clock() - self._checked_at
+            if result is not None and age < self.max_age:
+                return {**result, 'age': round(age, 3)}
+            if result is not None:
+                if not self._refreshing:
+                    self._refreshing = True
+                    self._thread = threading.Thread(target=self._refresh_in_background, daemon=True)
+                    self._thread.start()
+                return {**result, 'age': round(age, 3)}
+        # First call: nothing cached yet, check synchronously and once.
+        with self._first_check:
+            if self._result is None:
+                self._refresh()
+        return {**self._result, 'age': 0.0}
+
+
+readiness = ReadinessChecker()
@@ -0,0 +1,99 @@
+"""
+Incremental readers for task imports.
+
+Uploads are read line by line from the file object (Django spools large
+uploads to a temporary file), so an import holds one batch of rows in
+memory however large the file is. Readers yield (row number, data, error):
+a row that cannot be parsed carries an error instead of data. A CSV file
+that breaks mid-way (bad encoding, unterminated quote) ends with one last
+error row, since the rows after it cannot be located.
+"""
+import codecs
+import csv
+import json
+from typing import IO, Any, Dict, Iterator, Optional, Tuple
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+
+FORMATS = ('csv', 'ndjson')
+EXTENSIONS = {
+    '.csv': 'csv',
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+}
+
+BOM = codecs.BOM_UTF8
+Row = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+class ImportFileError(ValueError):
+    """The file cannot be imported at all (for example a CSV without a detail column)."""
+
+
+def upload_storage() -> FileSystemStorage:
+    """Where background imports keep uploads until the worker has read them."""
+    return FileSystemStorage(location=settings.IMPORT_UPLOAD_DIR)
+
+
+def detect_format(filename: str) -> str:
+    """Format implied by the file name, csv when unknown."""
+    lowered = filename.lower()
+    for extension, file_format in EXTENSIONS.items():
+        if lowered.endswith(extension):
+            return file_format
+    return 'csv'
+
+
+def _lines(file: IO[bytes]) -> Iterator[str]:
+    """
+    Decode the file line by line, so a bad byte is reported on its own
+    line. The BOM spreadsheet tools put in front of CSV files is dropped.
+    """
+    first = True
+    for line in file:
+        if first:
+            line, first = line.removeprefix(BOM), False
+        yield line.decode('utf-8')
+
+
+def csv_rows(file: IO[bytes]) -> Iterator[Row]:
+    """Rows of a CSV file with a header line; row numbers exclude the header."""
+    reader = csv.DictReader(_lines(file))
+    number = 0
+    try:
+        if 'detail' not in (reader.fieldnames or ()):
+            raise ImportFileError("CSV header must include a detail column")
+        for number, data in enumerate(reader, start=1):
+            yield number, data, None
+    except UnicodeDecodeError:
+        yield number + 1, None, "File is not valid UTF-8"
+    except csv.Error as e:
+        yield number + 1, None, f"Invalid CSV: {e}"
+
+
+def ndjson_rows(file: IO[bytes]) -> Iterator[Row]:
+    """One JSON object per line; blank lines are skipped but counted."""
+    first = True
+    for number, line in enumerate(file, start=1):
+        if first:
+            line, first = line.removeprefix(BOM), False
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line.decode('utf-8'))
+        except UnicodeDecodeError:
+            yield number, None, "Line is not valid UTF-8"
+            continue
+        except ValueError:
+            yield number, None, "Invalid JSON"
+            continue
+        if isinstance(data, dict):
+            yield number, data, None
+        else:
+            yield number, None, "Each line must be a JSON object"
+
+
+READERS = {
+    'csv': csv_rows,
+    'ndjson': ndjson_rows,
+}
@@ -0,0 +1,115 @@
+"""
+Background jobs.
+
+Heavy work is queued as a Job row (JobRepository.enqueue) and executed
+by the run_worker command in a thread or process pool, outside request
+threads. A job is a function registered under a name; it receives the Job
+and returns a JSON-serializable result, which clients can poll through
+GET /api/jobs/{id}/. A job that raises is retried with exponential
+backoff until its attempts run out. A worker that dies stops renewing
+its locks and its jobs are picked up again after the visibility timeout,
+so jobs must be safe to run more than once.
+
+    from src.core.jobs import job
+
+    @job('rebuild_something')
+    def rebuild_something(job):
+        return {'rows': ...}
+"""
+from io import StringIO
+from typing import Any, Callable, Dict, Optional
+from django.conf import settings
+from django.core.management import call_command
+from django.db import close_old_connections
+from src.core import importer
+from src.core.repositories.job_repository import JobRepository
+from src.core.services.task_service import TaskService
+
+_jobs: Dict[str, Callable] = {}
+
+
+def job(name: str):
+    """Register the decorated function as the job `name`."""
+    def decorator(func: Callable) -> Callable:
+        _jobs[name] = func
+        return func
+    return decorator
+
+
+def get_job(name: str) -> Optional[Callable]:
+    return _jobs.get(name)
+
+
+def retry_delay(attempts: int) -> int:
+    """Seconds to wait before retrying a job that failed `attempts` times."""
+    return min(30 * 2 ** min(max(attempts - 1, 0), 20), getattr(settings, 'JOB_RETRY_MAX_SECONDS', 3600))
+
+
+class UnknownJob(LookupError):
+    """The job name has no registered function; retrying will not help."""
+
+
+def run(job_row) -> Any:
+    """
+    Run a claimed job's function in a pool thread or process and return its
+    result. The worker records the outcome, so pools only ever write a job's
+    progress (JobRepository.report_progress).
+    """
+    func = get_job(job_row.name)
+    if func is None:
+        raise UnknownJob(f'Unknown job: {job_row.name}')
+    close_old_connections()
+    try:
+        return func(job_row)
+    finally:
+        close_old_connections()
+
+
+def init_worker_process() -> None:
+    """Initializer for process pools: processes started with spawn need Django set up."""
+    import django
+    django.setup()
+
+
+def _command(name: str, job_row, **defaults) -> Dict[str, str]:
+    out = StringIO()
+    call_command(name, stdout=out, **{**defaults, **job_row.args})
+    return {'output': out.getvalue().strip()}
+
+
+@job('erase_users')
+def erase_users(job_row):
+    return _command('erase_users', job_row)
+
+
+@job('archive_tasks')
+def archive_tasks(job_row):
+    return _command('archive_tasks', job_row)
+
+
+@job('index_tasks')
+def index_tasks(job_row):
+    return _command('index_tasks', job_row)
+
+
+@job('rebalance_ranks')
+def rebalance_ranks(job_row):
+    return _command('rebalance_ranks', job_row)
+
+
+@job('import_tasks')
+def import_tasks(job_row):
+    """
+    Import a file saved by TaskService.import_tasks. A retried job resumes
+    after the last batch it reported as committed.
+    """
+    storage = importer.upload_storage()
+    path = job_row.args['path']
+    repository = JobRepository()
+    with storage.open(path, 'rb') as file:
+        report = TaskService().import_rows(
+            job_row.user_id, file, job_row.args['format'], resume=job_row.progress,
+            progress=lambda progress: repository.report_progress(job_row, progress)
+        )
+    storage.delete(path)
+    return report
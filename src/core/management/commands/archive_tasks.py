@@ -0,0 +1,65 @@
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from src.core.sharding import get_shard_map
+
+
+class Command(BaseCommand):
+    help = ('Move completed and cancelled tasks not updated for a while into the archive table, '
+            'in small batches on every task shard.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int,
+                            help='Archive finished tasks not updated for this many days '
+                                 '(default: TASK_ARCHIVE_AFTER_DAYS)')
+        parser.add_argument('--batch-size', type=int, default=500, help='Tasks moved per transaction')
+        parser.add_argument('--sleep', type=float, default=0.1,
+                            help='Seconds to pause between batches to leave room for live traffic')
+        parser.add_argument('--max-batches', type=int, help='Stop each shard after this many batches')
+        parser.add_argument('--dry-run', action='store_true', help='Count the tasks without moving them')
+
+    def handle(self, *args, **options):
+        days = options['older_than_days']
+        if days is None:
+            days = settings.TASK_ARCHIVE_AFTER_DAYS
+        if days < 0:
+            raise CommandError('--older-than-days cannot be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        cutoff = timezone.now() - timedelta(days=days)
+
+        repository = TaskArchiveRepository()
+        started = time.perf_counter()
+        total = 0
+        for alias in get_shard_map().shards:
+            if alias not in connections.databases:
+                raise CommandError(f'Unknown database alias: {alias}')
+            if options['dry_run']:
+                count = repository.archivable(alias, cutoff).count()
+                self.stdout.write(f'Would archive {count} tasks on {alias}')
+                total += count
+                continue
+
+            archived = batches = 0
+            while options['max_batches'] is None or batches < options['max_batches']:
+                moved = repository.archive_batch(alias, cutoff, options['batch_size'])
+                if not moved:
+                    break
+                archived += moved
+                batches += 1
+                if moved < options['batch_size']:
+                    break
+                if options['sleep']:
+                    time.sleep(options['sleep'])
+            self.stdout.write(f'Archived {archived} tasks on {alias} in {batches} batches')
+            total += archived
+
+        verb = 'Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {total} tasks finished before {cutoff:%Y-%m-%d %H:%M} '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
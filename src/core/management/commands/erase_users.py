@@ -0,0 +1,56 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from src.core.repositories.label_repository import LabelRepository
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from src.core.repositories.task_daily_stat_repository import TaskDailyStatRepository
+from src.core.repositories.task_repository import TaskRepository
+from src.core.repositories.task_token_repository import TaskTokenRepository
+from src.core.repositories.user_repository import UserRepository
+
+
+class Command(BaseCommand):
+    help = ('Delete users whose erasure was requested: their task index, daily stats, tasks and archived tasks go first, '
+            'in bounded batches with pauses so locks stay short, then the user row.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows deleted per statement')
+        parser.add_argument('--sleep', type=float, default=0.05, help='Seconds to pause between batches')
+        parser.add_argument('--limit', type=int, help='Erase at most this many users in this run')
+        parser.add_argument('--user-ids', help='Only erase these users, comma separated')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        self.options = options
+        user_repository = UserRepository()
+        pending = user_repository.get_pending_erasures(options['limit'])
+        if options['user_ids']:
+            wanted = {int(value) for value in options['user_ids'].split(',')}
+            pending = [user_id for user_id in pending if user_id in wanted]
+
+        started = time.perf_counter()
+        total_rows = 0
+        for user_id in pending:
+            self.delete_rows(TaskTokenRepository(), user_id)
+            self.delete_rows(TaskDailyStatRepository(), user_id)
+            self.delete_rows(LabelRepository(), user_id)
+            rows = self.delete_rows(TaskRepository(), user_id) + self.delete_rows(TaskArchiveRepository(), user_id)
+            user_repository.delete_user(user_id)
+            self.stdout.write(f'Erased user {user_id}: {rows} task rows')
+            total_rows += rows
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Erased {len(pending)} users ({total_rows} task rows) in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def delete_rows(self, repository, user_id):
+        """Delete the user's rows of one table batch by batch."""
+        batch_size = self.options['batch_size']
+        deleted = 0
+        while True:
+            count = repository.delete_user_batch(user_id, batch_size)
+            deleted += count
+            if count < batch_size:
+                return deleted
+            if self.options['sleep']:
+                time.sleep(self.options['sleep'])
@@ -0,0 +1,56 @@
+import time
+from typing import Tuple
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from src.core.models import Task
+from src.core.repositories.task_token_repository import TaskTokenRepository
+from src.core.routers import task_shard_for
+
+User = get_user_model()
+
+
+def index_user(user_id: int, alias: str, batch_size: int) -> Tuple[int, int]:
+    """Index a user's tasks on database `alias`, batch_size tasks per transaction; return (tasks, tokens)."""
+    repository = TaskTokenRepository()
+    indexed_tasks = written = 0
+    last_id = 0
+    while True:
+        batch = list(
+            Task.objects.using(alias).filter(user_id=user_id, id__gt=last_id)
+            .order_by('id').only('id', 'user_id', 'detail', 'detail_blob')[:batch_size]
+        )
+        if not batch:
+            break
+        with transaction.atomic(using=alias):
+            written += repository.index_tasks(batch, alias)
+        indexed_tasks += len(batch)
+        last_id = batch[-1].id
+    return indexed_tasks, written
+
+
+class Command(BaseCommand):
+    help = ('Rebuild the typeahead word index (task_tokens) from task details, user by user. '
+            'Needed once after the index is introduced and after raw imports such as seed_data.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-ids', help='Only index these users, comma separated')
+        parser.add_argument('--batch-size', type=int, default=500, help='Tasks indexed per transaction')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        users = User.objects.using(DEFAULT_DB_ALIAS).order_by('id').values_list('id', flat=True)
+        if options['user_ids']:
+            users = users.filter(id__in=[int(value) for value in options['user_ids'].split(',')])
+
+        started = time.perf_counter()
+        indexed_tasks = written = 0
+        for user_id in users.iterator():
+            tasks, tokens = index_user(user_id, task_shard_for(user_id), options['batch_size'])
+            indexed_tasks += tasks
+            written += tokens
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {indexed_tasks} tasks ({written} tokens) in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,93 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from src.core import outbox
+from src.core.repositories.outbox_repository import OutboxRepository
+from src.core.sharding import get_shard_map
+
+
+class Command(BaseCommand):
+    help = ('Deliver task change events from the outbox to the registered handlers, in batches on every '
+            'task shard. Several workers can run at once on backends with SKIP LOCKED.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100, help='Events claimed per transaction')
+        parser.add_argument('--max-batches', type=int, help='Stop each shard after this many batches per pass')
+        parser.add_argument('--loop', action='store_true', help='Keep polling instead of exiting when drained')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait between passes with --loop when no events were due')
+        parser.add_argument('--retry-failed', action='store_true',
+                            help='Make events that used up OUTBOX_MAX_ATTEMPTS due again first')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        aliases = get_shard_map().shards
+        for alias in aliases:
+            if alias not in connections.databases:
+                raise CommandError(f'Unknown database alias: {alias}')
+        outbox.load_handlers()
+        self.repository = OutboxRepository()
+        if options['retry_failed']:
+            retried = sum(self.repository.retry_failed(alias) for alias in aliases)
+            self.stdout.write(f'Retrying {retried} failed events')
+
+        started = time.perf_counter()
+        delivered = failed = 0
+        try:
+            while True:
+                pass_delivered = pass_failed = 0
+                for alias in aliases:
+                    done, errors = self.drain(alias, options['batch_size'], options['max_batches'])
+                    pass_delivered += done
+                    pass_failed += errors
+                delivered += pass_delivered
+                failed += pass_failed
+                if not options['loop']:
+                    break
+                if not pass_delivered and not pass_failed:
+                    time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Delivered {delivered} events ({failed} failed, retried until OUTBOX_MAX_ATTEMPTS) in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def drain(self, alias, batch_size, max_batches):
+        """Process due events of one database until none are left; returns (delivered, failed)."""
+        delivered = failed = batches = 0
+        while max_batches is None or batches < max_batches:
+            done, errors, claimed = self.process_batch(alias, batch_size)
+            delivered += done
+            failed += errors
+            batches += 1
+            if claimed < batch_size:
+                break
+        return delivered, failed
+
+    def process_batch(self, alias, batch_size):
+        """Claim one batch, dispatch it and settle every event in the same transaction."""
+        delivered = []
+        failed = 0
+        with transaction.atomic(using=alias):
+            events = self.repository.claim_batch(alias, batch_size)
+            for event in events:
+                try:
+                    # A savepoint keeps a handler's failed writes out of the batch.
+                    with transaction.atomic(using=alias):
+                        outbox.dispatch(event)
+                except Exception as e:
+                    failed += 1
+                    error = f'{type(e).__name__}: {e}'
+                    delay = outbox.retry_delay(event.attempts + 1)
+                    if delay is None:
+                        self.repository.fail(event, error, alias)
+                        self.stderr.write(f'Event {event.id} ({event.event_type}) failed for good: {e}')
+                    else:
+                        self.repository.reschedule(event, error, delay, alias)
+                        self.stderr.write(f'Event {event.id} ({event.event_type}) failed: {e}')
+                else:
+                    delivered.append(event.id)
+            self.repository.acknowledge(delivered, alias)
+        return len(delivered), failed, len(events)
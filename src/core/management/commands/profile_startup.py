@@ -0,0 +1,151 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+PHASES = ('setup', 'handler', 'first_request')
+
+# Runs in a fresh interpreter started with -X importtime. Phase markers go
+# straight to fd 2 so they interleave correctly with the importtime lines.
+CHILD = r'''
+import io, json, os, sys, time
+started = time.perf_counter()
+def mark(phase):
+    os.write(2, ("startup-phase: " + phase + "\n").encode())
+mark("setup")
+import django
+django.setup()
+setup_done = time.perf_counter()
+mark("handler")
+from django.core.handlers.wsgi import WSGIHandler
+handler = WSGIHandler()
+handler_done = time.perf_counter()
+mark("first_request")
+statuses = []
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": %(path)r, "QUERY_STRING": "",
+    "SERVER_NAME": %(host)r, "SERVER_PORT": "80", "HTTP_HOST": %(host)r,
+    "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr, "wsgi.url_scheme": "http",
+}
+response = handler(environ, lambda status, headers: statuses.append(status))
+b"".join(response)
+response.close()
+done = time.perf_counter()
+print(json.dumps({
+    "status": statuses[0] if statuses else None,
+    "setup_ms": (setup_done - started) * 1000,
+    "handler_ms": (handler_done - setup_done) * 1000,
+    "first_request_ms": (done - handler_done) * 1000,
+    "modules": sorted(sys.modules),
+}))
+'''
+
+
+def parse_importtime(lines):
+    """
+    Build import trees from `-X importtime` output.
+    Returns {phase: [root nodes]}; a node is a dict with name, self_ms,
+    cumulative_ms and children.
+    """
+    trees = {phase: [] for phase in PHASES}
+    phase = PHASES[0]
+    pending = {}
+    for line in lines:
+        if line.startswith('startup-phase: '):
+            trees[phase].extend(pending.pop(0, []))
+            pending = {}
+            phase = line.split(': ', 1)[1].strip()
+            continue
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, raw_name = line[len('import time:'):].split('|', 2)
+        name = raw_name.rstrip().lstrip(' ')
+        # One space after the bar, then two per nesting level.
+        level = (len(raw_name) - len(raw_name.lstrip(' ')) - 1) // 2
+        node = {
+            'name': name,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'children': pending.pop(level + 1, []),
+        }
+        pending.setdefault(level, []).append(node)
+    trees.setdefault(phase, []).extend(pending.pop(0, []))
+    return trees
+
+
+def profile_startup(path='/api/health/live/', settings_module=None, python=None):
+    """Start a fresh interpreter, serve one request and return the measurements."""
+    settings_module = settings_module or os.environ.get('DJANGO_SETTINGS_MODULE') or settings.SETTINGS_MODULE
+    root = str(settings.BASE_DIR.parent)
+    host = next((host for host in settings.ALLOWED_HOSTS if host and '*' not in host and not host.startswith('.')),
+                'localhost')
+    env = {**os.environ, 'DJANGO_SETTINGS_MODULE': settings_module,
+           'PYTHONPATH': os.pathsep.join(filter(None, [root, os.environ.get('PYTHONPATH')]))}
+    code = CHILD % {'path': path, 'host': host}
+    started = time.perf_counter()
+    result = subprocess.run([python or sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, env=env, cwd=root)
+    wall_ms = (time.perf_counter() - started) * 1000
+    if result.returncode != 0:
+        errors = [line for line in result.stderr.splitlines() if not line.startswith(('import time:', 'startup-phase:'))]
+        raise CommandError('Startup failed:\n' + '\n'.join(errors[-20:]))
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    trees = parse_importtime(result.stderr.splitlines())
+    report['wall_ms'] = wall_ms
+    report['import_ms'] = {phase: sum(node['cumulative_ms'] for node in trees.get(phase, [])) for phase in PHASES}
+    report['imports'] = trees
+    return report
+
+
+class Command(BaseCommand):
+    help = 'Report the import-time tree and time to first request of a fresh worker.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/health/live/', help='Path of the first request')
+        parser.add_argument('--settings-module', help='Settings module to profile (default: current)')
+        parser.add_argument('--min-ms', type=float, default=2.0, help='Hide imports cheaper than this')
+        parser.add_argument('--depth', type=int, default=3, help='Levels of the import tree to show')
+        parser.add_argument('--top', type=int, default=15, help='Slowest imports by self time to list')
+        parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+
+    def handle(self, *args, **options):
+        report = profile_startup(options['path'], options['settings_module'])
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for phase in PHASES:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"{phase}: {report[phase + '_ms']:.1f} ms ({report['import_ms'][phase]:.1f} ms importing)"
+            ))
+            roots = sorted(report['imports'][phase], key=lambda node: -node['cumulative_ms'])
+            self._write_tree(roots, options['min_ms'], options['depth'], 1)
+
+        nodes = []
+        stack = [node for phase in PHASES for node in report['imports'][phase]]
+        while stack:
+            node = stack.pop()
+            nodes.append(node)
+            stack.extend(node['children'])
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Slowest imports (self time)"))
+        for node in sorted(nodes, key=lambda node: -node['self_ms'])[:options['top']]:
+            self.stdout.write(f"  {node['self_ms']:8.1f} ms  {node['name']}")
+
+        total = report['setup_ms'] + report['handler_ms'] + report['first_request_ms']
+        self.stdout.write(self.style.SUCCESS(
+            f"First request {options['path']} -> {report['status']}: "
+            f"{total:.1f} ms after interpreter start, {report['wall_ms']:.1f} ms wall "
+            f"({len(report['modules'])} modules loaded)"
+        ))
+
+    def _write_tree(self, nodes, min_ms, depth, level):
+        for node in nodes:
+            if node['cumulative_ms'] < min_ms:
+                continue
+            self.stdout.write(f"{'  ' * level}{node['cumulative_ms']:8.1f} ms  {node['name']}")
+            if level < depth:
+                children = sorted(node['children'], key=lambda child: -child['cumulative_ms'])
+                self._write_tree(children, min_ms, depth, level + 1)
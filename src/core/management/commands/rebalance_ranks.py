@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from src.core.repositories.task_repository import TaskRepository
+from src.core.routers import task_shard_for
+
+
+class Command(BaseCommand):
+    help = ("Respace users' manual task order ranks so they are short again, keeping the order. "
+            'Queued by moves whose rank grows long; safe to run again.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-ids', required=True, help='Users to rebalance, comma separated')
+
+    def handle(self, *args, **options):
+        try:
+            user_ids = [int(value) for value in options['user_ids'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError('--user-ids must be a comma separated list of user ids')
+        repository = TaskRepository()
+
+        started = time.perf_counter()
+        ranked = 0
+        for user_id in user_ids:
+            ranked += repository.rebalance_ranks(user_id, task_shard_for(user_id))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebalanced ranks of {len(user_ids)} users ({ranked} tasks) in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from src.core.repositories.task_daily_stat_repository import TaskDailyStatRepository
+from src.core.routers import task_shard_for
+from src.core.sharding import get_shard_map
+
+User = get_user_model()
+
+
+def rebuild_user(user_id):
+    return TaskDailyStatRepository().rebuild_user(user_id, task_shard_for(user_id))
+
+
+def _rebuild_in_thread(user_id):
+    try:
+        return rebuild_user(user_id)
+    finally:
+        # Pool threads open their own connections; do not leave them behind.
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = ('Recompute the daily task counts (task_daily_stats) from tasks and archived tasks, '
+            'several users at a time. Needed once after the table is introduced and after raw imports.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user-ids', help='Only rebuild these users, comma separated')
+        parser.add_argument('--workers', type=int, default=4, help='Users rebuilt at the same time')
+        parser.add_argument('--batch-size', type=int, default=1000, help='User ids read per query')
+
+    def handle(self, *args, **options):
+        if options['workers'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--workers and --batch-size must be positive')
+        workers = options['workers']
+        if workers > 1 and any(connections[alias].vendor == 'sqlite' for alias in get_shard_map().shards):
+            # SQLite takes one writer at a time; parallel rebuilds would fail with "database is locked".
+            self.stdout.write('SQLite shard: rebuilding with a single worker')
+            workers = 1
+        users = User.objects.using(DEFAULT_DB_ALIAS).order_by('id')
+        if options['user_ids']:
+            users = users.filter(id__in=[int(value) for value in options['user_ids'].split(',')])
+
+        started = time.perf_counter()
+        rebuilt_users = written = 0
+        last_id = 0
+        with ThreadPoolExecutor(workers, thread_name_prefix='stats') as pool:
+            while True:
+                batch = list(users.filter(id__gt=last_id).values_list('id', flat=True)[:options['batch_size']])
+                if not batch:
+                    break
+                # A single worker rebuilds in this thread.
+                if workers > 1:
+                    written += sum(pool.map(_rebuild_in_thread, batch))
+                else:
+                    written += sum(map(rebuild_user, batch))
+                rebuilt_users += len(batch)
+                last_id = batch[-1]
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt daily stats of {rebuilt_users} users ({written} rows) in {time.perf_counter() - started:.2f}s'
+        ))
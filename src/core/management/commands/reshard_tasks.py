@@ -0,0 +1,296 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+from src.core.models import Label, OutboxEvent, Task, TaskArchive
+from src.core.repositories.task_daily_stat_repository import TaskDailyStatRepository
+from src.core.repositories.task_token_repository import TaskTokenRepository
+from src.core.sharding import STRATEGIES, ShardMap, get_shard_map
+
+User = get_user_model()
+
+# Per-user tables moved together, with the column that orders versions of
+# a row and the columns that mark rows written while a move is running
+# (mark_reminded sets reminded_at without touching updated_at).
+MOVED_MODELS = (
+    (Task, 'updated_at', ('updated_at', 'reminded_at')),
+    (TaskArchive, 'archived_at', ('archived_at',)),
+)
+
+
+def _insert(alias, rows, keep_ids=True):
+    """Insert rows as they are, keeping timestamps and, unless told otherwise, ids."""
+    if not rows:
+        return
+    connection = connections[alias]
+    model = type(rows[0])
+    fields = [field for field in model._meta.concrete_fields if keep_ids or not field.primary_key]
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    # pre_save derives stored columns (e.g. compressed details); auto_now
+    # fields keep their value instead of being bumped.
+    params = [
+        [
+            field.get_db_prep_value(
+                getattr(row, field.attname) if getattr(field, 'auto_now', False) else field.pre_save(row, False),
+                connection
+            )
+            for field in fields
+        ]
+        for row in rows
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(f'INSERT INTO {table} ({columns}) VALUES ({placeholders})', params)
+
+
+def set_id_sequence(alias, start):
+    """Make new task ids on a shard start at `start` unless they are already past it."""
+    connection = connections[alias]
+    table = Task._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = %s', [table])
+            row = cursor.fetchone()
+            if row is None:
+                cursor.execute('INSERT INTO sqlite_sequence (name, seq) VALUES (%s, %s)', [table, start - 1])
+            elif row[0] < start - 1:
+                cursor.execute('UPDATE sqlite_sequence SET seq = %s WHERE name = %s', [start - 1, table])
+        elif connection.vendor == 'mysql':
+            # MySQL never lowers AUTO_INCREMENT below max(id) + 1.
+            cursor.execute(f'ALTER TABLE {connection.ops.quote_name(table)} AUTO_INCREMENT = {int(start)}')
+        else:
+            raise CommandError(f'Cannot set the task id sequence on {connection.vendor}')
+
+
+class Command(BaseCommand):
+    help = ('Move users\' tasks between shards in batches so they match a target shard map. '
+            'Moved users keep an explicit task shard until the settings map agrees (--finalize).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--shards', help='Target shard aliases, comma separated (default: settings)')
+        parser.add_argument('--strategy', choices=STRATEGIES, help='Target strategy (default: settings)')
+        parser.add_argument('--ranges', help="Target ranges for the range strategy, e.g. '1000:default,:shard_1'")
+        parser.add_argument('--user-ids', help='Only consider these users, comma separated')
+        parser.add_argument('--batch-size', type=int, default=500, help='Tasks copied or deleted per batch')
+        parser.add_argument('--sleep', type=float, default=0.0, help='Seconds to pause between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Report the moves without making them')
+        parser.add_argument('--prepare-ids', action='store_true',
+                            help='Give every target shard its own task id range before moving')
+        parser.add_argument('--finalize', action='store_true',
+                            help='Clear explicit task shards that the settings map already agrees with')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        self.options = options
+        if options['finalize']:
+            self.finalize()
+            return
+
+        current = get_shard_map()
+        try:
+            target = ShardMap(
+                shards=options['shards'].split(',') if options['shards'] else current.shards,
+                strategy=options['strategy'] or current.strategy,
+                ranges=ShardMap.parse_ranges(options['ranges']) if options['ranges'] else current.ranges,
+            )
+        except ImproperlyConfigured as error:
+            raise CommandError(str(error))
+        unknown = set(target.shards) - set(connections.databases)
+        if unknown:
+            raise CommandError(f"Unknown database aliases: {', '.join(sorted(unknown))}")
+
+        if options['prepare_ids'] and not options['dry_run']:
+            for alias in target.shards:
+                set_id_sequence(alias, target.id_range_start(alias))
+            self.stdout.write(f"Prepared task id ranges on {', '.join(target.shards)}")
+
+        started = time.perf_counter()
+        moved_users = moved_tasks = 0
+        for user_id, override in self.users():
+            source = override or current.shard_for(user_id)
+            destination = target.shard_for(user_id)
+            if source == destination:
+                continue
+            if options['dry_run']:
+                count = Task.objects.using(source).filter(user_id=user_id).count()
+                self.stdout.write(f'Would move user {user_id}: {count} tasks {source} -> {destination}')
+            else:
+                count = self.move_user(user_id, source, destination)
+            moved_users += 1
+            moved_tasks += count
+
+        verb = 'Would move' if options['dry_run'] else 'Moved'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {moved_users} users ({moved_tasks} tasks) in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def users(self):
+        """Yield (id, task_shard) for the users to consider, in id order."""
+        queryset = User.objects.using(DEFAULT_DB_ALIAS).order_by('id')
+        if self.options['user_ids']:
+            queryset = queryset.filter(id__in=[int(value) for value in self.options['user_ids'].split(',')])
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).values_list('id', 'task_shard')[:self.options['batch_size']])
+            if not batch:
+                return
+            yield from batch
+            last_id = batch[-1][0]
+
+    def batches(self, queryset):
+        """Yield lists of tasks in id order, pausing between batches."""
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).order_by('id')[:self.options['batch_size']])
+            if not batch:
+                return
+            yield batch
+            last_id = batch[-1].id
+            if self.options['sleep']:
+                time.sleep(self.options['sleep'])
+
+    def ids(self, queryset):
+        """Set of the ids of a queryset, read in id order batches."""
+        ids = set()
+        last_id = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id).order_by('id')
+                         .values_list('id', flat=True)[:self.options['batch_size']])
+            if not batch:
+                return ids
+            ids.update(batch)
+            last_id = batch[-1]
+
+    def copy_labels(self, user_id, source, destination):
+        """Copy the user's labels the destination does not have yet; their slots match the task bits."""
+        existing = set(Label.objects.using(destination).filter(user_id=user_id).values_list('slot', flat=True))
+        labels = [label for label in Label.objects.using(source).filter(user_id=user_id) if label.slot not in existing]
+        with transaction.atomic(using=destination):
+            _insert(destination, labels)
+
+    def move_outbox(self, user_id, source, destination):
+        """
+        Move the user's undelivered events to the destination, oldest
+        first, so they are still delivered if the source leaves the map.
+        Events claimed by a worker are waited for; an event delivered
+        before its source row is deleted may be delivered twice, as
+        outbox handlers already allow.
+        """
+        source_events = OutboxEvent.objects.using(source).filter(user_id=user_id)
+        for batch in self.batches(source_events):
+            with transaction.atomic(using=source):
+                events = list(source_events.select_for_update().filter(id__in=[event.id for event in batch])
+                              .order_by('id'))
+                with transaction.atomic(using=destination):
+                    _insert(destination, events, keep_ids=False)
+                source_events.filter(id__in=[event.id for event in events]).delete()
+
+    def move_user(self, user_id, source, destination):
+        """
+        Copy a user's labels, tasks and archived tasks, switch the user to
+        the destination, then catch up with the source: copy rows written
+        meanwhile, drop rows deleted (or archived, or restored) there and
+        move the user's pending outbox events. Recounts the daily stats on
+        the destination and deletes the source rows. Returns tasks moved.
+        """
+        copy_started = timezone.now()
+        tokens = TaskTokenRepository()
+        self.copy_labels(user_id, source, destination)
+        copied = {}
+        copied_ids = {}
+        for model, _, _ in MOVED_MODELS:
+            source_rows = model.objects.using(source).filter(user_id=user_id)
+            copied[model] = 0
+            copied_ids[model] = set()
+            for batch in self.batches(source_rows):
+                existing = dict(
+                    model.objects.using(destination).filter(id__in=[row.id for row in batch])
+                    .values_list('id', 'user_id')
+                )
+                if any(owner != user_id for owner in existing.values()):
+                    raise CommandError(
+                        f'Task ids of user {user_id} are already used on {destination}; '
+                        'shards need separate id ranges (--prepare-ids) before they take writes'
+                    )
+                new_rows = [row for row in batch if row.id not in existing]
+                with transaction.atomic(using=destination):
+                    _insert(destination, new_rows)
+                    if model is Task:
+                        tokens.index_tasks(new_rows, destination, replace=False)
+                copied[model] += len(batch)
+                copied_ids[model].update(row.id for row in batch)
+
+        User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id).update(task_shard=destination)
+        self.copy_labels(user_id, source, destination)
+
+        # Rows written to the source while copying, and rows that appeared
+        # there without a newer timestamp (restores); newer destination rows win.
+        for model, version, changed in MOVED_MODELS:
+            source_rows = model.objects.using(source).filter(user_id=user_id)
+            source_ids = self.ids(source_rows)
+            written = Q(id__in=sorted(source_ids - copied_ids[model]))
+            for column in changed:
+                written |= Q(**{f'{column}__gte': copy_started})
+            for batch in self.batches(source_rows.filter(written)):
+                with transaction.atomic(using=destination):
+                    for row in batch:
+                        model.objects.using(destination).filter(
+                            id=row.id, **{f'{version}__lt': getattr(row, version)}
+                        ).delete()
+                        if not model.objects.using(destination).filter(id=row.id).exists():
+                            _insert(destination, [row])
+                            if model is Task:
+                                tokens.index_tasks([row], destination)
+                        elif model is Task and row.reminded_at:
+                            model.objects.using(destination).filter(
+                                id=row.id, reminded_at__isnull=True
+                            ).update(reminded_at=row.reminded_at)
+            # Copied rows gone from the source were deleted, archived or
+            # restored there; the rows they became were caught up above.
+            gone = sorted(copied_ids[model] - source_ids)
+            for start in range(0, len(gone), self.options['batch_size']):
+                batch = gone[start:start + self.options['batch_size']]
+                with transaction.atomic(using=destination):
+                    model.objects.using(destination).filter(user_id=user_id, id__in=batch).delete()
+                    if model is Task:
+                        tokens.unindex_tasks(user_id, batch, destination)
+        self.move_outbox(user_id, source, destination)
+
+        # Daily counts are derived from the rows; recount them where the rows now are.
+        stats = TaskDailyStatRepository()
+        stats.rebuild_user(user_id, destination)
+        while tokens.delete_batch('user_id', user_id, self.options['batch_size'], source):
+            pass
+        while stats.delete_batch('user_id', user_id, self.options['batch_size'], source):
+            pass
+        Label.objects.using(source).filter(user_id=user_id).delete()
+        for model, _, _ in MOVED_MODELS:
+            source_rows = model.objects.using(source).filter(user_id=user_id)
+            for batch in self.batches(source_rows):
+                model.objects.using(source).filter(id__in=[row.id for row in batch]).delete()
+        self.stdout.write(
+            f'Moved user {user_id}: {copied[Task]} tasks and {copied[TaskArchive]} archived tasks '
+            f'{source} -> {destination}'
+        )
+        return copied[Task]
+
+    def finalize(self):
+        """Drop explicit task shards that match the settings map."""
+        shard_map = get_shard_map()
+        cleared = 0
+        pending = User.objects.using(DEFAULT_DB_ALIAS).filter(task_shard__isnull=False)
+        for user_id, override in list(pending.values_list('id', 'task_shard')):
+            if override != shard_map.shard_for(user_id):
+                continue
+            if not self.options['dry_run']:
+                User.objects.using(DEFAULT_DB_ALIAS).filter(pk=user_id, task_shard=override).update(task_shard=None)
+            cleared += 1
+        verb = 'Would clear' if self.options['dry_run'] else 'Cleared'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {cleared} explicit task shards; {pending.count() - cleared} users still differ from the map'
+        ))
@@ -0,0 +1,67 @@
+import signal
+import threading
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from src.core.reminders import ReminderScheduler
+from src.core.sharding import get_shard_map
+
+
+class Command(BaseCommand):
+    help = ('Fire due date reminders as task.due outbox events. Keeps the reminders of the next --window '
+            'seconds in memory and sleeps until the earliest; stop with SIGTERM or Ctrl-C.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=3600, help='Seconds of upcoming reminders kept in memory')
+        parser.add_argument('--refresh', type=float, default=30.0,
+                            help='Seconds between reads of new and changed due dates')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Reminders read per query')
+        parser.add_argument('--max-loaded', type=int, default=100000, help='Reminders held in memory at most')
+        parser.add_argument('--catch-up', type=int, default=3600,
+                            help='On start, also fire reminders missed up to this many seconds ago')
+        parser.add_argument('--once', action='store_true', help='Load the window, fire what is due and exit')
+
+    def handle(self, *args, **options):
+        for name in ('window', 'refresh', 'batch_size', 'max_loaded'):
+            if options[name] <= 0:
+                raise CommandError(f'--{name.replace("_", "-")} must be positive')
+        if options['catch_up'] < 0:
+            raise CommandError('--catch-up cannot be negative')
+        aliases = get_shard_map().shards
+        for alias in aliases:
+            if alias not in connections.databases:
+                raise CommandError(f'Unknown database alias: {alias}')
+
+        scheduler = ReminderScheduler(
+            aliases, timedelta(seconds=options['window']), batch_size=options['batch_size'],
+            max_loaded=options['max_loaded'], catch_up=timedelta(seconds=options['catch_up']),
+        )
+        self.stopping = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+
+        started = time.perf_counter()
+        fired = 0
+        refresh = timedelta(seconds=options['refresh'])
+        try:
+            scheduler.refresh()
+            next_refresh = timezone.now() + refresh
+            while True:
+                fired += scheduler.fire_due()
+                if options['once'] or self.stopping.is_set():
+                    break
+                now = timezone.now()
+                if now >= next_refresh or scheduler.needs_loading():
+                    scheduler.refresh()
+                    next_refresh = now + refresh
+                    continue
+                wake = min(filter(None, (scheduler.next_due(), next_refresh)))
+                self.stopping.wait(max((wake - now).total_seconds(), 0))
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Fired {fired} reminders in {time.perf_counter() - started:.2f}s'
+        ))
@@ -0,0 +1,108 @@
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from src.core import jobs
+from src.core.repositories.job_repository import JobRepository
+
+
+class Command(BaseCommand):
+    help = ('Run background jobs from the jobs table in a thread or process pool. Several workers can '
+            'run at once on backends with SKIP LOCKED; stop with SIGTERM or Ctrl-C to finish running jobs.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Jobs run at the same time')
+        parser.add_argument('--pool', choices=('thread', 'process'), default='thread',
+                            help='Run jobs in threads (I/O bound work) or processes (CPU bound work)')
+        parser.add_argument('--visibility-timeout', type=int,
+                            help='Seconds a job stays locked without a heartbeat (default: JOB_VISIBILITY_TIMEOUT)')
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help='Seconds to wait for new jobs when the queue is empty')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queue is empty')
+
+    def handle(self, *args, **options):
+        concurrency = options['concurrency']
+        if concurrency < 1:
+            raise CommandError('--concurrency must be positive')
+        timeout = options['visibility_timeout'] or settings.JOB_VISIBILITY_TIMEOUT
+        if timeout < 1:
+            raise CommandError('--visibility-timeout must be positive')
+
+        repository = JobRepository()
+        worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self.stopping = threading.Event()
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.stopping.set())
+
+        if options['pool'] == 'process':
+            # Children must not share the parent's database sockets.
+            connections.close_all()
+            executor = ProcessPoolExecutor(concurrency, initializer=jobs.init_worker_process)
+        else:
+            executor = ThreadPoolExecutor(concurrency, thread_name_prefix='job')
+
+        self.stdout.write(f'Worker {worker_id} running {concurrency} {options["pool"]}(s)')
+        started = time.perf_counter()
+        succeeded = failed = 0
+        in_flight = {}
+        last_heartbeat = time.monotonic()
+        try:
+            while not self.stopping.is_set():
+                claimed = []
+                if len(in_flight) < concurrency:
+                    claimed = repository.claim(worker_id, concurrency - len(in_flight), timeout)
+                    for job in claimed:
+                        in_flight[executor.submit(jobs.run, job)] = job
+
+                if in_flight and time.monotonic() - last_heartbeat > timeout / 3:
+                    repository.heartbeat([job.id for job in in_flight.values()], worker_id, timeout)
+                    last_heartbeat = time.monotonic()
+
+                if not in_flight:
+                    if options['burst']:
+                        break
+                    self.stopping.wait(options['poll_interval'])
+                    continue
+                if not claimed or len(in_flight) == concurrency:
+                    done, _ = wait(in_flight, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                    for future in done:
+                        if self.settle(repository, in_flight.pop(future), future, worker_id):
+                            succeeded += 1
+                        else:
+                            failed += 1
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # Let running jobs finish; their locks are still held.
+            for future, job in in_flight.items():
+                if self.settle(repository, job, future, worker_id):
+                    succeeded += 1
+                else:
+                    failed += 1
+            executor.shutdown(wait=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Ran {succeeded + failed} jobs ({succeeded} succeeded, {failed} failed) '
+            f'in {time.perf_counter() - started:.2f}s'
+        ))
+
+    def settle(self, repository, job, future, worker_id):
+        """Record a finished job's outcome; returns whether it succeeded."""
+        try:
+            result = future.result()
+        except jobs.UnknownJob as e:
+            repository.fail(job, worker_id, str(e), retry_delay=None)
+        except Exception as e:
+            # Includes pool processes that crashed while running the job.
+            repository.fail(job, worker_id, f'{type(e).__name__}: {e}', jobs.retry_delay(job.attempts))
+            self.stderr.write(f'Job {job.id} ({job.name}) failed: {e}')
+        else:
+            repository.complete(job, worker_id, result)
+            return True
+        return False
@@ -0,0 +1,216 @@
+import math
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.utils import timezone as django_timezone
+from src.authentication.models import User
+from src.core.fields import make_preview, pack_detail
+from src.core.management.commands.index_tasks import index_user
+from src.core.models import TaskDailyStat
+from src.core.repositories.task_daily_stat_repository import TaskDailyStatRepository
+from src.core.repositories.task_repository import TaskRepository
+from src.core.routers import task_shard_for
+from src.core.sharding import get_shard_map
+
+WORDS = (
+    'review', 'update', 'prepare', 'send', 'call', 'fix', 'write', 'plan', 'book',
+    'report', 'invoice', 'meeting', 'budget', 'design', 'deploy', 'release', 'backup',
+    'client', 'team', 'quarterly', 'weekly', 'draft', 'slides', 'groceries', 'dentist',
+    'migration', 'database', 'tests', 'docs', 'onboarding', 'contract', 'renewal',
+)
+LOG_LINE = '2025-09-30T10:00:00Z ERROR worker-{n} request failed: timeout after 30s (retry {n})'
+STATUS_WEIGHTS_RECENT = (('pending', 0.70), ('completed', 0.25), ('cancelled', 0.05))
+STATUS_WEIGHTS_OLD = (('pending', 0.15), ('completed', 0.72), ('cancelled', 0.13))
+INSERT_COLUMNS = (
+    'detail', 'detail_blob', 'detail_preview', 'detail_length', 'status', 'user_id', 'created_at', 'updated_at',
+    'status_changed_at',
+)
+
+
+def _task_count(rng, mean, skew):
+    """Tasks for one user: Pareto-distributed around mean, or fixed when skew is 0."""
+    if skew <= 0:
+        return mean
+    alpha = 1 + skew
+    count = mean * rng.paretovariate(alpha) * (alpha - 1) / alpha
+    return min(int(round(count)), mean * 100)
+
+
+def _detail(rng):
+    """A short sentence most of the time, with a long tail and rare pasted logs."""
+    if rng.random() < 0.01:
+        return '\n'.join(LOG_LINE.format(n=n) for n in range(rng.randint(20, 200)))
+    words = max(1, min(200, int(rng.lognormvariate(2.0, 0.6))))
+    return ' '.join(rng.choices(WORDS, k=words)).capitalize()
+
+
+def _created_at(rng, now, days):
+    """Recent activity is more frequent; times cluster in working hours."""
+    age_days = min(days, rng.expovariate(3.0 / days)) if days else 0
+    moment = now - timedelta(days=age_days)
+    hour = min(23, max(0, int(rng.gauss(14, 3.5))))
+    return min(now, moment.replace(hour=hour, minute=rng.randrange(60), second=rng.randrange(60)))
+
+
+def _status(rng, age_days, days):
+    weights = STATUS_WEIGHTS_RECENT if age_days < max(1, days * 0.05) else STATUS_WEIGHTS_OLD
+    roll = rng.random()
+    for status, weight in weights:
+        roll -= weight
+        if roll < 0:
+            return status
+    return weights[-1][0]
+
+
+def generate_tasks(user_index, user_id, options, now):
+    """
+    Yield task rows for a user.
+    Rows depend only on the seed and the user's position in the run, so the
+    same seed produces the same data however the users are partitioned.
+    """
+    rng = random.Random(f"{options['seed']}:{user_index}")
+    for _ in range(_task_count(rng, options['tasks_per_user'], options['skew'])):
+        created_at = _created_at(rng, now, options['days'])
+        age_days = (now - created_at).total_seconds() / 86400
+        status = _status(rng, age_days, options['days'])
+        updated_at = created_at
+        if status != 'pending':
+            updated_at = min(now, created_at + timedelta(hours=rng.expovariate(1 / 48)))
+        yield (_detail(rng), status, user_id, created_at, updated_at)
+
+
+def task_database(user_id, options):
+    """Database of a seeded user's tasks: their task shard, or --database when tasks are not sharded."""
+    if get_shard_map().is_sharded:
+        return task_shard_for(user_id)
+    return options['database']
+
+
+def insert_tasks(users, options, now):
+    """
+    Insert tasks for (index, user id) pairs with multi-row INSERTs on each
+    user's task database, adding their daily counts in the same
+    transactions, then index their words for suggestions; return rows inserted.
+    """
+    repository = TaskRepository()
+    stats_repository = TaskDailyStatRepository()
+    batch_size = options['batch_size']
+    batches = {}
+    deltas = {}
+    inserted = 0
+
+    def flush(alias):
+        rows = batches.pop(alias)
+        with transaction.atomic(using=alias):
+            repository.insert_rows(INSERT_COLUMNS, rows, alias, batch_size)
+            stats_repository.add(deltas.pop(alias), alias)
+        return len(rows)
+
+    databases = {}
+    for user_index, user_id in users:
+        alias = databases[user_id] = task_database(user_id, options)
+        adapt = connections[alias].ops.adapt_datetimefield_value
+        batch = batches.setdefault(alias, [])
+        counts = deltas.setdefault(alias, Counter())
+        for detail, status, owner, created_at, updated_at in generate_tasks(user_index, user_id, options, now):
+            status_changed_at = updated_at if status != 'pending' else None
+            text, blob = pack_detail(detail)
+            batch.append((text, blob, make_preview(detail), len(detail), status, owner,
+                          adapt(created_at), adapt(updated_at), adapt(status_changed_at)))
+            # The counts task_deltas() gives for these rows.
+            counts[(owner, django_timezone.localdate(created_at), TaskDailyStat.CREATED)] += 1
+            if status_changed_at:
+                counts[(owner, django_timezone.localdate(status_changed_at), status)] += 1
+            if len(batch) >= batch_size:
+                inserted += flush(alias)
+                batch = batches.setdefault(alias, [])
+                counts = deltas.setdefault(alias, Counter())
+    for alias in list(batches):
+        inserted += flush(alias)
+    for user_id, alias in databases.items():
+        index_user(user_id, alias, batch_size)
+    return inserted
+
+
+def _worker_init():
+    import django
+    django.setup()
+    # Never reuse a connection inherited from the parent process.
+    for connection in connections.all():
+        connection.close()
+
+
+def _worker_insert(args):
+    users, options, now = args
+    return insert_tasks(users, options, now)
+
+
+class Command(BaseCommand):
+    help = ('Generate synthetic users and tasks with batched multi-row inserts, on each user\'s task shard, '
+            'with their daily counts and suggestion index.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000, help='Users to create')
+        parser.add_argument('--tasks-per-user', type=int, default=100, help='Mean tasks per user')
+        parser.add_argument('--skew', type=float, default=1.0,
+                            help='Pareto skew of tasks per user (0 = every user gets the mean)')
+        parser.add_argument('--days', type=int, default=365, help='Spread created_at over this many days')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; same seed, same data')
+        parser.add_argument('--workers', type=int, default=1, help='Insert processes, partitioned by user id')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Rows per INSERT statement')
+        parser.add_argument('--email-prefix', default='seed', help='Prefix of generated user emails')
+        parser.add_argument('--database', default='default',
+                            help='Database alias of the users, and of their tasks when tasks are not sharded')
+
+    def handle(self, *args, **options):
+        if options['users'] < 1 or options['batch_size'] < 1 or options['workers'] < 1:
+            raise CommandError('--users, --batch-size and --workers must be positive')
+        prefix = f"{options['email_prefix']}{options['seed']}-"
+        if User.objects.using(options['database']).filter(email__startswith=prefix).exists():
+            raise CommandError(f"Users with prefix '{prefix}' already exist; pick another --seed or --email-prefix")
+
+        started = time.perf_counter()
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        password = make_password(None)  # unusable, computed once for every user
+        users = [
+            User(email=f'{prefix}{index}@example.com', password=password,
+                 first_name='Seed', last_name=str(index))
+            for index in range(options['users'])
+        ]
+        User.objects.using(options['database']).bulk_create(users, batch_size=options['batch_size'])
+        user_ids = list(
+            User.objects.using(options['database'])
+            .filter(email__startswith=prefix).order_by('id').values_list('id', flat=True)
+        )
+        users_elapsed = time.perf_counter() - started
+        self.stdout.write(f'Created {len(user_ids)} users in {users_elapsed:.2f}s')
+
+        task_options = {key: options[key] for key in
+                        ('tasks_per_user', 'skew', 'days', 'seed', 'batch_size', 'database')}
+        workers = min(options['workers'], len(user_ids))
+        tasks_started = time.perf_counter()
+        users = list(enumerate(user_ids))
+        if workers == 1:
+            inserted = insert_tasks(users, task_options, now)
+        else:
+            chunk = math.ceil(len(users) / workers)
+            partitions = [users[i:i + chunk] for i in range(0, len(users), chunk)]
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init) as pool:
+                inserted = sum(pool.map(_worker_insert, [(part, task_options, now) for part in partitions]))
+        tasks_elapsed = time.perf_counter() - tasks_started
+
+        total_elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'Inserted {inserted} tasks in {tasks_elapsed:.2f}s '
+            f'({inserted / max(tasks_elapsed, 1e-9):,.0f} rows/s)'
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(user_ids) + inserted} rows in {total_elapsed:.2f}s '
+            f'({(len(user_ids) + inserted) / max(total_elapsed, 1e-9):,.0f} rows/s overall)'
+        ))
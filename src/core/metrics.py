@@ -0,0 +1,367 @@
+"""
+In-process metrics with multi-process aggregation.
+
+Every process owns a MetricStore: a memory-mapped array of float64 slots
+addressed by sample key. Recording a sample is a dict lookup plus an
+in-place add on the mapping. When METRICS_DIR is set each process maps a
+file in that directory, named after its pid and start time, and a scrape
+merges all files, so the numbers cover every worker; the files of workers
+that exited are folded into one archive file at scrape time so counters
+keep their totals and the directory stays small. Otherwise an anonymous
+mapping serves the current process only.
+"""
+import bisect
+import fcntl
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from django.conf import settings
+
+_HEADER = struct.Struct('<Q')
+_LENGTH = struct.Struct('<I')
+_VALUE = struct.Struct('<d')
+_INITIAL_SIZE = 64 * 1024
+_ARCHIVE_FILE = 'metrics_archive.db'
+_LOCK_FILE = 'metrics.lock'
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class MetricStore:
+    """
+    Append-only key/value slots in a memory-mapped region.
+
+    Layout: an 8-byte header with the number of used bytes, followed by
+    entries of [uint32 key length][key, padded to 8 bytes][float64 value].
+    The header is updated after an entry is written, so readers in other
+    processes never see a partial entry.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.positions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        if path:
+            self._file = open(path, 'w+b')
+            self._file.truncate(_INITIAL_SIZE)
+            self._map = mmap.mmap(self._file.fileno(), _INITIAL_SIZE)
+        else:
+            self._map = mmap.mmap(-1, _INITIAL_SIZE)
+        self._used = _HEADER.size
+        _HEADER.pack_into(self._map, 0, self._used)
+
+    def _grow(self, needed: int) -> None:
+        size = len(self._map)
+        while size < needed:
+            size *= 2
+        if self._file is not None:
+            self._map.close()
+            self._file.truncate(size)
+            self._map = mmap.mmap(self._file.fileno(), size)
+        else:
+            grown = mmap.mmap(-1, size)
+            grown[:self._used] = self._map[:self._used]
+            self._map.close()
+            self._map = grown
+
+    def _allocate(self, key: str) -> int:
+        with self._lock:
+            position = self.positions.get(key)
+            if position is not None:
+                return position
+            encoded = key.encode('utf-8')
+            padded = _LENGTH.size + len(encoded)
+            padded += (8 - padded % 8) % 8
+            end = self._used + padded + _VALUE.size
+            if end > len(self._map):
+                self._grow(end)
+            _LENGTH.pack_into(self._map, self._used, len(encoded))
+            self._map[self._used + _LENGTH.size:self._used + _LENGTH.size + len(encoded)] = encoded
+            position = self._used + padded
+            _VALUE.pack_into(self._map, position, 0.0)
+            self._used = end
+            _HEADER.pack_into(self._map, 0, self._used)
+            self.positions[key] = position
+            return position
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        """Add amount to the slot for key."""
+        position = self.positions.get(key)
+        if position is None:
+            position = self._allocate(key)
+        with self._lock:
+            value = _VALUE.unpack_from(self._map, position)[0]
+            _VALUE.pack_into(self._map, position, value + amount)
+
+    def inc_many(self, samples: Sequence[Tuple[str, float]]) -> None:
+        """Add several (key, amount) samples under a single lock."""
+        positions = [self.positions.get(key) for key, _ in samples]
+        for index, position in enumerate(positions):
+            if position is None:
+                positions[index] = self._allocate(samples[index][0])
+        with self._lock:
+            for position, (_, amount) in zip(positions, samples):
+                value = _VALUE.unpack_from(self._map, position)[0]
+                _VALUE.pack_into(self._map, position, value + amount)
+
+    def items(self) -> Iterator[Tuple[str, float]]:
+        """Yield every (key, value) pair held by this store."""
+        with self._lock:
+            snapshot = self._map[:self._used]
+        return _read_entries(snapshot)
+
+    def close(self) -> None:
+        self._map.close()
+        if self._file is not None:
+            self._file.close()
+
+
+def _read_entries(buffer) -> Iterator[Tuple[str, float]]:
+    used = _HEADER.unpack_from(buffer, 0)[0]
+    position = _HEADER.size
+    while position < used:
+        length = _LENGTH.unpack_from(buffer, position)[0]
+        start = position + _LENGTH.size
+        key = bytes(buffer[start:start + length]).decode('utf-8')
+        padded = _LENGTH.size + length
+        padded += (8 - padded % 8) % 8
+        position += padded
+        yield key, _VALUE.unpack_from(buffer, position)[0]
+        position += _VALUE.size
+
+
+_store: Optional[MetricStore] = None
+_store_pid: Optional[int] = None
+_store_lock = threading.Lock()
+
+
+def _metrics_dir() -> str:
+    return getattr(settings, 'METRICS_DIR', '') or ''
+
+
+def get_store() -> MetricStore:
+    """Return this process's store, opening a new one after a fork."""
+    global _store, _store_pid
+    pid = os.getpid()
+    if _store_pid != pid:
+        with _store_lock:
+            if _store_pid != pid:
+                directory = _metrics_dir()
+                # The start time keeps a recycled pid from truncating an older file.
+                path = os.path.join(directory, f'metrics_{pid}_{time.time_ns()}.db') if directory else None
+                _store = MetricStore(path)
+                _store_pid = pid
+    return _store
+
+
+def reset() -> None:
+    """Discard the current process's samples (used by tests)."""
+    global _store, _store_pid
+    with _store_lock:
+        if _store is not None:
+            _store.close()
+            if _store.path and os.path.exists(_store.path):
+                os.remove(_store.path)
+        _store = None
+        _store_pid = None
+
+
+class Metric:
+    """Base class for a named metric family with fixed label names."""
+
+    type = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY[name] = self
+
+    def _key(self, suffix: str, labels: Tuple[str, ...], le: Optional[str] = None) -> str:
+        return json.dumps([self.name, suffix, labels, le])
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._keys: Dict[Tuple[str, ...], str] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        key = self._keys.get(labels)
+        if key is None:
+            key = self._keys.setdefault(labels, self._key('_total', labels))
+        get_store().inc(key, amount)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        self._keys: Dict[Tuple[str, ...], Tuple[List[str], str, str]] = {}
+
+    def _keys_for(self, labels: Tuple[str, ...]) -> Tuple[List[str], str, str]:
+        bounds = [repr(float(b)) for b in self.buckets] + ['+Inf']
+        keys = (
+            [self._key('_bucket', labels, le) for le in bounds],
+            self._key('_sum', labels),
+            self._key('_count', labels),
+        )
+        return self._keys.setdefault(labels, keys)
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        keys = self._keys.get(labels) or self._keys_for(labels)
+        bucket_keys, sum_key, count_key = keys
+        # Buckets are stored non-cumulatively and accumulated at scrape time.
+        get_store().inc_many((
+            (bucket_keys[bisect.bisect_left(self.buckets, value)], 1.0),
+            (sum_key, value),
+            (count_key, 1.0),
+        ))
+
+
+REGISTRY: Dict[str, Metric] = {}
+
+http_requests = Counter(
+    'todo_http_requests', 'HTTP requests served.', ('route', 'method', 'status'))
+http_request_duration = Histogram(
+    'todo_http_request_duration_seconds', 'HTTP request latency.', ('route', 'method'))
+db_queries = Counter(
+    'todo_db_queries', 'Database queries run while serving requests.', ('route',))
+db_query_seconds = Counter(
+    'todo_db_query_seconds', 'Time spent in database queries while serving requests.', ('route',))
+service_duration = Histogram(
+    'todo_service_call_duration_seconds', 'Service method latency.', ('method',))
+auth_failures = Counter(
+    'todo_auth_failures', 'Requests rejected with 401 Unauthorized.', ('route',))
+
+
+def _read_file(path: str) -> Dict[str, float]:
+    totals: Dict[str, float] = defaultdict(float)
+    try:
+        with open(path, 'rb') as handle:
+            data = handle.read()
+    except FileNotFoundError:
+        return totals
+    if len(data) >= _HEADER.size:
+        for key, value in _read_entries(data):
+            totals[key] += value
+    return totals
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _dead_files(paths: List[str]) -> List[str]:
+    """Worker files whose process exited: its pid is gone or a newer file took it."""
+    by_pid: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+    for path in paths:
+        pid, _, started = os.path.basename(path)[len('metrics_'):-len('.db')].partition('_')
+        if pid.isdigit():
+            by_pid[int(pid)].append((int(started) if started.isdigit() else 0, path))
+    dead = []
+    for pid, files in by_pid.items():
+        files.sort()
+        dead.extend(path for _, path in files[:-1])
+        if not _pid_alive(pid):
+            dead.append(files[-1][1])
+    return dead
+
+
+def _fold_dead_files(directory: str, paths: List[str]) -> None:
+    """Add the samples of exited workers to the archive file and remove their files."""
+    dead = _dead_files(paths)
+    if not dead:
+        return
+    archive_path = os.path.join(directory, _ARCHIVE_FILE)
+    totals = _read_file(archive_path)
+    for path in dead:
+        for key, value in _read_file(path).items():
+            totals[key] += value
+    folded = MetricStore(f'{archive_path}.{os.getpid()}.tmp')
+    for key, value in totals.items():
+        folded.inc(key, value)
+    folded.close()
+    os.replace(folded.path, archive_path)
+    for path in dead:
+        os.remove(path)
+
+
+def collect() -> Dict[str, float]:
+    """Merge the samples of every process into one mapping."""
+    totals: Dict[str, float] = defaultdict(float)
+    directory = _metrics_dir()
+    if directory:
+        get_store()
+        # Scrapes take turns so a file is never folded while another scrape reads it.
+        with open(os.path.join(directory, _LOCK_FILE), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            _fold_dead_files(directory, glob.glob(os.path.join(directory, 'metrics_*.db')))
+            for path in glob.glob(os.path.join(directory, 'metrics_*.db')):
+                for key, value in _read_file(path).items():
+                    totals[key] += value
+    else:
+        for key, value in get_store().items():
+            totals[key] += value
+    return totals
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labelnames: Sequence[str], labels: Sequence[str], le: Optional[str] = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labels)]
+    if le is not None:
+        pairs.append(f'le="{le}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def render() -> str:
+    """Render all metrics in the Prometheus text exposition format."""
+    samples: Dict[str, List[Tuple[str, Tuple[str, ...], Optional[str], float]]] = defaultdict(list)
+    for key, value in collect().items():
+        name, suffix, labels, le = json.loads(key)
+        samples[name].append((suffix, tuple(labels), le, value))
+
+    lines = []
+    for name, metric in REGISTRY.items():
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.type}')
+        family = samples.get(name, [])
+        if isinstance(metric, Histogram):
+            series: Dict[Tuple[str, ...], Dict[str, object]] = defaultdict(lambda: {'buckets': {}})
+            for suffix, labels, le, value in family:
+                if suffix == '_bucket':
+                    series[labels]['buckets'][le] = value
+                else:
+                    series[labels][suffix] = value
+            for labels in sorted(series):
+                data = series[labels]
+                cumulative = 0.0
+                for le in [repr(float(b)) for b in metric.buckets] + ['+Inf']:
+                    cumulative += data['buckets'].get(le, 0.0)
+                    lines.append(f'{name}_bucket{_format_labels(metric.labelnames, labels, le)} {cumulative:g}')
+                lines.append(f'{name}_sum{_format_labels(metric.labelnames, labels)} {data.get("_sum", 0.0)!r}')
+                lines.append(f'{name}_count{_format_labels(metric.labelnames, labels)} {data.get("_count", 0.0):g}')
+        else:
+            for suffix, labels, _, value in sorted(family):
+                lines.append(f'{name}{suffix}{_format_labels(metric.labelnames, labels)} {value!r}')
+    return '\n'.join(lines) + '\n'
@@ -1,8 +1,16 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 import logging
+import time
+from src.core import metrics
+from src.core.profiling import profile_request
+from src.core.routers import replica_aliases, routing_scope
+from src.core.sharding import get_shard_map
 
 logger = logging.getLogger(__name__)
+profiling_logger = logging.getLogger('src.core.profiling')
 
 
 class ErrorHandlingMiddleware(MiddlewareMixin):
@@ -19,6 +27,97 @@ class ErrorHandlingMiddleware(MiddlewareMixin):
         return JsonResponse({
             'success': False,
             'message': 'An internal server error occurred',
-            'error': str(exception) if request.settings.DEBUG else 'Internal server error'
+            'error': str(exception) if settings.DEBUG else 'Internal server error'
         }, status=500)
 
+
+class ServerTimingMiddleware:
+    """
+    Opt-in profiling middleware.
+    Measures DB, service and render time for each request and reports them
+    in a Server-Timing header and, optionally, a log line.
+    Removed from the middleware chain entirely when PROFILING_ENABLED is off.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log_requests = getattr(settings, 'PROFILING_LOG', False)
+
+    def __call__(self, request):
+        with profile_request() as profile:
+            request.profile = profile
+            response = self.get_response(request)
+            # Post-render callbacks have run by now, so every phase is known.
+            response['Server-Timing'] = profile.server_timing()
+            if self.log_requests:
+                profiling_logger.info(
+                    "%s %s %s total=%.2fms db=%dq/%.2fms service=%.2fms render=%.2fms",
+                    request.method, request.path, response.status_code,
+                    profile.elapsed * 1000, profile.db_count, profile.db_time * 1000,
+                    profile.service_time * 1000, profile.render_time * 1000,
+                )
+        return response
+
+    def process_template_response(self, request, response):
+        """Time the render step that follows template response middleware."""
+        profile = getattr(request, 'profile', None)
+        if profile is not None:
+            profile.start_render()
+            response.add_post_render_callback(lambda rendered: profile.finish_render())
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Records per-route request counts, latency, DB usage, service method
+    timings and auth failures into the process metric store.
+    Queries are only counted and timed; their SQL is kept only when
+    PROFILING_ENABLED is on.
+    Removed from the middleware chain when METRICS_ENABLED is off.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.keep_queries = getattr(settings, 'PROFILING_ENABLED', False)
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with profile_request(keep_queries=self.keep_queries) as profile:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        match = request.resolver_match
+        route = match.view_name if match is not None else 'unmatched'
+        metrics.http_requests.inc((route, request.method, str(response.status_code)))
+        metrics.http_request_duration.observe(duration, (route, request.method))
+        if profile.db_count:
+            metrics.db_queries.inc((route,), profile.db_count)
+            metrics.db_query_seconds.inc((route,), profile.db_time)
+        for name, elapsed in profile.service_calls:
+            metrics.service_duration.observe(elapsed, (name,))
+        if response.status_code == 401:
+            metrics.auth_failures.inc((route,))
+        return response
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Opens a database routing scope for each request so authenticated reads
+    can be served by a replica and task shard lookups are made once per
+    request (see src.core.routers).
+    Removed from the middleware chain when there are no replicas or shards.
+    """
+
+    def __init__(self, get_response):
+        self.replicas = replica_aliases()
+        if not self.replicas and not get_shard_map().is_sharded:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with routing_scope(self.replicas):
+            return self.get_response(request)
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:32
+
+import src.core.fields
+from django.db import migrations
+from src.core.fields import make_preview, pack_detail, unpack_detail
+
+BATCH_SIZE = 1000
+
+
+def backfill_detail_storage(apps, schema_editor):
+    """Compress large existing details and fill previews and lengths, in id batches."""
+    alias = schema_editor.connection.alias
+    for model_name in ('Task', 'TaskArchive'):
+        model = apps.get_model('core', model_name)
+        last_id = 0
+        while True:
+            rows = list(
+                model.objects.using(alias).filter(id__gt=last_id).order_by('id')
+                .values_list('id', 'detail')[:BATCH_SIZE]
+            )
+            if not rows:
+                break
+            for row_id, detail in rows:
+                text, blob = pack_detail(detail)
+                model.objects.using(alias).filter(id=row_id).update(
+                    detail=text, detail_blob=blob,
+                    detail_preview=make_preview(detail), detail_length=len(detail),
+                )
+            last_id = rows[-1][0]
+
+
+def restore_plain_details(apps, schema_editor):
+    """Put compressed details back into the text column before the blob is dropped."""
+    alias = schema_editor.connection.alias
+    for model_name in ('Task', 'TaskArchive'):
+        model = apps.get_model('core', model_name)
+        compressed = model.objects.using(alias).filter(detail_blob__isnull=False)
+        for row_id, blob in compressed.values_list('id', 'detail_blob').iterator(chunk_size=BATCH_SIZE):
+            model.objects.using(alias).filter(id=row_id).update(detail=unpack_detail('', blob), detail_blob=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_task_user_do_nothing'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='detail_blob',
+            field=src.core.fields.DetailBlobField(null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='detail_length',
+            field=src.core.fields.DetailLengthField(default=0),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='detail_preview',
+            field=src.core.fields.DetailPreviewField(default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='taskarchive',
+            name='detail_blob',
+            field=src.core.fields.DetailBlobField(null=True),
+        ),
+        migrations.AddField(
+            model_name='taskarchive',
+            name='detail_length',
+            field=src.core.fields.DetailLengthField(default=0),
+        ),
+        migrations.AddField(
+            model_name='taskarchive',
+            name='detail_preview',
+            field=src.core.fields.DetailPreviewField(default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='detail',
+            field=src.core.fields.DetailTextField(help_text='Detailed description of the task'),
+        ),
+        migrations.AlterField(
+            model_name='taskarchive',
+            name='detail',
+            field=src.core.fields.DetailTextField(),
+        ),
+        migrations.RunPython(backfill_detail_storage, restore_plain_details),
+    ]
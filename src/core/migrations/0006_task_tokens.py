@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 10:36
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_task_detail_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskToken',
+            fields=[
+                ('pk', models.CompositePrimaryKey('user', 'task', 'token', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('token', models.CharField(max_length=32)),
+                ('task', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.task')),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'task_tokens',
+                'indexes': [models.Index(fields=['user', 'token', '-task'], name='task_tokens_prefix_idx')],
+            },
+        ),
+    ]
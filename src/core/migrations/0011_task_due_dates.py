@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_task_daily_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='due_at',
+            field=models.DateTimeField(blank=True, help_text='When the task is due, if ever', null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='reminded_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='taskarchive',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='outboxevent',
+            name='event_type',
+            field=models.CharField(choices=[('task.created', 'Task created'), ('task.updated', 'Task updated'), ('task.status_changed', 'Task status changed'), ('task.deleted', 'Task deleted'), ('task.archived', 'Task archived'), ('task.restored', 'Task restored'), ('task.due', 'Task due')], max_length=32),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'due_at'], name='tasks_status_due_idx'),
+        ),
+    ]
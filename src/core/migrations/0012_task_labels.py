@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_task_due_dates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='label_mask',
+            field=models.BigIntegerField(db_default=0, default=0),
+        ),
+        migrations.AddField(
+            model_name='taskarchive',
+            name='label_mask',
+            field=models.BigIntegerField(db_default=0, default=0),
+        ),
+        migrations.CreateModel(
+            name='Label',
+            fields=[
+                ('pk', models.CompositePrimaryKey('user', 'slot', blank=True, editable=False, primary_key=True, serialize=False)),
+                ('slot', models.PositiveSmallIntegerField()),
+                ('name', models.CharField(max_length=50)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'labels',
+                'constraints': [models.UniqueConstraint(fields=('user', 'name'), name='labels_user_name_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-19 11:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_task_ranks'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='path',
+            field=models.CharField(blank=True, db_default='', default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='taskarchive',
+            name='path',
+            field=models.CharField(blank=True, db_default='', default='', max_length=255),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['user', 'path'], name='tasks_user_path_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_outbox_failed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='taskarchive',
+            name='rank',
+            field=models.CharField(blank=True, db_default='', default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_task_archive_rank'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='taskarchive',
+            index=models.Index(fields=['user', 'path'], name='tasks_archive_user_path_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 12:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_task_archive_path_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='insert_batch',
+            field=models.UUIDField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,10 +1,70 @@
+from functools import lru_cache
+from typing import Optional, Tuple
 from django.db import models
+from django.db.models import DEFERRED
+from django.utils import timezone
 from django.contrib.auth import get_user_model
+from src.core import ranks, task_paths
+from src.core.fields import (
+    DetailBlobField, DetailLengthField, DetailPreviewField, DetailTextField, unpack_detail,
+)
 
 User = get_user_model()
 
 
-class Task(models.Model):
+@lru_cache(maxsize=None)
+def _loaded_layout(model, field_names: Tuple[str, ...]) -> Tuple[Optional[int], ...]:
+    """For each concrete field of `model`, its index in `field_names`, or None when deferred."""
+    positions = {name: index for index, name in enumerate(field_names)}
+    return tuple(positions.get(field.attname) for field in model._meta.concrete_fields)
+
+
+class TaskDetailStorage(models.Model):
+    """
+    Compressed detail storage shared by tasks and archived tasks
+    (see src.core.fields). `detail` always holds the full text once loaded;
+    list queries defer `detail` and `detail_blob` and use the preview.
+    """
+    LIST_DEFERRED_FIELDS = ('detail', 'detail_blob')
+    
+    detail_blob = DetailBlobField(null=True)
+    detail_preview = DetailPreviewField()
+    detail_length = DetailLengthField()
+    
+    class Meta:
+        abstract = True
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Model.from_db, with the loaded values placed among the deferred
+        # fields by a layout computed once per column set (_loaded_layout)
+        # instead of a scan of field_names for every field of every row.
+        if len(values) != len(cls._meta.concrete_fields):
+            layout = _loaded_layout(cls, tuple(field_names))
+            values = [DEFERRED if index is None else values[index] for index in layout]
+        instance = cls(*values)
+        instance._state.adding = False
+        instance._state.db = db
+        if instance.__dict__.get('detail_blob') is not None:
+            instance.detail = unpack_detail('', instance.detail_blob)
+        return instance
+    
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # A compressed detail lives in detail_blob; load both together.
+        if fields is not None and 'detail' in fields and 'detail_blob' not in fields:
+            fields = [*fields, 'detail_blob']
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+    
+    @property
+    def detail_truncated(self) -> bool:
+        return self.detail_length > len(self.detail_preview)
+    
+    @property
+    def parent_id(self):
+        return task_paths.parent_id(self.path)
+
+
+class Task(TaskDetailStorage):
     """
     Model for application tasks.
     """
@@ -14,7 +74,7 @@ class Task(models.Model):
         ('cancelled', 'Cancelled'),
     ]
     
-    detail = models.TextField(help_text="Detailed description of the task")
+    detail = DetailTextField(help_text="Detailed description of the task")
     status = models.CharField(
         max_length=20, 
         choices=STATUS_CHOICES, 
@@ -23,18 +83,271 @@ class Task(models.Model):
     )
     user = models.ForeignKey(
         User, 
-        on_delete=models.CASCADE, 
+        # Tasks may live on a different database shard than their user, and
+        # a cascade would load every task; users are removed by erase_users.
+        on_delete=models.DO_NOTHING, 
         related_name='tasks',
+        db_constraint=False,
         help_text="User who owns the task"
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set by TaskRepository when the status is written; the day a task was
+    # completed or cancelled in the daily stats. NULL for older rows, which
+    # fall back to updated_at.
+    status_changed_at = models.DateTimeField(null=True, blank=True)
+    due_at = models.DateTimeField(null=True, blank=True, help_text="When the task is due, if ever")
+    # Set when run_reminders fires the task's due reminder; cleared when
+    # due_at changes so the new date is reminded too.
+    reminded_at = models.DateTimeField(null=True, blank=True)
+    # Bit n set when the task has the owner's label in slot n (see Label).
+    label_mask = models.BigIntegerField(default=0, db_default=0)
+    # Position in the user's manual order (src.core.ranks); '' until the
+    # task is first moved, which sorts it before the ranked tasks.
+    rank = models.CharField(max_length=ranks.MAX_LENGTH, blank=True, default='', db_default='')
+    # Ids of the task's ancestors, root first (src.core.task_paths); ''
+    # for top-level tasks.
+    path = models.CharField(max_length=task_paths.MAX_LENGTH, blank=True, default='', db_default='')
+    # Marks the rows of one multi-row INSERT of TaskRepository.create_many
+    # where the INSERT does not return their ids (MySQL), to read them back;
+    # NULL otherwise.
+    insert_batch = models.UUIDField(null=True, blank=True, editable=False)
     
     class Meta:
         db_table = 'tasks'
         verbose_name = 'Task'
         verbose_name_plural = 'Tasks'
         ordering = ['-created_at']
+        indexes = [
+            # Finished tasks due for archival (archive_tasks); pending tasks
+            # changed recently (run_reminders).
+            models.Index(fields=['status', 'updated_at'], name='tasks_status_updated_idx'),
+            # Pending tasks coming due, in due order (run_reminders).
+            models.Index(fields=['status', 'due_at'], name='tasks_status_due_idx'),
+            # A user's tasks in manual order (search order=rank, moves).
+            models.Index(fields=['user', 'rank'], name='tasks_user_rank_idx'),
+            # A user's subtrees as ranges of paths (subtasks, cascades).
+            models.Index(fields=['user', 'path'], name='tasks_user_path_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.detail[:50]}... - {self.status}"
+
+
+class TaskArchive(TaskDetailStorage):
+    """
+    Finished tasks moved out of the tasks table by archive_tasks.
+    Rows keep their task id, timestamps, rank and path so they can be
+    restored in place.
+    """
+    FINISHED_STATUSES = ('completed', 'cancelled')
+    
+    id = models.BigIntegerField(primary_key=True)
+    detail = DetailTextField()
+    status = models.CharField(max_length=20, choices=Task.STATUS_CHOICES)
+    user = models.ForeignKey(
+        User,
+        on_delete=models.DO_NOTHING,
+        related_name='archived_tasks',
+        db_constraint=False,
+    )
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    status_changed_at = models.DateTimeField(null=True, blank=True)
+    due_at = models.DateTimeField(null=True, blank=True)
+    label_mask = models.BigIntegerField(default=0, db_default=0)
+    rank = models.CharField(max_length=ranks.MAX_LENGTH, blank=True, default='', db_default='')
+    path = models.CharField(max_length=task_paths.MAX_LENGTH, blank=True, default='', db_default='')
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tasks_archive'
+        verbose_name = 'Archived task'
+        verbose_name_plural = 'Archived tasks'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='tasks_archive_user_idx'),
+            # Archived subtasks of a deleted task (TaskRepository.delete_many_by_user).
+            models.Index(fields=['user', 'path'], name='tasks_archive_user_path_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.detail[:50]}... - {self.status} (archived)"
+
+
+class Label(models.Model):
+    """
+    A user's task label. Each label takes one of MAX_PER_USER slots and a
+    task carries its labels as the bits of Task.label_mask, so label filters
+    are a bit test on the task rows instead of a join. Stored on the user's
+    task shard.
+    """
+    # Bits 0-62 of a signed 64-bit column.
+    MAX_PER_USER = 63
+    
+    pk = models.CompositePrimaryKey('user', 'slot')
+    # Leading column of the primary key.
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='+',
+                             db_constraint=False, db_index=False)
+    slot = models.PositiveSmallIntegerField()
+    name = models.CharField(max_length=50)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'labels'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'name'], name='labels_user_name_uniq'),
+        ]
+    
+    def __str__(self):
+        return self.name
+    
+    @property
+    def bit(self) -> int:
+        return 1 << self.slot
+
+
+class TaskToken(models.Model):
+    """
+    Word index over task details for typeahead suggestions.
+    One row per distinct word of a task, kept in sync by TaskRepository in
+    the transaction that writes the task. Archived tasks are not indexed.
+    """
+    pk = models.CompositePrimaryKey('user', 'task', 'token')
+    # Both are leading columns of the primary key or the prefix index.
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='+',
+                             db_constraint=False, db_index=False)
+    task = models.ForeignKey(Task, on_delete=models.DO_NOTHING, related_name='+',
+                             db_constraint=False, db_index=False)
+    token = models.CharField(max_length=32)
+    
+    class Meta:
+        db_table = 'task_tokens'
+        indexes = [
+            # Prefix lookups: newest matching tasks first, read in index order.
+            models.Index(fields=['user', 'token', '-task'], name='task_tokens_prefix_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.token} -> {self.task_id}"
+
+
+class TaskDailyStat(models.Model):
+    """
+    Per-user daily task counts for charts: tasks created on a day, and
+    tasks completed or cancelled on a day (for tasks still in that status).
+    Kept up to date by TaskRepository in the transaction of each write,
+    on the user's task shard; rebuild_task_stats recomputes them.
+    """
+    CREATED = 'created'
+    STATUS_CHOICES = [
+        (CREATED, 'Created'),
+        ('completed', 'Completed'),
+        ('cancelled', 'Cancelled'),
+    ]
+    
+    pk = models.CompositePrimaryKey('user', 'day', 'status')
+    # Leading column of the primary key, which serves the range reads.
+    user = models.ForeignKey(User, on_delete=models.DO_NOTHING, related_name='+',
+                             db_constraint=False, db_index=False)
+    day = models.DateField()
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'task_daily_stats'
+    
+    def __str__(self):
+        return f"{self.user_id} {self.day} {self.status}: {self.count}"
+
+
+class OutboxEvent(models.Model):
+    """
+    A task change waiting to be handed to the outbox handlers.
+    Written in the same transaction as the change, on the task's shard, and
+    deleted by process_outbox once every handler has accepted it. Events
+    still failing after OUTBOX_MAX_ATTEMPTS get failed_at and are kept for
+    inspection until process_outbox --retry-failed.
+    """
+    TASK_CREATED = 'task.created'
+    TASK_UPDATED = 'task.updated'
+    TASK_STATUS_CHANGED = 'task.status_changed'
+    TASK_DELETED = 'task.deleted'
+    TASK_ARCHIVED = 'task.archived'
+    TASK_RESTORED = 'task.restored'
+    TASK_DUE = 'task.due'
+    EVENT_TYPE_CHOICES = [
+        (TASK_CREATED, 'Task created'),
+        (TASK_UPDATED, 'Task updated'),
+        (TASK_STATUS_CHANGED, 'Task status changed'),
+        (TASK_DELETED, 'Task deleted'),
+        (TASK_ARCHIVED, 'Task archived'),
+        (TASK_RESTORED, 'Task restored'),
+        (TASK_DUE, 'Task due'),
+    ]
+    
+    event_type = models.CharField(max_length=32, choices=EVENT_TYPE_CHOICES)
+    # Plain ids: events outlive the rows they describe.
+    user_id = models.BigIntegerField()
+    task_id = models.BigIntegerField()
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.CharField(max_length=255, blank=True, default='')
+    failed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'outbox_events'
+        indexes = [
+            # Pending events (failed_at IS NULL) are claimed in (available_at, id) order.
+            models.Index(fields=['failed_at', 'available_at', 'id'], name='outbox_pending_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} task={self.task_id}"
+
+
+class Job(models.Model):
+    """
+    Background job run by the run_worker command (see src.core.jobs).
+    Jobs always live on the primary database.
+    """
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    name = models.CharField(max_length=64)
+    args = models.JSONField(default=dict, blank=True)
+    # Owner allowed to poll the job; NULL for system jobs.
+    user_id = models.BigIntegerField(null=True, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    # A running job whose lock expired is picked up again by another worker.
+    locked_by = models.CharField(max_length=128, blank=True, default='')
+    locked_until = models.DateTimeField(null=True, blank=True)
+    # Reported by long jobs while they run, e.g. rows imported so far.
+    progress = models.JSONField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'jobs'
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='jobs_status_run_after_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.detail[:50]}... - {self.status}"
\ No newline at end of file
+        return f"{self.name} #{self.pk} ({self.status})"
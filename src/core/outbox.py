@@ -0,0 +1,76 @@
+"""
+Handlers for task change events (transactional outbox).
+
+Task writes add an OutboxEvent row in their own transaction, so an event
+exists exactly when the change was committed. The process_outbox command
+reads pending events in batches and calls every handler registered for the
+event type. Delivery is at least once: an event is deleted only after all
+its handlers returned, and a failure retries the whole event later, so
+handlers must tolerate duplicates and tasks that no longer exist. An event
+that fails OUTBOX_MAX_ATTEMPTS times is marked failed and left in the table.
+
+Handlers live in the modules listed in OUTBOX_HANDLERS and register with
+the decorator:
+
+    from src.core.outbox import register
+
+    @register('task.created', 'task.status_changed')
+    def warm_cache(event):
+        ...
+"""
+import importlib
+from typing import Callable, Dict, List, Optional
+from django.conf import settings
+
+ALL_EVENTS = '*'
+
+_handlers: Dict[str, List[Callable]] = {}
+_loaded = False
+
+
+def register(*event_types: str):
+    """Register the decorated function for these event types (all events when none are given)."""
+    def decorator(handler: Callable) -> Callable:
+        for event_type in event_types or (ALL_EVENTS,):
+            _handlers.setdefault(event_type, []).append(handler)
+        return handler
+    return decorator
+
+
+def unregister(handler: Callable) -> None:
+    """Remove a handler from every event type."""
+    for handlers in _handlers.values():
+        while handler in handlers:
+            handlers.remove(handler)
+
+
+def load_handlers() -> None:
+    """Import the OUTBOX_HANDLERS modules once so their handlers register."""
+    global _loaded
+    if _loaded:
+        return
+    for module in getattr(settings, 'OUTBOX_HANDLERS', []):
+        importlib.import_module(module)
+    _loaded = True
+
+
+def handlers_for(event_type: str) -> List[Callable]:
+    return _handlers.get(event_type, []) + _handlers.get(ALL_EVENTS, [])
+
+
+def dispatch(event) -> int:
+    """Call the handlers of an event; returns how many ran."""
+    handlers = handlers_for(event.event_type)
+    for handler in handlers:
+        handler(event)
+    return len(handlers)
+
+
+def retry_delay(attempts: int) -> Optional[int]:
+    """
+    Seconds to wait before retrying an event that failed `attempts` times;
+    None once it has used up OUTBOX_MAX_ATTEMPTS.
+    """
+    if attempts >= getattr(settings, 'OUTBOX_MAX_ATTEMPTS', 10):
+        return None
+    return min(2 ** min(attempts, 20), getattr(settings, 'OUTBOX_RETRY_MAX_SECONDS', 3600))
@@ -0,0 +1,134 @@
+import functools
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from django.db import connections
+
+_current_profile: ContextVar[Optional['RequestProfile']] = ContextVar('request_profile', default=None)
+
+
+class RequestProfile:
+    """
+    Timings collected while serving a single request.
+    All durations are in seconds.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_time = 0.0
+        self.queries: List[Tuple[str, float]] = []
+        self.service_time = 0.0
+        self.services: Dict[str, List[float]] = {}
+        self.service_calls: List[Tuple[str, float]] = []
+        self.render_time = 0.0
+        self._service_depth = 0
+        self._render_started = None
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """Execute wrapper that times every query run on a connection."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.db_count += 1
+            self.db_time += duration
+            self.queries.append((sql, duration))
+
+    def count_wrapper(self, execute, sql, params, many, context):
+        """Execute wrapper that only counts and times queries."""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_count += 1
+            self.db_time += time.perf_counter() - start
+
+    def record_service(self, name: str, duration: float, outermost: bool) -> None:
+        """Record a service method call; only outermost calls add to the total."""
+        entry = self.services.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += duration
+        self.service_calls.append((name, duration))
+        if outermost:
+            self.service_time += duration
+
+    def start_render(self) -> None:
+        self._render_started = time.perf_counter()
+
+    def finish_render(self) -> None:
+        if self._render_started is not None:
+            self.render_time += time.perf_counter() - self._render_started
+            self._render_started = None
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        """Format the collected timings as a Server-Timing header value."""
+        metrics = [
+            f'db;desc="{self.db_count} queries";dur={self.db_time * 1000:.2f}',
+            f'service;dur={self.service_time * 1000:.2f}',
+            f'render;dur={self.render_time * 1000:.2f}',
+        ]
+        for name, (calls, duration) in self.services.items():
+            metrics.append(f'svc-{name};desc="{calls} calls";dur={duration * 1000:.2f}')
+        metrics.append(f'total;dur={self.elapsed * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+def current_profile() -> Optional[RequestProfile]:
+    """Return the profile of the request being served, if profiling is active."""
+    return _current_profile.get()
+
+
+@contextmanager
+def profile_request(keep_queries: bool = True):
+    """
+    Activate a RequestProfile for the enclosed block.
+    Nested activations share the outer profile, so several middleware
+    can read the same timings. With keep_queries off queries are only
+    counted and timed and profile.queries stays empty.
+    """
+    profile = _current_profile.get()
+    if profile is not None:
+        yield profile
+        return
+    profile = RequestProfile()
+    wrapper = profile.db_wrapper if keep_queries else profile.count_wrapper
+    token = _current_profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def profiled(func):
+    """
+    Decorator for service methods.
+    Records the call duration on the active profile; when no request is
+    being profiled it adds a single context variable lookup.
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        outermost = profile._service_depth == 0
+        profile._service_depth += 1
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile._service_depth -= 1
+            profile.record_service(name, time.perf_counter() - start, outermost)
+
+    return wrapper
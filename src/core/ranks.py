@@ -0,0 +1,58 @@
+"""
+Fractional ranks for the manual task order.
+
+A rank is a string of base-36 digits read as a fraction (0.a1b2...), so
+string order is rank order and there is always a rank between two
+others: moving a task writes only that task's rank. Ranks only use 0-9
+and a-z, which sort the same under binary and case-insensitive
+collations, and never end in '0', so no rank is a prefix-plus-zeros of
+another.
+
+Each move between the same neighbours makes the new rank about one digit
+longer every five moves. When a rank reaches REBALANCE_LENGTH the user's
+ranks are respaced in the background (rebalance_ranks); MAX_LENGTH is the
+column size.
+"""
+from typing import List, Optional
+
+DIGITS = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(DIGITS)
+MAX_LENGTH = 64
+REBALANCE_LENGTH = 16
+
+_VALUES = {digit: value for value, digit in enumerate(DIGITS)}
+
+
+def rank_between(before: str, after: Optional[str]) -> str:
+    """
+    A rank sorting after `before` and before `after`. '' is the lowest
+    rank and None the end of the list; `before` must sort before `after`.
+    The result is at most one digit longer than the longer of the two.
+    """
+    if after is not None and before >= after:
+        raise ValueError(f'No rank between {before!r} and {after!r}')
+    digits = []
+    position = 0
+    while True:
+        low = _VALUES[before[position]] if position < len(before) else 0
+        high = BASE if after is None else (_VALUES[after[position]] if position < len(after) else 0)
+        if low == high:
+            digits.append(DIGITS[low])
+        else:
+            middle = (low + high) // 2
+            if middle > low:
+                digits.append(DIGITS[middle])
+                return ''.join(digits)
+            # Adjacent digits: keep the low one; anything longer is below `after`.
+            digits.append(DIGITS[low])
+            after = None
+        position += 1
+
+
+def ranks_between(before: str, after: Optional[str], count: int) -> List[str]:
+    """`count` increasing ranks between `before` and `after`, spread by bisection."""
+    if count <= 0:
+        return []
+    middle = rank_between(before, after)
+    lower = (count - 1) // 2
+    return ranks_between(before, middle, lower) + [middle] + ranks_between(middle, after, count - 1 - lower)
@@ -0,0 +1,118 @@
+"""
+Due date reminders.
+
+ReminderScheduler keeps the reminders of the next `window` in a min-heap
+ordered by due time and sleeps until the earliest one, so the tasks table
+is never scanned as a whole:
+
+- The window is loaded from the (status, due_at) index in batches,
+  continuing from the (due_at, id) position where the previous load of
+  each shard stopped. At most `max_loaded` reminders are held; the rest
+  of the window is loaded as the heap empties.
+- Tasks given a due date inside the loaded range after it was read are
+  found on every refresh through the (status, updated_at) index, reading
+  only the tasks written since the previous refresh.
+
+A reminder that comes due is recorded by TaskRepository.mark_reminded as a
+'task.due' outbox event, which process_outbox hands to the handlers. The
+write only succeeds while the task is still pending, due at that time and
+not yet reminded, so entries made stale by later changes are dropped and
+several schedulers can run without duplicates.
+"""
+import heapq
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from django.utils import timezone
+from src.core.repositories.task_repository import DueTask, TaskRepository
+
+# Writes committed late can carry an updated_at slightly before the
+# previous refresh; re-read that margin of recent changes.
+CHANGE_OVERLAP = timedelta(seconds=5)
+
+# (due_at, task id, user id, database alias)
+Reminder = Tuple[datetime, int, int, str]
+
+
+class ReminderScheduler:
+    """In-memory min-heap of upcoming reminders over the task shards `aliases`."""
+
+    def __init__(self, aliases: Sequence[str], window: timedelta, batch_size: int = 1000,
+                 max_loaded: int = 100000, catch_up: timedelta = timedelta(hours=1),
+                 repository: Optional[TaskRepository] = None,
+                 clock: Callable[[], datetime] = timezone.now):
+        self.aliases = list(aliases)
+        self.window = window
+        self.batch_size = batch_size
+        self.max_loaded = max_loaded
+        self.repository = repository or TaskRepository()
+        self.clock = clock
+        now = clock()
+        self.heap: List[Reminder] = []
+        # Due time held in the heap for each task, to skip reloading it.
+        self.loaded: Dict[int, datetime] = {}
+        # Per shard: (due_at, id) up to which the window has been loaded.
+        # Reminders missed while no scheduler ran are fired when they are
+        # at most catch_up old.
+        self.horizon: Dict[str, Tuple[datetime, int]] = {alias: (now - catch_up, 0) for alias in self.aliases}
+        self.last_refresh: Optional[datetime] = None
+        # Shards whose loading stopped because the heap was full.
+        self.truncated = set()
+
+    def push(self, alias: str, task: DueTask) -> bool:
+        due_at, task_id, user_id = task
+        if self.loaded.get(task_id) == due_at:
+            return False
+        self.loaded[task_id] = due_at
+        heapq.heappush(self.heap, (due_at, task_id, user_id, alias))
+        return True
+
+    def refresh(self) -> int:
+        """Load new reminders of the window and recently changed tasks; returns how many were added."""
+        now = self.clock()
+        until = now + self.window
+        added = 0
+        for alias in self.aliases:
+            if self.last_refresh is not None:
+                horizon_due = self.horizon[alias][0]
+                for task in self.repository.changed_due(alias, self.last_refresh - CHANGE_OVERLAP, horizon_due):
+                    added += self.push(alias, task)
+            added += self.load_window(alias, until)
+        self.last_refresh = now
+        return added
+
+    def load_window(self, alias: str, until: datetime) -> int:
+        """Load the shard's reminders due up to `until`, in batches, while the heap has room."""
+        added = 0
+        self.truncated.discard(alias)
+        while True:
+            room = self.max_loaded - len(self.heap)
+            if room <= 0:
+                self.truncated.add(alias)
+                return added
+            limit = min(self.batch_size, room)
+            batch = self.repository.due_batch(alias, self.horizon[alias], until, limit)
+            for task in batch:
+                added += self.push(alias, task)
+            if len(batch) < limit:
+                # Nothing else is due up to `until`; later loads start there.
+                self.horizon[alias] = max(self.horizon[alias], (until, 0))
+                return added
+            self.horizon[alias] = batch[-1][:2]
+
+    def needs_loading(self) -> bool:
+        """Whether part of the window was left unloaded and the heap has room again."""
+        return bool(self.truncated) and len(self.heap) < self.max_loaded // 2
+
+    def fire_due(self) -> int:
+        """Record every reminder due by now; returns how many were recorded."""
+        fired = 0
+        now = self.clock()
+        while self.heap and self.heap[0][0] <= now:
+            due_at, task_id, user_id, alias = heapq.heappop(self.heap)
+            if self.loaded.get(task_id) == due_at:
+                del self.loaded[task_id]
+            fired += self.repository.mark_reminded(alias, (due_at, task_id, user_id))
+        return fired
+
+    def next_due(self) -> Optional[datetime]:
+        return self.heap[0][0] if self.heap else None
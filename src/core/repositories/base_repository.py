@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Type, TypeVar
-from django.db import models
+from typing import Iterator, List, Optional, Sequence, Type, TypeVar
+from django.db import connections, models
 
 T = TypeVar('T', bound=models.Model)
 
@@ -47,6 +47,22 @@ class BaseRepository(ABC):
         instance.save()
         return instance
     
+    def iter_chunks(self, queryset: models.QuerySet, fields: Sequence[str],
+                    chunk_size: int) -> Iterator[List[tuple]]:
+        """
+        Yield the rows of `queryset` as lists of `fields` tuples in primary
+        key order, chunk_size at a time. Each chunk is its own short query
+        starting after the last key seen (keyset pagination), so no cursor
+        or transaction stays open and memory does not grow with the result.
+        `fields` must start with the primary key.
+        """
+        rows = list(queryset.order_by('pk').values_list(*fields)[:chunk_size])
+        while rows:
+            yield rows
+            if len(rows) < chunk_size:
+                return
+            rows = list(queryset.filter(pk__gt=rows[-1][0]).order_by('pk').values_list(*fields)[:chunk_size])
+    
     def delete(self, instance: T) -> bool:
         """Delete an instance."""
         try:
@@ -63,3 +79,43 @@ class BaseRepository(ABC):
         """Count instances matching the criteria."""
         return self.model.objects.filter(**kwargs).count()
 
+    def insert_rows(self, columns: Sequence[str], rows: List[Sequence], using: str,
+                    batch_size: int = 500) -> None:
+        """
+        Insert rows of values already prepared for the database with
+        multi-row statements of up to `batch_size` rows, bypassing the ORM
+        compiler on hot write paths. Columns left out take their database
+        defaults.
+        """
+        connection = connections[using]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        names = ', '.join(connection.ops.quote_name(column) for column in columns)
+        row = '(' + ', '.join(['%s'] * len(columns)) + ')'
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                cursor.execute(
+                    f'INSERT INTO {table} ({names}) VALUES {", ".join([row] * len(batch))}',
+                    [value for values in batch for value in values]
+                )
+
+    def delete_batch(self, column: str, value, batch_size: int, using: str) -> int:
+        """
+        Delete up to `batch_size` rows where `column` equals `value` with a
+        single statement, bypassing the ORM collector (no signals, no
+        cascades, nothing loaded into memory). Returns the rows deleted.
+        """
+        connection = connections[using]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        column = connection.ops.quote_name(column)
+        if connection.vendor == 'mysql':
+            sql = f'DELETE FROM {table} WHERE {column} = %s LIMIT %s'
+        else:
+            # DELETE ... LIMIT is MySQL-only; select the batch by primary key.
+            pk_fields = self.model._meta.pk_fields
+            pk = ', '.join(connection.ops.quote_name(field.column) for field in pk_fields)
+            target = pk if len(pk_fields) == 1 else f'({pk})'
+            sql = f'DELETE FROM {table} WHERE {target} IN (SELECT {pk} FROM {table} WHERE {column} = %s LIMIT %s)'
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [value, batch_size])
+            return cursor.rowcount
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from src.core.models import Job
+from .base_repository import BaseRepository
+
+
+class JobRepository(BaseRepository):
+    """
+    Repository for background jobs.
+    Every query uses the primary: workers need current state and clients
+    polling a job must not see a lagging replica.
+    """
+
+    def __init__(self):
+        super().__init__(Job)
+
+    @property
+    def objects(self):
+        return self.model.objects.using(DEFAULT_DB_ALIAS)
+
+    def enqueue(self, name: str, args: Optional[Dict[str, Any]] = None, user_id: Optional[int] = None,
+                max_attempts: Optional[int] = None, delay: float = 0) -> Job:
+        """Queue a job; it runs once committed and a worker is free."""
+        return self.objects.create(
+            name=name,
+            args=args or {},
+            user_id=user_id,
+            max_attempts=max_attempts or getattr(settings, 'JOB_MAX_ATTEMPTS', 3),
+            run_after=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def get_for_user(self, job_id: int, user_id: int) -> Optional[Job]:
+        """Get a job if it belongs to the user."""
+        return self.objects.filter(id=job_id, user_id=user_id).first()
+
+    def delete_for_user(self, user_id: int) -> int:
+        """Delete the jobs owned by a user."""
+        deleted, _ = self.objects.filter(user_id=user_id).delete()
+        return deleted
+
+    def claim(self, worker_id: str, limit: int, visibility_timeout: int) -> List[Job]:
+        """
+        Lock up to `limit` due jobs for this worker, oldest first: queued
+        jobs whose run_after has passed and running jobs whose lock expired.
+        Expired jobs without attempts left are failed instead.
+        """
+        now = timezone.now()
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            queryset = self.objects.filter(
+                Q(status=Job.STATUS_QUEUED, run_after__lte=now)
+                | Q(status=Job.STATUS_RUNNING, locked_until__lt=now)
+            )
+            if connections[DEFAULT_DB_ALIAS].features.has_select_for_update_skip_locked:
+                queryset = queryset.select_for_update(skip_locked=True)
+            jobs = list(queryset.order_by('run_after', 'id')[:limit])
+
+            exhausted = [job.id for job in jobs if job.status == Job.STATUS_RUNNING
+                         and job.attempts >= job.max_attempts]
+            if exhausted:
+                self.objects.filter(id__in=exhausted).update(
+                    status=Job.STATUS_FAILED, error='Worker lost: visibility timeout expired',
+                    locked_by='', locked_until=None, finished_at=now,
+                )
+            jobs = [job for job in jobs if job.id not in exhausted]
+            locked_until = now + timedelta(seconds=visibility_timeout)
+            self.objects.filter(id__in=[job.id for job in jobs]).update(
+                status=Job.STATUS_RUNNING, attempts=F('attempts') + 1,
+                locked_by=worker_id, locked_until=locked_until, started_at=now,
+            )
+        for job in jobs:
+            job.status, job.attempts = Job.STATUS_RUNNING, job.attempts + 1
+            job.locked_by, job.locked_until, job.started_at = worker_id, locked_until, now
+        return jobs
+
+    def heartbeat(self, job_ids: List[int], worker_id: str, visibility_timeout: int) -> int:
+        """Extend the locks this worker still holds."""
+        return self.objects.filter(id__in=job_ids, locked_by=worker_id, status=Job.STATUS_RUNNING).update(
+            locked_until=timezone.now() + timedelta(seconds=visibility_timeout)
+        )
+
+    def report_progress(self, job: Job, progress: Dict[str, Any]) -> bool:
+        """
+        Store a running job's progress for clients polling it. Called from
+        the job itself; ignored once the job lost its lock.
+        """
+        job.progress = progress
+        updated = self.objects.filter(id=job.id, locked_by=job.locked_by, status=Job.STATUS_RUNNING).update(
+            progress=progress
+        )
+        return updated > 0
+
+    def complete(self, job: Job, worker_id: str, result: Any) -> bool:
+        """Mark a job succeeded unless another worker took it over."""
+        return self._settle(job, worker_id, status=Job.STATUS_SUCCEEDED, result=result, error='',
+                            finished_at=timezone.now())
+
+    def fail(self, job: Job, worker_id: str, error: str, retry_delay: Optional[float]) -> bool:
+        """Queue a failed job again after `retry_delay` seconds, or fail it for good."""
+        if retry_delay is not None and job.attempts < job.max_attempts:
+            return self._settle(job, worker_id, status=Job.STATUS_QUEUED, error=error,
+                                run_after=timezone.now() + timedelta(seconds=retry_delay))
+        return self._settle(job, worker_id, status=Job.STATUS_FAILED, error=error, finished_at=timezone.now())
+
+    def _settle(self, job: Job, worker_id: str, **fields) -> bool:
+        updated = self.objects.filter(id=job.id, locked_by=worker_id, status=Job.STATUS_RUNNING).update(
+            locked_by='', locked_until=None, **fields
+        )
+        return updated > 0
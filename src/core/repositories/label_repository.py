@@ -0,0 +1,92 @@
+from typing import List, Optional
+from django.db import IntegrityError, router, transaction
+from django.db.models import F
+from src.core.models import Label, OutboxEvent, Task, TaskArchive
+from src.core.sharding import shard_key
+from .base_repository import BaseRepository
+from .outbox_repository import OutboxRepository
+
+
+def label_bits(slots) -> int:
+    """Task.label_mask with the bits of the given label slots set."""
+    mask = 0
+    for slot in slots:
+        mask |= 1 << slot
+    return mask
+
+
+def mask_slots(mask: int) -> List[int]:
+    """Label slots whose bits are set in a Task.label_mask."""
+    slots = []
+    while mask:
+        low = mask & -mask
+        slots.append(low.bit_length() - 1)
+        mask ^= low
+    return slots
+
+
+class LabelRepository(BaseRepository):
+    """
+    Repository for task labels.
+    A label's slot is its bit in Task.label_mask; labels live on their
+    owner's task shard, next to the tasks carrying them.
+    """
+
+    def __init__(self):
+        super().__init__(Label)
+        self.outbox_repository = OutboxRepository()
+
+    @shard_key('user_id')
+    def get_by_user(self, user_id: int) -> List[Label]:
+        """A user's labels in slot order: one read of the primary key."""
+        return list(self.model.objects.filter(user_id=user_id).order_by('slot'))
+
+    @shard_key('user_id')
+    def create(self, user_id: int, name: str) -> Label:
+        """
+        Give the user a label in their lowest free slot. Raises ValueError
+        when the name is taken or every slot is in use.
+        """
+        alias = router.db_for_write(self.model)
+        try:
+            with transaction.atomic(using=alias):
+                used = set(
+                    self.model.objects.using(alias).select_for_update()
+                    .filter(user_id=user_id).values_list('slot', flat=True)
+                )
+                slot = next((slot for slot in range(Label.MAX_PER_USER) if slot not in used), None)
+                if slot is None:
+                    raise ValueError(f"A user can have at most {Label.MAX_PER_USER} labels")
+                return self.model.objects.using(alias).create(user_id=user_id, slot=slot, name=name)
+        except IntegrityError:
+            raise ValueError(f"Label '{name}' already exists")
+
+    @shard_key('user_id')
+    def delete_by_slot(self, user_id: int, slot: int) -> Optional[Label]:
+        """
+        Delete a label and clear its bit from the user's tasks and archived
+        tasks with one UPDATE each, recording an update event for the
+        active tasks that had it. Returns the deleted label, if any.
+        """
+        alias = router.db_for_write(self.model)
+        bit = 1 << slot
+        with transaction.atomic(using=alias):
+            label = self.model.objects.using(alias).select_for_update().filter(user_id=user_id, slot=slot).first()
+            if label is None:
+                return None
+            self.model.objects.using(alias).filter(user_id=user_id, slot=slot).delete()
+            tasks = Task.objects.using(alias).alias(bit=F('label_mask').bitand(bit)).filter(user_id=user_id, bit=bit)
+            task_ids = list(tasks.values_list('id', flat=True))
+            if task_ids:
+                Task.objects.using(alias).filter(id__in=task_ids).update(label_mask=F('label_mask').bitand(~bit))
+                self.outbox_repository.record(
+                    OutboxEvent.TASK_UPDATED, user_id, task_ids, alias, {'fields': ['label_mask']}
+                )
+            (TaskArchive.objects.using(alias).alias(bit=F('label_mask').bitand(bit))
+             .filter(user_id=user_id, bit=bit).update(label_mask=F('label_mask').bitand(~bit)))
+        return label
+
+    @shard_key('user_id')
+    def delete_user_batch(self, user_id: int, batch_size: int) -> int:
+        """Delete up to batch_size of the user's labels on their shard."""
+        return self.delete_batch('user_id', user_id, batch_size, router.db_for_write(self.model))
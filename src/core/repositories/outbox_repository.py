@@ -0,0 +1,73 @@
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional
+from django.db import connections
+from django.utils import timezone
+from src.core.models import OutboxEvent
+from .base_repository import BaseRepository
+
+# Columns written by record(); failed_at is left NULL.
+RECORD_COLUMNS = (
+    'event_type', 'user_id', 'task_id', 'payload', 'created_at', 'available_at', 'attempts', 'last_error'
+)
+
+
+class OutboxRepository(BaseRepository):
+    """
+    Repository for task change events.
+    Writers call record() inside the transaction of the change, on the same
+    database alias; process_outbox claims and settles events per alias.
+    """
+
+    def __init__(self):
+        super().__init__(OutboxEvent)
+
+    def record(self, event_type: str, user_id: int, task_ids: Iterable[int], using: str,
+               payload: Optional[Dict[str, Any]] = None) -> None:
+        """Add one event per task with a shared payload, with multi-row INSERTs."""
+        operations = connections[using].ops
+        now = operations.adapt_datetimefield_value(timezone.now())
+        payload = operations.adapt_json_value(payload or {}, None)
+        self.insert_rows(
+            RECORD_COLUMNS,
+            [(event_type, user_id, task_id, payload, now, now, 0, '') for task_id in task_ids],
+            using
+        )
+
+    def claim_batch(self, using: str, batch_size: int) -> List[OutboxEvent]:
+        """
+        Lock and return up to batch_size due events, oldest first; call
+        inside a transaction. Rows locked by another worker are skipped;
+        backends without SKIP LOCKED (SQLite) read them plainly, so run a
+        single worker there.
+        """
+        queryset = self.model.objects.using(using).filter(failed_at__isnull=True, available_at__lte=timezone.now())
+        if connections[using].features.has_select_for_update_skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        return list(queryset.order_by('available_at', 'id')[:batch_size])
+
+    def acknowledge(self, event_ids: List[int], using: str) -> int:
+        """Delete delivered events."""
+        if not event_ids:
+            return 0
+        deleted, _ = self.model.objects.using(using).filter(id__in=event_ids).delete()
+        return deleted
+
+    def reschedule(self, event: OutboxEvent, error: str, delay: int, using: str) -> None:
+        """Record a failed delivery and make the event due again after `delay` seconds."""
+        self.model.objects.using(using).filter(id=event.id).update(
+            attempts=event.attempts + 1,
+            last_error=error[:255],
+            available_at=timezone.now() + timedelta(seconds=delay),
+        )
+
+    def fail(self, event: OutboxEvent, error: str, using: str) -> None:
+        """Record the last failed delivery of an event and stop retrying it."""
+        self.model.objects.using(using).filter(id=event.id).update(
+            attempts=event.attempts + 1, last_error=error[:255], failed_at=timezone.now()
+        )
+
+    def retry_failed(self, using: str) -> int:
+        """Make every failed event due again with a fresh attempt count."""
+        return self.model.objects.using(using).filter(failed_at__isnull=False).update(
+            failed_at=None, attempts=0, available_at=timezone.now()
+        )
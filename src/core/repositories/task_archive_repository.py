@@ -0,0 +1,155 @@
+from datetime import datetime
+from typing import Iterator, List, Optional
+from django.db import router, transaction
+from django.db.models import CharField, Exists, OuterRef, QuerySet, Value
+from django.db.models.functions import Cast, Concat
+from src.core import task_paths
+from src.core.models import OutboxEvent, Task, TaskArchive
+from src.core.sharding import shard_key
+from .base_repository import BaseRepository
+from .outbox_repository import OutboxRepository
+from .task_repository import EXPORT_FIELDS, MATCH_DEFERRED_FIELDS, TaskRepository, unpacked_chunks
+from .task_token_repository import TaskTokenRepository
+
+
+class TaskArchiveRepository(BaseRepository):
+    """
+    Repository for archived tasks.
+    Moves finished tasks between the tasks and tasks_archive tables; both
+    tables of a user live on the same shard.
+    """
+
+    def __init__(self):
+        super().__init__(TaskArchive)
+        self.token_repository = TaskTokenRepository()
+        self.outbox_repository = OutboxRepository()
+
+    @shard_key('user_id')
+    def search(self, user_id: int, detail: str = '', created_date=None,
+               due_after: Optional[datetime] = None, due_before: Optional[datetime] = None,
+               label_mask: int = 0, all_labels: bool = True) -> List[TaskArchive]:
+        """Search a user's archived tasks by detail, creation date, due range and/or labels, without full details."""
+        queryset = self.model.objects.filter(user_id=user_id)
+        if detail:
+            queryset = queryset.filter(TaskRepository.detail_matches(detail))
+        if created_date:
+            queryset = queryset.filter(created_at__date=created_date)
+        if due_after:
+            queryset = queryset.filter(due_at__gte=due_after)
+        if due_before:
+            queryset = queryset.filter(due_at__lt=due_before)
+        if label_mask:
+            queryset = TaskRepository.with_labels(queryset, label_mask, all_labels)
+        if detail:
+            return TaskRepository.with_detail(
+                queryset.order_by('-created_at').defer(*MATCH_DEFERRED_FIELDS), detail
+            )
+        return list(queryset.order_by('-created_at').defer(*TaskArchive.LIST_DEFERRED_FIELDS))
+
+    @shard_key('user_id')
+    def export_chunks(self, user_id: int, detail: str = '', created_date=None,
+                      chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        """Archived counterpart of TaskRepository.export_chunks."""
+        queryset = self.model.objects.using(router.db_for_read(self.model)).filter(user_id=user_id)
+        if detail:
+            queryset = queryset.filter(TaskRepository.detail_matches(detail))
+        if created_date:
+            queryset = queryset.filter(created_at__date=created_date)
+        return unpacked_chunks(self.iter_chunks(queryset, EXPORT_FIELDS, chunk_size), detail)
+
+    @staticmethod
+    def archivable(alias: str, cutoff: datetime) -> QuerySet:
+        """
+        Finished tasks of database `alias` last updated before `cutoff`
+        without subtasks left in the tasks table, so a subtree is archived
+        leaves first and no active task's path names an archived one. Each
+        task is checked with one probe of its (user_id, path) range.
+        """
+        # Descendants' paths are in [path + id + '/', path + id + '0'); see task_paths.
+        prefix = Concat(OuterRef('path'), Cast(OuterRef('id'), CharField()), output_field=CharField())
+        subtasks = Task.objects.using(alias).filter(
+            user_id=OuterRef('user_id'),
+            path__gte=Concat(prefix, Value(task_paths.SEPARATOR), output_field=CharField()),
+            path__lt=Concat(prefix, Value(chr(ord(task_paths.SEPARATOR) + 1)), output_field=CharField()),
+        )
+        return Task.objects.using(alias).filter(
+            ~Exists(subtasks), status__in=TaskArchive.FINISHED_STATUSES, updated_at__lt=cutoff
+        )
+
+    def archive_batch(self, alias: str, cutoff: datetime, batch_size: int) -> int:
+        """
+        Move up to `batch_size` archivable() tasks from the tasks table of
+        database `alias` into the archive. Returns the number of tasks
+        archived.
+        """
+        with transaction.atomic(using=alias):
+            tasks = list(self.archivable(alias, cutoff).select_for_update().order_by('id')[:batch_size])
+            if not tasks:
+                return 0
+            self.model.objects.using(alias).bulk_create([
+                self.model(
+                    id=task.id,
+                    detail=task.detail,
+                    status=task.status,
+                    user_id=task.user_id,
+                    created_at=task.created_at,
+                    updated_at=task.updated_at,
+                    status_changed_at=task.status_changed_at,
+                    due_at=task.due_at,
+                    label_mask=task.label_mask,
+                    rank=task.rank,
+                    path=task.path,
+                )
+                for task in tasks
+            ])
+            by_user = {}
+            for task in tasks:
+                by_user.setdefault(task.user_id, []).append(task.id)
+            for user_id, task_ids in by_user.items():
+                # Archived tasks are not suggested.
+                self.token_repository.unindex_tasks(user_id, task_ids, alias)
+                self.outbox_repository.record(OutboxEvent.TASK_ARCHIVED, user_id, task_ids, alias)
+            Task.objects.using(alias).filter(id__in=[task.id for task in tasks]).delete()
+        return len(tasks)
+
+    @shard_key('user_id')
+    def restore(self, task_id: int, user_id: int) -> Optional[Task]:
+        """
+        Move an archived task back to the tasks table, keeping its id, its
+        rank and its place under its ancestors. Returns None unless the
+        archived task is the user's; raises ValueError when its parent is
+        not in the tasks table, which stays locked until then. A live
+        parent has live ancestors, since archive_batch archives leaves
+        first.
+        """
+        alias = router.db_for_write(Task)
+        with transaction.atomic(using=alias):
+            archived = (
+                self.model.objects.using(alias).select_for_update()
+                .filter(id=task_id, user_id=user_id).first()
+            )
+            if archived is None:
+                return None
+            parent_id = archived.parent_id
+            if parent_id is not None and not (
+                Task.objects.using(alias).select_for_update().filter(id=parent_id, user_id=user_id).exists()
+            ):
+                raise ValueError(f"Restore the parent task {parent_id} first")
+            task = Task(id=archived.id, detail=archived.detail, status=archived.status, user_id=archived.user_id,
+                        status_changed_at=archived.status_changed_at, due_at=archived.due_at,
+                        label_mask=archived.label_mask, rank=archived.rank, path=archived.path)
+            task.save(using=alias, force_insert=True)
+            # created_at is auto_now_add; put the original back.
+            Task.objects.using(alias).filter(id=task.id).update(created_at=archived.created_at)
+            task.created_at = archived.created_at
+            archived.delete(using=alias)
+            self.token_repository.index_tasks([task], alias, replace=False)
+            self.outbox_repository.record(
+                OutboxEvent.TASK_RESTORED, user_id, [task.id], alias, {'status': task.status}
+            )
+        return task
+
+    @shard_key('user_id')
+    def delete_user_batch(self, user_id: int, batch_size: int) -> int:
+        """Delete up to batch_size of the user's archived tasks on their shard."""
+        return self.delete_batch('user_id', user_id, batch_size, router.db_for_write(self.model))
@@ -0,0 +1,118 @@
+from collections import Counter
+from datetime import date
+from typing import Dict, Iterable, List, Tuple
+from django.db import connections, router, transaction
+from django.db.models import Count
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+from src.core.models import Task, TaskArchive, TaskDailyStat
+from src.core.sharding import shard_key
+from .base_repository import BaseRepository
+
+# (user_id, day, status) -> change of the count
+Deltas = Dict[Tuple[int, date, str], int]
+
+
+def finished_day(task) -> date:
+    """Day a finished task reached its status; rows written before the column existed use updated_at."""
+    return timezone.localdate(task.status_changed_at or task.updated_at)
+
+
+def task_deltas(tasks: Iterable, sign: int = 1) -> Deltas:
+    """Add (sign=1) or remove (sign=-1) the counts of whole tasks, e.g. when created or deleted."""
+    deltas = Counter()
+    for task in tasks:
+        deltas[(task.user_id, timezone.localdate(task.created_at), TaskDailyStat.CREATED)] += sign
+        if task.status in TaskArchive.FINISHED_STATUSES:
+            deltas[(task.user_id, finished_day(task), task.status)] += sign
+    return deltas
+
+
+def status_deltas(task, previous_status: str, previous_day: date) -> Deltas:
+    """Move a task's finished count when its status changed from previous_status on previous_day."""
+    deltas = Counter()
+    if previous_status in TaskArchive.FINISHED_STATUSES:
+        deltas[(task.user_id, previous_day, previous_status)] -= 1
+    if task.status in TaskArchive.FINISHED_STATUSES:
+        deltas[(task.user_id, finished_day(task), task.status)] += 1
+    return deltas
+
+
+class TaskDailyStatRepository(BaseRepository):
+    """
+    Repository for the per-user daily task counts.
+    Writers call add() inside the transaction that changes the tasks, on
+    the same database alias, with the deltas from task_deltas().
+    """
+
+    def __init__(self):
+        super().__init__(TaskDailyStat)
+
+    def add(self, deltas: Deltas, using: str) -> None:
+        """
+        Apply count changes with one multi-row upsert, so concurrent writers
+        of the same day add up instead of overwriting each other.
+        """
+        rows = [(user_id, day, status, delta) for (user_id, day, status), delta in deltas.items() if delta]
+        if not rows:
+            return
+        connection = connections[using]
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        count = quote('count')
+        placeholders = ', '.join(['(%s, %s, %s, %s)'] * len(rows))
+        if connection.vendor == 'mysql':
+            upsert = f'ON DUPLICATE KEY UPDATE {count} = {count} + VALUES({count})'
+        else:
+            upsert = (f'ON CONFLICT ({quote("user_id")}, {quote("day")}, {quote("status")}) '
+                      f'DO UPDATE SET {count} = {table}.{count} + excluded.{count}')
+        params = []
+        for user_id, day, status, delta in rows:
+            params += [user_id, connection.ops.adapt_datefield_value(day), status, delta]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} ({quote("user_id")}, {quote("day")}, {quote("status")}, {count}) '
+                f'VALUES {placeholders} {upsert}',
+                params
+            )
+
+    @shard_key('user_id')
+    def get_range(self, user_id: int, start: date, end: date) -> List[Tuple[date, str, int]]:
+        """(day, status, count) of a user between two days, inclusive, from the primary key index."""
+        return list(
+            self.model.objects.filter(user_id=user_id, day__gte=start, day__lte=end)
+            .exclude(count=0).order_by('day', 'status').values_list('day', 'status', 'count')
+        )
+
+    def rebuild_user(self, user_id: int, using: str) -> int:
+        """
+        Recompute a user's counts from their tasks and archived tasks on
+        database `using`. The user's existing rows are locked for the
+        duration. Returns rows written.
+        """
+        with transaction.atomic(using=using):
+            list(self.model.objects.using(using).select_for_update().filter(user_id=user_id).values_list('day'))
+            counts = Counter()
+            for model in (Task, TaskArchive):
+                rows = model.objects.using(using).filter(user_id=user_id).order_by()
+                created = rows.values(day=TruncDate('created_at')).annotate(total=Count('id'))
+                for row in created:
+                    counts[(row['day'], TaskDailyStat.CREATED)] += row['total']
+                finished = (
+                    rows.filter(status__in=TaskArchive.FINISHED_STATUSES)
+                    .values('status', day=TruncDate(Coalesce('status_changed_at', 'updated_at')))
+                    .annotate(total=Count('id'))
+                )
+                for row in finished:
+                    counts[(row['day'], row['status'])] += row['total']
+            self.model.objects.using(using).filter(user_id=user_id).delete()
+            self.model.objects.using(using).bulk_create([
+                self.model(user_id=user_id, day=day, status=status, count=total)
+                for (day, status), total in sorted(counts.items())
+            ])
+        return len(counts)
+
+    @shard_key('user_id')
+    def delete_user_batch(self, user_id: int, batch_size: int) -> int:
+        """Delete up to batch_size of the user's counts on their shard."""
+        return self.delete_batch('user_id', user_id, batch_size, router.db_for_write(self.model))
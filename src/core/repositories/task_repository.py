@@ -1,64 +1,627 @@
-from typing import List, Optional
-from django.db.models import Q
-from src.core.models import Task
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Iterator, List, Optional, Sequence, Tuple
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from src.core import ranks, task_paths
+from src.core.fields import unpack_detail
+from src.core.models import OutboxEvent, Task, TaskArchive
+from src.core.sharding import shard_key, shard_user
 from .base_repository import BaseRepository
+from .outbox_repository import OutboxRepository
+from .task_daily_stat_repository import TaskDailyStatRepository, finished_day, status_deltas, task_deltas
+from .task_token_repository import TaskTokenRepository
+
+EXPORT_FIELDS = ('id', 'detail', 'detail_blob', 'status', 'created_at', 'updated_at')
+# Columns left out of list queries searching details: compressed rows are
+# candidates until their detail_blob is decompressed and matched.
+MATCH_DEFERRED_FIELDS = ('detail',)
+# Task columns list items do not show, also left out of list queries.
+UNLISTED_FIELDS = ('status_changed_at', 'reminded_at', 'rank', 'insert_batch')
+# Columns written from Task.detail (src.core.fields).
+DETAIL_COLUMNS = ('detail', 'detail_blob', 'detail_preview', 'detail_length')
+# Columns the daily counts need of a task being deleted or changing status.
+STATS_FIELDS = ('id', 'user_id', 'status', 'created_at', 'updated_at', 'status_changed_at')
+# Ranks written per UPDATE when many tasks are ranked at once.
+RANK_BATCH_SIZE = 1000
+# Subtasks locked and deleted per batch when a task is deleted with its subtree.
+SUBTREE_BATCH_SIZE = 1000
+# Manual order: unranked tasks ('') first, oldest first, then by rank.
+RANK_ORDERING = ('rank', 'id')
+# (due_at, task id, user id) of a pending task coming due.
+DueTask = Tuple[datetime, int, int]
+
+
+def unpacked_chunks(chunks: Iterator[List[tuple]], detail: str = '') -> Iterator[List[tuple]]:
+    """
+    Turn EXPORT_FIELDS rows into (id, detail, status, created_at, updated_at).
+    With `detail`, the rows come from a detail_matches() query: compressed
+    rows whose full detail does not contain it are dropped.
+    """
+    needle = detail.casefold()
+    for rows in chunks:
+        rows = [
+            (pk, unpack_detail(text, blob), *rest) for pk, text, blob, *rest in rows
+            if blob is None or needle in unpack_detail(text, blob).casefold()
+        ]
+        if rows:
+            yield rows
 
 
 class TaskRepository(BaseRepository):
     """
     Repository for Task model operations.
     Handles all database operations related to tasks.
+    Methods scoped to a user run against that user's task shard.
+    Writes update the typeahead index (TaskToken) and the daily counts
+    (TaskDailyStat) and record a change event (OutboxEvent) in the same
+    transaction.
     """
     
     def __init__(self):
         super().__init__(Task)
+        self.token_repository = TaskTokenRepository()
+        self.outbox_repository = OutboxRepository()
+        self.stats_repository = TaskDailyStatRepository()
+    
+    def create(self, **kwargs) -> Task:
+        """Create a task on its owner's shard and index its words."""
+        user = kwargs.get('user')
+        kwargs.setdefault('status_changed_at', timezone.now())
+        with shard_user(kwargs.get('user_id', getattr(user, 'pk', None))):
+            alias = router.db_for_write(self.model)
+            with transaction.atomic(using=alias):
+                task = self.model.objects.using(alias).create(**kwargs)
+                self.token_repository.index_tasks([task], alias, replace=False)
+                self.stats_repository.add(task_deltas([task]), alias)
+                self.outbox_repository.record(
+                    OutboxEvent.TASK_CREATED, task.user_id, [task.id], alias, {'status': task.status}
+                )
+            return task
+    
+    def update(self, instance: Task, **kwargs) -> Optional[Task]:
+        """
+        Update a task, re-indexing it when its detail changes. A new due
+        date is reminded again. `instance` only needs its id and user_id:
+        the row is re-read and locked on the database tasks are written to
+        (never the replica it may have been read from) and only the given
+        columns are written, so newer values of the others are kept.
+        Returns the updated task, also copied onto `instance`, or None when
+        the task no longer exists.
+        """
+        with shard_user(instance.user_id):
+            alias = router.db_for_write(self.model, instance=instance)
+            with transaction.atomic(using=alias):
+                task = (
+                    self.model.objects.using(alias).select_for_update()
+                    .filter(pk=instance.pk, user_id=instance.user_id).first()
+                )
+                if task is None:
+                    return None
+                previous, previous_day = task.status, finished_day(task)
+                fields = sorted(kwargs)
+                if kwargs.get('status', previous) != previous:
+                    kwargs['status_changed_at'] = timezone.now()
+                if kwargs.get('due_at', task.due_at) != task.due_at:
+                    kwargs['reminded_at'] = None
+                for field, value in kwargs.items():
+                    setattr(task, field, value)
+                written = {*kwargs, 'updated_at'}
+                if 'detail' in kwargs:
+                    written.update(DETAIL_COLUMNS)
+                task.save(using=alias, update_fields=written)
+                if 'detail' in kwargs:
+                    self.token_repository.index_tasks([task], alias)
+                if task.status != previous:
+                    self.stats_repository.add(status_deltas(task, previous, previous_day), alias)
+                self.outbox_repository.record(
+                    OutboxEvent.TASK_UPDATED, task.user_id, [task.id], alias, {'fields': fields}
+                )
+        for field in written:
+            setattr(instance, field, getattr(task, field))
+        return task
+    
+    @shard_key('user_id')
+    def update_by_id_and_user(self, task_id: int, user_id: int, **kwargs) -> Optional[Task]:
+        """Update a task if it belongs to the user, without reading it first; see update()."""
+        return self.update(self.model(pk=task_id, user_id=user_id), **kwargs)
     
+    @shard_key('user_id')
+    def create_many(self, user_id: int, rows: Sequence[Tuple[str, str]]) -> List[Task]:
+        """
+        Create a user's tasks from (detail, status) pairs, index their words
+        and record their created events, all in one transaction on the
+        user's shard. Rows go in with one multi-row INSERT; where it does
+        not return the new ids (MySQL) they are read back, see _read_back_ids.
+        """
+        alias = router.db_for_write(self.model)
+        now = timezone.now()
+        tasks = [
+            self.model(user_id=user_id, detail=detail, status=status, status_changed_at=now)
+            for detail, status in rows
+        ]
+        with transaction.atomic(using=alias):
+            if connections[alias].features.can_return_rows_from_bulk_insert or not tasks:
+                self.model.objects.using(alias).bulk_create(tasks)
+            else:
+                marker = uuid.uuid4()
+                for task in tasks:
+                    task.insert_batch = marker
+                self.model.objects.using(alias).bulk_create(tasks, batch_size=len(tasks))
+                task_ids = self._read_back_ids(user_id, marker, len(tasks), alias)
+                if len(task_ids) != len(tasks):
+                    raise DatabaseError(f'Read back {len(task_ids)} ids of {len(tasks)} inserted tasks')
+                for task, task_id in zip(tasks, task_ids):
+                    task.id = task_id
+            self.token_repository.index_tasks(tasks, alias, replace=False)
+            self.stats_repository.add(task_deltas(tasks), alias)
+            by_status = {}
+            for task in tasks:
+                by_status.setdefault(task.status, []).append(task.id)
+            for status, task_ids in by_status.items():
+                self.outbox_repository.record(OutboxEvent.TASK_CREATED, user_id, task_ids, alias, {'status': status})
+        return tasks
+    
+    def _read_back_ids(self, user_id: int, marker: uuid.UUID, count: int, alias: str) -> List[int]:
+        """
+        Ids of the `count` rows create_many just inserted with one multi-row
+        INSERT marked `marker`, in insert order. On MySQL the statement's
+        first id is LAST_INSERT_ID(): with innodb_autoinc_lock_mode 0 or 1
+        its ids are consecutive steps of auto_increment_increment; with 2
+        (interleaved, the MySQL 8 default) concurrent inserts may take ids
+        in between, so the marked rows from that id on are selected, a
+        short range of the primary key.
+        """
+        connection = connections[alias]
+        marked = self.model.objects.using(alias).filter(user_id=user_id, insert_batch=marker)
+        if connection.vendor == 'mysql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT LAST_INSERT_ID(), @@innodb_autoinc_lock_mode, @@auto_increment_increment')
+                first_id, lock_mode, increment = cursor.fetchone()
+            if lock_mode < 2:
+                return list(range(first_id, first_id + count * increment, increment))
+            marked = marked.filter(id__gte=first_id)
+        return list(marked.order_by('id').values_list('id', flat=True))
+    
+    @shard_key('user_id')
     def get_by_user(self, user_id: int) -> List[Task]:
-        """Get all tasks for a specific user."""
-        return self.filter(user_id=user_id)
+        """Get all tasks for a specific user, without their full details."""
+        return list(self.model.objects.filter(user_id=user_id).defer(*Task.LIST_DEFERRED_FIELDS, *UNLISTED_FIELDS))
     
+    @shard_key('user_id')
     def get_by_user_and_status(self, user_id: int, status: str) -> List[Task]:
         """Get tasks for a user filtered by status."""
         return self.filter(user_id=user_id, status=status)
     
+    @staticmethod
+    def detail_matches(detail: str) -> Q:
+        """
+        Rows that may match a case-insensitive detail search: those whose
+        text column contains `detail`, and every compressed row, whose text
+        column is empty. Load them deferring only MATCH_DEFERRED_FIELDS and
+        pass them through with_detail() to drop the compressed ones whose
+        full detail does not match.
+        """
+        return Q(detail__icontains=detail) | Q(detail_blob__isnull=False)
+    
+    @staticmethod
+    def with_detail(tasks, detail: str) -> list:
+        """Rows of a detail_matches() query whose detail contains `detail`."""
+        needle = detail.casefold()
+        return [task for task in tasks if task.detail_blob is None or needle in task.detail.casefold()]
+    
+    @shard_key('user_id')
     def search_by_detail(self, user_id: int, detail: str) -> List[Task]:
         """Search tasks by detail (case insensitive)."""
-        return list(
+        return self.with_detail(
             self.model.objects.filter(
-                user_id=user_id,
-                detail__icontains=detail
-            ).order_by('-created_at')
+                self.detail_matches(detail),
+                user_id=user_id
+            ).order_by('-created_at').defer(*MATCH_DEFERRED_FIELDS, *UNLISTED_FIELDS),
+            detail
         )
     
+    @shard_key('user_id')
     def search_by_created_date(self, user_id: int, date) -> List[Task]:
         """Search tasks by creation date."""
         return list(
             self.model.objects.filter(
                 user_id=user_id,
                 created_at__date=date
-            ).order_by('-created_at')
+            ).order_by('-created_at').defer(*Task.LIST_DEFERRED_FIELDS, *UNLISTED_FIELDS)
         )
     
+    @shard_key('user_id')
     def search_by_detail_and_date(self, user_id: int, detail: str, date) -> List[Task]:
         """Search tasks by both detail and creation date."""
-        return list(
+        return self.with_detail(
             self.model.objects.filter(
+                self.detail_matches(detail),
                 user_id=user_id,
-                detail__icontains=detail,
                 created_at__date=date
-            ).order_by('-created_at')
+            ).order_by('-created_at').defer(*MATCH_DEFERRED_FIELDS, *UNLISTED_FIELDS),
+            detail
         )
     
-    def update_status(self, task_id: int, user_id: int, new_status: str) -> Optional[Task]:
-        """Update only the status of a task."""
-        try:
-            task = self.model.objects.get(id=task_id, user_id=user_id)
-            task.status = new_status
-            task.save()
+    @shard_key('user_id')
+    def search(self, user_id: int, detail: str = '', created_date=None, due_after: Optional[datetime] = None,
+               due_before: Optional[datetime] = None, label_mask: int = 0, all_labels: bool = True,
+               order: str = '') -> List[Task]:
+        """
+        A user's tasks matching every given filter. label_mask selects tasks
+        with all (all_labels) or any of its label bits: a bit test on the
+        rows of the user's index range, with no join. With order='rank'
+        tasks come in the user's manual order, read from the (user_id, rank)
+        index; otherwise tasks searched by due range come soonest first and
+        others newest first.
+        """
+        queryset = self.model.objects.filter(user_id=user_id)
+        if due_after or due_before:
+            queryset = queryset.filter(due_at__isnull=False)
+        if due_after:
+            queryset = queryset.filter(due_at__gte=due_after)
+        if due_before:
+            queryset = queryset.filter(due_at__lt=due_before)
+        if detail:
+            queryset = queryset.filter(self.detail_matches(detail))
+        if created_date:
+            queryset = queryset.filter(created_at__date=created_date)
+        if label_mask:
+            queryset = self.with_labels(queryset, label_mask, all_labels)
+        if order == 'rank':
+            ordering = RANK_ORDERING
+        elif due_after or due_before:
+            ordering = ('due_at', 'id')
+        else:
+            ordering = ('-created_at',)
+        if detail:
+            return self.with_detail(
+                queryset.order_by(*ordering).defer(*MATCH_DEFERRED_FIELDS, *UNLISTED_FIELDS), detail
+            )
+        return list(queryset.order_by(*ordering).defer(*Task.LIST_DEFERRED_FIELDS, *UNLISTED_FIELDS))
+    
+    @staticmethod
+    def with_labels(queryset, label_mask: int, all_labels: bool = True):
+        """Rows of `queryset` whose label_mask has all (or any) of the bits of `label_mask`."""
+        queryset = queryset.alias(labels_matched=F('label_mask').bitand(label_mask))
+        if all_labels:
+            return queryset.filter(labels_matched=label_mask)
+        return queryset.filter(labels_matched__gt=0)
+    
+    @shard_key('user_id')
+    def move(self, task_id: int, user_id: int, after_id: Optional[int]) -> Optional[Task]:
+        """
+        Put a task right after the user's task `after_id` in the manual
+        order (first when None) by writing only its rank, between the ranks
+        of its new neighbours. The order is not a change of the task: its
+        updated_at is kept (archive_tasks goes by it) and no event is
+        recorded. Returns None unless both tasks are the user's.
+        """
+        alias = router.db_for_write(self.model)
+        with transaction.atomic(using=alias):
+            ids = [task_id] if after_id is None else [task_id, after_id]
+            tasks = {
+                task.id: task
+                for task in self.model.objects.using(alias).select_for_update()
+                .filter(id__in=ids, user_id=user_id).order_by()
+            }
+            if len(tasks) < len(set(ids)):
+                return None
+            task, anchor = tasks[task_id], tasks.get(after_id)
+            before, after = self.neighbour_ranks(alias, task, anchor)
+            if after == '':
+                # Unranked tasks all sort alike; rank them to make room between them.
+                self.rank_unranked(user_id, alias)
+                before, after = self.neighbour_ranks(alias, task, anchor, refresh=True)
+            if (after is not None and before >= after) or max(len(before), len(after or '')) >= ranks.MAX_LENGTH:
+                # Equal ranks from concurrent moves, or ranks as long as the column.
+                self.rebalance_ranks(user_id, alias)
+                before, after = self.neighbour_ranks(alias, task, anchor, refresh=True)
+            # Like _write_ranks: the rank column only, no updated_at, no event.
+            task.rank = ranks.rank_between(before, after)
+            self.model.objects.using(alias).filter(pk=task.pk).update(rank=task.rank)
             return task
-        except self.model.DoesNotExist:
+    
+    def neighbour_ranks(self, alias: str, task: Task, anchor: Optional[Task],
+                        refresh: bool = False) -> Tuple[str, Optional[str]]:
+        """
+        Ranks `task` goes between when moved after `anchor`: the anchor's
+        ('' at the top) and the next task's (None at the end), read from the
+        (user_id, rank) index. `refresh` re-reads the anchor's rank.
+        """
+        following = self.model.objects.using(alias).filter(user_id=task.user_id).exclude(id=task.id)
+        if anchor is None:
+            before = ''
+        else:
+            if refresh:
+                anchor.refresh_from_db(using=alias, fields=['rank'])
+            before = anchor.rank
+            following = following.filter(Q(rank__gt=before) | Q(rank=before, id__gt=anchor.id))
+        after = following.order_by(*RANK_ORDERING).values_list('rank', flat=True).first()
+        return before, after
+    
+    def rank_unranked(self, user_id: int, alias: str) -> int:
+        """
+        Rank the user's never moved tasks where they already sort: before
+        every ranked task, oldest first. Returns tasks ranked.
+        """
+        tasks = self.model.objects.using(alias).filter(user_id=user_id)
+        unranked = list(tasks.filter(rank='').order_by('id').values_list('id', flat=True))
+        first = tasks.exclude(rank='').order_by('rank').values_list('rank', flat=True).first()
+        self._write_ranks(alias, unranked, ranks.ranks_between('', first, len(unranked)))
+        return len(unranked)
+    
+    def rebalance_ranks(self, user_id: int, alias: str) -> int:
+        """
+        Respace all of a user's ranks on database `alias`, keeping their
+        order, so ranks are short again. The user's tasks are locked for
+        the duration. Returns tasks ranked.
+        """
+        with transaction.atomic(using=alias):
+            task_ids = list(
+                self.model.objects.using(alias).select_for_update().filter(user_id=user_id)
+                .order_by(*RANK_ORDERING).values_list('id', flat=True)
+            )
+            self._write_ranks(alias, task_ids, ranks.ranks_between('', None, len(task_ids)))
+        return len(task_ids)
+    
+    def _write_ranks(self, alias: str, task_ids: List[int], new_ranks: List[str]) -> None:
+        # Ranks are not changes of the tasks: no updated_at, no events.
+        self.model.objects.using(alias).bulk_update(
+            [self.model(id=task_id, rank=rank) for task_id, rank in zip(task_ids, new_ranks)],
+            ['rank'], batch_size=RANK_BATCH_SIZE
+        )
+    
+    @shard_key('user_id')
+    def create_subtask(self, parent_id: int, user_id: int, **kwargs) -> Optional[Task]:
+        """
+        Create a task under the user's task `parent_id`, which stays locked
+        until then so it cannot be deleted meanwhile. Returns None unless
+        the parent is the user's; raises ValueError when the parent already
+        has task_paths.MAX_DEPTH ancestors.
+        """
+        alias = router.db_for_write(self.model)
+        with transaction.atomic(using=alias):
+            parent = (
+                self.model.objects.using(alias).select_for_update()
+                .filter(id=parent_id, user_id=user_id).only('id', 'path').first()
+            )
+            if parent is None:
+                return None
+            if task_paths.depth(parent.path) >= task_paths.MAX_DEPTH:
+                raise ValueError(f"Subtasks can be nested at most {task_paths.MAX_DEPTH} levels deep")
+            return self.create(user_id=user_id, path=task_paths.child_path(parent.path, parent.id), **kwargs)
+    
+    @shard_key('user_id')
+    def get_subtree(self, task_id: int, user_id: int) -> Optional[Tuple[Task, List[Task]]]:
+        """
+        A user's task and all its descendants, without full details. The
+        descendants are one range read of the (user_id, path) index however
+        deep they nest, by path and then manual order, so every task comes
+        after its parent. Returns None unless the task is the user's.
+        """
+        task = self.model.objects.filter(id=task_id, user_id=user_id).defer(*Task.LIST_DEFERRED_FIELDS).first()
+        if task is None:
             return None
+        low, high = task_paths.subtree_range(task.path, task.id)
+        subtasks = list(
+            self.model.objects.filter(user_id=user_id, path__gte=low, path__lt=high)
+            .order_by('path', *RANK_ORDERING).defer(*Task.LIST_DEFERRED_FIELDS)
+        )
+        return task, subtasks
+    
+    @shard_key('user_id')
+    def get_ancestors(self, user_id: int, path: str) -> List[Task]:
+        """The user's tasks on a path, root first: one primary key read."""
+        ids = task_paths.path_ids(path)
+        if not ids:
+            return []
+        by_id = {
+            task.id: task
+            for task in self.model.objects.filter(id__in=ids, user_id=user_id)
+            .only('id', 'detail_preview', 'detail_length', 'status', 'path')
+        }
+        return [by_id[task_id] for task_id in ids if task_id in by_id]
+    
+    @shard_key('user_id')
+    def update_subtree_status(self, task_id: int, user_id: int, new_status: str) -> Optional[Tuple[Task, int]]:
+        """
+        Set the status of a task and all its descendants with one UPDATE of
+        the task and its (user_id, path) range, moving the daily counts and
+        recording a status event for the tasks whose status changed.
+        Returns the task and how many tasks changed, or None unless the
+        task is the user's.
+        """
+        alias = router.db_for_write(self.model)
+        now = timezone.now()
+        with transaction.atomic(using=alias):
+            task = self.model.objects.using(alias).select_for_update().filter(id=task_id, user_id=user_id).first()
+            if task is None:
+                return None
+            low, high = task_paths.subtree_range(task.path, task.id)
+            subtree = self.model.objects.using(alias).filter(
+                Q(id=task.id) | Q(path__gte=low, path__lt=high), user_id=user_id
+            ).exclude(status=new_status)
+            changed = list(subtree.select_for_update().only(*STATS_FIELDS))
+            if not changed:
+                return task, 0
+            subtree.update(status=new_status, status_changed_at=now, updated_at=now)
+            deltas = Counter()
+            by_previous = {}
+            for row in changed:
+                previous, previous_day = row.status, finished_day(row)
+                row.status, row.status_changed_at = new_status, now
+                deltas.update(status_deltas(row, previous, previous_day))
+                by_previous.setdefault(previous, []).append(row.id)
+            self.stats_repository.add(deltas, alias)
+            for previous, task_ids in by_previous.items():
+                self.outbox_repository.record(
+                    OutboxEvent.TASK_STATUS_CHANGED, user_id, task_ids, alias,
+                    {'status': new_status, 'previous': previous}
+                )
+            if task.status != new_status:
+                task.status, task.status_changed_at, task.updated_at = new_status, now, now
+        return task, len(changed)
+    
+    def due_batch(self, alias: str, after: Tuple[datetime, int], until: datetime, limit: int) -> List[DueTask]:
+        """
+        Pending, not yet reminded tasks of database `alias` due after the
+        (due_at, id) position `after` and no later than `until`, in due
+        order: a range read of the (status, due_at) index.
+        """
+        due_at, task_id = after
+        return list(
+            self.model.objects.using(alias)
+            .filter(Q(due_at__gt=due_at) | Q(due_at=due_at, id__gt=task_id),
+                    status='pending', due_at__lte=until, reminded_at__isnull=True)
+            .order_by('due_at', 'id').values_list('due_at', 'id', 'user_id')[:limit]
+        )
+    
+    def changed_due(self, alias: str, since: datetime, until: datetime) -> List[DueTask]:
+        """
+        Pending, not yet reminded tasks of database `alias` updated since
+        `since` and due no later than `until`: a range read of the
+        (status, updated_at) index over recent writes.
+        """
+        return list(
+            self.model.objects.using(alias)
+            .filter(status='pending', updated_at__gte=since, due_at__lte=until, reminded_at__isnull=True)
+            .order_by().values_list('due_at', 'id', 'user_id')
+        )
     
+    def mark_reminded(self, alias: str, task: DueTask) -> bool:
+        """
+        Record the due reminder of a task and its 'task.due' event, unless
+        the task was finished, rescheduled or already reminded since it was
+        read. Returns whether the reminder was recorded.
+        """
+        due_at, task_id, user_id = task
+        with transaction.atomic(using=alias):
+            marked = self.model.objects.using(alias).filter(
+                id=task_id, status='pending', due_at=due_at, reminded_at__isnull=True
+            ).update(reminded_at=timezone.now())
+            if marked:
+                self.outbox_repository.record(
+                    OutboxEvent.TASK_DUE, user_id, [task_id], alias, {'due_at': due_at.isoformat()}
+                )
+        return bool(marked)
+    
+    @shard_key('user_id')
+    def export_chunks(self, user_id: int, detail: str = '', created_date=None,
+                      chunk_size: int = 1000) -> Iterator[List[tuple]]:
+        """
+        A user's tasks matching the search filters as chunks of
+        (id, detail, status, created_at, updated_at), oldest first.
+        The database is chosen now, while the user's routing applies.
+        """
+        queryset = self.model.objects.using(router.db_for_read(self.model)).filter(user_id=user_id)
+        if detail:
+            queryset = queryset.filter(self.detail_matches(detail))
+        if created_date:
+            queryset = queryset.filter(created_at__date=created_date)
+        return unpacked_chunks(self.iter_chunks(queryset, EXPORT_FIELDS, chunk_size), detail)
+    
+    @shard_key('user_id')
+    def update_status(self, task_id: int, user_id: int, new_status: str) -> Optional[Task]:
+        """
+        Update only the status of a task. The row is locked while it is
+        read, so concurrent changes count once each in the daily stats; a
+        status that does not change writes nothing and records no event.
+        """
+        alias = router.db_for_write(self.model)
+        with transaction.atomic(using=alias):
+            task = self.model.objects.using(alias).select_for_update().filter(id=task_id, user_id=user_id).first()
+            if task is None or task.status == new_status:
+                return task
+            previous, previous_day = task.status, finished_day(task)
+            task.status, task.status_changed_at = new_status, timezone.now()
+            task.save(using=alias, update_fields=['status', 'status_changed_at', 'updated_at'])
+            self.stats_repository.add(status_deltas(task, previous, previous_day), alias)
+            self.outbox_repository.record(
+                OutboxEvent.TASK_STATUS_CHANGED, user_id, [task_id], alias,
+                {'status': new_status, 'previous': previous}
+            )
+        return task
+    
+    @shard_key('user_id')
     def get_by_id_and_user(self, task_id: int, user_id: int) -> Optional[Task]:
         """Get a task by ID ensuring it belongs to the user."""
         return self.get_first(id=task_id, user_id=user_id)
+
+    @shard_key('user_id')
+    def delete_by_id_and_user(self, task_id: int, user_id: int) -> bool:
+        """Delete a task if it belongs to the user."""
+        return self.delete_many_by_user([task_id], user_id) > 0
+    
+    @shard_key('user_id')
+    def delete_many_by_user(self, task_ids: List[int], user_id: int) -> int:
+        """
+        Delete the given tasks that belong to the user, with their subtasks
+        and archived subtasks; returns how many. The subtrees are deleted in
+        batches of SUBTREE_BATCH_SIZE rows, so a large tree is never loaded
+        at once.
+        """
+        alias = router.db_for_write(self.model)
+        with transaction.atomic(using=alias):
+            tasks = list(
+                self.model.objects.using(alias).select_for_update()
+                .filter(id__in=task_ids, user_id=user_id).only(*STATS_FIELDS, 'path')
+            )
+            if not tasks:
+                return 0
+            ranges, deleted = self._subtree_ranges(tasks), 0
+            for model in (self.model, TaskArchive):
+                while True:
+                    subtasks = list(
+                        model.objects.using(alias).select_for_update().filter(ranges, user_id=user_id)
+                        .exclude(id__in=[task.id for task in tasks]).order_by('path', 'id')
+                        .only(*STATS_FIELDS)[:SUBTREE_BATCH_SIZE]
+                    )
+                    # The given tasks go with the first batch of their subtasks.
+                    batch, tasks = tasks + subtasks, []
+                    if batch:
+                        deleted += self._delete_tasks(model, batch, user_id, alias)
+                    if len(subtasks) < SUBTREE_BATCH_SIZE:
+                        break
+        return deleted
+    
+    @staticmethod
+    def _subtree_ranges(tasks: List[Task]) -> Q:
+        """
+        The (user_id, path) ranges of the descendants of `tasks`: one per
+        task not inside another's subtree.
+        """
+        selected = {task.id for task in tasks}
+        ranges = Q()
+        for task in tasks:
+            if not selected.intersection(task_paths.path_ids(task.path)):
+                low, high = task_paths.subtree_range(task.path, task.id)
+                ranges |= Q(path__gte=low, path__lt=high)
+        return ranges
+    
+    def _delete_tasks(self, model, tasks: List, user_id: int, alias: str) -> int:
+        """Delete locked tasks or archived tasks of the user with their counts, words and event."""
+        task_ids = [task.id for task in tasks]
+        if model is self.model:
+            # Archived tasks are not indexed.
+            self.token_repository.unindex_tasks(user_id, task_ids, alias)
+        self.stats_repository.add(task_deltas(tasks, sign=-1), alias)
+        deleted, _ = model.objects.using(alias).filter(id__in=task_ids).delete()
+        self.outbox_repository.record(OutboxEvent.TASK_DELETED, user_id, task_ids, alias)
+        return deleted
+    
+    @shard_key('user_id')
+    def get_previews(self, user_id: int, task_ids: List[int]) -> List[Task]:
+        """The user's tasks with these ids, in the given order, without full details."""
+        tasks = self.model.objects.filter(id__in=task_ids, user_id=user_id).only(
+            'id', 'detail_preview', 'detail_length', 'status'
+        )
+        by_id = {task.id: task for task in tasks}
+        return [by_id[task_id] for task_id in task_ids if task_id in by_id]
+    
+    @shard_key('user_id')
+    def delete_user_batch(self, user_id: int, batch_size: int) -> int:
+        """Delete up to batch_size of the user's tasks on their shard."""
+        return self.delete_batch('user_id', user_id, batch_size, router.db_for_write(self.model))
@@ -0,0 +1,83 @@
+from typing import Iterable, List
+from django.db import router
+from django.db.models import Q
+from src.core.models import Task, TaskToken
+from src.core.search import prefix_range, tokenize
+from src.core.sharding import shard_key
+from .base_repository import BaseRepository
+
+
+class TaskTokenRepository(BaseRepository):
+    """
+    Repository for the typeahead word index.
+    Writers call index_tasks/unindex_tasks inside the transaction that
+    changes the tasks, on the same database alias.
+    """
+
+    def __init__(self):
+        super().__init__(TaskToken)
+
+    def index_tasks(self, tasks: Iterable[Task], using: str, replace: bool = True) -> int:
+        """
+        Write the tokens of the given tasks, replacing existing ones unless
+        the tasks are new. Returns tokens written.
+        """
+        tasks = list(tasks)
+        if not tasks:
+            return 0
+        by_user = {}
+        for task in tasks:
+            by_user.setdefault(task.user_id, []).append(task.id)
+        for user_id, task_ids in by_user.items() if replace else ():
+            self.unindex_tasks(user_id, task_ids, using)
+        tokens = [(task.user_id, task.id, token) for task in tasks for token in tokenize(task.detail)]
+        self.insert_rows(('user_id', 'task_id', 'token'), tokens, using)
+        return len(tokens)
+
+    def unindex_tasks(self, user_id: int, task_ids: List[int], using: str) -> int:
+        """Remove the tokens of the given tasks of one user."""
+        deleted, _ = self.model.objects.using(using).filter(user_id=user_id, task_id__in=task_ids).delete()
+        return deleted
+
+    @shard_key('user_id')
+    def suggest(self, user_id: int, query: str, limit: int) -> List[int]:
+        """
+        IDs of the user's tasks with a word starting with each word of the
+        query, ordered by their first word matching the longest query word
+        (alphabetically, so an exact match comes first), newest tasks first
+        for the same word. That word drives an index-ordered scan, read in
+        pages until `limit` distinct tasks are found.
+        """
+        words = tokenize(query, limit=None)
+        if not words:
+            return []
+        words.sort(key=len, reverse=True)
+        low, high = prefix_range(words[0])
+        queryset = self.model.objects.filter(user_id=user_id, token__gte=low, token__lt=high)
+        for word in words[1:]:
+            low, high = prefix_range(word)
+            queryset = queryset.filter(task_id__in=self.model.objects.filter(
+                user_id=user_id, token__gte=low, token__lt=high
+            ).values('task_id'))
+        task_ids = []
+        # A task matches once per word sharing the prefix; over-fetch so one page usually fills the result.
+        page_size = limit * 4
+        queryset = queryset.order_by('token', '-task_id')
+        page = list(queryset.values_list('token', 'task_id')[:page_size])
+        while page:
+            for token, task_id in page:
+                if task_id not in task_ids:
+                    task_ids.append(task_id)
+                    if len(task_ids) == limit:
+                        return task_ids
+            if len(page) < page_size:
+                break
+            token, task_id = page[-1]
+            page = list(queryset.filter(Q(token__gt=token) | Q(token=token, task_id__lt=task_id))
+                        .values_list('token', 'task_id')[:page_size])
+        return task_ids
+
+    @shard_key('user_id')
+    def delete_user_batch(self, user_id: int, batch_size: int) -> int:
+        """Delete up to batch_size of the user's tokens on their shard."""
+        return self.delete_batch('user_id', user_id, batch_size, router.db_for_write(self.model))
@@ -1,7 +1,10 @@
-from typing import Optional
+from typing import List, Optional
 from django.contrib.auth.hashers import make_password
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils import timezone
 from src.authentication.models import User
 from .base_repository import BaseRepository
+from .job_repository import JobRepository
 
 
 class UserRepository(BaseRepository):
@@ -12,6 +15,7 @@ class UserRepository(BaseRepository):
     
     def __init__(self):
         super().__init__(User)
+        self.job_repository = JobRepository()
     
     def get_by_email(self, email: str) -> Optional[User]:
         """Get a user by email address."""
@@ -29,3 +33,29 @@ class UserRepository(BaseRepository):
     def email_exists(self, email: str) -> bool:
         """Check if email already exists."""
         return self.exists(email=email)
+
+    def request_erasure(self, user_id: int) -> bool:
+        """Deactivate the user and queue a background erase_users job for their data."""
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            updated = self.model.objects.filter(pk=user_id, erasure_requested_at__isnull=True).update(
+                is_active=False,
+                erasure_requested_at=timezone.now()
+            )
+            if updated:
+                self.job_repository.enqueue('erase_users', {'user_ids': str(user_id)})
+        return updated > 0
+    
+    def get_pending_erasures(self, limit: Optional[int] = None) -> List[int]:
+        """IDs of users waiting for erasure, oldest request first."""
+        queryset = (
+            self.model.objects.filter(erasure_requested_at__isnull=False)
+            .order_by('erasure_requested_at', 'id').values_list('id', flat=True)
+        )
+        return list(queryset[:limit] if limit else queryset)
+    
+    def delete_user(self, user_id: int) -> bool:
+        """Delete the user row and their jobs once their tasks are gone."""
+        with transaction.atomic(using=DEFAULT_DB_ALIAS):
+            self.job_repository.delete_for_user(user_id)
+            deleted, _ = self.model.objects.filter(pk=user_id).delete()
+        return deleted > 0
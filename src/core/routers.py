@@ -0,0 +1,224 @@
+"""
+Database routing for read replicas and task shards.
+
+Replicas are the DATABASES entries marked with 'REPLICA': True. Reads of
+users and tasks made while serving an authenticated request go to one
+replica, picked once per request; everything else, and every write, uses
+the primary. After a user writes, their reads stay on the primary for
+REPLICA_PIN_SECONDS so they always see their own changes. The pin is kept
+in the cache, which must be shared between workers for it to hold across
+processes.
+
+Tasks are spread over the databases of the shard map (src.core.sharding)
+by user id; TaskShardRouter sends every task query made on behalf of a
+user to that user's shard.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import DEFAULT_DB_ALIAS, connections
+from src.core.sharding import current_shard_user, get_shard_map
+
+ROUTED_APPS = ('authentication', 'core')
+SHARDED_MODELS = ('task', 'taskarchive', 'tasktoken', 'taskdailystat', 'label', 'outboxevent')
+PIN_KEY = 'db:pin:{user_id}'
+# Cache backends private to each process, where other workers never see a pin.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+class RoutingState:
+    """Replica choice and pinning for the request being served."""
+
+    def __init__(self, replica: Optional[str]):
+        self.replica = replica
+        self.user_id = None
+        self.pinned = False
+        self.task_shards = {}
+
+
+_state: ContextVar[Optional[RoutingState]] = ContextVar('db_routing_state', default=None)
+
+
+def replica_aliases() -> List[str]:
+    """Aliases of the configured replicas."""
+    return [alias for alias, config in settings.DATABASES.items() if config.get('REPLICA')]
+
+
+def pin_seconds() -> float:
+    return getattr(settings, 'REPLICA_PIN_SECONDS', 5)
+
+
+def check_pin_cache() -> None:
+    """
+    Refuse to start with replicas and a per-process cache: a write served
+    by one worker would not pin the reads served by another.
+    """
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if replica_aliases() and backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            f"Read replicas need a cache shared by every worker for read-your-writes pins; "
+            f"'{backend}' is private to each process. Set CACHE_BACKEND to a shared backend."
+        )
+
+
+@contextmanager
+def routing_scope(replicas: Optional[Iterable[str]] = None):
+    """Route reads in the enclosed block; used once per request."""
+    replicas = list(replica_aliases() if replicas is None else replicas)
+    token = _state.set(RoutingState(random.choice(replicas) if replicas else None))
+    try:
+        yield _state.get()
+    finally:
+        _state.reset(token)
+
+
+def set_current_user(user_id) -> None:
+    """
+    Attach the authenticated user to the current scope.
+    Reads go to the primary if that user wrote within the pin window.
+    """
+    state = _state.get()
+    if state is None or state.replica is None or user_id is None:
+        return
+    state.user_id = user_id
+    state.pinned = cache.get(PIN_KEY.format(user_id=user_id)) is not None
+
+
+def pin_user(user_id) -> None:
+    """Keep the user's reads on the primary for the pin window."""
+    if user_id is None:
+        return
+    cache.set(PIN_KEY.format(user_id=user_id), 1, pin_seconds())
+    state = _state.get()
+    if state is not None and state.user_id == user_id:
+        state.pinned = True
+
+
+def remember_task_shard(user) -> None:
+    """Keep the user's shard override for the rest of the request."""
+    state = _state.get()
+    if state is not None and user is not None:
+        state.task_shards[user.pk] = user.task_shard
+
+
+def task_shard_for(user_id) -> str:
+    """
+    Alias of the database holding the user's tasks: the user's explicit
+    task_shard when set (users being or already resharded), else the map.
+    """
+    shard_map = get_shard_map()
+    if not shard_map.is_sharded:
+        return shard_map.shards[0]
+    state = _state.get()
+    if state is not None and user_id in state.task_shards:
+        override = state.task_shards[user_id]
+    else:
+        from django.contrib.auth import get_user_model
+        override = (
+            get_user_model().objects.using(DEFAULT_DB_ALIAS)
+            .filter(pk=user_id).values_list('task_shard', flat=True).first()
+        )
+        if state is not None:
+            state.task_shards[user_id] = override
+    return override or shard_map.shard_for(user_id)
+
+
+def _instance_user_id(instance):
+    if instance is None:
+        return None
+    if instance._meta.app_label == 'authentication':
+        return instance.pk
+    return getattr(instance, 'user_id', None)
+
+
+class ReplicaRouter:
+    """
+    Sends reads of routed apps to a replica and writes to the primary.
+    `replicas` defaults to the DATABASES entries marked as replicas.
+    """
+
+    def __init__(self, replicas: Optional[Iterable[str]] = None):
+        self.replicas = set(replica_aliases() if replicas is None else replicas)
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in ROUTED_APPS or not self.replicas:
+            return None
+        state = _state.get()
+        if state is None or state.replica is None or state.user_id is None or state.pinned:
+            return DEFAULT_DB_ALIAS
+        # Reads inside a write transaction must see that transaction.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label not in ROUTED_APPS or not self.replicas:
+            return None
+        state = _state.get()
+        if state is not None and state.user_id is not None and not state.pinned:
+            pin_user(state.user_id)
+        owner = _instance_user_id(hints.get('instance'))
+        if owner is not None and (state is None or owner != state.user_id):
+            pin_user(owner)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = self.replicas | {DEFAULT_DB_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication.
+        if db in self.replicas:
+            return False
+        return None
+
+
+class TaskShardRouter:
+    """
+    Sends task queries to the shard of the user they belong to.
+    The user comes from the running repository call (see sharding.shard_key)
+    or from the instance being saved. Defers to the next router when tasks
+    are not sharded or the user is unknown.
+    """
+
+    def _shard(self, model, hints):
+        if model._meta.app_label != 'core' or model._meta.model_name not in SHARDED_MODELS:
+            return None
+        if not get_shard_map().is_sharded:
+            return None
+        user_id = current_shard_user()
+        if user_id is None:
+            user_id = getattr(hints.get('instance'), 'user_id', None)
+        if user_id is None:
+            return None
+        return task_shard_for(user_id)
+
+    def db_for_read(self, model, **hints):
+        return self._shard(model, hints)
+
+    def db_for_write(self, model, **hints):
+        return self._shard(model, hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Tasks reference users that live on the primary.
+        models = {obj1._meta.model_name, obj2._meta.model_name}
+        if models & set(SHARDED_MODELS) and get_shard_map().is_sharded:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Shards other than the primary only hold task tables.
+        if db == DEFAULT_DB_ALIAS or db not in get_shard_map().shards:
+            return None
+        if app_label != 'core':
+            return False
+        return model_name is None or model_name in SHARDED_MODELS
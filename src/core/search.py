@@ -0,0 +1,39 @@
+"""
+Word tokens for the typeahead index (TaskToken).
+
+Details are split into lowercase words with accents removed, so
+"Documentación" is found by "docu". Tokens are capped in length and
+number per task so pasted logs do not blow up the index.
+"""
+import re
+import unicodedata
+from typing import List, Optional, Tuple
+
+MAX_TOKEN_LENGTH = 32
+MAX_TOKENS_PER_TASK = 256
+
+_WORD = re.compile(r'\w+')
+
+
+def normalize(text: str) -> str:
+    """Lowercase and strip accents."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str, limit: Optional[int] = MAX_TOKENS_PER_TASK) -> List[str]:
+    """Distinct normalized words of a text in order of appearance."""
+    tokens = {}
+    for match in _WORD.finditer(normalize(text)):
+        tokens.setdefault(match.group()[:MAX_TOKEN_LENGTH], None)
+        if limit is not None and len(tokens) >= limit:
+            break
+    return list(tokens)
+
+
+def prefix_range(prefix: str) -> Tuple[str, str]:
+    """
+    Bounds (inclusive, exclusive) of the tokens starting with `prefix`.
+    A range instead of LIKE lets every backend walk the index.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
-from django.core.exceptions import ValidationError
+from typing import Any, Dict
+from .schema import Schema, SchemaValidationError
 
 
 class BaseService(ABC):
@@ -9,32 +9,20 @@ class BaseService(ABC):
     Contains common validation and error handling methods.
     """
     
-    def validate_required_fields(self, data: Dict[str, Any], required_fields: List[str]) -> None:
-        """Validate that all required fields are present in the data."""
-        missing_fields = [field for field in required_fields if field not in data or not data[field]]
-        if missing_fields:
-            raise ValidationError(f"Missing required fields: {', '.join(missing_fields)}")
-    
-    def validate_email_format(self, email: str) -> bool:
-        """Validate email format."""
-        import re
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
-    
-    def validate_password_strength(self, password: str) -> bool:
-        """Validate password strength."""
-        if len(password) < 8:
-            return False
-        # Add more password validation rules as needed
-        return True
+    def validate_schema(self, schema: Schema, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate data against a compiled schema and return the cleaned values."""
+        return schema.clean(data)
     
     def handle_service_error(self, error: Exception, message: str = "An error occurred") -> Dict[str, Any]:
         """Handle service errors and return standardized error response."""
-        return {
+        response = {
             'success': False,
             'message': message,
             'error': str(error)
         }
+        if isinstance(error, SchemaValidationError):
+            response['errors'] = error.errors
+        return response
     
     def create_success_response(self, data: Any = None, message: str = "Operation successful") -> Dict[str, Any]:
         """Create standardized success response."""
@@ -0,0 +1,59 @@
+from typing import Dict, Any
+from django.core.exceptions import ValidationError
+from src.core.models import Job
+from ..repositories.job_repository import JobRepository
+from src.core.profiling import profiled
+from .base_service import BaseService
+
+
+class JobService(BaseService):
+    """
+    Service class for background jobs.
+    Lets clients poll the jobs started on their behalf.
+    """
+    
+    def __init__(self):
+        self.job_repository = JobRepository()
+    
+    @staticmethod
+    def job_data(job: Job) -> Dict[str, Any]:
+        return {
+            'id': job.id,
+            'name': job.name,
+            'status': job.status,
+            'attempts': job.attempts,
+            'progress': job.progress,
+            'result': job.result,
+            'error': job.error,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at
+        }
+    
+    @profiled
+    def get_job(self, user_id: int, job_id: int) -> Dict[str, Any]:
+        """
+        Get the status of one of the user's jobs.
+        
+        Args:
+            user_id: ID of the user
+            job_id: ID of the job
+            
+        Returns:
+            Dictionary with success status and job data or error message
+        """
+        try:
+            job = self.job_repository.get_for_user(job_id, user_id)
+            
+            if job is None:
+                raise ValidationError("Job not found or you don't have permission to view it")
+            
+            return self.create_success_response(
+                data=self.job_data(job),
+                message="Job retrieved successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error retrieving job")
@@ -0,0 +1,114 @@
+from typing import Any, Dict
+from django.core.exceptions import ValidationError
+from src.core.models import Label
+from ..repositories.label_repository import LabelRepository
+from src.core.profiling import profiled
+from .base_service import BaseService
+from .schema import Field, Schema
+
+
+class LabelService(BaseService):
+    """
+    Service class for task labels.
+    Lets users manage the labels they attach to their tasks.
+    """
+
+    CREATE_SCHEMA = Schema(
+        name=Field(str, required=True, trim=True, max_length=Label._meta.get_field('name').max_length,
+                   messages={'blank': "Label name cannot be empty"}),
+    )
+
+    def __init__(self):
+        self.label_repository = LabelRepository()
+
+    @staticmethod
+    def label_data(label: Label) -> Dict[str, Any]:
+        return {
+            'id': label.slot,
+            'name': label.name,
+            'created_at': label.created_at
+        }
+
+    @profiled
+    def list_labels(self, user_id: int) -> Dict[str, Any]:
+        """
+        List the user's labels.
+
+        Args:
+            user_id: ID of the user
+
+        Returns:
+            Dictionary with success status and the labels or error message
+        """
+        try:
+            labels = self.label_repository.get_by_user(user_id)
+
+            return self.create_success_response(
+                data={
+                    'labels': [self.label_data(label) for label in labels],
+                    'total': len(labels)
+                },
+                message="Labels retrieved successfully"
+            )
+
+        except Exception as e:
+            return self.handle_service_error(e, "Error retrieving labels")
+
+    @profiled
+    def create_label(self, user_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Create a label for the user.
+
+        Args:
+            user_id: ID of the user
+            data: Dictionary with the label name
+
+        Returns:
+            Dictionary with success status and label data or error message
+        """
+        try:
+            cleaned = self.validate_schema(self.CREATE_SCHEMA, data)
+
+            try:
+                label = self.label_repository.create(user_id=user_id, name=cleaned['name'])
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+            return self.create_success_response(
+                data=self.label_data(label),
+                message="Label created successfully"
+            )
+
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error creating label")
+
+    @profiled
+    def delete_label(self, user_id: int, label_id: int) -> Dict[str, Any]:
+        """
+        Delete one of the user's labels and remove it from their tasks.
+
+        Args:
+            user_id: ID of the user
+            label_id: ID of the label to delete
+
+        Returns:
+            Dictionary with success status and the deleted label id or error message
+        """
+        try:
+            label = None
+            if label_id < Label.MAX_PER_USER:
+                label = self.label_repository.delete_by_slot(user_id, label_id)
+            if label is None:
+                raise ValidationError("Label not found or you don't have permission to delete it")
+
+            return self.create_success_response(
+                data={'id': label_id},
+                message="Label deleted successfully"
+            )
+
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error deleting label")
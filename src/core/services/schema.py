@@ -0,0 +1,241 @@
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+DEFAULT_MESSAGES = {
+    'required': 'This field is required.',
+    'blank': 'This field cannot be blank.',
+    'type': 'Must be a valid {type}.',
+    'choices': 'Must be one of: {choices}.',
+    'min_length': 'Ensure this field has at least {min_length} characters.',
+    'max_length': 'Ensure this field has at most {max_length} characters.',
+    'pattern': 'Invalid format.',
+}
+
+_MISSING = object()
+
+
+class SchemaValidationError(ValidationError):
+    """
+    Raised when input does not match a schema.
+    Carries the structured per-field errors next to a one-line summary.
+    """
+
+    def __init__(self, errors: Dict[str, List[str]], message: str):
+        super().__init__(message)
+        self.errors = errors
+
+    def __str__(self):
+        return self.message
+
+
+class _Invalid(Exception):
+    def __init__(self, code: str):
+        self.code = code
+
+
+def _coerce_str(value):
+    if not isinstance(value, str):
+        raise _Invalid('type')
+    return value
+
+
+def _coerce_int(value):
+    if isinstance(value, bool):
+        raise _Invalid('type')
+    if isinstance(value, int):
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise _Invalid('type')
+
+
+def _coerce_date(value):
+    if isinstance(value, date):
+        return value
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise _Invalid('type')
+
+
+def _coerce_datetime(value):
+    # Times without an offset are in the current time zone.
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(value)
+        except (TypeError, ValueError):
+            raise _Invalid('type')
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+def _coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ('true', '1', 'yes'):
+        return True
+    if isinstance(value, str) and value.lower() in ('false', '0', 'no'):
+        return False
+    raise _Invalid('type')
+
+
+COERCERS = {
+    str: ('string', _coerce_str),
+    int: ('integer', _coerce_int),
+    date: ('date (YYYY-MM-DD)', _coerce_date),
+    datetime: ('date and time (ISO 8601)', _coerce_datetime),
+    bool: ('boolean', _coerce_bool),
+}
+
+
+class Field:
+    """
+    Declarative description of a single input field.
+    """
+
+    def __init__(self, type: type = str, required: bool = False, trim: bool = False,
+                 choices: Optional[Iterable[Any]] = None, min_length: Optional[int] = None,
+                 max_length: Optional[int] = None, pattern: Optional[re.Pattern] = None,
+                 default: Any = None, messages: Optional[Dict[str, str]] = None):
+        if type not in COERCERS:
+            raise ValueError(f"Unsupported field type: {type!r}")
+        self.type = type
+        self.required = required
+        self.trim = trim
+        self.choices = tuple(choices) if choices is not None else None
+        self.min_length = min_length
+        self.max_length = max_length
+        self.pattern = re.compile(pattern) if isinstance(pattern, str) else pattern
+        self.default = default
+        self.messages = messages or {}
+
+    def compile(self) -> Tuple[Callable[[Any], Any], Dict[str, str]]:
+        """
+        Build a checker specialised for this field's options.
+        Only the checks that were declared end up in the returned closure.
+        """
+        type_name, coerce = COERCERS[self.type]
+        messages = {
+            code: text.format(
+                type=type_name,
+                choices=', '.join(str(c) for c in self.choices or ()),
+                min_length=self.min_length,
+                max_length=self.max_length,
+            )
+            for code, text in {**DEFAULT_MESSAGES, **self.messages}.items()
+        }
+
+        steps = []
+        if self.trim and self.type is str:
+            steps.append(str.strip)
+        if self.choices is not None:
+            allowed = frozenset(self.choices)
+
+            def check_choices(value):
+                if value not in allowed:
+                    raise _Invalid('choices')
+                return value
+            steps.append(check_choices)
+        if self.min_length is not None:
+            min_length = self.min_length
+
+            def check_min_length(value):
+                if len(value) < min_length:
+                    raise _Invalid('min_length')
+                return value
+            steps.append(check_min_length)
+        if self.max_length is not None:
+            max_length = self.max_length
+
+            def check_max_length(value):
+                if len(value) > max_length:
+                    raise _Invalid('max_length')
+                return value
+            steps.append(check_max_length)
+        if self.pattern is not None:
+            match = self.pattern.match
+
+            def check_pattern(value):
+                if match(value) is None:
+                    raise _Invalid('pattern')
+                return value
+            steps.append(check_pattern)
+
+        steps = tuple(steps)
+        trim = self.trim and self.type is str
+
+        def check(value):
+            value = coerce(value)
+            if trim:
+                value = value.strip()
+                if not value:
+                    raise _Invalid('blank')
+            for step in steps:
+                value = step(value)
+            return value
+
+        return check, messages
+
+
+class Schema:
+    """
+    A set of fields compiled once into a single validator.
+
+    Usage:
+        schema = Schema(detail=Field(required=True, trim=True))
+        cleaned, errors = schema.validate(data)
+    """
+
+    def __init__(self, **fields: Field):
+        self.fields = fields
+        compiled = []
+        for name, field in fields.items():
+            check, messages = field.compile()
+            compiled.append((name, field.required, field.default, check, messages))
+        self._compiled = tuple(compiled)
+
+    def validate(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[str]]]:
+        """Return the cleaned data and the per-field errors (empty when valid)."""
+        cleaned = {}
+        errors = {}
+        get = data.get
+        for name, required, default, check, messages in self._compiled:
+            value = get(name, _MISSING)
+            if value is _MISSING or value is None or value == '':
+                if required:
+                    errors[name] = [messages['required']]
+                else:
+                    cleaned[name] = default
+                continue
+            try:
+                cleaned[name] = check(value)
+            except _Invalid as invalid:
+                if invalid.code == 'blank' and not required:
+                    cleaned[name] = default
+                else:
+                    errors[name] = [messages[invalid.code]]
+        return cleaned, errors
+
+    def clean(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the cleaned data or raise SchemaValidationError."""
+        cleaned, errors = self.validate(data)
+        if errors:
+            raise SchemaValidationError(errors, self.summarize(errors))
+        return cleaned
+
+    def summarize(self, errors: Dict[str, List[str]]) -> str:
+        """Collapse per-field errors into the single message exposed by the API."""
+        missing = [
+            name for name, _, _, _, messages in self._compiled
+            if errors.get(name, [None])[0] == messages['required']
+        ]
+        if missing:
+            return f"Missing required fields: {', '.join(missing)}"
+        return next(iter(errors.values()))[0]
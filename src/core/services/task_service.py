@@ -1,8 +1,32 @@
-from typing import Dict, Any, List, Optional
+from collections import Counter
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import IO, Any, Callable, Dict, List, Optional
+from uuid import uuid4
 from django.core.exceptions import ValidationError
-from src.core.models import Task
+from django.utils import timezone
+from src.core import export, importer, ranks, task_paths
+from src.core.models import Task, TaskDailyStat
+from ..repositories.job_repository import JobRepository
+from ..repositories.label_repository import LabelRepository, label_bits, mask_slots
+from ..repositories.task_archive_repository import TaskArchiveRepository
+from ..repositories.task_daily_stat_repository import TaskDailyStatRepository
 from ..repositories.task_repository import TaskRepository
+from ..repositories.task_token_repository import TaskTokenRepository
+from src.core.profiling import profiled
 from .base_service import BaseService
+from .schema import Field, Schema
+
+TASK_STATUSES = [value for value, _ in Task.STATUS_CHOICES]
+BULK_DELETE_MAX = 1000
+SUGGEST_MAX_LIMIT = 50
+EXPORT_CHUNK_SIZE = 1000
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_ERRORS = 100
+STATS_DEFAULT_DAYS = 30
+STATS_MAX_DAYS = 366
+STATS_COUNTS = [value for value, _ in TaskDailyStat.STATUS_CHOICES]
+SEARCH_ORDERS = ('rank',)
 
 
 class TaskService(BaseService):
@@ -11,41 +35,135 @@ class TaskService(BaseService):
     Handles task creation, status updates, and search operations.
     """
     
+    CREATE_SCHEMA = Schema(
+        detail=Field(str, required=True, trim=True, messages={'blank': "Task detail cannot be empty"}),
+        due_at=Field(datetime),
+        parent=Field(int),
+    )
+    DUE_SCHEMA = Schema(
+        due_at=Field(datetime),
+    )
+    STATUS_SCHEMA = Schema(
+        status=Field(str, required=True, choices=TASK_STATUSES, messages={
+            'choices': "Invalid status. Must be one of: {choices}",
+        }),
+        cascade=Field(bool, default=False),
+    )
+    SEARCH_SCHEMA = Schema(
+        detail=Field(str, trim=True, default=''),
+        created_date=Field(date),
+        due_after=Field(datetime),
+        due_before=Field(datetime),
+        labels=Field(str, trim=True, default='', pattern=r'^\d+(\s*,\s*\d+)*$', messages={
+            'pattern': "labels must be a comma-separated list of label ids",
+        }),
+        labels_match=Field(str, default='all', choices=('all', 'any'), messages={
+            'choices': "Invalid labels_match. Must be one of: {choices}",
+        }),
+        order=Field(str, default='', choices=SEARCH_ORDERS, messages={
+            'choices': "Invalid order. Must be one of: {choices}",
+        }),
+        include_archived=Field(bool, default=False),
+    )
+    EXPORT_SCHEMA = Schema(
+        format=Field(str, default='csv', choices=export.STREAMS),
+        detail=Field(str, trim=True, default=''),
+        created_date=Field(date),
+        include_archived=Field(bool, default=False),
+    )
+    IMPORT_SCHEMA = Schema(
+        format=Field(str, choices=importer.FORMATS),
+        background=Field(bool, default=False),
+    )
+    # One row of an import: the create rules plus an optional status.
+    IMPORT_ROW_SCHEMA = Schema(
+        detail=Field(str, required=True, trim=True, messages={'blank': "Task detail cannot be empty"}),
+        status=Field(str, default='pending', choices=TASK_STATUSES, messages={
+            'choices': "Invalid status. Must be one of: {choices}",
+        }),
+    )
+    STATS_SCHEMA = Schema(**{
+        'from': Field(date),
+        'to': Field(date),
+    })
+    SUGGEST_SCHEMA = Schema(
+        q=Field(str, required=True, trim=True, max_length=100),
+        limit=Field(int, default=10),
+    )
+    
     def __init__(self):
         self.task_repository = TaskRepository()
+        self.archive_repository = TaskArchiveRepository()
+        self.token_repository = TaskTokenRepository()
+        self.job_repository = JobRepository()
+        self.stats_repository = TaskDailyStatRepository()
+        self.label_repository = LabelRepository()
+    
+    @staticmethod
+    def list_item(task, archived: bool, label_names: Dict[int, str]) -> Dict[str, Any]:
+        """
+        Task as returned by list endpoints: the stored preview instead of
+        the full detail, which is served by get_task, and its labels named
+        from label_names (slot -> name).
+        """
+        return {
+            'id': task.id,
+            'parent_id': task.parent_id,
+            'detail': task.detail_preview,
+            'detail_truncated': task.detail_truncated,
+            'status': task.status,
+            'due_at': task.due_at,
+            'labels': [
+                {'id': slot, 'name': label_names[slot]}
+                for slot in mask_slots(task.label_mask) if slot in label_names
+            ],
+            'created_at': task.created_at,
+            'updated_at': task.updated_at,
+            'archived': archived
+        }
     
+    @profiled
     def create_task(self, user_id: int, task_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Create a new task for a user.
         
         Args:
             user_id: ID of the user creating the task
-            task_data: Dictionary containing task information (detail)
+            task_data: Dictionary containing task information (detail, optional
+                due_at and parent, the id of the task to create it under)
             
         Returns:
             Dictionary with success status and task data or error message
         """
         try:
-            # Validate required fields
-            required_fields = ['detail']
-            self.validate_required_fields(task_data, required_fields)
-            
-            # Validate detail is not empty
-            if not task_data['detail'].strip():
-                raise ValidationError("Task detail cannot be empty")
+            cleaned = self.validate_schema(self.CREATE_SCHEMA, task_data)
             
             # Create task
-            task = self.task_repository.create(
-                detail=task_data['detail'].strip(),
-                user_id=user_id,
-                status='pending'
-            )
+            if cleaned['parent'] is None:
+                task = self.task_repository.create(
+                    detail=cleaned['detail'],
+                    user_id=user_id,
+                    status='pending',
+                    due_at=cleaned['due_at']
+                )
+            else:
+                try:
+                    task = self.task_repository.create_subtask(
+                        cleaned['parent'], user_id, detail=cleaned['detail'], status='pending',
+                        due_at=cleaned['due_at']
+                    )
+                except ValueError as e:
+                    raise ValidationError(str(e))
+                if task is None:
+                    raise ValidationError("Parent task not found or you don't have permission to modify it")
             
             return self.create_success_response(
                 data={
                     'id': task.id,
+                    'parent_id': task.parent_id,
                     'detail': task.detail,
                     'status': task.status,
+                    'due_at': task.due_at,
                     'created_at': task.created_at,
                     'updated_at': task.updated_at
                 },
@@ -57,63 +175,326 @@ class TaskService(BaseService):
         except Exception as e:
             return self.handle_service_error(e, "Error creating task")
     
-    def update_task_status(self, user_id: int, task_id: int, new_status: str) -> Dict[str, Any]:
+    @profiled
+    def update_task_status(self, user_id: int, task_id: int, new_status: str,
+                           cascade: Any = False) -> Dict[str, Any]:
         """
-        Update the status of a task.
+        Update the status of a task, and with cascade that of all its
+        subtasks too, in one statement.
         
         Args:
             user_id: ID of the user
             task_id: ID of the task to update
             new_status: New status for the task
+            cascade: Whether the subtasks get the new status too
             
         Returns:
             Dictionary with success status and updated task data or error message
         """
         try:
-            # Validate status
-            valid_statuses = ['pending', 'completed', 'cancelled']
-            if new_status not in valid_statuses:
-                raise ValidationError(f"Invalid status. Must be one of: {', '.join(valid_statuses)}")
+            cleaned = self.validate_schema(self.STATUS_SCHEMA, {'status': new_status, 'cascade': cascade})
             
             # Update task status
-            task = self.task_repository.update_status(task_id, user_id, new_status)
+            updated = None
+            if cleaned['cascade']:
+                task, updated = self.task_repository.update_subtree_status(task_id, user_id, new_status) or (None, 0)
+            else:
+                task = self.task_repository.update_status(task_id, user_id, new_status)
+            
+            if task is None:
+                raise ValidationError("Task not found or you don't have permission to modify it")
+            
+            data = {
+                'id': task.id,
+                'detail': task.detail,
+                'status': task.status,
+                'created_at': task.created_at,
+                'updated_at': task.updated_at
+            }
+            if updated is not None:
+                data['updated_tasks'] = updated
+            
+            return self.create_success_response(
+                data=data,
+                message="Task status updated successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error updating task status")
+    
+    @profiled
+    def update_task_due(self, user_id: int, task_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Set or clear (due_at null) the due date of a task.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the task to update
+            data: Dictionary with due_at
+            
+        Returns:
+            Dictionary with success status and updated task data or error message
+        """
+        try:
+            if 'due_at' not in data:
+                raise ValidationError("due_at is required (null clears the due date)")
+            cleaned = self.validate_schema(self.DUE_SCHEMA, data)
+            
+            task = self.task_repository.update_by_id_and_user(task_id, user_id, due_at=cleaned['due_at'])
+            if task is None:
+                raise ValidationError("Task not found or you don't have permission to modify it")
+            
+            return self.create_success_response(
+                data={
+                    'id': task.id,
+                    'status': task.status,
+                    'due_at': task.due_at,
+                    'updated_at': task.updated_at
+                },
+                message="Task due date updated successfully"
+            )
             
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error updating task due date")
+    
+    @profiled
+    def set_task_labels(self, user_id: int, task_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace the labels of a task.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the task to update
+            data: Dictionary with the list of label ids (labels), empty to clear them
+            
+        Returns:
+            Dictionary with success status and the task's labels or error message
+        """
+        try:
+            slots = data.get('labels')
+            if not isinstance(slots, list):
+                raise ValidationError("labels must be a list of label ids")
+            if any(isinstance(slot, bool) or not isinstance(slot, int) for slot in slots):
+                raise ValidationError("labels must be a list of label ids")
+            
+            label_names = self.label_names(user_id) if slots else {}
+            unknown = sorted(set(slots) - label_names.keys())
+            if unknown:
+                raise ValidationError("Unknown label ids: " + ', '.join(str(slot) for slot in unknown))
+            
+            task = self.task_repository.update_by_id_and_user(task_id, user_id, label_mask=label_bits(slots))
             if task is None:
                 raise ValidationError("Task not found or you don't have permission to modify it")
             
+            return self.create_success_response(
+                data={
+                    'id': task.id,
+                    'labels': [{'id': slot, 'name': label_names[slot]} for slot in mask_slots(task.label_mask)],
+                    'updated_at': task.updated_at
+                },
+                message="Task labels updated successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error updating task labels")
+    
+    @profiled
+    def move_task(self, user_id: int, task_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Move a task in the user's manual order, right after another task
+        or to the top (after null). Only the moved task is written.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the task to move
+            data: Dictionary with the id of the task to place it after (after)
+            
+        Returns:
+            Dictionary with success status and the task's new rank or error message
+        """
+        try:
+            if 'after' not in data:
+                raise ValidationError("after is required (null moves the task to the top)")
+            after_id = data['after']
+            if after_id is not None and (isinstance(after_id, bool) or not isinstance(after_id, int)):
+                raise ValidationError("after must be a task id or null")
+            if after_id == task_id:
+                raise ValidationError("A task cannot be moved after itself")
+            
+            task = self.task_repository.move(task_id, user_id, after_id)
+            if task is None:
+                raise ValidationError("Task not found or you don't have permission to modify it")
+            if len(task.rank) == ranks.REBALANCE_LENGTH:
+                # Ranks grow a digit at a time, so this is the first rank
+                # this long since the user's ranks were last respaced.
+                self.job_repository.enqueue('rebalance_ranks', {'user_ids': str(user_id)}, user_id=user_id)
+            
+            return self.create_success_response(
+                data={
+                    'id': task.id,
+                    'rank': task.rank,
+                    'updated_at': task.updated_at
+                },
+                message="Task moved successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error moving task")
+    
+    @profiled
+    def get_task(self, user_id: int, task_id: int) -> Dict[str, Any]:
+        """
+        Get one task with its full detail.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the task
+            
+        Returns:
+            Dictionary with success status and task data or error message
+        """
+        try:
+            task = self.task_repository.get_by_id_and_user(task_id, user_id)
+            
+            if task is None:
+                raise ValidationError("Task not found or you don't have permission to view it")
+            
             return self.create_success_response(
                 data={
                     'id': task.id,
                     'detail': task.detail,
                     'status': task.status,
+                    'due_at': task.due_at,
                     'created_at': task.created_at,
                     'updated_at': task.updated_at
                 },
-                message="Task status updated successfully"
+                message="Task retrieved successfully"
             )
             
         except ValidationError as e:
             return self.handle_service_error(e, str(e))
         except Exception as e:
-            return self.handle_service_error(e, "Error updating task status")
+            return self.handle_service_error(e, "Error retrieving task")
+    
+    @profiled
+    def get_subtasks(self, user_id: int, task_id: int) -> Dict[str, Any]:
+        """
+        Get a task's ancestors and whole subtree, each task with the
+        status counts of its own subtasks at every depth (rollup), all from
+        one read of the subtree.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the task
+            
+        Returns:
+            Dictionary with success status and the task tree or error message
+        """
+        try:
+            subtree = self.task_repository.get_subtree(task_id, user_id)
+            
+            if subtree is None:
+                raise ValidationError("Task not found or you don't have permission to view it")
+            task, subtasks = subtree
+            ancestors = self.task_repository.get_ancestors(user_id, task.path)
+            label_names = {}
+            if any(item.label_mask for item in chain([task], subtasks)):
+                label_names = self.label_names(user_id)
+            
+            # Each subtask counts towards every ancestor on its path.
+            rollups = {item.id: Counter() for item in chain([task], subtasks)}
+            for subtask in subtasks:
+                for ancestor_id in task_paths.path_ids(subtask.path):
+                    if ancestor_id in rollups:
+                        rollups[ancestor_id][subtask.status] += 1
+            
+            def tree_item(item):
+                counts = rollups[item.id]
+                return {
+                    **self.list_item(item, False, label_names),
+                    'rank': item.rank,
+                    'depth': task_paths.depth(item.path),
+                    'rollup': {
+                        'total': sum(counts.values()),
+                        **{status: counts[status] for status in TASK_STATUSES}
+                    }
+                }
+            
+            return self.create_success_response(
+                data={
+                    'task': tree_item(task),
+                    'ancestors': [
+                        {'id': ancestor.id, 'detail': ancestor.detail_preview, 'status': ancestor.status}
+                        for ancestor in ancestors
+                    ],
+                    'subtasks': [tree_item(subtask) for subtask in subtasks],
+                    'total': len(subtasks)
+                },
+                message="Subtasks retrieved successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error retrieving subtasks")
     
+    @profiled
     def search_tasks(self, user_id: int, search_params: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Search tasks by detail and/or creation date.
+        Search tasks by detail, creation date, due range and/or labels.
+        Tasks searched by due date come soonest first; with order=rank
+        tasks come in the user's manual order. Label filters match tasks
+        with all (labels_match=all) or any of the given labels. Archived
+        tasks are only included when include_archived is true, after the
+        active ones in manual order.
         
         Args:
             user_id: ID of the user
-            search_params: Dictionary containing search criteria (detail, created_date)
+            search_params: Dictionary containing search criteria
+                (detail, created_date, due_after, due_before, labels,
+                labels_match, order, include_archived)
             
         Returns:
             Dictionary with success status and list of tasks or error message
         """
         try:
-            detail = search_params.get('detail', '').strip()
-            created_date = search_params.get('created_date')
+            cleaned = self.validate_schema(self.SEARCH_SCHEMA, search_params)
+            detail = cleaned['detail']
+            created_date = cleaned['created_date']
+            filters = {key: cleaned[key] for key in ('due_after', 'due_before') if cleaned[key]}
+            by_due = bool(filters)
+            
+            # The user's labels are read once, to check the filter and to
+            # name the labels of every task listed.
+            label_names = None
+            if cleaned['labels']:
+                label_names = self.label_names(user_id)
+                slots = {int(slot) for slot in cleaned['labels'].split(',')}
+                if not slots <= label_names.keys():
+                    raise ValidationError("Unknown label ids: " + ', '.join(
+                        str(slot) for slot in sorted(slots - label_names.keys())
+                    ))
+                filters['label_mask'] = label_bits(slots)
+                if cleaned['labels_match'] == 'any':
+                    filters['all_labels'] = False
             
+            order = {'order': cleaned['order']} if cleaned['order'] else {}
+            
+            # Search by due range and/or labels, or in manual order, with the other criteria when given
+            if filters or order:
+                tasks = self.task_repository.search(
+                    user_id, detail=detail, created_date=created_date, **filters, **order
+                )
             # If no search criteria provided, return all user tasks
-            if not detail and not created_date:
+            elif not detail and not created_date:
                 tasks = self.task_repository.get_by_user(user_id)
             # Search by both criteria
             elif detail and created_date:
@@ -125,24 +506,356 @@ class TaskService(BaseService):
             else:
                 tasks = self.task_repository.search_by_created_date(user_id, created_date)
             
+            archived_tasks = []
+            if cleaned['include_archived']:
+                archived_tasks = self.archive_repository.search(user_id, detail, created_date, **filters)
+            
+            if label_names is None:
+                label_names = {}
+                if any(task.label_mask for task in chain(tasks, archived_tasks)):
+                    label_names = self.label_names(user_id)
+            
             # Convert tasks to dictionary format
             tasks_data = []
             for task in tasks:
-                tasks_data.append({
+                tasks_data.append(self.list_item(task, False, label_names))
+            
+            if cleaned['include_archived']:
+                for task in archived_tasks:
+                    tasks_data.append(self.list_item(task, True, label_names))
+                # Archived tasks have no rank; in manual order they follow the active ones.
+                if by_due and not order:
+                    tasks_data.sort(key=lambda item: (item['due_at'], item['id']))
+                elif not order:
+                    tasks_data.sort(key=lambda item: item['created_at'], reverse=True)
+            
+            return self.create_success_response(
+                data={
+                    'tasks': tasks_data,
+                    'total': len(tasks_data)
+                },
+                message="Search completed successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error searching tasks")
+    
+    def label_names(self, user_id: int) -> Dict[int, str]:
+        """The user's label names by slot, in one query."""
+        return {label.slot: label.name for label in self.label_repository.get_by_user(user_id)}
+
+    @profiled
+    def export_tasks(self, user_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Export all the user's tasks matching the search filters, with full
+        details. Rows are read and encoded chunk by chunk while the response
+        is sent, so memory stays flat for any number of tasks.
+        
+        Args:
+            user_id: ID of the user
+            params: Dictionary with format (csv or ndjson) and the search filters
+            
+        Returns:
+            Dictionary with success status and the content type, file name and
+            byte stream of the export, or error message
+        """
+        try:
+            cleaned = self.validate_schema(self.EXPORT_SCHEMA, params)
+            filters = {'detail': cleaned['detail'], 'created_date': cleaned['created_date']}
+            
+            chunks = export.flagged(
+                self.task_repository.export_chunks(user_id, chunk_size=EXPORT_CHUNK_SIZE, **filters),
+                archived=False
+            )
+            if cleaned['include_archived']:
+                chunks = chain(chunks, export.flagged(
+                    self.archive_repository.export_chunks(user_id, chunk_size=EXPORT_CHUNK_SIZE, **filters),
+                    archived=True
+                ))
+            
+            file_format = cleaned['format']
+            return self.create_success_response(
+                data={
+                    'content_type': export.CONTENT_TYPES[file_format],
+                    'filename': f'tasks.{file_format}',
+                    'stream': export.STREAMS[file_format](chunks)
+                },
+                message="Export started"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error exporting tasks")
+    
+    @profiled
+    def import_tasks(self, user_id: int, upload: Optional[IO[bytes]], params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Import tasks from an uploaded CSV or NDJSON file with detail and
+        optional status columns. With background, the file is saved and
+        imported by the import_tasks job, whose progress can be polled.
+        
+        Args:
+            user_id: ID of the user
+            upload: Uploaded file, read incrementally
+            params: Dictionary with format (default: from the file name) and background
+            
+        Returns:
+            Dictionary with success status and the import report (imported,
+            failed, first row errors) or the queued job, or error message
+        """
+        try:
+            cleaned = self.validate_schema(self.IMPORT_SCHEMA, params)
+            if upload is None:
+                raise ValidationError("A file is required")
+            file_format = cleaned['format'] or importer.detect_format(getattr(upload, 'name', None) or '')
+            
+            if cleaned['background']:
+                path = importer.upload_storage().save(f'{uuid4().hex}.{file_format}', upload)
+                job = self.job_repository.enqueue(
+                    'import_tasks', {'path': path, 'format': file_format}, user_id=user_id
+                )
+                return self.create_success_response(
+                    data={'job_id': job.id, 'status': job.status},
+                    message="Import queued"
+                )
+            
+            return self.create_success_response(
+                data=self.import_rows(user_id, upload, file_format),
+                message="Import completed"
+            )
+            
+        except importer.ImportFileError as e:
+            return self.handle_service_error(e, str(e))
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error importing tasks")
+    
+    def import_rows(self, user_id: int, file: IO[bytes], file_format: str,
+                    resume: Optional[Dict[str, Any]] = None,
+                    progress: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Dict[str, Any]:
+        """
+        Validate and insert the rows of `file`, IMPORT_BATCH_SIZE tasks per
+        transaction. After each batch `progress` gets the report so far,
+        whose `rows` is the last row committed; passing it back as `resume`
+        continues after that row. Invalid rows are counted and the first
+        IMPORT_MAX_ERRORS are reported with their row number.
+        """
+        report = {'rows': 0, 'imported': 0, 'failed': 0, 'errors': [], **(resume or {})}
+        report['errors'] = list(report['errors'])
+        skip = report['rows']
+        validate = self.IMPORT_ROW_SCHEMA.validate
+        batch = []
+        
+        def flush(rows):
+            if batch:
+                report['imported'] += len(self.task_repository.create_many(user_id, tuple(batch)))
+                batch.clear()
+            report['rows'] = rows
+            if progress is not None:
+                progress({**report, 'errors': list(report['errors'])})
+        
+        number = skip
+        for number, data, error in importer.READERS[file_format](file):
+            if number <= skip:
+                continue
+            if error is None:
+                cleaned, errors = validate(data)
+                if errors:
+                    error = self.IMPORT_ROW_SCHEMA.summarize(errors)
+                else:
+                    batch.append((cleaned['detail'], cleaned['status']))
+            if error is not None:
+                report['failed'] += 1
+                if len(report['errors']) < IMPORT_MAX_ERRORS:
+                    report['errors'].append({'row': number, 'error': error})
+            if len(batch) == IMPORT_BATCH_SIZE:
+                flush(number)
+        flush(max(number, skip))
+        return report
+    
+    @profiled
+    def get_task_stats(self, user_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Tasks created, completed and cancelled per day, read from the daily
+        counts maintained on every write instead of grouping the tasks.
+        
+        Args:
+            user_id: ID of the user
+            params: Dictionary with the first (from) and last (to) day,
+                by default the last STATS_DEFAULT_DAYS days up to today
+            
+        Returns:
+            Dictionary with success status and one entry per day of the
+            range plus totals, or error message
+        """
+        try:
+            cleaned = self.validate_schema(self.STATS_SCHEMA, params)
+            end = cleaned['to'] or timezone.localdate()
+            start = cleaned['from'] or end - timedelta(days=STATS_DEFAULT_DAYS - 1)
+            if start > end:
+                raise ValidationError("from must not be after to")
+            if (end - start).days >= STATS_MAX_DAYS:
+                raise ValidationError(f"The range can span at most {STATS_MAX_DAYS} days")
+            
+            days = {
+                start + timedelta(days=offset): dict.fromkeys(STATS_COUNTS, 0)
+                for offset in range((end - start).days + 1)
+            }
+            for day, status, count in self.stats_repository.get_range(user_id, start, end):
+                days[day][status] = count
+            
+            return self.create_success_response(
+                data={
+                    'from': start,
+                    'to': end,
+                    'days': [{'day': day, **counts} for day, counts in days.items()],
+                    'totals': {
+                        name: sum(counts[name] for counts in days.values()) for name in STATS_COUNTS
+                    }
+                },
+                message="Stats retrieved successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error retrieving task stats")
+    
+    @profiled
+    def restore_task(self, user_id: int, task_id: int) -> Dict[str, Any]:
+        """
+        Move an archived task back to the user's active tasks.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the archived task
+            
+        Returns:
+            Dictionary with success status and restored task data or error message
+        """
+        try:
+            try:
+                task = self.archive_repository.restore(task_id, user_id)
+            except ValueError as e:
+                raise ValidationError(str(e))
+            
+            if task is None:
+                raise ValidationError("Archived task not found or you don't have permission to restore it")
+            
+            return self.create_success_response(
+                data={
                     'id': task.id,
                     'detail': task.detail,
                     'status': task.status,
                     'created_at': task.created_at,
                     'updated_at': task.updated_at
-                })
+                },
+                message="Task restored successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error restoring task")
+
+    @profiled
+    def delete_task(self, user_id: int, task_id: int) -> Dict[str, Any]:
+        """
+        Delete one of the user's tasks.
+        
+        Args:
+            user_id: ID of the user
+            task_id: ID of the task to delete
+            
+        Returns:
+            Dictionary with success status and the deleted task id or error message
+        """
+        try:
+            if not self.task_repository.delete_by_id_and_user(task_id, user_id):
+                raise ValidationError("Task not found or you don't have permission to delete it")
+            
+            return self.create_success_response(
+                data={'id': task_id},
+                message="Task deleted successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error deleting task")
+    
+    @profiled
+    def bulk_delete_tasks(self, user_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Delete several of the user's tasks in one statement.
+        Ids that do not exist or belong to someone else are ignored.
+        
+        Args:
+            user_id: ID of the user
+            data: Dictionary with the list of task ids (ids)
+            
+        Returns:
+            Dictionary with success status and the number of deleted tasks or error message
+        """
+        try:
+            ids = data.get('ids')
+            if not isinstance(ids, list) or not ids:
+                raise ValidationError("ids must be a non-empty list of task ids")
+            if any(isinstance(task_id, bool) or not isinstance(task_id, int) for task_id in ids):
+                raise ValidationError("ids must be a non-empty list of task ids")
+            if len(ids) > BULK_DELETE_MAX:
+                raise ValidationError(f"At most {BULK_DELETE_MAX} tasks can be deleted at once")
+            
+            deleted = self.task_repository.delete_many_by_user(ids, user_id)
+            
+            return self.create_success_response(
+                data={'deleted': deleted},
+                message="Tasks deleted successfully"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Error deleting tasks")
+
+    @profiled
+    def suggest_tasks(self, user_id: int, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Typeahead: the user's tasks with words starting with the query words.
+        Served from the TaskToken index instead of scanning details.
+        
+        Args:
+            user_id: ID of the user
+            params: Dictionary with the query (q) and optional limit
+            
+        Returns:
+            Dictionary with success status and matching task previews or error message
+        """
+        try:
+            cleaned = self.validate_schema(self.SUGGEST_SCHEMA, params)
+            limit = cleaned['limit']
+            if not 1 <= limit <= SUGGEST_MAX_LIMIT:
+                raise ValidationError(f"limit must be between 1 and {SUGGEST_MAX_LIMIT}")
+            
+            task_ids = self.token_repository.suggest(user_id, cleaned['q'], limit)
+            tasks = self.task_repository.get_previews(user_id, task_ids) if task_ids else []
             
             return self.create_success_response(
                 data={
-                    'tasks': tasks_data,
-                    'total': len(tasks_data)
+                    'tasks': [
+                        {'id': task.id, 'detail': task.detail_preview, 'status': task.status}
+                        for task in tasks
+                    ],
+                    'total': len(tasks)
                 },
-                message="Search completed successfully"
+                message="Suggestions retrieved successfully"
             )
             
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
         except Exception as e:
-            return self.handle_service_error(e, "Error searching tasks")
+            return self.handle_service_error(e, "Error retrieving suggestions")
@@ -3,7 +3,9 @@ from django.core.exceptions import ValidationError
 from django.contrib.auth import authenticate
 from src.authentication.models import User
 from ..repositories.user_repository import UserRepository
+from src.core.profiling import profiled
 from .base_service import BaseService
+from .schema import EMAIL_PATTERN, Field, Schema
 
 
 class UserService(BaseService):
@@ -12,9 +14,27 @@ class UserService(BaseService):
     Handles user registration and authentication.
     """
     
+    REGISTER_SCHEMA = Schema(
+        email=Field(str, required=True, max_length=254, pattern=EMAIL_PATTERN, messages={
+            'pattern': "Invalid email format",
+        }),
+        password=Field(str, required=True, min_length=8, messages={
+            'min_length': "Password must be at least 8 characters long",
+        }),
+        first_name=Field(str, required=True, max_length=150),
+        last_name=Field(str, required=True, max_length=150),
+    )
+    LOGIN_SCHEMA = Schema(
+        email=Field(str, required=True, pattern=EMAIL_PATTERN, messages={
+            'pattern': "Invalid email format",
+        }),
+        password=Field(str),
+    )
+    
     def __init__(self):
         self.user_repository = UserRepository()
     
+    @profiled
     def register_user(self, user_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Register a new user.
@@ -26,28 +46,18 @@ class UserService(BaseService):
             Dictionary with success status and user data or error message
         """
         try:
-            # Validate required fields
-            required_fields = ['email', 'password', 'first_name', 'last_name']
-            self.validate_required_fields(user_data, required_fields)
-            
-            # Validate email format
-            if not self.validate_email_format(user_data['email']):
-                raise ValidationError("Invalid email format")
-            
-            # Validate password strength
-            if not self.validate_password_strength(user_data['password']):
-                raise ValidationError("Password must be at least 8 characters long")
+            cleaned = self.validate_schema(self.REGISTER_SCHEMA, user_data)
             
             # Check if email already exists
-            if self.user_repository.email_exists(user_data['email']):
+            if self.user_repository.email_exists(cleaned['email']):
                 raise ValidationError("User with this email already exists")
             
             # Create user
             user = self.user_repository.create_user(
-                email=user_data['email'],
-                password=user_data['password'],
-                first_name=user_data['first_name'],
-                last_name=user_data['last_name']
+                email=cleaned['email'],
+                password=cleaned['password'],
+                first_name=cleaned['first_name'],
+                last_name=cleaned['last_name']
             )
             
             
@@ -66,6 +76,7 @@ class UserService(BaseService):
         except Exception as e:
             return self.handle_service_error(e, "Failed to register user")
     
+    @profiled
     def authenticate_user(self, email: str, password: str) -> Dict[str, Any]:
         """
         Authenticate a user with email and password.
@@ -78,12 +89,10 @@ class UserService(BaseService):
             Dictionary with success status and user data or error message
         """
         try:
-            # Validate email format
-            if not self.validate_email_format(email):
-                raise ValidationError("Invalid email format")
+            cleaned = self.validate_schema(self.LOGIN_SCHEMA, {'email': email, 'password': password})
             
             # Authenticate user
-            user = authenticate(username=email, password=password)
+            user = authenticate(username=cleaned['email'], password=cleaned['password'])
             
             if user is None:
                 raise ValidationError("Invalid email or password")
@@ -103,3 +112,29 @@ class UserService(BaseService):
             return self.handle_service_error(e, str(e))
         except Exception as e:
             return self.handle_service_error(e, "Authentication failed")
+
+    @profiled
+    def request_erasure(self, user_id: int) -> Dict[str, Any]:
+        """
+        Close a user's account. The user can no longer log in; their tasks
+        and the user itself are deleted later by erase_users.
+        
+        Args:
+            user_id: ID of the user
+            
+        Returns:
+            Dictionary with success status or error message
+        """
+        try:
+            if not self.user_repository.request_erasure(user_id):
+                raise ValidationError("Account erasure was already requested")
+            
+            return self.create_success_response(
+                data={'id': user_id},
+                message="Account scheduled for erasure"
+            )
+            
+        except ValidationError as e:
+            return self.handle_service_error(e, str(e))
+        except Exception as e:
+            return self.handle_service_error(e, "Failed to schedule account erasure")
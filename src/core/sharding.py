@@ -0,0 +1,139 @@
+"""
+Shard map for tasks, keyed by user id.
+
+TASK_SHARDING names the database aliases holding tasks and how users are
+spread over them:
+
+    TASK_SHARDING = {
+        'STRATEGY': 'hash',              # or 'range'
+        'SHARDS': ['default', 'shard_1'],
+        'RANGES': [[100000, 'default'], [None, 'shard_1']],  # 'range' only
+    }
+
+Users moved by reshard_tasks carry an explicit User.task_shard that wins
+over the map until the map is updated to agree (see src.core.routers).
+"""
+import functools
+import inspect
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, List, Optional, Sequence, Tuple
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS
+
+STRATEGIES = ('hash', 'range')
+
+# Task ids stay unique across shards by giving each shard its own id range,
+# so moved rows keep their ids (see reshard_tasks --prepare-ids).
+TASK_ID_RANGE = 10 ** 12
+
+_shard_user: ContextVar[Optional[int]] = ContextVar('shard_user', default=None)
+
+
+class ShardMap:
+    """Maps a user id to the alias of the database holding their tasks."""
+
+    def __init__(self, shards: Sequence[str], strategy: str = 'hash',
+                 ranges: Optional[Iterable[Tuple[Optional[int], str]]] = None):
+        if not shards:
+            raise ImproperlyConfigured('TASK_SHARDING needs at least one shard')
+        if strategy not in STRATEGIES:
+            raise ImproperlyConfigured(f"Unknown shard strategy '{strategy}'; use one of: {', '.join(STRATEGIES)}")
+        self.shards: List[str] = list(shards)
+        self.strategy = strategy
+        self.ranges: List[Tuple[Optional[int], str]] = [(bound, alias) for bound, alias in (ranges or [])]
+        if strategy == 'range':
+            if not self.ranges or self.ranges[-1][0] is not None:
+                raise ImproperlyConfigured('Range sharding needs a final open-ended range (upper bound None)')
+            unknown = {alias for _, alias in self.ranges} - set(self.shards)
+            if unknown:
+                raise ImproperlyConfigured(f"Ranges point at unknown shards: {', '.join(sorted(unknown))}")
+
+    @classmethod
+    def from_settings(cls, config: Optional[dict] = None) -> 'ShardMap':
+        config = config if config is not None else getattr(settings, 'TASK_SHARDING', {})
+        return cls(
+            shards=config.get('SHARDS') or [DEFAULT_DB_ALIAS],
+            strategy=config.get('STRATEGY', 'hash'),
+            ranges=config.get('RANGES'),
+        )
+
+    @staticmethod
+    def parse_ranges(text: str) -> List[Tuple[Optional[int], str]]:
+        """Parse '1000:default,5000:shard_1,:shard_2' into (upper bound, alias) pairs."""
+        ranges = []
+        for part in filter(None, (item.strip() for item in text.split(','))):
+            bound, _, alias = part.partition(':')
+            ranges.append((int(bound) if bound else None, alias))
+        return ranges
+
+    @property
+    def is_sharded(self) -> bool:
+        return len(self.shards) > 1 or self.shards[0] != DEFAULT_DB_ALIAS
+
+    def shard_for(self, user_id: int) -> str:
+        if len(self.shards) == 1:
+            return self.shards[0]
+        if self.strategy == 'range':
+            for bound, alias in self.ranges:
+                if bound is None or user_id < bound:
+                    return alias
+        return self.shards[zlib.crc32(str(user_id).encode()) % len(self.shards)]
+
+    def id_range_start(self, alias: str) -> int:
+        """First task id owned by a shard; shards keep their list position."""
+        return self.shards.index(alias) * TASK_ID_RANGE + 1
+
+
+@functools.lru_cache(maxsize=None)
+def get_shard_map() -> ShardMap:
+    return ShardMap.from_settings()
+
+
+def _reset_shard_map(*, setting, **kwargs):
+    if setting == 'TASK_SHARDING':
+        get_shard_map.cache_clear()
+
+
+setting_changed.connect(_reset_shard_map)
+
+
+def current_shard_user() -> Optional[int]:
+    """User whose tasks the running repository call works on, if any."""
+    return _shard_user.get()
+
+
+@contextmanager
+def shard_user(user_id: Optional[int]):
+    """Route task queries in the enclosed block to this user's shard."""
+    token = _shard_user.set(user_id)
+    try:
+        yield
+    finally:
+        _shard_user.reset(token)
+
+
+def shard_key(argument: str):
+    """
+    Decorator for repository methods scoped to one user.
+    `argument` names the parameter holding the user id; task queries made
+    during the call go to that user's shard.
+    """
+    def decorator(func):
+        position = list(inspect.signature(func).parameters).index(argument)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            user_id = kwargs[argument] if argument in kwargs else args[position]
+            token = _shard_user.set(user_id)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _shard_user.reset(token)
+
+        return wrapper
+
+    return decorator
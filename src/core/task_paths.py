@@ -0,0 +1,48 @@
+"""
+Materialized paths for subtasks.
+
+A task's path lists the ids of its ancestors, root first, each followed
+by '/': '' for a top-level task, '12/' for a subtask of task 12 and
+'12/40/' for a subtask of that one. A task's parent and ancestors are read
+off its own row, and its whole subtree is the range of paths starting with
+its children's path, so one read of the (user_id, path) index returns it
+however deep the tree is.
+
+Paths only hold digits and '/', which sort the same under binary and
+case-insensitive collations, so the range is taken with plain >= and <
+rather than LIKE: '/' is the character right before '0', so every path
+starting with '12/' sorts in ['12/', '120').
+"""
+from typing import List, Optional, Tuple
+
+SEPARATOR = '/'
+MAX_DEPTH = 8
+# Column size: MAX_DEPTH ancestors of up to 20 digits each.
+MAX_LENGTH = 255
+
+
+def child_path(path: str, task_id: int) -> str:
+    """Path of the subtasks of task `task_id`, whose own path is `path`."""
+    return f'{path}{task_id}{SEPARATOR}'
+
+
+def path_ids(path: str) -> List[int]:
+    """Ancestor ids of a path, root first."""
+    return [int(task_id) for task_id in path.split(SEPARATOR)[:-1]]
+
+
+def parent_id(path: str) -> Optional[int]:
+    """Id of the parent of a task with this path; None at the top level."""
+    ids = path_ids(path)
+    return ids[-1] if ids else None
+
+
+def depth(path: str) -> int:
+    """Number of ancestors of a task with this path."""
+    return path.count(SEPARATOR)
+
+
+def subtree_range(path: str, task_id: int) -> Tuple[str, str]:
+    """[low, high) range of the paths of every descendant of task `task_id`."""
+    prefix = child_path(path, task_id)
+    return prefix, prefix[:-1] + chr(ord(SEPARATOR) + 1)
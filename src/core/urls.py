@@ -5,8 +5,25 @@ app_name = 'core'
 
 urlpatterns = [
     path('health/', views.health_check, name='health_check'),
+    path('health/live/', views.health_live, name='health_live'),
+    path('health/ready/', views.health_ready, name='health_ready'),
+    path('metrics', views.metrics, name='metrics'),
     path('tasks/', views.create_task, name='create_task'),
+    path('tasks/<int:task_id>/', views.task_detail, name='task_detail'),
+    path('tasks/bulk-delete/', views.bulk_delete_tasks, name='bulk_delete_tasks'),
     path('tasks/<int:task_id>/status/', views.update_task_status, name='update_task_status'),
+    path('tasks/<int:task_id>/due/', views.update_task_due, name='update_task_due'),
+    path('tasks/<int:task_id>/subtasks/', views.task_subtasks, name='task_subtasks'),
+    path('tasks/<int:task_id>/move/', views.move_task, name='move_task'),
+    path('tasks/<int:task_id>/labels/', views.set_task_labels, name='set_task_labels'),
+    path('tasks/<int:task_id>/restore/', views.restore_task, name='restore_task'),
     path('tasks/search/', views.search_tasks, name='search_tasks'),
+    path('tasks/suggest/', views.suggest_tasks, name='suggest_tasks'),
+    path('tasks/export/', views.export_tasks, name='export_tasks'),
+    path('tasks/import/', views.import_tasks, name='import_tasks'),
+    path('tasks/stats/', views.task_stats, name='task_stats'),
+    path('labels/', views.labels, name='labels'),
+    path('labels/<int:label_id>/', views.label_detail, name='label_detail'),
+    path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
 ]
 
@@ -1,7 +1,18 @@
-from rest_framework.decorators import api_view, permission_classes
+import hmac
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden, JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from src.core import metrics as metrics_registry
+from src.core.export import accepts_gzip, gzip_stream
+from src.core.health import readiness
+from src.core.services.job_service import JobService
+from src.core.services.label_service import LabelService
 from src.core.services.task_service import TaskService
 
 
@@ -18,6 +29,51 @@ def health_check(request):
     }, status=status.HTTP_200_OK)
 
 
+@require_GET
+def health_live(request):
+    """
+    Liveness probe: the process is up and serving requests.
+    Touches no dependency, so it stays cheap under heavy probing.
+    """
+    return JsonResponse({'status': 'alive'})
+
+
+@require_GET
+def health_ready(request):
+    """
+    Readiness probe: database, migrations and cache are usable.
+    Check results are cached for HEALTH_CHECK_CACHE_SECONDS.
+    """
+    result = readiness.status()
+    return JsonResponse(
+        {'status': 'ready' if result['ready'] else 'unavailable', **result},
+        status=status.HTTP_200_OK if result['ready'] else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+def metrics_allowed(request) -> bool:
+    """Whether the request carries METRICS_TOKEN or comes from METRICS_ALLOWED_IPS."""
+    token = settings.METRICS_TOKEN
+    if token and hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+        return True
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+@require_GET
+def metrics(request):
+    """
+    Expose application metrics in the Prometheus text format to scrapers
+    allowed by METRICS_TOKEN or METRICS_ALLOWED_IPS.
+    With METRICS_DIR configured the samples of every worker are merged.
+    """
+    if not metrics_allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(
+        metrics_registry.render(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_task(request):
@@ -26,7 +82,9 @@ def create_task(request):
     
     Expected payload:
     {
-        "detail": "Task description"
+        "detail": "Task description",
+        "due_at": "2025-10-01T09:00:00Z",  (optional)
+        "parent": 42  (optional, id of the task to create it under)
     }
     """
     task_service = TaskService()
@@ -38,6 +96,45 @@ def create_task(request):
         return Response(result, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated])
+def task_detail(request, task_id):
+    """
+    GET: retrieve a task with its full detail (lists only carry a preview).
+    DELETE: delete a task.
+    """
+    task_service = TaskService()
+    if request.method == 'GET':
+        result = task_service.get_task(request.user.id, task_id)
+    else:
+        result = task_service.delete_task(request.user.id, task_id)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_delete_tasks(request):
+    """
+    Delete several tasks at once.
+    
+    Expected payload:
+    {
+        "ids": [1, 2, 3]
+    }
+    """
+    task_service = TaskService()
+    result = task_service.bulk_delete_tasks(request.user.id, request.data)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def update_task_status(request, task_id):
@@ -46,7 +143,8 @@ def update_task_status(request, task_id):
     
     Expected payload:
     {
-        "status": "pending" | "completed" | "cancelled"
+        "status": "pending" | "completed" | "cancelled",
+        "cascade": true  (optional, set the status of all its subtasks too)
     }
     """
     task_service = TaskService()
@@ -58,7 +156,84 @@ def update_task_status(request, task_id):
             'message': 'Status field is required'
         }, status=status.HTTP_400_BAD_REQUEST)
     
-    result = task_service.update_task_status(request.user.id, task_id, new_status)
+    result = task_service.update_task_status(
+        request.user.id, task_id, new_status, request.data.get('cascade', False)
+    )
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def update_task_due(request, task_id):
+    """
+    Set or clear a task's due date.
+    
+    Expected payload:
+    {
+        "due_at": "2025-10-01T09:00:00Z" | null
+    }
+    """
+    task_service = TaskService()
+    result = task_service.update_task_due(request.user.id, task_id, request.data)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def task_subtasks(request, task_id):
+    """
+    Get a task's ancestors and all its subtasks, with per-subtree status counts.
+    """
+    task_service = TaskService()
+    result = task_service.get_subtasks(request.user.id, task_id)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def move_task(request, task_id):
+    """
+    Move a task in the manual order.
+    
+    Expected payload:
+    {
+        "after": 42  (id of the task to place it after; null for the top)
+    }
+    """
+    task_service = TaskService()
+    result = task_service.move_task(request.user.id, task_id, request.data)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['PUT'])
+@permission_classes([IsAuthenticated])
+def set_task_labels(request, task_id):
+    """
+    Replace a task's labels.
+    
+    Expected payload:
+    {
+        "labels": [1, 2]  (empty list clears them)
+    }
+    """
+    task_service = TaskService()
+    result = task_service.set_task_labels(request.user.id, task_id, request.data)
     
     if result['success']:
         return Response(result, status=status.HTTP_200_OK)
@@ -70,18 +245,30 @@ def update_task_status(request, task_id):
 @permission_classes([IsAuthenticated])
 def search_tasks(request):
     """
-    Search tasks by detail and/or creation date.
+    Search tasks by detail, creation date and/or due date.
     
     Query parameters:
     - detail: Search in task description (optional)
     - created_date: Search by creation date in format YYYY-MM-DD (optional)
+    - due_after: Tasks due at or after this ISO 8601 time (optional)
+    - due_before: Tasks due before this ISO 8601 time (optional)
+    - labels: Comma-separated label ids (optional)
+    - labels_match: Tasks with all (default) or any of the labels (optional)
+    - order: "rank" for the manual order (optional)
+    - include_archived: Also search archived tasks, true/false (optional)
     """
     task_service = TaskService()
     
     # Get query parameters
     search_params = {
         'detail': request.GET.get('detail', ''),
-        'created_date': request.GET.get('created_date')
+        'created_date': request.GET.get('created_date'),
+        'due_after': request.GET.get('due_after'),
+        'due_before': request.GET.get('due_before'),
+        'labels': request.GET.get('labels', ''),
+        'labels_match': request.GET.get('labels_match'),
+        'order': request.GET.get('order', ''),
+        'include_archived': request.GET.get('include_archived')
     }
     
     result = task_service.search_tasks(request.user.id, search_params)
@@ -89,4 +276,179 @@ def search_tasks(request):
     if result['success']:
         return Response(result, status=status.HTTP_200_OK)
     else:
-        return Response(result, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_tasks(request):
+    """
+    Download all matching tasks as a streamed file.
+    
+    Query parameters:
+    - format: csv (default) or ndjson
+    - detail, created_date, include_archived: same filters as search
+    
+    Compressed with gzip on the fly when the client accepts it.
+    """
+    task_service = TaskService()
+    result = task_service.export_tasks(request.user.id, {
+        'format': request.GET.get('format'),
+        'detail': request.GET.get('detail', ''),
+        'created_date': request.GET.get('created_date'),
+        'include_archived': request.GET.get('include_archived')
+    })
+    
+    if not result['success']:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    
+    data = result['data']
+    stream = data['stream']
+    gzipped = accepts_gzip(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    response = StreamingHttpResponse(gzip_stream(stream) if gzipped else stream, content_type=data['content_type'])
+    response['Content-Disposition'] = f'attachment; filename="{data["filename"]}"'
+    if gzipped:
+        response['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+# Multipart even under the API-only settings, which only parse JSON.
+@parser_classes([MultiPartParser])
+def import_tasks(request):
+    """
+    Import tasks from a multipart upload.
+    
+    Form fields:
+    - file: CSV with a header line or NDJSON, with detail and optional status
+    - format: csv or ndjson (optional, default: from the file name)
+    - background: true to import in the job queue and poll /api/jobs/{id}/ (optional)
+    """
+    task_service = TaskService()
+    result = task_service.import_tasks(request.user.id, request.FILES.get('file'), {
+        'format': request.data.get('format'),
+        'background': request.data.get('background')
+    })
+    
+    if not result['success']:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+    if 'job_id' in result['data']:
+        return Response(result, status=status.HTTP_202_ACCEPTED)
+    return Response(result, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def task_stats(request):
+    """
+    Tasks created, completed and cancelled per day.
+    
+    Query parameters:
+    - from: First day, YYYY-MM-DD (optional, default: 29 days before to)
+    - to: Last day, YYYY-MM-DD (optional, default: today); at most 366 days
+    """
+    task_service = TaskService()
+    result = task_service.get_task_stats(request.user.id, {
+        'from': request.GET.get('from'),
+        'to': request.GET.get('to')
+    })
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def restore_task(request, task_id):
+    """
+    Restore an archived task to the active tasks.
+    """
+    task_service = TaskService()
+    result = task_service.restore_task(request.user.id, task_id)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def suggest_tasks(request):
+    """
+    Typeahead over task words.
+    
+    Query parameters:
+    - q: Word prefixes to match, e.g. "inf rep" (required)
+    - limit: Maximum tasks returned, 1-50 (optional, default 10)
+    """
+    task_service = TaskService()
+    result = task_service.suggest_tasks(request.user.id, {
+        'q': request.GET.get('q', ''),
+        'limit': request.GET.get('limit')
+    })
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET', 'POST'])
+@permission_classes([IsAuthenticated])
+def labels(request):
+    """
+    GET: list the user's labels.
+    POST: create a label.
+    
+    Expected payload:
+    {
+        "name": "work"
+    }
+    """
+    label_service = LabelService()
+    if request.method == 'GET':
+        result = label_service.list_labels(request.user.id)
+        success_status = status.HTTP_200_OK
+    else:
+        result = label_service.create_label(request.user.id, request.data)
+        success_status = status.HTTP_201_CREATED
+    
+    if result['success']:
+        return Response(result, status=success_status)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['DELETE'])
+@permission_classes([IsAuthenticated])
+def label_detail(request, label_id):
+    """
+    Delete a label and remove it from the tasks that have it.
+    """
+    label_service = LabelService()
+    result = label_service.delete_label(request.user.id, label_id)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def job_detail(request, job_id):
+    """
+    Poll a background job started for the user: status, attempts, result or error.
+    """
+    job_service = JobService()
+    result = job_service.get_job(request.user.id, job_id)
+    
+    if result['success']:
+        return Response(result, status=status.HTTP_200_OK)
+    else:
+        return Response(result, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,44 @@
+"""
+API-only settings for worker processes that serve JWT clients.
+
+Drops the admin, sessions, messages and static files apps, the session,
+CSRF, auth, messages and clickjacking middleware, the template engine and
+DRF's browsable API renderer. Admin keeps running from a deployment that
+uses the full settings module.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=src.todo_api.api_settings gunicorn src.todo_api.wsgi
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+API_EXCLUDED_APPS = (
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+
+API_EXCLUDED_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+)
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in API_EXCLUDED_APPS]
+
+# DRF authenticates every request itself from the JWT header, so the
+# session-based middleware only added work.
+MIDDLEWARE = [item for item in MIDDLEWARE if item not in API_EXCLUDED_MIDDLEWARE]
+
+ROOT_URLCONF = 'src.todo_api.api_urls'
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['rest_framework.parsers.JSONParser'],
+}
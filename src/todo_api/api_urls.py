@@ -0,0 +1,10 @@
+"""
+URL configuration for API-only workers (see api_settings).
+Same routes as the main URLconf without the admin site.
+"""
+from django.urls import path, include
+
+urlpatterns = [
+    path('api/auth/', include('src.authentication.urls')),
+    path('api/', include('src.core.urls')),
+]
@@ -45,6 +45,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'src.core.middleware.MetricsMiddleware',
+    'src.core.middleware.ServerTimingMiddleware',
+    'src.core.middleware.DatabaseRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -52,8 +55,24 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'src.core.middleware.ErrorHandlingMiddleware',
 ]
 
+# Request profiling (Server-Timing headers); off by default
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+PROFILING_LOG = config('PROFILING_LOG', default=False, cast=bool)
+
+# Prometheus metrics; set METRICS_DIR to aggregate across worker processes
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_DIR = config('METRICS_DIR', default='')
+# /api/metrics is served to clients sending "Authorization: Bearer
+# METRICS_TOKEN" or connecting from METRICS_ALLOWED_IPS, and refused to others
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = [ip for ip in config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',') if ip]
+
+# Readiness probe results are reused for this many seconds
+HEALTH_CHECK_CACHE_SECONDS = config('HEALTH_CHECK_CACHE_SECONDS', default=5, cast=float)
+
 ROOT_URLCONF = 'src.todo_api.urls'
 
 TEMPLATES = [
@@ -91,6 +110,81 @@ DATABASES = {
     }
 }
 
+# Task shards: one DATABASES entry per extra host, named shard_N. Tasks are
+# placed by user id with the TASK_SHARDING map (see src.core.sharding);
+# TASK_SHARD_RANGES looks like "100000:default,:shard_1".
+DB_SHARD_HOSTS = [host for host in config('DB_SHARD_HOSTS', default='').split(',') if host]
+for index, host in enumerate(DB_SHARD_HOSTS, start=1):
+    DATABASES[f'shard_{index}'] = {**DATABASES['default'], 'HOST': host}
+
+TASK_SHARDING = {
+    'STRATEGY': config('TASK_SHARD_STRATEGY', default='hash'),
+    'SHARDS': ['default'] + [f'shard_{index}' for index in range(1, len(DB_SHARD_HOSTS) + 1)],
+    'RANGES': [
+        (int(bound) if bound else None, alias)
+        for bound, _, alias in (
+            item.partition(':') for item in config('TASK_SHARD_RANGES', default='').split(',') if item
+        )
+    ],
+}
+
+# Read replicas: one DATABASES entry per host, marked with 'REPLICA': True.
+# Authenticated reads of users and tasks go to a replica unless the user
+# wrote within the last REPLICA_PIN_SECONDS (see src.core.routers).
+DB_REPLICA_HOSTS = [host for host in config('DB_REPLICA_HOSTS', default='').split(',') if host]
+for index, host in enumerate(DB_REPLICA_HOSTS, start=1):
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'REPLICA': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['src.core.routers.TaskShardRouter', 'src.core.routers.ReplicaRouter']
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=5, cast=float)
+
+# Replica pins live in the cache, so with replicas it must be shared by every
+# worker: the database cache by default (run createcachetable), or any other
+# shared backend set with CACHE_BACKEND/CACHE_LOCATION. A per-process cache
+# with replicas is refused at startup (src.core.routers.check_pin_cache).
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default=(
+            'django.core.cache.backends.db.DatabaseCache' if DB_REPLICA_HOSTS
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        )),
+        'LOCATION': config('CACHE_LOCATION', default='django_cache' if DB_REPLICA_HOSTS else ''),
+    }
+}
+
+# Completed and cancelled tasks untouched for this many days are moved to
+# the archive table by the archive_tasks command.
+TASK_ARCHIVE_AFTER_DAYS = config('TASK_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+
+# Task details larger than this many bytes are stored zlib-compressed;
+# list endpoints only return a short preview (see src.core.fields).
+TASK_DETAIL_COMPRESS_BYTES = config('TASK_DETAIL_COMPRESS_BYTES', default=4096, cast=int)
+
+# Task change events are written to an outbox table with each task write
+# and delivered by the process_outbox command to the handlers registered
+# in these modules (see src.core.outbox). Failed events are retried with
+# exponential backoff capped at OUTBOX_RETRY_MAX_SECONDS, and kept as failed
+# after OUTBOX_MAX_ATTEMPTS attempts.
+OUTBOX_HANDLERS = [module for module in config('OUTBOX_HANDLERS', default='').split(',') if module]
+OUTBOX_RETRY_MAX_SECONDS = config('OUTBOX_RETRY_MAX_SECONDS', default=3600, cast=int)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=10, cast=int)
+
+# Background jobs (see src.core.jobs) run in the run_worker command. A job
+# whose worker stops renewing its lock for JOB_VISIBILITY_TIMEOUT seconds is
+# picked up again; failures are retried with backoff up to JOB_MAX_ATTEMPTS.
+JOB_VISIBILITY_TIMEOUT = config('JOB_VISIBILITY_TIMEOUT', default=300, cast=int)
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=3, cast=int)
+JOB_RETRY_MAX_SECONDS = config('JOB_RETRY_MAX_SECONDS', default=3600, cast=int)
+
+# Uploads of background task imports wait here for the import_tasks job;
+# the web and worker processes must share this directory.
+IMPORT_UPLOAD_DIR = config('IMPORT_UPLOAD_DIR', default=str(BASE_DIR.parent / 'var' / 'imports'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -137,13 +231,15 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'src.authentication.authentication.RoutedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
+    # `format` is a parameter of the export endpoint, not a renderer override.
+    'URL_FORMAT_OVERRIDE': None,
 }
 
 
@@ -13,14 +13,25 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'src.todo_api.test_settings')
 if not settings.configured:
     django.setup()
 
+from django.db import DEFAULT_DB_ALIAS, connections
 from django.test import Client
 from django.contrib.auth import get_user_model
 from rest_framework_simplejwt.tokens import RefreshToken
 from tests.factories import UserFactory
+from tests.query_budget import QueryBudget
 
 User = get_user_model()
 
 
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        'markers',
+        'query_budget(max_queries, max_time_ms=None): limit the queries and query time '
+        'of every request made through the Django test client'
+    )
+
+
 @pytest.fixture
 def client():
     """Django test client fixture."""
@@ -52,3 +63,46 @@ def other_user():
 def enable_db_access_for_all_tests(db):
     """Enable database access for all tests."""
     pass
+
+
+@pytest.fixture
+def query_budget():
+    """Factory fixture returning a QueryBudget context manager."""
+    return QueryBudget
+
+
+def _budget_databases(request):
+    """Aliases a test may query: its TestCase `databases` or django_db marker, else default."""
+    databases = getattr(request.node.cls, 'databases', None)
+    marker = request.node.get_closest_marker('django_db')
+    if marker is not None and marker.kwargs.get('databases'):
+        databases = marker.kwargs['databases']
+    if databases == '__all__':
+        return list(connections)
+    return sorted(databases or {DEFAULT_DB_ALIAS})
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budget(request, monkeypatch):
+    """
+    Apply the query_budget marker to each request issued by a test client.
+    Works for pytest-style tests and Django TestCase classes alike, since
+    the budget wraps Client.request rather than a particular client instance.
+    Queries are counted on every database the test may use.
+    """
+    marker = request.node.get_closest_marker('query_budget')
+    if marker is None:
+        yield
+        return
+    options = dict(marker.kwargs)
+    options.setdefault('using', _budget_databases(request))
+
+    original_request = Client.request
+
+    def budgeted_request(self, **request_kwargs):
+        label = f"{request_kwargs.get('REQUEST_METHOD', '')} {request_kwargs.get('PATH_INFO', '')}"
+        with QueryBudget(*marker.args, label=label, **options):
+            return original_request(self, **request_kwargs)
+
+    monkeypatch.setattr(Client, 'request', budgeted_request)
+    yield
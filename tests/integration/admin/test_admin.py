@@ -0,0 +1,143 @@
+"""
+Integration tests for the task and user admin pages.
+"""
+import pytest
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from src.authentication.models import User
+from src.core.models import Task, TaskDailyStat, TaskToken
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import TaskFactory, UserFactory
+
+CHANGELIST = '/admin/core/task/'
+
+# The API-only settings profile has no admin site.
+pytestmark = pytest.mark.skipif('django.contrib.admin' not in settings.INSTALLED_APPS,
+                                reason='admin is not installed')
+
+
+@pytest.mark.integration
+class TestTaskAdmin(TestCase):
+    """Integration tests for TaskAdmin."""
+
+    databases = {'default', 'shard_1'}
+
+    def setUp(self):
+        self.admin = UserFactory(is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+        self.owner = UserFactory(email='owner@example.com')
+        self.repository = TaskRepository()
+
+    def listed_ids(self, response):
+        return [task.id for task in response.context['cl'].result_list]
+
+    @pytest.mark.query_budget(8)
+    def test_changelist_does_not_count_table(self):
+        """Test that the list pages in id order, with users joined and a bounded count."""
+        # Arrange
+        tasks = TaskFactory.create_batch(3, user=self.owner)
+
+        # Act
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(CHANGELIST)
+
+        # Assert
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.listed_ids(response), [task.id for task in reversed(tasks)])
+        counts = [query['sql'] for query in captured if 'COUNT(' in query['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT', counts[0])
+        listing = next(query['sql'] for query in captured if 'FROM "tasks" INNER JOIN "users"' in query['sql'])
+        self.assertNotIn('"tasks"."detail_blob"', listing)
+
+    def test_search_uses_ids_and_email(self):
+        """Test that search matches a task id, a user id or an exact email."""
+        # Arrange
+        mine = TaskFactory(user=self.owner)
+        other = TaskFactory()
+
+        # Act
+        by_task = self.client.get(CHANGELIST, {'q': str(other.id)})
+        by_email = self.client.get(CHANGELIST, {'q': 'owner@example.com'})
+        by_user = self.client.get(CHANGELIST, {'q': str(self.owner.id)})
+        unknown = self.client.get(CHANGELIST, {'q': 'nobody@example.com'})
+
+        # Assert
+        self.assertIn(other.id, self.listed_ids(by_task))
+        self.assertEqual(self.listed_ids(by_email), [mine.id])
+        self.assertIn(mine.id, self.listed_ids(by_user))
+        self.assertEqual(self.listed_ids(unknown), [])
+
+    def test_writes_go_through_repository(self):
+        """Test that adding, editing and deleting keep the token index and daily counts."""
+        # Act
+        added = self.client.post('/admin/core/task/add/', {
+            'user': self.owner.id, 'detail': 'Renew passport', 'status': 'pending',
+        })
+        task = Task.objects.get(user=self.owner)
+        changed = self.client.post(f'/admin/core/task/{task.id}/change/', {
+            'detail': 'Renew passport', 'status': 'completed',
+        })
+
+        # Assert
+        self.assertEqual(added.status_code, 302)
+        self.assertEqual(changed.status_code, 302)
+        self.assertTrue(TaskToken.objects.filter(task_id=task.id, token='passport').exists())
+        statuses = set(TaskDailyStat.objects.filter(user=self.owner).values_list('status', flat=True))
+        self.assertEqual(statuses, {'created', 'completed'})
+
+        # Act
+        deleted = self.client.post(f'/admin/core/task/{task.id}/delete/', {'post': 'yes'})
+
+        # Assert
+        self.assertEqual(deleted.status_code, 302)
+        self.assertFalse(Task.objects.filter(id=task.id).exists())
+        self.assertFalse(TaskToken.objects.filter(task_id=task.id).exists())
+        self.assertEqual(sum(TaskDailyStat.objects.filter(user=self.owner).values_list('count', flat=True)), 0)
+
+    @override_settings(TASK_SHARDING={'STRATEGY': 'range', 'SHARDS': ['default', 'shard_1'],
+                                      'RANGES': [(100, 'default'), (None, 'shard_1')]})
+    def test_shard_filter(self):
+        """Test that the list and change pages read the shard picked in the filter."""
+        # Arrange
+        sharded = UserFactory(id=150)
+        task = self.repository.create(user_id=sharded.id, detail='On shard', status='pending')
+
+        # Act
+        default_list = self.client.get(CHANGELIST)
+        shard_list = self.client.get(CHANGELIST, {'shard': 'shard_1'})
+        change = self.client.get(f'/admin/core/task/{task.id}/change/',
+                                 {'_changelist_filters': 'shard=shard_1'})
+
+        # Assert
+        self.assertNotIn(task.id, self.listed_ids(default_list))
+        self.assertEqual(self.listed_ids(shard_list), [task.id])
+        self.assertEqual(change.status_code, 200)
+        self.assertContains(change, 'On shard')
+
+
+@pytest.mark.integration
+class TestUserAdmin(TestCase):
+    """Integration tests for UserAdmin."""
+
+    def setUp(self):
+        self.admin = UserFactory(email='admin@example.com', is_staff=True, is_superuser=True)
+        self.client.force_login(self.admin)
+
+    def test_changelist_searches_email_prefix(self):
+        """Test that users are listed newest first and searched by email prefix."""
+        # Arrange
+        first = UserFactory(email='ana@example.com', first_name='Zed')
+        second = UserFactory(email='anabel@example.com')
+        UserFactory(email='bob@example.com', first_name='Ana')
+
+        # Act
+        listed = self.client.get('/admin/authentication/user/')
+        found = self.client.get('/admin/authentication/user/', {'q': 'ana'})
+
+        # Assert
+        self.assertEqual(listed.status_code, 200)
+        self.assertEqual(listed.context['cl'].result_list[0], User.objects.order_by('-id')[0])
+        self.assertEqual(list(found.context['cl'].result_list), [second, first])
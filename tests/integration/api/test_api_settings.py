@@ -0,0 +1,82 @@
+"""
+Integration tests for the API-only settings profile.
+"""
+import json
+import pytest
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.todo_api import api_settings
+from tests.factories import UserFactory, TaskFactory
+
+api_profile = override_settings(
+    ROOT_URLCONF=api_settings.ROOT_URLCONF,
+    MIDDLEWARE=api_settings.MIDDLEWARE,
+    TEMPLATES=api_settings.TEMPLATES,
+    REST_FRAMEWORK=api_settings.REST_FRAMEWORK,
+)
+
+
+@pytest.mark.integration
+@api_profile
+class TestApiSettingsProfile(TestCase):
+    """Integration tests for requests served with the API-only profile."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.user = UserFactory()
+        refresh = RefreshToken.for_user(self.user)
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_profile_strips_unused_components(self):
+        """Test that admin, sessions and CSRF are not part of the profile."""
+        # Act
+        response = self.client.get('/admin/')
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotIn('django.contrib.admin', api_settings.INSTALLED_APPS)
+        self.assertNotIn('django.contrib.sessions', api_settings.INSTALLED_APPS)
+        self.assertNotIn('django.middleware.csrf.CsrfViewMiddleware', api_settings.MIDDLEWARE)
+        self.assertIn('src.core.middleware.ErrorHandlingMiddleware', api_settings.MIDDLEWARE)
+        # Views keep the renderers of the settings they were imported under,
+        # so the JSON-only rendering is checked here rather than per request.
+        self.assertEqual(api_settings.REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'],
+                         ['rest_framework.renderers.JSONRenderer'])
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_search_with_jwt(self):
+        """Test that JWT requests work without session middleware."""
+        # Arrange
+        TaskFactory(user=self.user, detail='Slim profile task')
+
+        # Act
+        response = self.client.get('/api/tasks/search/', **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(response.json()['data']['total'], 1)
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_create_without_csrf_token(self):
+        """Test that JSON writes need no CSRF token."""
+        # Act
+        response = self.client.post(
+            '/api/tasks/', data=json.dumps({'detail': 'No CSRF'}),
+            content_type='application/json', **self.auth_headers
+        )
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_admin_not_routed(self):
+        """Test that the admin site is not served by API workers."""
+        # Act
+        response = self.client.get('/admin/')
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -22,6 +22,7 @@ class TestAuthEndpoints(TestCase):
         self.register_url = '/api/auth/register/'
         self.login_url = '/api/auth/login/'
     
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
     def test_register_endpoint_success(self):
         """Test successful user registration via API."""
         # Arrange
@@ -54,6 +55,7 @@ class TestAuthEndpoints(TestCase):
         self.assertEqual(user.last_name, 'User')
         self.assertTrue(user.check_password('testpass123'))
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_register_endpoint_duplicate_email(self):
         """Test user registration with duplicate email via API."""
         # Arrange
@@ -78,6 +80,7 @@ class TestAuthEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('User with this email already exists', data['message'])
     
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
     def test_register_endpoint_missing_fields(self):
         """Test user registration with missing required fields via API."""
         # Arrange
@@ -100,6 +103,7 @@ class TestAuthEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Missing required fields', data['message'])
     
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
     def test_register_endpoint_invalid_email(self):
         """Test user registration with invalid email format via API."""
         # Arrange
@@ -123,6 +127,7 @@ class TestAuthEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Invalid email format', data['message'])
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_login_endpoint_success(self):
         """Test successful user login via API."""
         # Arrange
@@ -158,6 +163,7 @@ class TestAuthEndpoints(TestCase):
         self.assertIn('refresh', data['data'])
         self.assertEqual(data['data']['expires_in'], 3600)
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_login_endpoint_invalid_credentials(self):
         """Test user login with invalid credentials via API."""
         # Arrange
@@ -180,6 +186,7 @@ class TestAuthEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Invalid email or password', data['message'])
     
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
     def test_login_endpoint_invalid_email(self):
         """Test user login with invalid email format via API."""
         # Arrange
@@ -201,6 +208,7 @@ class TestAuthEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Invalid email format', data['message'])
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_jwt_token_validation(self):
         """Test that JWT tokens are valid and can be used for authentication."""
         # Arrange
@@ -231,3 +239,24 @@ class TestAuthEndpoints(TestCase):
         
         # Health endpoint should work with valid token
         self.assertEqual(health_response.status_code, status.HTTP_200_OK)
+    
+    @pytest.mark.query_budget(max_queries=5, max_time_ms=50)
+    def test_delete_account_endpoint(self):
+        """Test that closing an account disables it and queues the erasure."""
+        # Arrange
+        user = UserFactory()
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        
+        # Act
+        response = self.client.delete('/api/auth/account/', **headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertTrue(response.json()['success'])
+        user.refresh_from_db()
+        self.assertFalse(user.is_active)
+        self.assertIsNotNone(user.erasure_requested_at)
+        
+        # The token stops working once the account is disabled
+        response = self.client.delete('/api/auth/account/', **headers)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
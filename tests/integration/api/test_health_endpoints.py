@@ -0,0 +1,66 @@
+"""
+Integration tests for the liveness and readiness endpoints.
+"""
+import pytest
+from unittest.mock import patch
+from django.test import TestCase, Client
+from rest_framework import status
+from src.core.health import ReadinessChecker
+
+
+@pytest.mark.integration
+class TestHealthEndpoints(TestCase):
+    """Integration tests for /api/health/live/ and /api/health/ready/."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.live_url = '/api/health/live/'
+        self.ready_url = '/api/health/ready/'
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_live(self):
+        """Test that liveness answers without touching dependencies."""
+        # Act
+        response = self.client.get(self.live_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'alive'})
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_ready(self):
+        """Test that readiness reports every dependency check."""
+        # Arrange
+        with patch('src.core.views.readiness', ReadinessChecker()):
+            # Act
+            response = self.client.get(self.ready_url)
+
+        # Assert
+        data = response.json()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(data['status'], 'ready')
+        self.assertEqual(set(data['checks']), {'database', 'migrations', 'cache'})
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_ready_unavailable(self):
+        """Test that a failing dependency returns 503."""
+        # Arrange
+        checker = ReadinessChecker({'database': lambda: (False, 'down')})
+
+        with patch('src.core.views.readiness', checker):
+            # Act
+            response = self.client.get(self.ready_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.json()['checks']['database'], {'ok': False, 'detail': 'down'})
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_ready_rejects_post(self):
+        """Test that probes only accept GET."""
+        # Act
+        response = self.client.post(self.ready_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,71 @@
+"""
+Integration tests for job API endpoints.
+"""
+import pytest
+from django.test import TestCase, Client
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.core.repositories.job_repository import JobRepository
+from tests.factories import UserFactory
+
+
+@pytest.mark.integration
+class TestJobEndpoints(TestCase):
+    """Integration tests for job endpoints."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        
+        refresh = RefreshToken.for_user(self.user)
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+        self.job_url = '/api/jobs/{}/'
+        self.repository = JobRepository()
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_get_job_endpoint_success(self):
+        """Test polling a queued and then finished job."""
+        # Arrange
+        job = self.repository.enqueue('index_tasks', user_id=self.user.id)
+        
+        # Act
+        queued = self.client.get(self.job_url.format(job.id), **self.auth_headers)
+        claimed = self.repository.claim('worker', 1, visibility_timeout=60)[0]
+        self.repository.complete(claimed, 'worker', {'rows': 3})
+        finished = self.client.get(self.job_url.format(job.id), **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(queued.status_code, status.HTTP_200_OK)
+        self.assertEqual(queued.json()['data']['status'], 'queued')
+        data = finished.json()['data']
+        self.assertEqual(data['id'], job.id)
+        self.assertEqual(data['name'], 'index_tasks')
+        self.assertEqual(data['status'], 'succeeded')
+        self.assertEqual(data['attempts'], 1)
+        self.assertIsNone(data['progress'])
+        self.assertEqual(data['result'], {'rows': 3})
+        self.assertIsNotNone(data['finished_at'])
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_get_job_endpoint_wrong_user(self):
+        """Test that users cannot see other users' or system jobs."""
+        # Arrange
+        foreign = self.repository.enqueue('index_tasks', user_id=self.other_user.id)
+        system = self.repository.enqueue('index_tasks')
+        
+        # Act
+        responses = [self.client.get(self.job_url.format(job.id), **self.auth_headers) for job in (foreign, system)]
+        
+        # Assert
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertFalse(response.json()['success'])
+    
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_get_job_endpoint_unauthorized(self):
+        """Test that polling requires authentication."""
+        response = self.client.get(self.job_url.format(1))
+        
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,222 @@
+"""
+Integration tests for label API endpoints and label search filters.
+"""
+import pytest
+import json
+from django.test import TestCase, Client
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.core.models import Label, OutboxEvent, Task, TaskArchive
+from src.core.repositories.label_repository import LabelRepository
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import UserFactory
+
+
+@pytest.mark.integration
+class TestLabelEndpoints(TestCase):
+    """Integration tests for label endpoints."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+
+        refresh = RefreshToken.for_user(self.user)
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+        self.labels_url = '/api/labels/'
+        self.label_url = '/api/labels/{}/'
+        self.task_labels_url = '/api/tasks/{}/labels/'
+        self.search_url = '/api/tasks/search/'
+        self.labels = LabelRepository()
+        self.tasks = TaskRepository()
+
+    def put_labels(self, task, label_ids):
+        return self.client.put(
+            self.task_labels_url.format(task.id),
+            data=json.dumps({'labels': label_ids}),
+            content_type='application/json',
+            **self.auth_headers
+        )
+
+    def post_label(self, name):
+        return self.client.post(
+            self.labels_url,
+            data=json.dumps({'name': name}),
+            content_type='application/json',
+            **self.auth_headers
+        )
+
+    def search(self, query):
+        response = self.client.get(f'{self.search_url}?{query}', **self.auth_headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        return response.json()['data']['tasks']
+
+    @pytest.mark.query_budget(max_queries=6, max_time_ms=50)
+    def test_create_and_list_labels(self):
+        """Test that labels take the lowest free slot and names are unique per user."""
+        # Arrange
+        self.labels.create(user_id=self.other_user.id, name='work')
+
+        # Act
+        work = self.post_label(' work ')
+        home = self.post_label('home')
+        duplicate = self.post_label('work')
+        blank = self.post_label(' ')
+        listed = self.client.get(self.labels_url, **self.auth_headers)
+
+        # Assert
+        self.assertEqual(work.status_code, status.HTTP_201_CREATED)
+        self.assertEqual((work.json()['data']['id'], work.json()['data']['name']), (0, 'work'))
+        self.assertEqual(home.json()['data']['id'], 1)
+        self.assertEqual(duplicate.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Label 'work' already exists", duplicate.json()['message'])
+        self.assertEqual(blank.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [(label['id'], label['name']) for label in listed.json()['data']['labels']],
+            [(0, 'work'), (1, 'home')]
+        )
+
+    @pytest.mark.query_budget(max_queries=5, max_time_ms=50)
+    def test_create_label_limit(self):
+        """Test that a user cannot have more labels than Task.label_mask has bits."""
+        # Arrange
+        Label.objects.bulk_create([
+            Label(user=self.user, slot=slot, name=f'label-{slot}') for slot in range(Label.MAX_PER_USER)
+        ])
+
+        # Act
+        response = self.post_label('one more')
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f'at most {Label.MAX_PER_USER} labels', response.json()['message'])
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_set_task_labels(self):
+        """Test replacing a task's labels with the user's own labels only."""
+        # Arrange
+        work = self.labels.create(user_id=self.user.id, name='work')
+        urgent = self.labels.create(user_id=self.user.id, name='urgent')
+        self.labels.create(user_id=self.other_user.id, name='theirs')
+        self.labels.create(user_id=self.other_user.id, name='theirs too')
+        task = self.tasks.create(user_id=self.user.id, detail='Labeled')
+        other_task = self.tasks.create(user_id=self.other_user.id, detail='Not mine')
+
+        # Act
+        response = self.put_labels(task, [urgent.slot, work.slot])
+        unknown = self.put_labels(task, [work.slot, 5])
+        invalid = self.put_labels(task, 'work')
+        not_mine = self.put_labels(other_task, [work.slot])
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['labels'], [{'id': 0, 'name': 'work'}, {'id': 1, 'name': 'urgent'}])
+        self.assertEqual(Task.objects.get(id=task.id).label_mask, 0b11)
+        self.assertTrue(OutboxEvent.objects.filter(
+            task_id=task.id, event_type=OutboxEvent.TASK_UPDATED, payload={'fields': ['label_mask']}
+        ).exists())
+        self.assertEqual(unknown.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Unknown label ids: 5', unknown.json()['message'])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(not_mine.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Task.objects.get(id=other_task.id).label_mask, 0)
+
+    @pytest.mark.query_budget(max_queries=3, max_time_ms=50)
+    def test_search_tasks_by_labels(self):
+        """Test that label filters match all or any of the labels, with each task's labels named."""
+        # Arrange
+        work = self.labels.create(user_id=self.user.id, name='work')
+        home = self.labels.create(user_id=self.user.id, name='home')
+        urgent = self.labels.create(user_id=self.user.id, name='urgent')
+        both = self.tasks.create(user_id=self.user.id, detail='Both', label_mask=work.bit | urgent.bit)
+        work_only = self.tasks.create(user_id=self.user.id, detail='Work', label_mask=work.bit)
+        home_only = self.tasks.create(user_id=self.user.id, detail='Home', label_mask=home.bit)
+        self.tasks.create(user_id=self.user.id, detail='None')
+        self.tasks.create(user_id=self.other_user.id, detail='Theirs', label_mask=work.bit | urgent.bit)
+
+        # Act
+        all_of = self.search(f'labels={work.slot},{urgent.slot}')
+        any_of = self.search(f'labels={urgent.slot},{home.slot}&labels_match=any')
+        with_detail = self.search(f'labels={work.slot}&detail=work')
+
+        # Assert
+        self.assertEqual([task['id'] for task in all_of], [both.id])
+        self.assertEqual(all_of[0]['labels'], [{'id': 0, 'name': 'work'}, {'id': 2, 'name': 'urgent'}])
+        self.assertEqual({task['id'] for task in any_of}, {both.id, home_only.id})
+        self.assertEqual([task['id'] for task in with_detail], [work_only.id])
+
+    @pytest.mark.query_budget(max_queries=3, max_time_ms=50)
+    def test_search_prefetches_labels_once(self):
+        """Test that a page of labeled tasks reads the labels with a single query."""
+        # Arrange
+        labels = [self.labels.create(user_id=self.user.id, name=f'label-{n}') for n in range(5)]
+        for n in range(20):
+            self.tasks.create(user_id=self.user.id, detail=f'Task {n}', label_mask=labels[n % 5].bit)
+
+        # Act
+        tasks = self.search('detail=task')
+
+        # Assert
+        self.assertEqual(len(tasks), 20)
+        self.assertEqual(tasks[0]['labels'], [{'id': 4, 'name': 'label-4'}])
+
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_search_tasks_label_validation(self):
+        """Test rejecting malformed label filters."""
+        # Act
+        malformed = self.client.get(f'{self.search_url}?labels=work', **self.auth_headers)
+        bad_match = self.client.get(f'{self.search_url}?labels=1&labels_match=some', **self.auth_headers)
+
+        # Assert
+        self.assertEqual(malformed.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('comma-separated list of label ids', malformed.json()['message'])
+        self.assertEqual(bad_match.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_search_tasks_unknown_label(self):
+        """Test that filtering by a label the user does not have is rejected."""
+        # Arrange
+        theirs = self.labels.create(user_id=self.other_user.id, name='theirs')
+
+        # Act
+        response = self.client.get(f'{self.search_url}?labels={theirs.slot}', **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Unknown label ids: 0', response.json()['message'])
+
+    @pytest.mark.query_budget(max_queries=9, max_time_ms=50)
+    def test_delete_label_clears_task_bits(self):
+        """Test that deleting a label removes it from active and archived tasks and frees its slot."""
+        # Arrange
+        work = self.labels.create(user_id=self.user.id, name='work')
+        home = self.labels.create(user_id=self.user.id, name='home')
+        labeled = self.tasks.create(user_id=self.user.id, detail='Labeled', label_mask=work.bit | home.bit)
+        unlabeled = self.tasks.create(user_id=self.user.id, detail='Home', label_mask=home.bit)
+        archived = TaskArchive.objects.create(id=unlabeled.id + 1, user=self.user, detail='Archived',
+                                              status='completed', created_at=unlabeled.created_at,
+                                              updated_at=unlabeled.updated_at, label_mask=work.bit)
+        other_label = self.labels.create(user_id=self.other_user.id, name='work')
+        other_task = self.tasks.create(user_id=self.other_user.id, detail='Theirs', label_mask=other_label.bit)
+
+        # Act
+        response = self.client.delete(self.label_url.format(work.slot), **self.auth_headers)
+        again = self.client.delete(self.label_url.format(work.slot), **self.auth_headers)
+        out_of_range = self.client.delete(self.label_url.format(99), **self.auth_headers)
+        replacement = self.post_label('sprint-42')
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.get(id=labeled.id).label_mask, home.bit)
+        self.assertEqual(Task.objects.get(id=unlabeled.id).label_mask, home.bit)
+        self.assertEqual(TaskArchive.objects.get(id=archived.id).label_mask, 0)
+        self.assertEqual(Task.objects.get(id=other_task.id).label_mask, other_label.bit)
+        self.assertEqual(
+            list(OutboxEvent.objects.filter(payload={'fields': ['label_mask']}).values_list('task_id', flat=True)),
+            [labeled.id]
+        )
+        self.assertEqual(again.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(out_of_range.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(replacement.json()['data']['id'], work.slot)
+        self.assertEqual(self.search(f'labels={work.slot}'), [])
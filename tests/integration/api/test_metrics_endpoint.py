@@ -0,0 +1,90 @@
+"""
+Integration tests for the metrics endpoint.
+"""
+import pytest
+import json
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.core import metrics
+from tests.factories import UserFactory, TaskFactory
+
+
+@pytest.mark.integration
+class TestMetricsEndpoint(TestCase):
+    """Integration tests for /api/metrics."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        metrics.reset()
+        self.client = Client()
+        self.user = UserFactory()
+        refresh = RefreshToken.for_user(self.user)
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+        self.metrics_url = '/api/metrics'
+
+    def tearDown(self):
+        metrics.reset()
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_metrics_records_requests(self):
+        """Test that served requests show up in the exposition."""
+        # Arrange
+        TaskFactory(user=self.user)
+        self.client.get('/api/tasks/search/', **self.auth_headers)
+
+        # Act
+        response = self.client.get(self.metrics_url)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('todo_http_requests_total{route="core:search_tasks",method="GET",status="200"} 1.0', body)
+        self.assertIn('todo_http_request_duration_seconds_count{route="core:search_tasks",method="GET"} 1', body)
+        self.assertIn('todo_db_queries_total{route="core:search_tasks"}', body)
+        self.assertIn('todo_service_call_duration_seconds_count{method="TaskService.search_tasks"} 1', body)
+
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_metrics_records_auth_failures(self):
+        """Test that rejected logins and unauthenticated calls are counted."""
+        # Arrange
+        self.client.post(
+            '/api/auth/login/',
+            data=json.dumps({'email': 'nobody@example.com', 'password': 'wrongpass123'}),
+            content_type='application/json'
+        )
+        self.client.get('/api/tasks/search/')
+
+        # Act
+        body = self.client.get(self.metrics_url).content.decode()
+
+        # Assert
+        self.assertIn('todo_auth_failures_total{route="authentication:login"} 1.0', body)
+        self.assertIn('todo_auth_failures_total{route="core:search_tasks"} 1.0', body)
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_metrics_rejects_post(self):
+        """Test that only GET is allowed."""
+        response = self.client.post(self.metrics_url)
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    @override_settings(METRICS_TOKEN='scrape-secret', METRICS_ALLOWED_IPS=['10.0.0.9'])
+    def test_metrics_requires_token_or_allowed_ip(self):
+        """Test that only allowed addresses or the metrics token can scrape."""
+        # Act
+        outside = self.client.get(self.metrics_url, REMOTE_ADDR='203.0.113.7')
+        wrong_token = self.client.get(self.metrics_url, REMOTE_ADDR='203.0.113.7',
+                                      HTTP_AUTHORIZATION='Bearer guess')
+        user_token = self.client.get(self.metrics_url, REMOTE_ADDR='203.0.113.7', **self.auth_headers)
+        with_token = self.client.get(self.metrics_url, REMOTE_ADDR='203.0.113.7',
+                                     HTTP_AUTHORIZATION='Bearer scrape-secret')
+        allowed_ip = self.client.get(self.metrics_url, REMOTE_ADDR='10.0.0.9')
+
+        # Assert
+        self.assertEqual(outside.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(wrong_token.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(user_token.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(with_token.status_code, status.HTTP_200_OK)
+        self.assertEqual(allowed_ip.status_code, status.HTTP_200_OK)
@@ -0,0 +1,68 @@
+"""
+Integration tests for the Server-Timing profiling middleware.
+"""
+import pytest
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from tests.factories import UserFactory, TaskFactory
+
+
+@pytest.mark.integration
+class TestServerTimingMiddleware(TestCase):
+    """Integration tests for ServerTimingMiddleware."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.user = UserFactory()
+        refresh = RefreshToken.for_user(self.user)
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+        self.search_url = '/api/tasks/search/'
+
+    @override_settings(PROFILING_ENABLED=True)
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_server_timing_header_when_enabled(self):
+        """Test that profiled requests report every phase."""
+        # Arrange
+        TaskFactory(user=self.user)
+        client = Client()
+
+        # Act
+        response = client.get(self.search_url, **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header = response['Server-Timing']
+        self.assertIn('db;desc=', header)
+        self.assertIn('svc-TaskService.search_tasks', header)
+        self.assertIn('render;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    @override_settings(PROFILING_ENABLED=True, PROFILING_LOG=True)
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_server_timing_log_line(self):
+        """Test that a log line is emitted per request when enabled."""
+        # Arrange
+        client = Client()
+
+        # Act
+        with self.assertLogs('src.core.profiling', level='INFO') as logs:
+            client.get(self.search_url, **self.auth_headers)
+
+        # Assert
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn('GET /api/tasks/search/ 200', logs.output[0])
+
+    @override_settings(PROFILING_ENABLED=False)
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_no_header_when_disabled(self):
+        """Test that the middleware is dropped when profiling is off."""
+        # Arrange
+        client = Client()
+
+        # Act
+        response = client.get(self.search_url, **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('Server-Timing'))
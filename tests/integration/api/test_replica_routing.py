@@ -0,0 +1,198 @@
+"""
+Integration tests for read-replica routing.
+
+Uses two SQLite databases: `default` as the primary and `replica`. Rows
+are copied to the replica explicitly, so anything written afterwards is
+only on the primary, like a replica that has not caught up yet.
+"""
+import pytest
+import json
+from unittest.mock import patch
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TransactionTestCase, Client, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.authentication.models import User
+from src.core.models import Label, OutboxEvent, Task
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import UserFactory, TaskFactory
+
+
+@pytest.mark.integration
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TestReplicaRouting(TransactionTestCase):
+    """Integration tests for ReplicaRouter and DatabaseRoutingMiddleware."""
+
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        """Set up test fixtures."""
+        replica = patch.dict(settings.DATABASES['replica'], {'REPLICA': True})
+        replica.start()
+        self.addCleanup(replica.stop)
+        # Router instances read the replica list when created.
+        self.enterContext(override_settings(DATABASE_ROUTERS=['src.core.routers.ReplicaRouter']))
+        cache.clear()
+        self.client = Client()
+        self.user = UserFactory()
+        self.auth_headers = self.headers_for(self.user)
+        self.search_url = '/api/tasks/search/'
+
+    def headers_for(self, user):
+        return {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+
+    def replicate(self):
+        """Copy users and tasks from the primary to the replica."""
+        for model in (Task, User):
+            model.objects.using('replica').all().delete()
+        for model in (User, Task):
+            model.objects.using('replica').bulk_create(model.objects.using('default').all())
+        self.expire_pins()
+
+    def expire_pins(self):
+        """Drop read-your-writes pins, as if the pin window had passed."""
+        cache.clear()
+
+    def unreplicated_task(self, user):
+        """A task the replica has not received yet."""
+        task = TaskFactory(user=user)
+        self.expire_pins()
+        return task
+
+    def search_total(self, headers):
+        response = self.client.get(self.search_url, **headers)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()['data']['total']
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_authenticated_reads_use_replica(self):
+        """Test that searches are served by the replica."""
+        # Arrange
+        TaskFactory(user=self.user)
+        self.replicate()
+        self.unreplicated_task(self.user)
+
+        # Act
+        total = self.search_total(self.auth_headers)
+
+        # Assert
+        self.assertEqual(total, 1)
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_reads_after_write_use_primary(self):
+        """Test that a user sees their own write on the next request."""
+        # Arrange
+        TaskFactory(user=self.user)
+        self.replicate()
+
+        # Act
+        response = self.client.post(
+            '/api/tasks/', data=json.dumps({'detail': 'Fresh task'}),
+            content_type='application/json', **self.auth_headers
+        )
+        total = self.search_total(self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(total, 2)
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_pin_is_per_user(self):
+        """Test that one user's write does not move other users off the replica."""
+        # Arrange
+        other = UserFactory()
+        TaskFactory(user=other)
+        self.replicate()
+        self.unreplicated_task(other)
+
+        # Act
+        self.client.post(
+            '/api/tasks/', data=json.dumps({'detail': 'Fresh task'}),
+            content_type='application/json', **self.auth_headers
+        )
+        total = self.search_total(self.headers_for(other))
+
+        # Assert
+        self.assertEqual(total, 1)
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_pin_expires(self):
+        """Test that reads return to the replica once the pin is gone."""
+        # Arrange
+        self.replicate()
+        self.client.post(
+            '/api/tasks/', data=json.dumps({'detail': 'Fresh task'}),
+            content_type='application/json', **self.auth_headers
+        )
+
+        # Act
+        self.expire_pins()
+        total = self.search_total(self.auth_headers)
+
+        # Assert
+        self.assertEqual(total, 0)
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_login_after_register_uses_primary(self):
+        """Test that a user can log in before the replica has their row."""
+        # Arrange
+        self.replicate()
+        self.client.post('/api/auth/register/', data=json.dumps({
+            'email': 'new@example.com', 'password': 'newpass123',
+            'first_name': 'New', 'last_name': 'User',
+        }), content_type='application/json')
+
+        # Act
+        response = self.client.post('/api/auth/login/', data=json.dumps({
+            'email': 'new@example.com', 'password': 'newpass123',
+        }), content_type='application/json')
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
+    def test_reads_outside_requests_use_primary(self):
+        """Test that services called from commands read from the primary."""
+        # Arrange
+        self.replicate()
+        TaskFactory(user=self.user)
+
+        # Act
+        tasks = TaskRepository().get_by_user(self.user.id)
+
+        # Assert
+        self.assertEqual(len(tasks), 1)
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_task_writes_after_replica_reads_go_to_primary(self):
+        """Test that due date and label changes write the primary row, not the stale replica copy."""
+        # Arrange
+        self.enterContext(override_settings(DATABASE_ROUTERS=[
+            'src.core.routers.TaskShardRouter', 'src.core.routers.ReplicaRouter'
+        ]))
+        task = TaskFactory(user=self.user)
+        Label.objects.create(user=self.user, slot=0, name='work')
+        self.replicate()
+        Label.objects.using('replica').bulk_create(Label.objects.using('default').all())
+        # A write the replica has not received yet.
+        Task.objects.filter(id=task.id).update(status='completed')
+
+        # Act
+        due = self.client.put(
+            f'/api/tasks/{task.id}/due/', data=json.dumps({'due_at': '2030-01-01T09:00:00Z'}),
+            content_type='application/json', **self.auth_headers
+        )
+        self.expire_pins()
+        labels = self.client.put(
+            f'/api/tasks/{task.id}/labels/', data=json.dumps({'labels': [0]}),
+            content_type='application/json', **self.auth_headers
+        )
+
+        # Assert
+        self.assertEqual(due.status_code, status.HTTP_200_OK)
+        self.assertEqual(labels.status_code, status.HTTP_200_OK)
+        stored = Task.objects.using('default').get(id=task.id)
+        self.assertEqual((stored.status, stored.due_at.year, stored.label_mask), ('completed', 2030, 1))
+        self.assertEqual(OutboxEvent.objects.using('default').filter(task_id=task.id).count(), 2)
+        self.assertEqual(OutboxEvent.objects.using('replica').count(), 0)
@@ -0,0 +1,285 @@
+"""
+Integration tests for subtasks: creating, reading and cascading over task trees.
+"""
+import pytest
+import json
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.core import task_paths
+from src.core.models import OutboxEvent, Task, TaskArchive, TaskDailyStat
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import UserFactory
+from tests.query_budget import QueryBudget
+
+
+@pytest.mark.integration
+class TestSubtaskEndpoints(TestCase):
+    """Integration tests for subtask endpoints."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.client = Client()
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+
+        refresh = RefreshToken.for_user(self.user)
+        self.auth_headers = {'HTTP_AUTHORIZATION': f'Bearer {refresh.access_token}'}
+        self.create_url = '/api/tasks/'
+        self.subtasks_url = '/api/tasks/{}/subtasks/'
+        self.status_url = '/api/tasks/{}/status/'
+        self.tasks = TaskRepository()
+
+    def tree(self):
+        """A checklist: root > (a > (a1, a2 > a21), b), plus a separate task."""
+        root = self.tasks.create(user_id=self.user.id, detail='Release')
+        a = self.tasks.create_subtask(root.id, self.user.id, detail='Build')
+        b = self.tasks.create_subtask(root.id, self.user.id, detail='Announce')
+        a1 = self.tasks.create_subtask(a.id, self.user.id, detail='Compile', status='completed')
+        a2 = self.tasks.create_subtask(a.id, self.user.id, detail='Package')
+        a21 = self.tasks.create_subtask(a2.id, self.user.id, detail='Sign', status='cancelled')
+        other = self.tasks.create(user_id=self.user.id, detail='Unrelated')
+        return root, a, b, a1, a2, a21, other
+
+    def post_task(self, data):
+        return self.client.post(self.create_url, data=json.dumps(data), content_type='application/json',
+                                **self.auth_headers)
+
+    def put_status(self, task, data):
+        return self.client.put(self.status_url.format(task.id), data=json.dumps(data),
+                               content_type='application/json', **self.auth_headers)
+
+    @pytest.mark.query_budget(max_queries=10, max_time_ms=50)
+    def test_create_subtask(self):
+        """Test creating subtasks under the user's own tasks only, up to MAX_DEPTH levels."""
+        # Arrange
+        parent = self.tasks.create(user_id=self.user.id, detail='Parent')
+        theirs = self.tasks.create(user_id=self.other_user.id, detail='Theirs')
+        deepest = parent
+        for level in range(task_paths.MAX_DEPTH):
+            deepest = self.tasks.create_subtask(deepest.id, self.user.id, detail=f'Level {level + 1}')
+
+        # Act
+        response = self.post_task({'detail': 'Child', 'parent': parent.id})
+        not_mine = self.post_task({'detail': 'Child', 'parent': theirs.id})
+        too_deep = self.post_task({'detail': 'Child', 'parent': deepest.id})
+        invalid = self.post_task({'detail': 'Child', 'parent': 'first'})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.json()['data']['parent_id'], parent.id)
+        self.assertEqual(Task.objects.get(id=response.json()['data']['id']).path, f'{parent.id}/')
+        self.assertEqual(not_mine.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Parent task not found', not_mine.json()['message'])
+        self.assertEqual(too_deep.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f'at most {task_paths.MAX_DEPTH} levels', too_deep.json()['message'])
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Task.objects.filter(path__endswith=f'{theirs.id}/').exists())
+
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
+    def test_get_subtasks(self):
+        """Test reading a subtree with its ancestors and per-subtree rollups in constant queries."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+
+        # Act
+        response = self.client.get(self.subtasks_url.format(a.id), **self.auth_headers)
+        leaf = self.client.get(self.subtasks_url.format(a21.id), **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual(data['task']['id'], a.id)
+        self.assertEqual(data['task']['rollup'], {'total': 3, 'pending': 1, 'completed': 1, 'cancelled': 1})
+        self.assertEqual([ancestor['id'] for ancestor in data['ancestors']], [root.id])
+        self.assertEqual(
+            [(task['id'], task['parent_id'], task['depth']) for task in data['subtasks']],
+            [(a1.id, a.id, 2), (a2.id, a.id, 2), (a21.id, a2.id, 3)]
+        )
+        self.assertEqual(data['subtasks'][1]['rollup']['total'], 1)
+        self.assertEqual(leaf.json()['data']['subtasks'], [])
+        self.assertEqual([ancestor['id'] for ancestor in leaf.json()['data']['ancestors']], [root.id, a.id, a2.id])
+
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_get_subtasks_wrong_user(self):
+        """Test that users cannot read other users' subtrees."""
+        # Arrange
+        theirs = self.tasks.create(user_id=self.other_user.id, detail='Theirs')
+
+        # Act
+        response = self.client.get(self.subtasks_url.format(theirs.id), **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @pytest.mark.query_budget(max_queries=11, max_time_ms=50)
+    def test_cascade_status(self):
+        """Test that a cascading status change writes the whole subtree with one UPDATE."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+
+        # Act
+        with CaptureQueriesContext(connection) as queries:
+            response = self.put_status(a, {'status': 'completed', 'cascade': True})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['updated_tasks'], 3)
+        self.assertEqual(
+            dict(Task.objects.filter(user=self.user).values_list('id', 'status')),
+            {root.id: 'pending', a.id: 'completed', b.id: 'pending', a1.id: 'completed',
+             a2.id: 'completed', a21.id: 'completed', other.id: 'pending'}
+        )
+        task_updates = [query['sql'] for query in queries.captured_queries
+                        if query['sql'].startswith('UPDATE "tasks"')]
+        self.assertEqual(len(task_updates), 1)
+        self.assertEqual(
+            sorted((task_id, payload['status'], payload['previous']) for task_id, payload in
+                   OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_STATUS_CHANGED)
+                   .values_list('task_id', 'payload')),
+            [(a.id, 'completed', 'pending'), (a2.id, 'completed', 'pending'), (a21.id, 'completed', 'cancelled')]
+        )
+        self.assertEqual(
+            {status_: sum(TaskDailyStat.objects.filter(user=self.user, status=status_)
+                          .values_list('count', flat=True))
+             for status_ in ('completed', 'cancelled')},
+            {'completed': 4, 'cancelled': 0}
+        )
+
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_status_without_cascade_leaves_subtasks(self):
+        """Test that a plain status change only writes the task itself."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+
+        # Act
+        response = self.put_status(a, {'status': 'completed'})
+        invalid = self.put_status(a, {'status': 'completed', 'cascade': 'sometimes'})
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('updated_tasks', response.json()['data'])
+        self.assertEqual(Task.objects.get(id=a2.id).status, 'pending')
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @pytest.mark.query_budget(max_queries=10, max_time_ms=50)
+    def test_delete_removes_subtree(self):
+        """Test that deleting a task deletes its subtasks at every depth and nothing else."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+
+        # Act
+        response = self.client.delete(f'/api/tasks/{a.id}/', **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(Task.objects.filter(user=self.user).values_list('id', flat=True)),
+                         {root.id, b.id, other.id})
+        self.assertEqual(
+            set(OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_DELETED).values_list('task_id', flat=True)),
+            {a.id, a1.id, a2.id, a21.id}
+        )
+
+    def test_delete_removes_archived_subtasks(self):
+        """Test that deleting a task also deletes its archived subtasks, with their counts."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+        Task.objects.filter(id=a1.id).update(updated_at=a1.updated_at.replace(year=2000))
+        TaskArchiveRepository().archive_batch('default', a1.updated_at.replace(year=2001), 10)
+        unrelated = self.tasks.create(user_id=self.user.id, detail='Old', status='completed')
+        Task.objects.filter(id=unrelated.id).update(updated_at=a1.updated_at.replace(year=2000))
+        TaskArchiveRepository().archive_batch('default', a1.updated_at.replace(year=2001), 10)
+
+        # Act
+        response = self.client.delete(f'/api/tasks/{root.id}/', **self.auth_headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(list(TaskArchive.objects.values_list('id', flat=True)), [unrelated.id])
+        self.assertIn(a1.id, OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_DELETED)
+                      .values_list('task_id', flat=True))
+        self.assertEqual(
+            {status_: sum(TaskDailyStat.objects.filter(user=self.user, status=status_)
+                          .values_list('count', flat=True))
+             for status_ in (TaskDailyStat.CREATED, 'completed', 'cancelled')},
+            {TaskDailyStat.CREATED: 2, 'completed': 1, 'cancelled': 0}
+        )
+
+    def test_delete_subtree_in_batches(self):
+        """Test that a subtree larger than a batch is deleted whole, a batch at a time."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+
+        # Act
+        with patch('src.core.repositories.task_repository.SUBTREE_BATCH_SIZE', 2), \
+                CaptureQueriesContext(connection) as queries:
+            deleted = self.tasks.delete_many_by_user([root.id], self.user.id)
+
+        # Assert
+        self.assertEqual(deleted, 6)
+        self.assertEqual(list(Task.objects.filter(user=self.user).values_list('id', flat=True)), [other.id])
+        self.assertEqual(len([query for query in queries.captured_queries
+                              if query['sql'].startswith('DELETE FROM "tasks" ')]), 3)
+
+    def test_archive_and_restore_keep_path(self):
+        """Test that an archived subtask returns under its parent when restored."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+        archive = TaskArchiveRepository()
+        Task.objects.filter(id=a1.id).update(updated_at=a1.updated_at.replace(year=2000))
+
+        # Act
+        with QueryBudget(max_queries=7, max_time_ms=50, label='archive_batch'):
+            archive.archive_batch('default', a1.updated_at.replace(year=2001), 10)
+        archived_path = TaskArchive.objects.get(id=a1.id).path
+        with QueryBudget(max_queries=9, max_time_ms=50, label='restore'):
+            archive.restore(a1.id, self.user.id)
+
+        # Assert
+        self.assertEqual(archived_path, f'{root.id}/{a.id}/')
+        self.assertEqual(Task.objects.get(id=a1.id).parent_id, a.id)
+
+    def test_restore_keeps_rank(self):
+        """Test that a restored task comes back to its place in the manual order."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+        self.tasks.move(a1.id, self.user.id, None)
+        self.tasks.move(other.id, self.user.id, a1.id)
+        archive = TaskArchiveRepository()
+        Task.objects.filter(id=a1.id).update(updated_at=a1.updated_at.replace(year=2000))
+        archive.archive_batch('default', a1.updated_at.replace(year=2001), 10)
+
+        # Act
+        archive.restore(a1.id, self.user.id)
+
+        # Assert
+        ordered = [task.id for task in self.tasks.search(self.user.id, order='rank')]
+        self.assertEqual(ordered[:2], [a1.id, other.id])
+
+    def test_restore_rejects_archived_parent(self):
+        """Test that a subtask cannot be restored while its parent is archived."""
+        # Arrange
+        root, a, b, a1, a2, a21, other = self.tree()
+        Task.objects.filter(id=a2.id).update(status='completed')
+        Task.objects.filter(id__in=[a2.id, a21.id]).update(updated_at=a2.updated_at.replace(year=2000))
+        archive = TaskArchiveRepository()
+        archive.archive_batch('default', a2.updated_at.replace(year=2001), 10)
+        archive.archive_batch('default', a2.updated_at.replace(year=2001), 10)
+        self.assertEqual(set(TaskArchive.objects.values_list('id', flat=True)), {a2.id, a21.id})
+
+        # Act
+        rejected = self.client.post(f'/api/tasks/{a21.id}/restore/', **self.auth_headers)
+        parent = self.client.post(f'/api/tasks/{a2.id}/restore/', **self.auth_headers)
+        child = self.client.post(f'/api/tasks/{a21.id}/restore/', **self.auth_headers)
+
+        # Assert
+        self.assertEqual(rejected.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(str(a2.id), rejected.json()['message'])
+        self.assertEqual(parent.status_code, status.HTTP_200_OK)
+        self.assertEqual(child.status_code, status.HTTP_200_OK)
+        self.assertEqual(Task.objects.get(id=a21.id).parent_id, a2.id)
+        self.assertFalse(TaskArchive.objects.exists())
@@ -2,12 +2,24 @@
 Integration tests for task API endpoints.
 """
 import pytest
+import csv
+import gzip
+import io
 import json
-from django.test import TestCase, Client
+import os
+import tempfile
+from datetime import date, datetime, timezone as dt_timezone
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, Client, override_settings
+from django.utils import timezone
 from django.contrib.auth import get_user_model
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
-from src.core.models import Task
+from src.core import jobs
+from src.core.models import Job, OutboxEvent, Task, TaskArchive, TaskDailyStat, TaskToken
+from src.core.repositories.job_repository import JobRepository
+from src.core.repositories.task_repository import TaskRepository
 from tests.factories import UserFactory, TaskFactory
 
 User = get_user_model()
@@ -31,7 +43,15 @@ class TestTaskEndpoints(TestCase):
         self.create_url = '/api/tasks/'
         self.update_status_url = '/api/tasks/{}/status/'
         self.search_url = '/api/tasks/search/'
+        self.restore_url = '/api/tasks/{}/restore/'
+        self.suggest_url = '/api/tasks/suggest/'
+        self.export_url = '/api/tasks/export/'
+        self.import_url = '/api/tasks/import/'
+        self.stats_url = '/api/tasks/stats/'
+        self.due_url = '/api/tasks/{}/due/'
+        self.move_url = '/api/tasks/{}/move/'
     
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
     def test_create_task_endpoint_success(self):
         """Test successful task creation via API."""
         # Arrange
@@ -58,6 +78,7 @@ class TestTaskEndpoints(TestCase):
         self.assertEqual(task.detail, 'API test task')
         self.assertEqual(task.user, self.user)
     
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
     def test_create_task_endpoint_unauthorized(self):
         """Test task creation without authentication."""
         # Arrange
@@ -73,6 +94,7 @@ class TestTaskEndpoints(TestCase):
         # Assert
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_create_task_endpoint_missing_detail(self):
         """Test task creation with missing detail field."""
         # Arrange
@@ -92,6 +114,7 @@ class TestTaskEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Missing required fields', data['message'])
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_create_task_endpoint_empty_detail(self):
         """Test task creation with empty detail."""
         # Arrange
@@ -111,6 +134,7 @@ class TestTaskEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Task detail cannot be empty', data['message'])
     
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
     def test_update_task_status_endpoint_success(self):
         """Test successful task status update via API."""
         # Arrange
@@ -136,6 +160,7 @@ class TestTaskEndpoints(TestCase):
         task.refresh_from_db()
         self.assertEqual(task.status, 'completed')
     
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
     def test_update_task_status_endpoint_unauthorized(self):
         """Test task status update without authentication."""
         # Arrange
@@ -152,6 +177,7 @@ class TestTaskEndpoints(TestCase):
         # Assert
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
     def test_update_task_status_endpoint_not_found(self):
         """Test task status update with non-existent task."""
         # Arrange
@@ -172,6 +198,7 @@ class TestTaskEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Task not found or you don\'t have permission to modify it', data['message'])
     
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
     def test_update_task_status_endpoint_wrong_user(self):
         """Test task status update with task belonging to different user."""
         # Arrange
@@ -192,6 +219,7 @@ class TestTaskEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Task not found or you don\'t have permission to modify it', data['message'])
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_update_task_status_endpoint_invalid_status(self):
         """Test task status update with invalid status."""
         # Arrange
@@ -212,6 +240,7 @@ class TestTaskEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Invalid status', data['message'])
     
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
     def test_update_task_status_endpoint_missing_status(self):
         """Test task status update with missing status field."""
         # Arrange
@@ -232,6 +261,7 @@ class TestTaskEndpoints(TestCase):
         self.assertFalse(data['success'])
         self.assertIn('Status field is required', data['message'])
     
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
     def test_search_tasks_endpoint_all(self):
         """Test searching all tasks via API."""
         # Arrange
@@ -256,6 +286,7 @@ class TestTaskEndpoints(TestCase):
         self.assertIn('Second task', task_details)
         self.assertNotIn('Other user task', task_details)
     
+    @pytest.mark.query_budget(max_queries=0, max_time_ms=50)
     def test_search_tasks_endpoint_unauthorized(self):
         """Test task search without authentication."""
         # Act
@@ -264,6 +295,7 @@ class TestTaskEndpoints(TestCase):
         # Assert
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
     
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
     def test_search_tasks_endpoint_by_detail(self):
         """Test searching tasks by detail via API."""
         # Arrange
@@ -293,6 +325,7 @@ class TestTaskEndpoints(TestCase):
         self.assertEqual(data['data']['total'], 1)
         self.assertEqual(data['data']['tasks'][0]['detail'], 'Documentation task')
     
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
     def test_search_tasks_endpoint_by_date(self):
         """Test searching tasks by created date via API."""
         # Arrange
@@ -312,6 +345,7 @@ class TestTaskEndpoints(TestCase):
         data = response.json()
         self.assertGreaterEqual(data['data']['total'], 1)
     
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
     def test_search_tasks_endpoint_by_detail_and_date(self):
         """Test searching tasks by both detail and date via API."""
         # Arrange
@@ -332,6 +366,7 @@ class TestTaskEndpoints(TestCase):
         self.assertEqual(data['data']['total'], 1)
         self.assertEqual(data['data']['tasks'][0]['detail'], 'Documentation task')
     
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
     def test_task_status_choices_api(self):
         """Test that only valid status values are accepted via API."""
         # Arrange
@@ -357,3 +392,647 @@ class TestTaskEndpoints(TestCase):
             **self.auth_headers
         )
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def archive(self, task):
+        """Move a task to the archive the way archive_tasks does."""
+        TaskArchive.objects.create(
+            id=task.id, detail=task.detail, status=task.status, user=task.user,
+            created_at=task.created_at, updated_at=task.updated_at
+        )
+        Task.objects.filter(id=task.id).delete()
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_search_tasks_endpoint_excludes_archived(self):
+        """Test that archived tasks are left out of searches by default."""
+        # Arrange
+        TaskFactory(user=self.user, detail='Active task')
+        self.archive(TaskFactory(user=self.user, detail='Old task', status='completed'))
+        
+        # Act
+        response = self.client.get(self.search_url, **self.auth_headers)
+        
+        # Assert
+        data = response.json()
+        self.assertEqual(data['data']['total'], 1)
+        self.assertEqual(data['data']['tasks'][0]['detail'], 'Active task')
+        self.assertFalse(data['data']['tasks'][0]['archived'])
+    
+    @pytest.mark.query_budget(max_queries=3, max_time_ms=50)
+    def test_search_tasks_endpoint_include_archived(self):
+        """Test searching archived tasks with include_archived=true."""
+        # Arrange
+        TaskFactory(user=self.user, detail='Active task')
+        self.archive(TaskFactory(user=self.user, detail='Old task', status='completed'))
+        self.archive(TaskFactory(user=self.other_user, detail='Other old task', status='completed'))
+        
+        # Act
+        response = self.client.get(
+            f'{self.search_url}?include_archived=true&detail=old',
+            **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['data']['total'], 1)
+        self.assertEqual(data['data']['tasks'][0]['detail'], 'Old task')
+        self.assertTrue(data['data']['tasks'][0]['archived'])
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_search_tasks_endpoint_invalid_include_archived(self):
+        """Test that include_archived must be a boolean."""
+        # Act
+        response = self.client.get(f'{self.search_url}?include_archived=maybe', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_search_tasks_endpoint_due_range(self):
+        """Test that due_after/due_before return the tasks due in the range, soonest first."""
+        # Arrange
+        TaskFactory(user=self.user, detail='Later', due_at=datetime(2025, 3, 7, 9, tzinfo=dt_timezone.utc))
+        TaskFactory(user=self.user, detail='Sooner', due_at=datetime(2025, 3, 5, 9, tzinfo=dt_timezone.utc))
+        TaskFactory(user=self.user, detail='Next month', due_at=datetime(2025, 4, 1, tzinfo=dt_timezone.utc))
+        TaskFactory(user=self.user, detail='No due date')
+        TaskFactory(user=self.other_user, detail='Other', due_at=datetime(2025, 3, 5, tzinfo=dt_timezone.utc))
+        
+        # Act
+        response = self.client.get(
+            self.search_url, {'due_after': '2025-03-01T00:00:00Z', 'due_before': '2025-03-08'},
+            **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        tasks = response.json()['data']['tasks']
+        self.assertEqual([task['detail'] for task in tasks], ['Sooner', 'Later'])
+        self.assertEqual(tasks[0]['due_at'], '2025-03-05T09:00:00Z')
+    
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_task_due_endpoint(self):
+        """Test creating a task with a due date, moving it and clearing it."""
+        # Arrange
+        created = self.client.post(
+            self.create_url, data=json.dumps({'detail': 'File taxes', 'due_at': '2025-04-30T17:00:00Z'}),
+            content_type='application/json', **self.auth_headers
+        ).json()['data']
+        task = Task.objects.get(id=created['id'])
+        task.reminded_at = timezone.now()
+        task.save()
+        
+        # Act
+        moved = self.client.put(
+            self.due_url.format(task.id), data=json.dumps({'due_at': '2025-05-15T17:00:00Z'}),
+            content_type='application/json', **self.auth_headers
+        )
+        reminded_after_move = Task.objects.get(id=task.id).reminded_at
+        cleared = self.client.put(
+            self.due_url.format(task.id), data=json.dumps({'due_at': None}),
+            content_type='application/json', **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(created['due_at'], '2025-04-30T17:00:00Z')
+        self.assertEqual(moved.status_code, status.HTTP_200_OK)
+        self.assertEqual(moved.json()['data']['due_at'], '2025-05-15T17:00:00Z')
+        self.assertIsNone(reminded_after_move)
+        self.assertEqual(cleared.status_code, status.HTTP_200_OK)
+        self.assertIsNone(Task.objects.get(id=task.id).due_at)
+    
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
+    def test_task_due_endpoint_validation(self):
+        """Test that the due date is required, must parse and the task must be the user's."""
+        # Arrange
+        foreign = TaskFactory(user=self.other_user)
+        mine = TaskFactory(user=self.user)
+        
+        for task, payload in ((mine, {}), (mine, {'due_at': 'soon'}), (foreign, {'due_at': None})):
+            with self.subTest(payload=payload):
+                # Act
+                response = self.client.put(
+                    self.due_url.format(task.id), data=json.dumps(payload),
+                    content_type='application/json', **self.auth_headers
+                )
+                
+                # Assert
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @pytest.mark.query_budget(max_queries=9, max_time_ms=50)
+    def test_restore_task_endpoint_success(self):
+        """Test restoring an archived task keeps its id and creation time."""
+        # Arrange
+        task = TaskFactory(user=self.user, detail='Old task', status='completed')
+        self.archive(task)
+        
+        # Act
+        response = self.client.post(self.restore_url.format(task.id), **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['data']['id'], task.id)
+        restored = Task.objects.get(id=task.id)
+        self.assertEqual(restored.detail, 'Old task')
+        self.assertEqual(restored.status, 'completed')
+        self.assertEqual(restored.created_at, task.created_at)
+        self.assertFalse(TaskArchive.objects.filter(id=task.id).exists())
+    
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
+    def test_restore_task_endpoint_wrong_user(self):
+        """Test that users cannot restore other users' archived tasks."""
+        # Arrange
+        task = TaskFactory(user=self.other_user, status='completed')
+        self.archive(task)
+        
+        # Act
+        response = self.client.post(self.restore_url.format(task.id), **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(TaskArchive.objects.filter(id=task.id).exists())
+        self.assertFalse(Task.objects.filter(id=task.id).exists())
+    
+    @pytest.mark.query_budget(max_queries=10, max_time_ms=50)
+    def test_delete_task_endpoint_success(self):
+        """Test deleting a task via API."""
+        # Arrange
+        task = TaskFactory(user=self.user)
+        
+        # Act
+        response = self.client.delete(f'/api/tasks/{task.id}/', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['id'], task.id)
+        self.assertFalse(Task.objects.filter(id=task.id).exists())
+    
+    @pytest.mark.query_budget(max_queries=5, max_time_ms=50)
+    def test_delete_task_endpoint_wrong_user(self):
+        """Test that users cannot delete other users' tasks."""
+        # Arrange
+        task = TaskFactory(user=self.other_user)
+        
+        # Act
+        response = self.client.delete(f'/api/tasks/{task.id}/', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Task.objects.filter(id=task.id).exists())
+    
+    @pytest.mark.query_budget(max_queries=10, max_time_ms=50)
+    def test_bulk_delete_tasks_endpoint(self):
+        """Test bulk deleting tasks only removes the user's own tasks."""
+        # Arrange
+        own = [TaskFactory(user=self.user) for _ in range(3)]
+        other = TaskFactory(user=self.other_user)
+        
+        # Act
+        response = self.client.post(
+            '/api/tasks/bulk-delete/',
+            data=json.dumps({'ids': [own[0].id, own[1].id, other.id]}),
+            content_type='application/json',
+            **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['deleted'], 2)
+        self.assertEqual(set(Task.objects.values_list('id', flat=True)), {own[2].id, other.id})
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_bulk_delete_tasks_endpoint_invalid(self):
+        """Test bulk delete with a malformed id list."""
+        # Act
+        response = self.client.post(
+            '/api/tasks/bulk-delete/',
+            data=json.dumps({'ids': 'all'}),
+            content_type='application/json',
+            **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_get_task_endpoint_returns_full_detail(self):
+        """Test that the detail endpoint returns the full detail the list truncates."""
+        # Arrange
+        detail = 'Long log line. ' * 100
+        task = TaskFactory(user=self.user, detail=detail)
+        
+        # Act
+        response = self.client.get(f'/api/tasks/{task.id}/', **self.auth_headers)
+        listed = self.client.get(self.search_url, **self.auth_headers).json()['data']['tasks'][0]
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['detail'], detail)
+        self.assertLess(len(listed['detail']), 250)
+        self.assertTrue(listed['detail_truncated'])
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_get_task_endpoint_wrong_user(self):
+        """Test that users cannot read other users' tasks."""
+        # Arrange
+        task = TaskFactory(user=self.other_user)
+        
+        # Act
+        response = self.client.get(f'/api/tasks/{task.id}/', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @pytest.mark.query_budget(max_queries=3, max_time_ms=50)
+    def test_suggest_tasks_endpoint(self):
+        """Test typeahead suggestions by word prefix, newest first."""
+        # Arrange
+        repository = TaskRepository()
+        older = repository.create(user_id=self.user.id, detail='Informe trimestral de ventas')
+        newer = repository.create(user_id=self.user.id, detail='Enviar informe', status='completed')
+        repository.create(user_id=self.user.id, detail='Comprar leche')
+        repository.create(user_id=self.other_user.id, detail='Informe ajeno')
+        
+        # Act
+        response = self.client.get(f'{self.suggest_url}?q=INF', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual(data['total'], 2)
+        self.assertEqual(data['tasks'], [
+            {'id': newer.id, 'detail': 'Enviar informe', 'status': 'completed'},
+            {'id': older.id, 'detail': 'Informe trimestral de ventas', 'status': 'pending'},
+        ])
+    
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
+    def test_suggest_tasks_endpoint_pages_past_repeated_words(self):
+        """Test that tasks matching with many words do not crowd out the rest of the page."""
+        # Arrange
+        repository = TaskRepository()
+        wordy = repository.create(user_id=self.user.id, detail=' '.join(f'inf{letter}' for letter in 'abcdefghi'))
+        other = repository.create(user_id=self.user.id, detail='infz')
+        
+        # Act
+        response = self.client.get(f'{self.suggest_url}?q=inf&limit=2', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.json()['data']['tasks']], [wordy.id, other.id])
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_suggest_tasks_endpoint_no_match(self):
+        """Test that a query without matches returns an empty list."""
+        # Act
+        response = self.client.get(f'{self.suggest_url}?q=nada&limit=5', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data'], {'tasks': [], 'total': 0})
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_suggest_tasks_endpoint_validation(self):
+        """Test that q is required and limit is bounded."""
+        # Act
+        missing = self.client.get(self.suggest_url, **self.auth_headers)
+        too_many = self.client.get(f'{self.suggest_url}?q=a&limit=500', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(missing.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(too_many.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_export_tasks_endpoint_csv(self):
+        """Test the CSV export streams every task with its full detail."""
+        # Arrange
+        detail = 'Long log line. ' * 500
+        first = TaskFactory(user=self.user, detail='Buy milk')
+        second = TaskFactory(user=self.user, detail=detail, status='completed')
+        TaskFactory(user=self.other_user, detail='Not mine')
+        
+        # Act
+        response = self.client.get(self.export_url, **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="tasks.csv"')
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode('utf-8'))))
+        self.assertEqual([row['id'] for row in rows], [str(first.id), str(second.id)])
+        self.assertEqual(rows[1]['detail'], detail)
+        self.assertEqual(rows[1]['status'], 'completed')
+        self.assertEqual(rows[1]['archived'], 'False')
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_export_tasks_endpoint_ndjson_gzip_with_filters(self):
+        """Test NDJSON export with search filters, archived tasks and gzip."""
+        # Arrange
+        kept = TaskFactory(user=self.user, detail='Quarterly report')
+        TaskFactory(user=self.user, detail='Buy milk')
+        archived = TaskFactory(user=self.user, detail='Old report', status='completed')
+        self.archive(archived)
+        
+        # Act
+        response = self.client.get(
+            f'{self.export_url}?format=ndjson&detail=report&include_archived=true',
+            HTTP_ACCEPT_ENCODING='gzip, deflate', **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        body = gzip.decompress(b''.join(response.streaming_content)).decode('utf-8')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(row['id'], row['archived']) for row in rows], [(kept.id, False), (archived.id, True)])
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_export_tasks_endpoint_gzip_refused(self):
+        """Test that a client refusing gzip with q=0 gets an uncompressed export."""
+        # Arrange
+        task = TaskFactory(user=self.user, detail='Quarterly report')
+        
+        # Act
+        response = self.client.get(
+            f'{self.export_url}?format=ndjson', HTTP_ACCEPT_ENCODING='gzip;q=0, identity', **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('Content-Encoding', response)
+        self.assertIn('Accept-Encoding', response['Vary'])
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode('utf-8').splitlines()]
+        self.assertEqual([row['id'] for row in rows], [task.id])
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_export_tasks_endpoint_reads_in_chunks(self):
+        """Test that rows are fetched chunk by chunk while the response streams."""
+        # Arrange
+        tasks = [TaskFactory(user=self.user, detail=f'Task {index}') for index in range(7)]
+        
+        # Act
+        with patch('src.core.services.task_service.EXPORT_CHUNK_SIZE', 3):
+            response = self.client.get(f'{self.export_url}?format=ndjson', **self.auth_headers)
+            parts = list(response.streaming_content)
+        
+        # Assert
+        self.assertEqual([len(part.splitlines()) for part in parts], [3, 3, 1])
+        ids = [json.loads(line)['id'] for part in parts for line in part.splitlines()]
+        self.assertEqual(ids, [task.id for task in tasks])
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_export_tasks_endpoint_invalid_format(self):
+        """Test that unknown formats are rejected."""
+        # Act
+        response = self.client.get(f'{self.export_url}?format=xml', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.json()['success'])
+    
+    @pytest.mark.query_budget(max_queries=8, max_time_ms=50)
+    def test_import_tasks_endpoint_csv(self):
+        """Test a CSV import creates, indexes and reports rows with their errors."""
+        # Arrange
+        upload = SimpleUploadedFile('tasks.csv', (
+            'id,detail,status\r\n'
+            '7,Quarterly report,completed\r\n'
+            '8,,pending\r\n'
+            '9,Call mom,\r\n'
+            '10,Buy milk,done\r\n'
+        ).encode('utf-8'))
+        
+        # Act
+        response = self.client.post(self.import_url, {'file': upload}, **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual(data['imported'], 2)
+        self.assertEqual(data['failed'], 2)
+        self.assertEqual(data['rows'], 4)
+        self.assertEqual(data['errors'], [
+            {'row': 2, 'error': 'Missing required fields: detail'},
+            {'row': 4, 'error': 'Invalid status. Must be one of: pending, completed, cancelled'},
+        ])
+        tasks = Task.objects.filter(user=self.user).order_by('id')
+        self.assertEqual([(task.detail, task.status) for task in tasks],
+                         [('Quarterly report', 'completed'), ('Call mom', 'pending')])
+        self.assertTrue(TaskToken.objects.filter(task=tasks[0], token='quarterly').exists())
+        self.assertEqual(OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_CREATED).count(), 2)
+    
+    @pytest.mark.query_budget(max_queries=19, max_time_ms=50)
+    def test_import_tasks_endpoint_ndjson_in_batches(self):
+        """Test that NDJSON rows are inserted in batches and errors are capped."""
+        # Arrange
+        lines = [json.dumps({'detail': f'Task {index}'}) for index in range(5)] + ['oops'] * 3
+        upload = SimpleUploadedFile('tasks.ndjson', '\n'.join(lines).encode('utf-8'))
+        
+        # Act
+        with patch('src.core.services.task_service.IMPORT_BATCH_SIZE', 2), \
+                patch('src.core.services.task_service.IMPORT_MAX_ERRORS', 2), \
+                patch.object(TaskRepository, 'create_many', autospec=True,
+                             side_effect=TaskRepository.create_many) as create_many:
+            response = self.client.post(self.import_url, {'file': upload}, **self.auth_headers)
+        
+        # Assert
+        data = response.json()['data']
+        self.assertEqual((data['imported'], data['failed'], len(data['errors'])), (5, 3, 2))
+        self.assertEqual([len(call.args[2]) for call in create_many.call_args_list], [2, 2, 1])
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 5)
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_import_tasks_endpoint_invalid_file(self):
+        """Test that a missing file or a CSV without detail column is rejected."""
+        # Act
+        missing = self.client.post(self.import_url, {}, **self.auth_headers)
+        no_detail = self.client.post(
+            self.import_url, {'file': SimpleUploadedFile('tasks.csv', b'title\r\nBuy milk\r\n')},
+            **self.auth_headers
+        )
+        
+        # Assert
+        self.assertEqual(missing.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(missing.json()['error'], "['A file is required']")
+        self.assertEqual(no_detail.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(no_detail.json()['error'], 'CSV header must include a detail column')
+        self.assertFalse(Task.objects.exists())
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_import_tasks_endpoint_background(self):
+        """Test a background import is queued, then run by the job with progress."""
+        # Arrange
+        upload = SimpleUploadedFile('tasks.txt', b'{"detail": "One"}\n{"detail": "Two"}\n{"detail": "Three"}\n')
+        repository = JobRepository()
+        
+        with tempfile.TemporaryDirectory() as upload_dir, override_settings(IMPORT_UPLOAD_DIR=upload_dir):
+            # Act
+            response = self.client.post(
+                self.import_url, {'file': upload, 'format': 'ndjson', 'background': 'true'}, **self.auth_headers
+            )
+            job = repository.claim('worker', 1, visibility_timeout=60)[0]
+            with patch('src.core.services.task_service.IMPORT_BATCH_SIZE', 2), \
+                    patch.object(JobRepository, 'report_progress', autospec=True,
+                                 side_effect=JobRepository.report_progress) as report_progress:
+                result = jobs.run(job)
+            repository.complete(job, 'worker', result)
+            
+            # Assert
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            self.assertEqual(response.json()['data'], {'job_id': job.id, 'status': 'queued'})
+            self.assertEqual(job.args['format'], 'ndjson')
+            self.assertEqual([call.args[2]['rows'] for call in report_progress.call_args_list], [2, 3])
+            self.assertEqual(result, {'rows': 3, 'imported': 3, 'failed': 0, 'errors': []})
+            self.assertEqual(Job.objects.get(id=job.id).progress, result)
+            self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+            self.assertEqual(os.listdir(upload_dir), [])
+    
+    @pytest.mark.query_budget(max_queries=2, max_time_ms=50)
+    def test_task_stats_endpoint(self):
+        """Test daily counts for a range, with empty days filled in."""
+        # Arrange
+        TaskDailyStat.objects.bulk_create([
+            TaskDailyStat(user=self.user, day=date(2025, 3, 3), status='created', count=4),
+            TaskDailyStat(user=self.user, day=date(2025, 3, 5), status='completed', count=2),
+            TaskDailyStat(user=self.user, day=date(2025, 3, 5), status='cancelled', count=1),
+            TaskDailyStat(user=self.user, day=date(2025, 3, 9), status='created', count=7),
+            TaskDailyStat(user=self.other_user, day=date(2025, 3, 3), status='created', count=5),
+        ])
+        
+        # Act
+        response = self.client.get(f'{self.stats_url}?from=2025-03-03&to=2025-03-05', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()['data']
+        self.assertEqual((data['from'], data['to']), ('2025-03-03', '2025-03-05'))
+        self.assertEqual(data['days'], [
+            {'day': '2025-03-03', 'created': 4, 'completed': 0, 'cancelled': 0},
+            {'day': '2025-03-04', 'created': 0, 'completed': 0, 'cancelled': 0},
+            {'day': '2025-03-05', 'created': 0, 'completed': 2, 'cancelled': 1},
+        ])
+        self.assertEqual(data['totals'], {'created': 4, 'completed': 2, 'cancelled': 1})
+    
+    @pytest.mark.query_budget(max_queries=7, max_time_ms=50)
+    def test_task_stats_endpoint_follows_writes(self):
+        """Test that tasks created and completed through the API show up today."""
+        # Arrange
+        created = self.client.post(
+            self.create_url, data=json.dumps({'detail': 'Chart me'}),
+            content_type='application/json', **self.auth_headers
+        ).json()['data']
+        self.client.put(
+            self.update_status_url.format(created['id']), data=json.dumps({'status': 'completed'}),
+            content_type='application/json', **self.auth_headers
+        )
+        
+        # Act
+        response = self.client.get(self.stats_url, **self.auth_headers)
+        
+        # Assert
+        data = response.json()['data']
+        self.assertEqual(len(data['days']), 30)
+        self.assertEqual(data['to'], timezone.localdate().isoformat())
+        self.assertEqual(data['days'][-1], {
+            'day': data['to'], 'created': 1, 'completed': 1, 'cancelled': 0
+        })
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_task_stats_endpoint_validation(self):
+        """Test that reversed, too long or malformed ranges are rejected."""
+        for query in ('from=2025-03-05&to=2025-03-01', 'from=2024-01-01&to=2025-12-31', 'from=yesterday'):
+            with self.subTest(query=query):
+                # Act
+                response = self.client.get(f'{self.stats_url}?{query}', **self.auth_headers)
+                
+                # Assert
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    def move(self, task_id, after):
+        return self.client.post(
+            self.move_url.format(task_id), data=json.dumps({'after': after}),
+            content_type='application/json', **self.auth_headers
+        )
+    
+    def manual_order(self):
+        response = self.client.get(f'{self.search_url}?order=rank', **self.auth_headers)
+        return [task['id'] for task in response.json()['data']['tasks']]
+    
+    @pytest.mark.query_budget(max_queries=11, max_time_ms=50)
+    def test_move_task_endpoint(self):
+        """Test that moves place tasks after another task or first, and new tasks come first."""
+        # Arrange
+        repository = TaskRepository()
+        first, second, third, fourth = (
+            repository.create(user_id=self.user.id, detail=f'Task {n}') for n in range(4)
+        )
+        
+        # Act
+        response = self.move(fourth.id, first.id)
+        after_move = self.manual_order()
+        ranks = dict(Task.objects.values_list('id', 'rank'))
+        self.move(third.id, None)
+        changed = {task_id for task_id, rank in Task.objects.values_list('id', 'rank') if ranks[task_id] != rank}
+        newest = repository.create(user_id=self.user.id, detail='New')
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['rank'], Task.objects.get(id=fourth.id).rank)
+        self.assertEqual(after_move, [first.id, fourth.id, second.id, third.id])
+        self.assertEqual(self.manual_order(), [newest.id, third.id, first.id, fourth.id, second.id])
+        self.assertEqual(changed, {third.id})
+        self.assertEqual(Task.objects.get(id=third.id).updated_at, third.updated_at)
+        self.assertFalse(OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_UPDATED).exists())
+    
+    @pytest.mark.query_budget(max_queries=6, max_time_ms=50)
+    def test_move_task_endpoint_writes_one_row(self):
+        """Test that moving between ranked tasks reads its neighbours from the index and writes only the task."""
+        # Arrange
+        tasks = [TaskFactory(user=self.user, rank=rank) for rank in ('a', 'b', 'c')]
+        
+        # Act
+        response = self.move(tasks[2].id, tasks[0].id)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(Task.objects.order_by('id').values_list('rank', flat=True)), ['a', 'b', 'ai']
+        )
+        self.assertEqual(self.manual_order(), [tasks[0].id, tasks[2].id, tasks[1].id])
+    
+    @pytest.mark.query_budget(max_queries=4, max_time_ms=50)
+    def test_move_task_endpoint_validation(self):
+        """Test that malformed moves and other users' tasks are rejected."""
+        # Arrange
+        task = TaskFactory(user=self.user)
+        other_task = TaskFactory(user=self.other_user)
+        
+        for task_id, payload in (
+            (task.id, {}),
+            (task.id, {'after': 'first'}),
+            (task.id, {'after': True}),
+            (task.id, {'after': task.id}),
+            (task.id, {'after': other_task.id}),
+            (other_task.id, {'after': None}),
+        ):
+            with self.subTest(task_id=task_id, payload=payload):
+                # Act
+                response = self.client.post(
+                    self.move_url.format(task_id), data=json.dumps(payload),
+                    content_type='application/json', **self.auth_headers
+                )
+                
+                # Assert
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+    
+    @pytest.mark.query_budget(max_queries=1, max_time_ms=50)
+    def test_search_tasks_invalid_order(self):
+        """Test that unknown search orders are rejected."""
+        # Act
+        response = self.client.get(f'{self.search_url}?order=priority', **self.auth_headers)
+        
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Invalid order', response.json()['message'])
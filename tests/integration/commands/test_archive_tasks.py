@@ -0,0 +1,138 @@
+"""
+Integration tests for the archive_tasks management command.
+"""
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from src.core.models import Task, TaskArchive
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from tests.factories import TaskFactory, UserFactory
+
+
+@pytest.mark.integration
+class TestArchiveTasksCommand(TestCase):
+    """Integration tests for archive_tasks."""
+
+    def setUp(self):
+        self.user = UserFactory()
+
+    def archive(self, **options):
+        out = StringIO()
+        call_command('archive_tasks', stdout=out, sleep=0, **options)
+        return out.getvalue()
+
+    def make_task(self, status, days_ago, detail='Task'):
+        task = TaskFactory(user=self.user, status=status, detail=detail)
+        moment = timezone.now() - timedelta(days=days_ago)
+        Task.objects.filter(id=task.id).update(created_at=moment, updated_at=moment)
+        return Task.objects.get(id=task.id)
+
+    def test_archives_old_finished_tasks(self):
+        """Test that only finished tasks older than the cutoff are moved."""
+        # Arrange
+        completed = self.make_task('completed', 120)
+        cancelled = self.make_task('cancelled', 100)
+        old_pending = self.make_task('pending', 200)
+        recent = self.make_task('completed', 10)
+
+        # Act
+        output = self.archive(older_than_days=90)
+
+        # Assert
+        self.assertIn('Archived 2 tasks', output)
+        self.assertEqual(set(Task.objects.values_list('id', flat=True)), {old_pending.id, recent.id})
+        archived = TaskArchive.objects.get(id=completed.id)
+        self.assertEqual(archived.user_id, self.user.id)
+        self.assertEqual(archived.status, 'completed')
+        self.assertEqual(archived.created_at, completed.created_at)
+        self.assertEqual(archived.updated_at, completed.updated_at)
+        self.assertTrue(TaskArchive.objects.filter(id=cancelled.id).exists())
+
+    def test_compressed_detail_survives_archive_and_restore(self):
+        """Test that large details stay compressed in the archive and come back whole."""
+        # Arrange
+        detail = 'ERROR request failed: timeout\n' * 500
+        task = self.make_task('completed', 120, detail=detail)
+
+        # Act
+        self.archive(older_than_days=90)
+        archived = TaskArchive.objects.values('detail', 'detail_blob').get(id=task.id)
+        restored = TaskArchiveRepository().restore(task.id, self.user.id)
+
+        # Assert
+        self.assertEqual(archived['detail'], '')
+        self.assertIsNotNone(archived['detail_blob'])
+        self.assertEqual(Task.objects.get(id=restored.id).detail, detail)
+
+    def test_archives_in_batches(self):
+        """Test that tasks are moved in batches and --max-batches stops early."""
+        # Arrange
+        for _ in range(5):
+            self.make_task('completed', 100)
+
+        # Act
+        output = self.archive(older_than_days=90, batch_size=2, max_batches=2)
+
+        # Assert
+        self.assertIn('Archived 4 tasks on default in 2 batches', output)
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertEqual(TaskArchive.objects.count(), 4)
+
+    def test_keeps_tasks_with_active_subtasks(self):
+        """Test that a finished parent waits for its subtasks, which are archived first."""
+        # Arrange
+        waiting = self.make_task('completed', 120)
+        pending_child = self.make_task('pending', 120)
+        parent = self.make_task('completed', 120)
+        finished_child = self.make_task('cancelled', 120)
+        grandchild = self.make_task('completed', 120)
+        Task.objects.filter(id=pending_child.id).update(path=f'{waiting.id}/')
+        Task.objects.filter(id=finished_child.id).update(path=f'{parent.id}/')
+        Task.objects.filter(id=grandchild.id).update(path=f'{parent.id}/{finished_child.id}/')
+
+        # Act
+        dry_run = self.archive(older_than_days=90, dry_run=True)
+        first = self.archive(older_than_days=90)
+        self.archive(older_than_days=90)
+        self.archive(older_than_days=90)
+
+        # Assert
+        self.assertIn('Would archive 1 tasks', dry_run)
+        self.assertIn('Archived 1 tasks', first)
+        self.assertEqual(set(Task.objects.values_list('id', flat=True)), {waiting.id, pending_child.id})
+        self.assertEqual(set(TaskArchive.objects.values_list('id', flat=True)),
+                         {parent.id, finished_child.id, grandchild.id})
+
+    def test_dry_run(self):
+        """Test that a dry run only reports the count."""
+        # Arrange
+        self.make_task('completed', 100)
+
+        # Act
+        output = self.archive(older_than_days=90, dry_run=True)
+
+        # Assert
+        self.assertIn('Would archive 1 tasks', output)
+        self.assertEqual(Task.objects.count(), 1)
+        self.assertFalse(TaskArchive.objects.exists())
+
+    def test_default_age_from_settings(self):
+        """Test that TASK_ARCHIVE_AFTER_DAYS is used when no age is given."""
+        # Arrange
+        self.make_task('completed', 40)
+
+        # Act
+        with self.settings(TASK_ARCHIVE_AFTER_DAYS=30):
+            self.archive()
+
+        # Assert
+        self.assertEqual(TaskArchive.objects.count(), 1)
+
+    def test_rejects_bad_batch_size(self):
+        """Test that a non-positive batch size is refused."""
+        with self.assertRaises(CommandError):
+            self.archive(batch_size=0)
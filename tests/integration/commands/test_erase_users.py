@@ -0,0 +1,86 @@
+"""
+Integration tests for the erase_users management command.
+"""
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from src.authentication.models import User
+from src.core.models import Task, TaskArchive, TaskToken
+from src.core.repositories.user_repository import UserRepository
+from tests.factories import TaskFactory, UserFactory
+
+
+@pytest.mark.integration
+class TestEraseUsersCommand(TestCase):
+    """Integration tests for erase_users."""
+
+    def erase(self, **options):
+        out = StringIO()
+        call_command('erase_users', stdout=out, sleep=0, **options)
+        return out.getvalue()
+
+    def make_user(self, tasks, archived=0):
+        user = UserFactory()
+        for _ in range(tasks):
+            TaskFactory(user=user)
+        for index in range(archived):
+            task = TaskFactory(user=user, status='completed')
+            TaskArchive.objects.create(
+                id=task.id, detail=task.detail, status=task.status, user=user,
+                created_at=task.created_at, updated_at=task.updated_at
+            )
+            Task.objects.filter(id=task.id).delete()
+        return user
+
+    def test_erases_requested_users_in_batches(self):
+        """Test that tasks, archived tasks and the user are deleted."""
+        # Arrange
+        leaving = self.make_user(tasks=7, archived=2)
+        staying = self.make_user(tasks=2)
+        UserRepository().request_erasure(leaving.id)
+        call_command('index_tasks', stdout=StringIO())
+
+        # Act
+        output = self.erase(batch_size=3)
+
+        # Assert
+        self.assertIn(f'Erased user {leaving.id}: 9 task rows', output)
+        self.assertFalse(User.objects.filter(id=leaving.id).exists())
+        self.assertFalse(Task.objects.filter(user_id=leaving.id).exists())
+        self.assertFalse(TaskArchive.objects.filter(user_id=leaving.id).exists())
+        self.assertFalse(TaskToken.objects.filter(user_id=leaving.id).exists())
+        self.assertEqual(Task.objects.filter(user_id=staying.id).count(), 2)
+        self.assertTrue(TaskToken.objects.filter(user_id=staying.id).exists())
+
+    def test_ignores_users_without_request(self):
+        """Test that only users with a pending erasure are touched."""
+        # Arrange
+        user = self.make_user(tasks=1)
+
+        # Act
+        output = self.erase()
+
+        # Assert
+        self.assertIn('Erased 0 users', output)
+        self.assertTrue(User.objects.filter(id=user.id).exists())
+
+    def test_limit(self):
+        """Test that --limit erases the oldest requests first."""
+        # Arrange
+        first, second = self.make_user(tasks=1), self.make_user(tasks=1)
+        UserRepository().request_erasure(first.id)
+        UserRepository().request_erasure(second.id)
+
+        # Act
+        self.erase(limit=1)
+
+        # Assert
+        self.assertFalse(User.objects.filter(id=first.id).exists())
+        self.assertTrue(User.objects.filter(id=second.id).exists())
+
+    def test_rejects_bad_batch_size(self):
+        """Test that a non-positive batch size is refused."""
+        with self.assertRaises(CommandError):
+            self.erase(batch_size=0)
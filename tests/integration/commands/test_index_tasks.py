@@ -0,0 +1,123 @@
+"""
+Integration tests for the typeahead index and the index_tasks command.
+"""
+import pytest
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from src.core.models import Task, TaskToken
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from src.core.repositories.task_repository import TaskRepository
+from src.core.repositories.task_token_repository import TaskTokenRepository
+from tests.factories import TaskFactory, UserFactory
+
+
+def tokens_of(task_id):
+    return set(TaskToken.objects.filter(task_id=task_id).values_list('token', flat=True))
+
+
+@pytest.mark.integration
+class TestTaskTokenIndex(TestCase):
+    """Integration tests for keeping the index in step with task writes."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.repository = TaskRepository()
+
+    def test_create_update_delete_maintain_tokens(self):
+        """Test that task writes through the repository keep the index current."""
+        # Act / Assert
+        task = self.repository.create(user_id=self.user.id, detail='Write quarterly report')
+        self.assertEqual(tokens_of(task.id), {'write', 'quarterly', 'report'})
+
+        self.repository.update(task, detail='Review report')
+        self.assertEqual(tokens_of(task.id), {'review', 'report'})
+
+        task_id = task.id
+        self.assertTrue(self.repository.delete_by_id_and_user(task_id, self.user.id))
+        self.assertEqual(tokens_of(task_id), set())
+
+    def test_status_update_keeps_tokens(self):
+        """Test that changing only the status does not rewrite the index."""
+        task = self.repository.create(user_id=self.user.id, detail='Call plumber')
+
+        self.repository.update_status(task.id, self.user.id, 'completed')
+
+        self.assertEqual(tokens_of(task.id), {'call', 'plumber'})
+
+    def test_archive_and_restore(self):
+        """Test that archived tasks leave the index and come back on restore."""
+        # Arrange
+        task = self.repository.create(user_id=self.user.id, detail='Old invoice', status='completed')
+        Task.objects.filter(id=task.id).update(updated_at=timezone.now() - timedelta(days=200))
+        archive = TaskArchiveRepository()
+
+        # Act / Assert
+        archive.archive_batch('default', timezone.now() - timedelta(days=90), 10)
+        self.assertEqual(tokens_of(task.id), set())
+
+        archive.restore(task.id, self.user.id)
+        self.assertEqual(tokens_of(task.id), {'old', 'invoice'})
+
+    def test_suggest_matches_every_word_prefix(self):
+        """Test that all query words must prefix a word of the task, newest first."""
+        # Arrange
+        first = self.repository.create(user_id=self.user.id, detail='Prepare quarterly report')
+        second = self.repository.create(user_id=self.user.id, detail='Report bug in quarantine module')
+        self.repository.create(user_id=self.user.id, detail='Buy milk')
+        self.repository.create(user_id=UserFactory().id, detail='Quarterly report for someone else')
+        tokens = TaskTokenRepository()
+
+        # Act / Assert
+        self.assertEqual(tokens.suggest(self.user.id, 'rep', 10), [second.id, first.id])
+        self.assertEqual(tokens.suggest(self.user.id, 'QUAR rep', 10), [second.id, first.id])
+        self.assertEqual(tokens.suggest(self.user.id, 'quarte rep', 10), [first.id])
+        self.assertEqual(tokens.suggest(self.user.id, 'rep', 1), [second.id])
+        self.assertEqual(tokens.suggest(self.user.id, 'zzz', 10), [])
+        self.assertEqual(tokens.suggest(self.user.id, '!!', 10), [])
+
+
+@pytest.mark.integration
+class TestIndexTasksCommand(TestCase):
+    """Integration tests for index_tasks."""
+
+    def index(self, **options):
+        out = StringIO()
+        call_command('index_tasks', stdout=out, **options)
+        return out.getvalue()
+
+    def test_rebuilds_index_for_existing_tasks(self):
+        """Test that tasks written without the index (factories, raw imports) get indexed."""
+        # Arrange
+        user = UserFactory()
+        tasks = [TaskFactory(user=user, detail=f'Backfill item {index}') for index in range(5)]
+        TaskToken.objects.create(user=user, task=tasks[0], token='stale')
+
+        # Act
+        output = self.index(batch_size=2)
+
+        # Assert
+        self.assertIn('Indexed 5 tasks (15 tokens)', output)
+        self.assertEqual(tokens_of(tasks[0].id), {'backfill', 'item', '0'})
+        self.assertEqual(TaskToken.objects.count(), 15)
+
+    def test_only_selected_users(self):
+        """Test that --user-ids limits the rebuild."""
+        # Arrange
+        chosen = UserFactory()
+        TaskFactory(user=chosen, detail='One')
+        TaskFactory(user=UserFactory(), detail='Two')
+
+        # Act
+        self.index(user_ids=str(chosen.id))
+
+        # Assert
+        self.assertEqual(list(TaskToken.objects.values_list('token', flat=True)), ['one'])
+
+    def test_rejects_invalid_batch_size(self):
+        """Test that the batch size must be positive."""
+        with self.assertRaises(CommandError):
+            self.index(batch_size=0)
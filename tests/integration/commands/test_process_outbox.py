@@ -0,0 +1,193 @@
+"""
+Integration tests for task change events and the process_outbox command.
+"""
+import pytest
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from src.core import outbox
+from src.core.models import OutboxEvent, Task
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import TaskFactory, UserFactory
+
+
+def events():
+    return list(OutboxEvent.objects.order_by('id').values_list('event_type', 'task_id', 'payload'))
+
+
+@pytest.mark.integration
+class TestOutboxEvents(TestCase):
+    """Integration tests for events written with task changes."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.repository = TaskRepository()
+
+    def test_task_writes_record_events(self):
+        """Test that each repository write adds its event in the same transaction."""
+        # Act
+        task = self.repository.create(user_id=self.user.id, detail='Write report')
+        self.repository.update_status(task.id, self.user.id, 'completed')
+        self.repository.update(task, detail='Write the report')
+        task_id = task.id
+        self.repository.delete_by_id_and_user(task_id, self.user.id)
+
+        # Assert
+        self.assertEqual(events(), [
+            ('task.created', task_id, {'status': 'pending'}),
+            ('task.status_changed', task_id, {'status': 'completed', 'previous': 'pending'}),
+            ('task.updated', task_id, {'fields': ['detail']}),
+            ('task.deleted', task_id, {}),
+        ])
+        self.assertEqual(set(OutboxEvent.objects.values_list('user_id', flat=True)), {self.user.id})
+
+    def test_no_event_without_change(self):
+        """Test that missing or foreign tasks produce no events."""
+        # Arrange
+        foreign = TaskFactory(user=UserFactory())
+
+        # Act
+        self.repository.update_status(foreign.id, self.user.id, 'completed')
+        self.repository.delete_many_by_user([foreign.id, 999], self.user.id)
+
+        # Assert
+        self.assertEqual(events(), [])
+
+    def test_archive_and_restore_record_events(self):
+        """Test that archiving and restoring tasks are events too."""
+        # Arrange
+        task = TaskFactory(user=self.user, status='completed')
+        Task.objects.filter(id=task.id).update(updated_at=timezone.now() - timedelta(days=200))
+        archive = TaskArchiveRepository()
+
+        # Act
+        archive.archive_batch('default', timezone.now() - timedelta(days=90), 10)
+        archive.restore(task.id, self.user.id)
+
+        # Assert
+        self.assertEqual(events(), [
+            ('task.archived', task.id, {}),
+            ('task.restored', task.id, {'status': 'completed'}),
+        ])
+
+
+@pytest.mark.integration
+class TestProcessOutboxCommand(TestCase):
+    """Integration tests for process_outbox."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.received = []
+        self.fail_for = set()
+        outbox.register()(self.handler)
+
+    def tearDown(self):
+        outbox.unregister(self.handler)
+
+    def handler(self, event):
+        if event.task_id in self.fail_for:
+            raise RuntimeError('downstream unavailable')
+        self.received.append((event.event_type, event.task_id))
+
+    def process(self, **options):
+        out = StringIO()
+        call_command('process_outbox', stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_delivers_in_batches_and_deletes_events(self):
+        """Test that every due event reaches the handlers once, oldest first."""
+        # Arrange
+        tasks = [TaskRepository().create(user_id=self.user.id, detail=f'Task {index}') for index in range(5)]
+
+        # Act
+        output = self.process(batch_size=2)
+
+        # Assert
+        self.assertIn('Delivered 5 events (0 failed', output)
+        self.assertEqual(self.received, [('task.created', task.id) for task in tasks])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_failed_events_are_retried_later(self):
+        """Test that a failing event stays with a backoff while the others are delivered."""
+        # Arrange
+        failing = TaskRepository().create(user_id=self.user.id, detail='Broken')
+        working = TaskRepository().create(user_id=self.user.id, detail='Fine')
+        self.fail_for.add(failing.id)
+
+        # Act
+        output = self.process()
+
+        # Assert
+        self.assertIn('Delivered 1 events (1 failed', output)
+        self.assertEqual(self.received, [('task.created', working.id)])
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.task_id, failing.id)
+        self.assertEqual(event.attempts, 1)
+        self.assertEqual(event.last_error, 'RuntimeError: downstream unavailable')
+        self.assertGreater(event.available_at, timezone.now())
+
+        # Not due yet: left alone.
+        self.fail_for.clear()
+        self.process()
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+        # Due again: delivered.
+        OutboxEvent.objects.update(available_at=timezone.now())
+        self.process()
+        self.assertEqual(self.received[-1], ('task.created', failing.id))
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_events_fail_after_max_attempts(self):
+        """Test that an event is kept as failed after OUTBOX_MAX_ATTEMPTS and retried on request."""
+        # Arrange
+        failing = TaskRepository().create(user_id=self.user.id, detail='Broken')
+        self.fail_for.add(failing.id)
+
+        # Act
+        with self.settings(OUTBOX_MAX_ATTEMPTS=2):
+            self.process()
+            OutboxEvent.objects.update(available_at=timezone.now())
+            self.process()
+            OutboxEvent.objects.update(available_at=timezone.now())
+            self.process()
+
+        # Assert
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.attempts, 2)
+        self.assertIsNotNone(event.failed_at)
+        self.assertEqual(self.received, [])
+
+        # Retried on request: delivered.
+        self.fail_for.clear()
+        output = self.process(retry_failed=True)
+        self.assertIn('Retrying 1 failed events', output)
+        self.assertEqual(self.received, [('task.created', failing.id)])
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_failed_handler_writes_are_rolled_back(self):
+        """Test that a handler's writes are undone when it fails."""
+        # Arrange
+        task = TaskRepository().create(user_id=self.user.id, detail='Original')
+
+        def partial_write(event):
+            Task.objects.filter(id=event.task_id).update(status='cancelled')
+            raise RuntimeError('half done')
+
+        outbox.register('task.created')(partial_write)
+        self.addCleanup(outbox.unregister, partial_write)
+
+        # Act
+        self.process()
+
+        # Assert
+        self.assertEqual(Task.objects.get(id=task.id).status, 'pending')
+        self.assertEqual(OutboxEvent.objects.get().attempts, 1)
+
+    def test_rejects_invalid_batch_size(self):
+        """Test that the batch size must be positive."""
+        with self.assertRaises(CommandError):
+            self.process(batch_size=0)
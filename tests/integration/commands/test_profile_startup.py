@@ -0,0 +1,83 @@
+"""
+Startup budget tests built on the profile_startup management command.
+"""
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from src.core.management.commands.profile_startup import parse_importtime, profile_startup
+
+# Generous enough for a loaded CI machine; a regression that imports a heavy
+# dependency at boot usually costs far more than the headroom.
+STARTUP_BUDGET_MS = 3000
+
+# Modules a worker must not import just to boot and serve a request.
+FORBIDDEN_MODULES = (
+    'pkg_resources',
+    'django.db.migrations.executor',
+    'concurrent.futures.process',
+)
+
+
+@pytest.mark.integration
+class TestStartupBudget(SimpleTestCase):
+    """Cold-start budget for a fresh worker process."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.report = profile_startup('/api/health/live/')
+
+    def test_first_request_succeeds(self):
+        """Test that the fresh worker serves the probe."""
+        self.assertEqual(self.report['status'], '200 OK')
+
+    def test_time_to_first_request_within_budget(self):
+        """Test that boot plus the first request stays within the budget."""
+        total = self.report['setup_ms'] + self.report['handler_ms'] + self.report['first_request_ms']
+        self.assertLess(total, STARTUP_BUDGET_MS)
+
+    def test_heavy_modules_not_loaded(self):
+        """Test that modules only needed by rare code paths stay unloaded."""
+        loaded = set(self.report['modules'])
+        for module in FORBIDDEN_MODULES:
+            self.assertNotIn(module, loaded)
+
+    def test_command_reports_tree(self):
+        """Test that the command prints phases and the first request summary."""
+        out = StringIO()
+        call_command('profile_startup', min_ms=5, depth=1, top=3, stdout=out)
+        output = out.getvalue()
+        self.assertIn('setup:', output)
+        self.assertIn('first_request:', output)
+        self.assertIn('First request /api/health/live/ -> 200 OK', output)
+
+
+@pytest.mark.unit
+class TestParseImporttime(SimpleTestCase):
+    """Test cases for parse_importtime."""
+
+    def test_builds_tree_per_phase(self):
+        """Test that nesting and phase markers are respected."""
+        # Arrange
+        lines = [
+            'import time: self [us] | cumulative | imported package',
+            'startup-phase: setup',
+            'import time:       100 |        100 |     leaf',
+            'import time:       200 |        300 |   child',
+            'import time:        50 |        350 | root',
+            'startup-phase: first_request',
+            'import time:       400 |        400 | late',
+        ]
+
+        # Act
+        trees = parse_importtime(lines)
+
+        # Assert
+        root = trees['setup'][0]
+        self.assertEqual(root['name'], 'root')
+        self.assertEqual(root['cumulative_ms'], 0.35)
+        self.assertEqual(root['children'][0]['name'], 'child')
+        self.assertEqual(root['children'][0]['children'][0]['name'], 'leaf')
+        self.assertEqual([node['name'] for node in trees['first_request']], ['late'])
+        self.assertEqual(trees['handler'], [])
@@ -0,0 +1,76 @@
+"""
+Integration tests for manual order ranks and the rebalance_ranks command.
+"""
+import pytest
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from src.core import ranks
+from src.core.models import Job, Task
+from src.core.repositories.task_repository import TaskRepository
+from src.core.services.task_service import TaskService
+from tests.factories import UserFactory
+
+
+def manual_order(user):
+    return list(Task.objects.filter(user=user).order_by('rank', 'id').values_list('id', flat=True))
+
+
+@pytest.mark.integration
+class TestRebalanceRanks(TestCase):
+    """Integration tests for respacing a user's ranks."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.other_user = UserFactory()
+        self.repository = TaskRepository()
+
+    def test_rebalance_keeps_order_and_shortens_ranks(self):
+        """Test that the command respaces long ranks without reordering or touching other users."""
+        # Arrange
+        tasks = [self.repository.create(user_id=self.user.id, detail=f'Task {n}') for n in range(4)]
+        for task, rank in zip(tasks, ('1', '10000000000001', '1000000000001', 'z')):
+            Task.objects.filter(id=task.id).update(rank=rank)
+        theirs = self.repository.create(user_id=self.other_user.id, detail='Theirs')
+        Task.objects.filter(id=theirs.id).update(rank='10000000000001')
+        before = manual_order(self.user)
+        updated_at = {task.id: task.updated_at for task in Task.objects.filter(user=self.user)}
+
+        # Act
+        out = StringIO()
+        call_command('rebalance_ranks', user_ids=str(self.user.id), stdout=out)
+
+        # Assert
+        self.assertEqual(manual_order(self.user), before)
+        self.assertEqual(
+            {len(rank) for rank in Task.objects.filter(user=self.user).values_list('rank', flat=True)}, {1}
+        )
+        self.assertEqual({task.id: task.updated_at for task in Task.objects.filter(user=self.user)}, updated_at)
+        self.assertEqual(Task.objects.get(id=theirs.id).rank, '10000000000001')
+        self.assertIn('(4 tasks)', out.getvalue())
+
+    def test_long_rank_enqueues_rebalance(self):
+        """Test that a move producing a rank of REBALANCE_LENGTH digits queues a rebalance job."""
+        # Arrange
+        first = self.repository.create(user_id=self.user.id, detail='First')
+        second = self.repository.create(user_id=self.user.id, detail='Second')
+        moved = self.repository.create(user_id=self.user.id, detail='Moved')
+        Task.objects.filter(id=first.id).update(rank='1')
+        Task.objects.filter(id=second.id).update(rank='1' + '0' * (ranks.REBALANCE_LENGTH - 3) + '1')
+        Task.objects.filter(id=moved.id).update(rank='z')
+
+        # Act
+        result = TaskService().move_task(self.user.id, moved.id, {'after': first.id})
+
+        # Assert
+        self.assertTrue(result['success'], result)
+        self.assertEqual(len(result['data']['rank']), ranks.REBALANCE_LENGTH)
+        self.assertEqual(manual_order(self.user), [first.id, moved.id, second.id])
+        job = Job.objects.get(name='rebalance_ranks')
+        self.assertEqual(job.args, {'user_ids': str(self.user.id)})
+
+    def test_invalid_user_ids(self):
+        """Test that malformed --user-ids are rejected."""
+        with self.assertRaises(CommandError):
+            call_command('rebalance_ranks', user_ids='1,two', stdout=StringIO())
@@ -0,0 +1,102 @@
+"""
+Integration tests for the daily task counts and the rebuild_task_stats command.
+"""
+import pytest
+from datetime import date, datetime, timedelta, timezone
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from src.core.models import Task, TaskDailyStat
+from src.core.repositories.task_archive_repository import TaskArchiveRepository
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import TaskFactory, UserFactory
+
+MONDAY = datetime(2025, 3, 3, 9, 30, tzinfo=timezone.utc)
+
+
+def stats_of(user):
+    return {
+        (day, status): count
+        for day, status, count in TaskDailyStat.objects.filter(user=user).exclude(count=0)
+        .values_list('day', 'status', 'count')
+    }
+
+
+@pytest.mark.integration
+class TestTaskDailyStats(TestCase):
+    """Integration tests for keeping the daily counts in step with task writes."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.repository = TaskRepository()
+
+    def at(self, moment):
+        return patch('django.utils.timezone.now', return_value=moment)
+
+    def test_writes_maintain_counts(self):
+        """Test that creates, status changes and deletes move the counts of the right days."""
+        # Act
+        with self.at(MONDAY):
+            first = self.repository.create(user_id=self.user.id, detail='Write report')
+            second = self.repository.create(user_id=self.user.id, detail='Call plumber')
+        with self.at(MONDAY + timedelta(days=1)):
+            self.repository.update_status(first.id, self.user.id, 'completed')
+            self.repository.update_status(second.id, self.user.id, 'cancelled')
+        with self.at(MONDAY + timedelta(days=2)):
+            self.repository.update_status(second.id, self.user.id, 'completed')
+            self.repository.delete_by_id_and_user(first.id, self.user.id)
+            self.repository.create_many(self.user.id, [('Imported done', 'completed'), ('Imported', 'pending')])
+
+        # Assert
+        self.assertEqual(stats_of(self.user), {
+            (date(2025, 3, 3), 'created'): 1,
+            (date(2025, 3, 5), 'completed'): 2,
+            (date(2025, 3, 5), 'created'): 2,
+        })
+
+    def test_rebuild_matches_incremental_counts(self):
+        """Test that the command recomputes the same counts, archived tasks included."""
+        # Arrange
+        with self.at(MONDAY):
+            tasks = [self.repository.create(user_id=self.user.id, detail=f'Task {index}') for index in range(4)]
+        with self.at(MONDAY + timedelta(days=3)):
+            self.repository.update_status(tasks[0].id, self.user.id, 'completed')
+            self.repository.update_status(tasks[1].id, self.user.id, 'cancelled')
+        TaskArchiveRepository().archive_batch('default', MONDAY + timedelta(days=200), 10)
+        maintained = stats_of(self.user)
+        TaskDailyStat.objects.filter(user=self.user).update(count=99)
+
+        # Act
+        output = StringIO()
+        call_command('rebuild_task_stats', workers=1, stdout=output)
+
+        # Assert
+        self.assertIn('Rebuilt daily stats of 1 users (3 rows)', output.getvalue())
+        self.assertEqual(stats_of(self.user), maintained)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 2)
+
+    def test_rebuild_counts_tasks_written_without_repository(self):
+        """Test that rows from factories or raw imports are counted, using updated_at when needed."""
+        # Arrange
+        other = UserFactory()
+        task = TaskFactory(user=self.user, status='completed')
+        TaskFactory(user=other, status='pending')
+        Task.objects.filter(id=task.id).update(created_at=MONDAY, updated_at=MONDAY + timedelta(days=1))
+
+        # Act
+        call_command('rebuild_task_stats', user_ids=str(self.user.id), workers=1, stdout=StringIO())
+
+        # Assert
+        self.assertEqual(stats_of(self.user), {
+            (date(2025, 3, 3), 'created'): 1,
+            (date(2025, 3, 4), 'completed'): 1,
+        })
+        self.assertEqual(stats_of(other), {})
+
+    def test_invalid_workers(self):
+        """Test that a non-positive worker count is rejected."""
+        with self.assertRaises(CommandError):
+            call_command('rebuild_task_stats', workers=0, stdout=StringIO())
+
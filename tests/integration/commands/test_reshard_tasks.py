@@ -0,0 +1,292 @@
+"""
+Integration tests for task sharding and the reshard_tasks command.
+
+Uses three SQLite databases as shards with a range map on user id:
+users below 100 on default, below 200 on shard_1, the rest on shard_2.
+"""
+import pytest
+import json
+from datetime import datetime, timezone
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, Client, override_settings
+from rest_framework import status
+from rest_framework_simplejwt.tokens import RefreshToken
+from src.authentication.models import User
+from src.core.management.commands.reshard_tasks import Command as ReshardCommand
+from src.core.models import Label, OutboxEvent, Task, TaskArchive, TaskDailyStat
+from src.core.repositories.label_repository import LabelRepository
+from src.core.repositories.task_repository import TaskRepository
+from src.core.repositories.user_repository import UserRepository
+from src.core.services.task_service import TaskService
+from src.core.sharding import TASK_ID_RANGE
+from tests.factories import UserFactory
+
+SHARDS = ['default', 'shard_1', 'shard_2']
+RANGE_SHARDING = {
+    'STRATEGY': 'range',
+    'SHARDS': SHARDS,
+    'RANGES': [(100, 'default'), (200, 'shard_1'), (None, 'shard_2')],
+}
+TARGET_RANGES = '100:shard_1,200:shard_2,:default'
+
+
+@pytest.mark.integration
+@override_settings(TASK_SHARDING=RANGE_SHARDING)
+class TestTaskSharding(TestCase):
+    """Integration tests for TaskShardRouter and reshard_tasks."""
+
+    databases = set(SHARDS)
+
+    def setUp(self):
+        """Give each shard its own task id range, as deployments must."""
+        self.reshard(prepare_ids=True)
+
+    def tasks_on(self, alias, user):
+        return Task.objects.using(alias).filter(user_id=user.id)
+
+    def make_task(self, user):
+        # Factories always write to default; the repository picks the shard.
+        return TaskRepository().create(user_id=user.id, detail='Task', status='pending')
+
+    def reshard(self, *args, **options):
+        out = StringIO()
+        call_command('reshard_tasks', *args, stdout=out, **options)
+        return out.getvalue()
+
+    def test_service_uses_user_shard(self):
+        """Test that creates, updates and searches run on the user's shard."""
+        # Arrange
+        user = UserFactory(id=150)
+        service = TaskService()
+
+        # Act
+        created = service.create_task(user.id, {'detail': 'Sharded task'})
+        updated = service.update_task_status(user.id, created['data']['id'], 'completed')
+        found = service.search_tasks(user.id, {})
+
+        # Assert
+        self.assertTrue(updated['success'])
+        self.assertEqual(self.tasks_on('shard_1', user).get().status, 'completed')
+        self.assertFalse(self.tasks_on('default', user).exists())
+        self.assertEqual([task['detail'] for task in found['data']['tasks']], ['Sharded task'])
+
+    def test_api_uses_user_shard(self):
+        """Test that API requests reach the authenticated user's shard."""
+        # Arrange
+        user = UserFactory(id=250)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        client = Client()
+
+        # Act
+        client.post('/api/tasks/', data=json.dumps({'detail': 'API task'}),
+                    content_type='application/json', **headers)
+        response = client.get('/api/tasks/search/', **headers)
+
+        # Assert
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['data']['total'], 1)
+        self.assertEqual(self.tasks_on('shard_2', user).count(), 1)
+
+    def test_export_streams_from_user_shard(self):
+        """Test that the streamed export reads the shard chosen when the request was made."""
+        # Arrange
+        user = UserFactory(id=250)
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+        self.make_task(user)
+
+        # Act
+        response = Client().get('/api/tasks/export/?format=ndjson', **headers)
+
+        # Assert
+        lines = b''.join(response.streaming_content).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [self.tasks_on('shard_2', user).get().id])
+
+    def test_reshard_moves_tasks(self):
+        """Test that tasks move with their ids and timestamps and stay reachable."""
+        # Arrange
+        low, mid = UserFactory(id=50), UserFactory(id=150)
+        for _ in range(3):
+            self.make_task(low)
+        self.make_task(mid)
+        created_at = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+        self.tasks_on('default', low).update(created_at=created_at)
+        ids = set(self.tasks_on('default', low).values_list('id', flat=True))
+
+        # Act
+        output = self.reshard(strategy='range', ranges=TARGET_RANGES, batch_size=2)
+
+        # Assert
+        self.assertIn('Moved 2 users (4 tasks)', output)
+        self.assertFalse(self.tasks_on('default', low).exists())
+        self.assertFalse(self.tasks_on('shard_1', mid).exists())
+        self.assertEqual(set(self.tasks_on('shard_1', low).values_list('id', flat=True)), ids)
+        self.assertEqual(set(self.tasks_on('shard_1', low).values_list('created_at', flat=True)), {created_at})
+        self.assertEqual(self.tasks_on('shard_2', mid).count(), 1)
+        self.assertEqual(User.objects.get(id=low.id).task_shard, 'shard_1')
+        self.assertEqual(TaskService().search_tasks(low.id, {})['data']['total'], 3)
+        self.assertFalse(TaskDailyStat.objects.using('default').filter(user_id=low.id).exists())
+        self.assertEqual(
+            list(TaskDailyStat.objects.using('shard_1').filter(user_id=low.id).values_list('day', 'status', 'count')),
+            [(created_at.date(), 'created', 3)]
+        )
+
+    def test_reshard_moves_archived_tasks(self):
+        """Test that archived tasks and labels follow their user and can be restored there."""
+        # Arrange
+        low = UserFactory(id=50)
+        task = self.make_task(low)
+        label = LabelRepository().create(user_id=low.id, name='work')
+        TaskRepository().update(task, label_mask=label.bit)
+        TaskRepository().update_status(task.id, low.id, 'completed')
+        call_command('archive_tasks', older_than_days=0, sleep=0, stdout=StringIO())
+
+        # Act
+        output = self.reshard(strategy='range', ranges=TARGET_RANGES)
+        restored = TaskService().restore_task(low.id, task.id)
+
+        # Assert
+        self.assertIn('0 tasks and 1 archived tasks default -> shard_1', output)
+        self.assertFalse(TaskArchive.objects.using('default').exists())
+        self.assertTrue(restored['success'])
+        self.assertEqual(self.tasks_on('shard_1', low).get(id=task.id).label_mask, label.bit)
+        self.assertFalse(TaskArchive.objects.using('shard_1').exists())
+        self.assertFalse(Label.objects.using('default').exists())
+        self.assertEqual(list(Label.objects.using('shard_1').values_list('user_id', 'slot', 'name')),
+                         [(low.id, label.slot, 'work')])
+
+    def test_erase_user_on_shard(self):
+        """Test that erasure deletes tasks on the user's shard."""
+        # Arrange
+        user = UserFactory(id=250)
+        for _ in range(3):
+            self.make_task(user)
+        LabelRepository().create(user_id=user.id, name='work')
+        UserRepository().request_erasure(user.id)
+
+        # Act
+        call_command('erase_users', batch_size=2, sleep=0, stdout=StringIO())
+
+        # Assert
+        self.assertFalse(self.tasks_on('shard_2', user).exists())
+        self.assertFalse(TaskDailyStat.objects.using('shard_2').filter(user_id=user.id).exists())
+        self.assertFalse(Label.objects.using('shard_2').filter(user_id=user.id).exists())
+        self.assertFalse(User.objects.filter(id=user.id).exists())
+
+    def test_outbox_events_on_shard(self):
+        """Test that events are written next to the task and drained on every shard."""
+        # Arrange
+        user = UserFactory(id=150)
+        task = self.make_task(user)
+
+        # Act
+        self.assertTrue(OutboxEvent.objects.using('shard_1').filter(task_id=task.id).exists())
+        output = StringIO()
+        call_command('process_outbox', stdout=output)
+
+        # Assert
+        self.assertIn('Delivered 1 events', output.getvalue())
+        self.assertFalse(OutboxEvent.objects.using('shard_1').exists())
+
+    def test_dry_run_moves_nothing(self):
+        """Test that a dry run only reports."""
+        # Arrange
+        user = UserFactory(id=50)
+        self.make_task(user)
+
+        # Act
+        output = self.reshard(strategy='range', ranges=TARGET_RANGES, dry_run=True)
+
+        # Assert
+        self.assertIn('Would move user 50: 1 tasks default -> shard_1', output)
+        self.assertEqual(self.tasks_on('default', user).count(), 1)
+        self.assertIsNone(User.objects.get(id=user.id).task_shard)
+
+    def test_finalize_after_map_update(self):
+        """Test that explicit shards are cleared once the map agrees."""
+        # Arrange
+        user = UserFactory(id=50)
+        self.make_task(user)
+        self.reshard(strategy='range', ranges=TARGET_RANGES)
+        new_map = {**RANGE_SHARDING, 'RANGES': [(100, 'shard_1'), (200, 'shard_2'), (None, 'default')]}
+
+        # Act
+        with override_settings(TASK_SHARDING=new_map):
+            output = self.reshard(finalize=True)
+            total = TaskService().search_tasks(user.id, {})['data']['total']
+
+        # Assert
+        self.assertIn('Cleared 1 explicit task shards', output)
+        self.assertIsNone(User.objects.get(id=user.id).task_shard)
+        self.assertEqual(total, 1)
+
+    def test_prepare_ids(self):
+        """Test that each shard allocates task ids from its own range."""
+        # Arrange
+        user = UserFactory(id=150)
+
+        # Act
+        task_id = TaskService().create_task(user.id, {'detail': 'Ranged id'})['data']['id']
+
+        # Assert
+        self.assertGreater(task_id, TASK_ID_RANGE)
+
+    def test_reshard_catches_up_with_source_writes(self):
+        """Test that deletes, reminders, restores and events on the source during a move reach the destination."""
+        # Arrange
+        low = UserFactory(id=50)
+        kept, deleted, reminded = (self.make_task(low) for _ in range(3))
+        restored = self.make_task(low)
+        Task.objects.using('default').filter(id=restored.id).delete()
+        reminded_at = []
+        events = OutboxEvent.objects.using('default').filter(user_id=low.id).count()
+        copy_labels = ReshardCommand.copy_labels
+
+        def write_during_move(command, user_id, source, destination):
+            # The second label copy runs right after the user is switched.
+            if User.objects.get(id=user_id).task_shard == destination:
+                Task.objects.using(source).filter(id=deleted.id).delete()
+                reminded_at.append(datetime.now(timezone.utc))
+                Task.objects.using(source).filter(id=reminded.id).update(reminded_at=reminded_at[0])
+                restored.save(using=source, force_insert=True)
+                OutboxEvent.objects.using(source).create(
+                    event_type=OutboxEvent.TASK_DUE, user_id=user_id, task_id=reminded.id
+                )
+            copy_labels(command, user_id, source, destination)
+
+        # Act
+        with patch.object(ReshardCommand, 'copy_labels', autospec=True, side_effect=write_during_move):
+            self.reshard(strategy='range', ranges=TARGET_RANGES)
+
+        # Assert
+        self.assertEqual(set(self.tasks_on('shard_1', low).values_list('id', flat=True)),
+                         {kept.id, reminded.id, restored.id})
+        self.assertEqual(self.tasks_on('shard_1', low).get(id=reminded.id).reminded_at, reminded_at[0])
+        self.assertFalse(self.tasks_on('default', low).exists())
+        self.assertFalse(OutboxEvent.objects.using('default').filter(user_id=low.id).exists())
+        self.assertEqual(
+            list(OutboxEvent.objects.using('shard_1').filter(user_id=low.id).order_by('id')
+                 .values_list('event_type', flat=True)),
+            [OutboxEvent.TASK_CREATED] * events + [OutboxEvent.TASK_DUE]
+        )
+
+    def test_id_collision_aborts(self):
+        """Test that a move never overwrites another user's task."""
+        # Arrange
+        low, mid = UserFactory(id=50), UserFactory(id=150)
+        moving = self.make_task(low)
+        Task.objects.using('shard_1').filter(user_id=mid.id).delete()
+        self.make_task(mid)
+        Task.objects.using('shard_1').filter(user_id=mid.id).update(id=moving.id)
+
+        # Act / Assert
+        with self.assertRaises(CommandError):
+            self.reshard(strategy='range', ranges=TARGET_RANGES)
+        self.assertEqual(self.tasks_on('default', low).count(), 1)
+
+    def test_unknown_shard(self):
+        """Test that targets must be configured databases."""
+        with self.assertRaises(CommandError):
+            self.reshard(shards='default,shard_9')
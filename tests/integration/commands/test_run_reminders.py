@@ -0,0 +1,181 @@
+"""
+Integration tests for the due date reminder scheduler and the run_reminders command.
+"""
+import pytest
+from datetime import timedelta
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.utils import timezone
+from src.core.models import OutboxEvent, Task
+from src.core.reminders import ReminderScheduler
+from src.core.repositories.task_repository import TaskRepository
+from tests.factories import UserFactory
+
+
+class Clock:
+    """Settable time for the scheduler."""
+
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, **kwargs):
+        self.now += timedelta(**kwargs)
+
+
+def reminded():
+    return list(OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_DUE).order_by('id')
+                .values_list('task_id', flat=True))
+
+
+@pytest.mark.integration
+class TestReminderScheduler(TestCase):
+    """Integration tests for ReminderScheduler."""
+
+    def setUp(self):
+        self.user = UserFactory()
+        self.repository = TaskRepository()
+        self.clock = Clock(timezone.now())
+
+    def task_due_in(self, **kwargs):
+        due_at = self.clock.now + timedelta(**kwargs)
+        return self.repository.create(user_id=self.user.id, detail='Due task', due_at=due_at)
+
+    def scheduler(self, **options):
+        options.setdefault('window', timedelta(hours=1))
+        return ReminderScheduler(['default'], clock=self.clock, **options)
+
+    def test_fires_in_due_order_at_due_time(self):
+        """Test that reminders of the window fire when due, once, and later ones wait for their window."""
+        # Arrange
+        later = self.task_due_in(minutes=20)
+        sooner = self.task_due_in(minutes=10)
+        outside = self.task_due_in(hours=2)
+        deleted = self.task_due_in(minutes=5)
+        self.repository.delete_by_id_and_user(deleted.id, self.user.id)
+        scheduler = self.scheduler()
+
+        # Act
+        with self.assertNumQueries(1):
+            scheduler.refresh()
+        fired_now = scheduler.fire_due()
+        self.clock.advance(minutes=10)
+        fired_at_ten = scheduler.fire_due()
+        self.clock.advance(minutes=10)
+        fired_at_twenty = scheduler.fire_due()
+
+        # Assert
+        self.assertEqual((fired_now, fired_at_ten, fired_at_twenty), (0, 1, 1))
+        self.assertEqual(reminded(), [sooner.id, later.id])
+        self.assertNotIn(outside.id, scheduler.loaded)
+        event = OutboxEvent.objects.get(task_id=sooner.id, event_type=OutboxEvent.TASK_DUE)
+        self.assertEqual(event.payload, {'due_at': sooner.due_at.isoformat()})
+        self.assertIsNotNone(Task.objects.get(id=sooner.id).reminded_at)
+
+        # Act
+        self.clock.advance(hours=2)
+        scheduler.refresh()
+        scheduler.fire_due()
+
+        # Assert
+        self.assertEqual(reminded(), [sooner.id, later.id, outside.id])
+
+    def test_follows_changes_after_loading(self):
+        """Test that new, moved, finished and reset due dates are honoured without reloading the window."""
+        # Arrange
+        moved = self.task_due_in(minutes=10)
+        finished = self.task_due_in(minutes=10)
+        scheduler = self.scheduler()
+        scheduler.refresh()
+
+        # Act
+        added = self.task_due_in(minutes=5)
+        self.repository.update(moved, due_at=self.clock.now + timedelta(minutes=30))
+        self.repository.update_status(finished.id, self.user.id, 'completed')
+        scheduler.refresh()
+        self.clock.advance(minutes=10)
+        fired = scheduler.fire_due()
+
+        # Assert
+        self.assertEqual(fired, 1)
+        self.assertEqual(reminded(), [added.id])
+
+        # Act
+        self.clock.advance(minutes=20)
+        scheduler.fire_due()
+        self.repository.update(added, due_at=self.clock.now + timedelta(minutes=1))
+        scheduler.refresh()
+        self.clock.advance(minutes=1)
+        scheduler.fire_due()
+
+        # Assert
+        self.assertEqual(reminded(), [added.id, moved.id, added.id])
+
+    def test_loads_window_in_batches_within_memory_limit(self):
+        """Test that a dense window is loaded in keyset batches as the heap drains."""
+        # Arrange
+        tasks = [self.task_due_in(minutes=minutes) for minutes in (1, 1, 2, 3, 4)]
+        scheduler = self.scheduler(batch_size=2, max_loaded=3)
+
+        # Act
+        scheduler.refresh()
+        loaded_first = len(scheduler.heap)
+        self.clock.advance(minutes=2)
+        scheduler.fire_due()
+        needs_loading = scheduler.needs_loading()
+        scheduler.refresh()
+        self.clock.advance(minutes=2)
+        scheduler.fire_due()
+
+        # Assert
+        self.assertEqual(loaded_first, 3)
+        self.assertTrue(needs_loading)
+        self.assertEqual(reminded(), [task.id for task in tasks])
+
+    def test_second_scheduler_does_not_repeat(self):
+        """Test that a reminder is recorded once when two schedulers hold it."""
+        # Arrange
+        task = self.task_due_in(minutes=1)
+        first, second = self.scheduler(), self.scheduler()
+        first.refresh()
+        second.refresh()
+        self.clock.advance(minutes=1)
+
+        # Act
+        fired = first.fire_due() + second.fire_due()
+
+        # Assert
+        self.assertEqual(fired, 1)
+        self.assertEqual(reminded(), [task.id])
+
+
+@pytest.mark.integration
+class TestRunRemindersCommand(TestCase):
+    """Integration tests for the run_reminders command."""
+
+    def test_once_fires_missed_reminders_within_catch_up(self):
+        """Test that --once fires reminders missed up to --catch-up ago and exits."""
+        # Arrange
+        user = UserFactory()
+        repository = TaskRepository()
+        now = timezone.now()
+        missed = repository.create(user_id=user.id, detail='Missed', due_at=now - timedelta(minutes=30))
+        repository.create(user_id=user.id, detail='Too old', due_at=now - timedelta(hours=3))
+        repository.create(user_id=user.id, detail='Upcoming', due_at=now + timedelta(minutes=30))
+        out = StringIO()
+
+        # Act
+        call_command('run_reminders', once=True, catch_up=3600, stdout=out)
+
+        # Assert
+        self.assertEqual(reminded(), [missed.id])
+        self.assertIn('Fired 1 reminders', out.getvalue())
+
+    def test_invalid_options(self):
+        """Test that non-positive sizes are rejected."""
+        with self.assertRaises(CommandError):
+            call_command('run_reminders', once=True, window=0, stdout=StringIO())
@@ -0,0 +1,152 @@
+"""
+Integration tests for background jobs and the run_worker command.
+
+Uses TransactionTestCase: jobs run in pool threads with their own
+database connections, which only see committed rows.
+"""
+import pytest
+from io import StringIO
+from datetime import timedelta
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TransactionTestCase
+from django.utils import timezone
+from src.authentication.models import User
+from src.core import jobs
+from src.core.models import Job
+from src.core.repositories.job_repository import JobRepository
+from src.core.repositories.user_repository import UserRepository
+from tests.factories import UserFactory
+
+
+@pytest.mark.integration
+class TestRunWorkerCommand(TransactionTestCase):
+    """Integration tests for run_worker."""
+
+    def setUp(self):
+        self.repository = JobRepository()
+        jobs.job('test.echo')(lambda job: {'echo': job.args['value']})
+        jobs.job('test.fail')(self.fail_job)
+        self.addCleanup(jobs._jobs.pop, 'test.echo')
+        self.addCleanup(jobs._jobs.pop, 'test.fail')
+
+    @staticmethod
+    def fail_job(job):
+        raise RuntimeError('boom')
+
+    def work(self, **options):
+        out = StringIO()
+        call_command('run_worker', burst=True, stdout=out, stderr=StringIO(), **options)
+        return out.getvalue()
+
+    def test_runs_queued_jobs_in_a_thread_pool(self):
+        """Test that queued jobs run and store their results."""
+        # Arrange
+        queued = [self.repository.enqueue('test.echo', {'value': index}) for index in range(5)]
+
+        # Act
+        output = self.work(concurrency=2)
+
+        # Assert
+        self.assertIn('Ran 5 jobs (5 succeeded, 0 failed)', output)
+        for index, job in enumerate(queued):
+            job.refresh_from_db()
+            self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+            self.assertEqual(job.result, {'echo': index})
+            self.assertEqual(job.attempts, 1)
+            self.assertIsNotNone(job.finished_at)
+            self.assertEqual(job.locked_by, '')
+
+    def test_failed_job_is_retried_with_backoff(self):
+        """Test that a failing job is queued again later until attempts run out."""
+        # Arrange
+        job = self.repository.enqueue('test.fail', max_attempts=2)
+
+        # Act / Assert
+        self.assertIn('1 failed', self.work())
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_QUEUED)
+        self.assertEqual(job.error, 'RuntimeError: boom')
+        self.assertGreater(job.run_after, timezone.now())
+
+        # Not due yet.
+        self.assertIn('Ran 0 jobs', self.work())
+
+        Job.objects.filter(id=job.id).update(run_after=timezone.now())
+        self.work()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.attempts, 2)
+
+    def test_unknown_job_fails_without_retry(self):
+        """Test that a job nobody registered fails at once."""
+        job = self.repository.enqueue('test.missing')
+
+        self.work()
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+        self.assertEqual(job.error, 'Unknown job: test.missing')
+
+    def test_expired_lock_is_reclaimed(self):
+        """Test that jobs of a dead worker run again after the visibility timeout."""
+        # Arrange
+        expired = timezone.now() - timedelta(seconds=1)
+        retried = self.repository.enqueue('test.echo', {'value': 'again'})
+        exhausted = self.repository.enqueue('test.echo', {'value': 'never'}, max_attempts=1)
+        Job.objects.filter(id__in=[retried.id, exhausted.id]).update(
+            status=Job.STATUS_RUNNING, attempts=1, locked_by='dead-worker', locked_until=expired
+        )
+        live = self.repository.enqueue('test.echo', {'value': 'busy'})
+        Job.objects.filter(id=live.id).update(
+            status=Job.STATUS_RUNNING, attempts=1, locked_by='live-worker',
+            locked_until=timezone.now() + timedelta(minutes=5)
+        )
+
+        # Act
+        self.work()
+
+        # Assert
+        retried.refresh_from_db()
+        exhausted.refresh_from_db()
+        live.refresh_from_db()
+        self.assertEqual((retried.status, retried.attempts), (Job.STATUS_SUCCEEDED, 2))
+        self.assertEqual(exhausted.status, Job.STATUS_FAILED)
+        self.assertIn('visibility timeout', exhausted.error)
+        self.assertEqual((live.status, live.locked_by), (Job.STATUS_RUNNING, 'live-worker'))
+
+    def test_late_result_of_a_reclaimed_job_is_ignored(self):
+        """Test that a worker that lost its lock cannot overwrite the new owner's state."""
+        # Arrange
+        self.repository.enqueue('test.echo', {'value': 1})
+        job = self.repository.claim('old-worker', 1, visibility_timeout=60)[0]
+        Job.objects.filter(id=job.id).update(locked_by='new-worker')
+
+        # Act
+        settled = self.repository.complete(job, 'old-worker', {'stale': True})
+
+        # Assert
+        self.assertFalse(settled)
+        self.assertEqual(Job.objects.get(id=job.id).status, Job.STATUS_RUNNING)
+
+    def test_account_erasure_runs_in_background(self):
+        """Test that closing an account queues a job that erases the user."""
+        # Arrange
+        user = UserFactory()
+        UserRepository().request_erasure(user.id)
+        job = Job.objects.get(name='erase_users')
+
+        # Act
+        # One slot: in-memory SQLite locks whole tables across connections.
+        self.work(concurrency=1)
+
+        # Assert
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_SUCCEEDED)
+        self.assertIn('Erased 1 users', job.result['output'])
+        self.assertFalse(User.objects.filter(id=user.id).exists())
+
+    def test_rejects_invalid_concurrency(self):
+        """Test that concurrency must be positive."""
+        with self.assertRaises(CommandError):
+            self.work(concurrency=0)
@@ -0,0 +1,112 @@
+"""
+Integration tests for the seed_data management command.
+"""
+import pytest
+from datetime import datetime, timezone
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from src.authentication.models import User
+from src.core.management.commands.seed_data import generate_tasks
+from src.core.models import Task, TaskDailyStat, TaskToken
+from src.core.services.task_service import TaskService
+from src.core.sharding import get_shard_map
+
+SHARDS = ['default', 'shard_1']
+
+
+@pytest.mark.integration
+class TestSeedDataCommand(TestCase):
+    """Integration tests for seed_data."""
+
+    def seed(self, **options):
+        out = StringIO()
+        call_command('seed_data', stdout=out, **options)
+        return out.getvalue()
+
+    def test_seed_creates_users_and_tasks(self):
+        """Test that users and their tasks are inserted and reported."""
+        # Act
+        output = self.seed(users=5, tasks_per_user=20, skew=0, batch_size=7)
+
+        # Assert
+        users = User.objects.filter(email__startswith='seed0-')
+        self.assertEqual(users.count(), 5)
+        self.assertEqual(Task.objects.filter(user__in=users).count(), 100)
+        self.assertIn('Inserted 100 tasks', output)
+        self.assertIn('rows/s', output)
+        statuses = set(Task.objects.values_list('status', flat=True))
+        self.assertTrue(statuses <= {'pending', 'completed', 'cancelled'})
+
+    def test_seed_indexes_words_and_counts_days(self):
+        """Test that seeded tasks get the tokens and daily counts the rebuild commands would write."""
+        # Arrange
+        self.seed(users=3, tasks_per_user=15, skew=0, batch_size=7)
+        users = User.objects.filter(email__startswith='seed0-').values_list('id', flat=True)
+        user_ids = ','.join(str(user_id) for user_id in users)
+        seeded = (
+            sorted(TaskToken.objects.values_list('user_id', 'task_id', 'token')),
+            sorted(TaskDailyStat.objects.values_list('user_id', 'day', 'status', 'count')),
+        )
+
+        # Act
+        TaskToken.objects.all().delete()
+        call_command('index_tasks', user_ids=user_ids, stdout=StringIO())
+        call_command('rebuild_task_stats', user_ids=user_ids, workers=1, stdout=StringIO())
+
+        # Assert
+        self.assertTrue(seeded[0] and seeded[1])
+        self.assertEqual(seeded, (
+            sorted(TaskToken.objects.values_list('user_id', 'task_id', 'token')),
+            sorted(TaskDailyStat.objects.values_list('user_id', 'day', 'status', 'count')),
+        ))
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed and user position produce the same rows."""
+        # Arrange
+        now = datetime(2025, 9, 30, 12, 0, tzinfo=timezone.utc)
+        options = {'seed': 7, 'tasks_per_user': 30, 'skew': 1.0, 'days': 90}
+
+        # Act
+        first = list(generate_tasks(3, 100, options, now))
+        second = list(generate_tasks(3, 200, options, now))
+
+        # Assert
+        self.assertEqual([row[:2] + row[3:] for row in first], [row[:2] + row[3:] for row in second])
+        self.assertTrue(all(row[3] <= now and row[4] <= now for row in first))
+
+    def test_seed_rejects_existing_prefix(self):
+        """Test that seeding the same prefix twice is refused."""
+        # Arrange
+        self.seed(users=1, tasks_per_user=1)
+
+        # Act / Assert
+        with self.assertRaises(CommandError):
+            self.seed(users=1, tasks_per_user=1)
+
+
+@pytest.mark.integration
+@override_settings(TASK_SHARDING={'STRATEGY': 'hash', 'SHARDS': SHARDS, 'RANGES': []})
+class TestSeedDataSharded(TestCase):
+    """Integration tests for seed_data with tasks sharded by user."""
+
+    databases = set(SHARDS)
+
+    def test_seed_writes_each_user_to_their_shard(self):
+        """Test that every user's tasks, tokens and counts land on their shard and are served from it."""
+        # Act
+        call_command('seed_data', users=6, tasks_per_user=5, skew=0, stdout=StringIO())
+
+        # Assert
+        users = list(User.objects.filter(email__startswith='seed0-').values_list('id', flat=True))
+        shards = {get_shard_map().shard_for(user_id) for user_id in users}
+        self.assertEqual(shards, set(SHARDS))
+        for user_id in users:
+            shard = get_shard_map().shard_for(user_id)
+            other = next(alias for alias in SHARDS if alias != shard)
+            self.assertEqual(Task.objects.using(shard).filter(user_id=user_id).count(), 5)
+            self.assertFalse(Task.objects.using(other).filter(user_id=user_id).exists())
+            self.assertTrue(TaskToken.objects.using(shard).filter(user_id=user_id).exists())
+            self.assertTrue(TaskDailyStat.objects.using(shard).filter(user_id=user_id).exists())
+            self.assertEqual(TaskService().search_tasks(user_id, {})['data']['total'], 5)
@@ -1,10 +1,14 @@
 """
 Integration tests for TaskService.
 """
+import io
 import pytest
-from django.test import TestCase
+from unittest.mock import PropertyMock, patch
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from src.core.services.task_service import TaskService
-from src.core.models import Task
+from src.core.models import OutboxEvent, Task, TaskToken
 from tests.factories import TaskFactory, UserFactory
 
 
@@ -186,3 +190,113 @@ class TestTaskServiceIntegration(TestCase):
         result = self.service.update_task_status(self.user.id, task.id, 'invalid_status')
         self.assertFalse(result['success'])
         self.assertIn('Invalid status', result['message'])
+    
+    @override_settings(TASK_DETAIL_COMPRESS_BYTES=200)
+    def test_large_detail_compressed_at_rest(self):
+        """Test that large details are stored compressed and read back in full."""
+        # Arrange
+        detail = 'Pasted log:\n' + '\n'.join(['ERROR worker-1 request failed: timeout after 30s'] * 40)
+        
+        # Act
+        created = self.service.create_task(self.user.id, {'detail': detail})
+        
+        # Assert
+        stored = Task.objects.filter(id=created['data']['id']).values('detail', 'detail_blob', 'detail_length').get()
+        self.assertEqual(stored['detail'], '')
+        self.assertLess(len(stored['detail_blob']), len(detail) / 10)
+        self.assertEqual(stored['detail_length'], len(detail))
+        self.assertEqual(Task.objects.get(id=created['data']['id']).detail, detail)
+        self.assertEqual(self.service.get_task(self.user.id, created['data']['id'])['data']['detail'], detail)
+    
+    @override_settings(TASK_DETAIL_COMPRESS_BYTES=200)
+    def test_search_returns_previews(self):
+        """Test that searches return previews and still find compressed details by their start."""
+        # Arrange
+        detail = 'Pasted log:\n' + '\n'.join(['ERROR worker-1 request failed'] * 40)
+        task = self.service.create_task(self.user.id, {'detail': detail})['data']
+        self.service.update_task_status(self.user.id, task['id'], 'completed')
+        
+        # Act
+        result = self.service.search_tasks(self.user.id, {'detail': 'pasted log'})
+        
+        # Assert
+        self.assertEqual(result['data']['total'], 1)
+        item = result['data']['tasks'][0]
+        self.assertTrue(item['detail'].startswith('Pasted log: ERROR worker-1'))
+        self.assertTrue(item['detail_truncated'])
+        self.assertEqual(Task.objects.get(id=task['id']).status, 'completed')
+        self.assertEqual(Task.objects.get(id=task['id']).detail, detail)
+    
+    @override_settings(TASK_DETAIL_COMPRESS_BYTES=200)
+    def test_search_matches_compressed_details_past_the_preview(self):
+        """Test that searches and exports match text anywhere in a compressed detail, and only there."""
+        # Arrange
+        detail = 'Pasted log:\n' + '\n'.join(['INFO worker-1 request ok'] * 40) + '\nERROR disk FULL on db-3'
+        matching = self.service.create_task(self.user.id, {'detail': detail})['data']
+        self.service.create_task(self.user.id, {'detail': 'Pasted log:\n' + '\n'.join(['INFO ok'] * 60)})
+        self.service.create_task(self.user.id, {'detail': 'Check disk full alert'})
+        
+        # Act
+        found = self.service.search_tasks(self.user.id, {'detail': 'disk full on'})
+        by_order = self.service.search_tasks(self.user.id, {'detail': 'DISK FULL ON', 'order': 'rank'})
+        exported = [
+            row for chunk in self.service.task_repository.export_chunks(self.user.id, detail='disk full on')
+            for row in chunk
+        ]
+        
+        # Assert
+        self.assertEqual([item['id'] for item in found['data']['tasks']], [matching['id']])
+        self.assertEqual([item['id'] for item in by_order['data']['tasks']], [matching['id']])
+        self.assertEqual([(row[0], row[1]) for row in exported], [(matching['id'], detail)])
+    
+    def test_create_many_without_bulk_insert_ids(self):
+        """Test that where a multi-row INSERT returns no ids (MySQL) they are read back by the batch marker."""
+        # Arrange
+        TaskFactory(user=self.user, detail='Existing')
+        
+        # Act
+        with patch.object(type(connection.features), 'can_return_rows_from_bulk_insert',
+                          new_callable=PropertyMock, return_value=False), \
+                CaptureQueriesContext(connection) as queries:
+            tasks = self.service.task_repository.create_many(
+                self.user.id, [('Alpha report', 'pending'), ('Beta invoice', 'completed')]
+            )
+        
+        # Assert
+        self.assertEqual(len([query for query in queries.captured_queries
+                              if query['sql'].startswith('INSERT INTO "tasks"')]), 1)
+        self.assertEqual([Task.objects.get(id=task.id).detail for task in tasks], ['Alpha report', 'Beta invoice'])
+        self.assertEqual(
+            set(TaskToken.objects.filter(token__in=('alpha', 'beta')).values_list('token', 'task_id')),
+            {('alpha', tasks[0].id), ('beta', tasks[1].id)}
+        )
+        self.assertEqual(
+            set(OutboxEvent.objects.filter(event_type=OutboxEvent.TASK_CREATED).values_list('task_id', 'payload__status')),
+            {(tasks[0].id, 'pending'), (tasks[1].id, 'completed')}
+        )
+    
+    def test_import_rows_resumes_after_last_committed_row(self):
+        """Test that an interrupted import continues from its last progress report."""
+        # Arrange
+        data = b'detail\n' + b''.join(f'Task {index}\n'.encode() for index in range(1, 6)) + b' \n'
+        reports = []
+        with patch('src.core.services.task_service.IMPORT_BATCH_SIZE', 2), \
+                patch.object(self.service.task_repository, 'create_many',
+                             side_effect=[[None] * 2, RuntimeError('worker lost')]):
+            with self.assertRaises(RuntimeError):
+                self.service.import_rows(self.user.id, io.BytesIO(data), 'csv', progress=reports.append)
+        
+        # Act
+        with patch('src.core.services.task_service.IMPORT_BATCH_SIZE', 2):
+            report = self.service.import_rows(self.user.id, io.BytesIO(data), 'csv', resume=reports[-1])
+        
+        # Assert
+        self.assertEqual(reports, [{'rows': 2, 'imported': 2, 'failed': 0, 'errors': []}])
+        self.assertEqual(report, {
+            'rows': 6, 'imported': 5, 'failed': 1,
+            'errors': [{'row': 6, 'error': 'Task detail cannot be empty'}],
+        })
+        self.assertEqual(
+            list(Task.objects.filter(user=self.user).order_by('id').values_list('detail', flat=True)),
+            ['Task 3', 'Task 4', 'Task 5']
+        )
@@ -93,7 +93,7 @@ class TestUserServiceIntegration(TestCase):
         self.assertIn('Invalid email or password', result['message'])
     
     def test_validate_email_format(self):
-        """Test email format validation."""
+        """Test email format validation by the login schema."""
         # Test valid emails
         valid_emails = [
             'test@example.com',
@@ -103,7 +103,7 @@ class TestUserServiceIntegration(TestCase):
         
         for email in valid_emails:
             with self.subTest(email=email):
-                self.assertTrue(self.service.validate_email_format(email))
+                self.assertNotIn('email', self.service.LOGIN_SCHEMA.validate({'email': email})[1])
         
         # Test invalid emails
         invalid_emails = [
@@ -115,10 +115,10 @@ class TestUserServiceIntegration(TestCase):
         
         for email in invalid_emails:
             with self.subTest(email=email):
-                self.assertFalse(self.service.validate_email_format(email))
+                self.assertIn('email', self.service.LOGIN_SCHEMA.validate({'email': email})[1])
     
     def test_validate_password_strength(self):
-        """Test password strength validation."""
+        """Test password strength validation by the registration schema."""
         # Test valid passwords
         valid_passwords = [
             'password123',
@@ -129,7 +129,7 @@ class TestUserServiceIntegration(TestCase):
         
         for password in valid_passwords:
             with self.subTest(password=password):
-                self.assertTrue(self.service.validate_password_strength(password))
+                self.assertNotIn('password', self.service.REGISTER_SCHEMA.validate({'password': password})[1])
         
         # Test invalid passwords
         invalid_passwords = [
@@ -141,4 +141,4 @@ class TestUserServiceIntegration(TestCase):
         
         for password in invalid_passwords:
             with self.subTest(password=password):
-                self.assertFalse(self.service.validate_password_strength(password))
+                self.assertIn('password', self.service.REGISTER_SCHEMA.validate({'password': password})[1])
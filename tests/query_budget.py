@@ -0,0 +1,62 @@
+"""
+Query budgets for API calls made through the Django test client.
+"""
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a request runs more queries or spends more time than allowed."""
+
+
+class QueryBudget:
+    """
+    Context manager asserting a maximum query count and total query time.
+    `using` is one alias or several; queries on all of them (replicas,
+    task shards) count towards the same budget.
+
+    Usage:
+        with QueryBudget(max_queries=2, max_time_ms=50, label='GET /api/tasks/search/'):
+            client.get('/api/tasks/search/')
+    """
+
+    def __init__(self, max_queries, max_time_ms=None, label='', using='default'):
+        self.max_queries = max_queries
+        self.max_time_ms = max_time_ms
+        self.label = label
+        self.using = [using] if isinstance(using, str) else sorted(using)
+        self.queries = []
+
+    def __enter__(self):
+        self._contexts = {alias: CaptureQueriesContext(connections[alias]) for alias in self.using}
+        for context in self._contexts.values():
+            context.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.queries = []
+        for alias, context in self._contexts.items():
+            context.__exit__(exc_type, exc_value, traceback)
+            self.queries.extend({**query, 'alias': alias} for query in context.captured_queries)
+        if exc_type is None:
+            self.check()
+
+    @property
+    def total_time_ms(self):
+        return sum(float(query['time']) for query in self.queries) * 1000
+
+    def check(self):
+        """Raise QueryBudgetExceeded listing the SQL when the budget is exceeded."""
+        problems = []
+        if len(self.queries) > self.max_queries:
+            problems.append(f"{len(self.queries)} queries (budget {self.max_queries})")
+        if self.max_time_ms is not None and self.total_time_ms > self.max_time_ms:
+            problems.append(f"{self.total_time_ms:.2f}ms of queries (budget {self.max_time_ms}ms)")
+        if problems:
+            statements = '\n'.join(
+                f"  {index}. [{query['alias']}, {float(query['time']) * 1000:.2f}ms] {query['sql']}"
+                for index, query in enumerate(self.queries, start=1)
+            )
+            raise QueryBudgetExceeded(
+                f"Query budget exceeded for {self.label or 'block'}: {', '.join(problems)}\n{statements}"
+            )
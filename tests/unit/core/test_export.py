@@ -0,0 +1,59 @@
+"""
+Unit tests for the streaming export encoders.
+"""
+import csv
+import gzip
+import io
+import json
+import pytest
+from datetime import datetime, timezone
+from src.core.export import accepts_gzip, csv_stream, flagged, gzip_stream, ndjson_stream
+
+CREATED = datetime(2025, 9, 30, 12, 0, tzinfo=timezone.utc)
+CHUNKS = [
+    [(1, 'Buy milk', 'pending', CREATED, CREATED)],
+    [(2, 'Line one\nline "two", ñ', 'completed', CREATED, CREATED)],
+]
+
+
+@pytest.mark.unit
+class TestExportStreams:
+    """Test cases for csv_stream, ndjson_stream and gzip_stream."""
+
+    def test_csv_one_yield_per_chunk(self):
+        """Test that CSV has a header and round-trips quoting and newlines."""
+        parts = list(csv_stream(flagged(CHUNKS, archived=False)))
+
+        assert len(parts) == 2
+        rows = list(csv.reader(io.StringIO(b''.join(parts).decode('utf-8'))))
+        assert rows[0] == ['id', 'detail', 'status', 'created_at', 'updated_at', 'archived']
+        assert rows[2] == ['2', 'Line one\nline "two", ñ', 'completed',
+                           '2025-09-30T12:00:00+00:00', '2025-09-30T12:00:00+00:00', 'False']
+
+    def test_csv_empty_export_has_header(self):
+        """Test that an export without rows still has the header line."""
+        assert b''.join(csv_stream([])) == b'id,detail,status,created_at,updated_at,archived\r\n'
+
+    def test_ndjson(self):
+        """Test that NDJSON has one object per line."""
+        lines = b''.join(ndjson_stream(flagged(CHUNKS, archived=True))).decode('utf-8').splitlines()
+
+        assert [json.loads(line) for line in lines][1] == {
+            'id': 2, 'detail': 'Line one\nline "two", ñ', 'status': 'completed',
+            'created_at': '2025-09-30T12:00:00+00:00', 'updated_at': '2025-09-30T12:00:00+00:00',
+            'archived': True,
+        }
+
+    def test_gzip_stream(self):
+        """Test that the compressed stream decompresses to the original bytes."""
+        parts = [b'a' * 1000, b'b' * 1000, b'']
+
+        assert gzip.decompress(b''.join(gzip_stream(parts))) == b''.join(parts)
+
+    def test_accepts_gzip(self):
+        """Test that gzip is used only when listed, directly or as '*', with a q-value above 0."""
+        accepted = ['gzip', 'gzip, deflate', 'deflate;q=1.0, GZIP;q=0.5', 'br, *;q=0.1', 'gzip ; q=1']
+        refused = ['', 'identity', 'deflate, br', 'gzip;q=0', 'gzip;q=0.0, *', '*;q=0', 'gzip;q=none']
+
+        assert all(accepts_gzip(header) for header in accepted)
+        assert not any(accepts_gzip(header) for header in refused)
@@ -0,0 +1,82 @@
+"""
+Unit tests for compressed task detail storage.
+"""
+import pytest
+from django.test import override_settings
+from src.core.fields import ELLIPSIS, PREVIEW_LENGTH, make_preview, pack_detail, unpack_detail
+from src.core.models import Task
+
+
+@pytest.mark.unit
+class TestDetailPacking:
+    """Test cases for pack_detail and unpack_detail."""
+
+    def test_small_detail_stays_plain(self):
+        """Test that details under the threshold are stored as text."""
+        assert pack_detail('Buy milk') == ('Buy milk', None)
+
+    @override_settings(TASK_DETAIL_COMPRESS_BYTES=100)
+    def test_large_detail_is_compressed(self):
+        """Test that large details round-trip through the blob column."""
+        detail = 'ERROR worker-1 request failed: timeout ñ\n' * 50
+
+        text, blob = pack_detail(detail)
+
+        assert text == ''
+        assert len(blob) < len(detail.encode('utf-8')) / 10
+        assert unpack_detail(text, blob) == detail
+
+    @override_settings(TASK_DETAIL_COMPRESS_BYTES=1)
+    def test_incompressible_detail_stays_plain(self):
+        """Test that compression is skipped when it would not save space."""
+        assert pack_detail('abcde') == ('abcde', None)
+
+
+@pytest.mark.unit
+class TestMakePreview:
+    """Test cases for make_preview."""
+
+    def test_short_detail(self):
+        """Test that short details are kept with whitespace collapsed."""
+        assert make_preview('  Call\n the   dentist ') == 'Call the dentist'
+
+    def test_long_detail_is_truncated(self):
+        """Test that long details are cut with an ellipsis."""
+        preview = make_preview('word ' * 1000)
+
+        assert len(preview) == PREVIEW_LENGTH
+        assert preview.endswith(ELLIPSIS)
+
+    def test_long_whitespace_run_is_truncated(self):
+        """Test that text beyond the scanned window still marks the preview as cut."""
+        preview = make_preview('start' + ' ' * 5000 + 'end')
+
+        assert preview == 'start' + ELLIPSIS
+
+
+@pytest.mark.unit
+class TestFromDb:
+    """Test cases for TaskDetailStorage.from_db."""
+
+    def test_deferred_fields_stay_deferred(self):
+        """Test that rows loaded with deferred columns get the loaded values in place."""
+        field_names = ['id', 'detail_preview', 'detail_length', 'status', 'user_id', 'path']
+
+        task = Task.from_db('default', field_names, [7, 'Buy milk', 8, 'pending', 3, '2/'])
+
+        assert (task.id, task.detail_preview, task.detail_length, task.status, task.user_id, task.parent_id) == (
+            7, 'Buy milk', 8, 'pending', 3, 2
+        )
+        assert {'detail', 'detail_blob', 'created_at', 'rank'} <= task.get_deferred_fields()
+        assert not task._state.adding
+        assert task._state.db == 'default'
+
+    @override_settings(TASK_DETAIL_COMPRESS_BYTES=100)
+    def test_compressed_detail_is_unpacked(self):
+        """Test that a row loaded with its blob gets the full detail."""
+        detail = 'ERROR request failed: timeout\n' * 50
+        text, blob = pack_detail(detail)
+
+        task = Task.from_db('default', ['id', 'detail', 'detail_blob'], [7, text, blob])
+
+        assert task.detail == detail
@@ -0,0 +1,143 @@
+"""
+Unit tests for the readiness checker.
+"""
+import threading
+import pytest
+from django.test import override_settings
+from src.core.health import ReadinessChecker, check_cache, check_database, check_migrations
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting_check(result=(True, 'ok')):
+    calls = []
+
+    def check():
+        calls.append(1)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return check, calls
+
+
+@pytest.mark.unit
+class TestReadinessChecker:
+    """Test cases for ReadinessChecker."""
+
+    def test_ready_when_all_checks_pass(self):
+        """Test that the checker reports ready when every check passes."""
+        # Arrange
+        check, _ = counting_check()
+        checker = ReadinessChecker({'database': check, 'cache': check}, clock=FakeClock())
+
+        # Act
+        result = checker.status()
+
+        # Assert
+        assert result['ready'] is True
+        assert result['checks']['database'] == {'ok': True, 'detail': 'ok'}
+
+    def test_failing_check_makes_not_ready(self):
+        """Test that an exception in a check is reported, not raised."""
+        # Arrange
+        ok, _ = counting_check()
+        broken, _ = counting_check(RuntimeError('connection refused'))
+        checker = ReadinessChecker({'database': broken, 'cache': ok}, clock=FakeClock())
+
+        # Act
+        result = checker.status()
+
+        # Assert
+        assert result['ready'] is False
+        assert result['checks']['database'] == {'ok': False, 'detail': 'connection refused'}
+        assert result['checks']['cache']['ok'] is True
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=5)
+    def test_fresh_result_is_reused(self):
+        """Test that checks run once within the cache interval."""
+        # Arrange
+        clock = FakeClock()
+        check, calls = counting_check()
+        checker = ReadinessChecker({'database': check}, clock=clock)
+
+        # Act
+        checker.status()
+        clock.now += 4
+        result = checker.status()
+
+        # Assert
+        assert len(calls) == 1
+        assert result['age'] == 4
+
+    @override_settings(HEALTH_CHECK_CACHE_SECONDS=5)
+    def test_stale_result_is_served_while_refreshing(self):
+        """Test that a stale result is returned and refreshed in the background."""
+        # Arrange
+        clock = FakeClock()
+        release = threading.Event()
+        calls = []
+
+        def slow_check():
+            calls.append(1)
+            if len(calls) > 1:
+                release.wait(5)
+            return True, 'ok'
+
+        checker = ReadinessChecker({'database': slow_check}, clock=clock)
+        checker.status()
+        clock.now += 10
+
+        # Act
+        first = checker.status()
+        second = checker.status()
+        release.set()
+        checker._thread.join(5)
+
+        # Assert
+        assert first['age'] == 10 and second['age'] == 10
+        assert len(calls) == 2
+        assert checker.status()['age'] == 0
+
+    def test_migrations_checked_until_applied(self):
+        """Test that the migration check stops running once it has passed."""
+        # Arrange
+        clock = FakeClock()
+        check, calls = counting_check()
+        checker = ReadinessChecker({'migrations': check}, clock=clock)
+
+        # Act
+        checker.run_checks()
+        checker.run_checks()
+
+        # Assert
+        assert len(calls) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestDependencyChecks:
+    """Test cases for the individual dependency checks."""
+
+    def test_database(self):
+        """Test that the database check succeeds on the test database."""
+        assert check_database() == (True, 'ok')
+
+    def test_migrations(self):
+        """Test that no migrations are pending on the test database."""
+        assert check_migrations() == (True, 'ok')
+
+    def test_dummy_cache_is_skipped(self):
+        """Test that a dummy cache backend is reported as disabled."""
+        assert check_cache() == (True, 'disabled')
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_cache_round_trip(self):
+        """Test that a working cache passes the round trip."""
+        assert check_cache() == (True, 'ok')
@@ -0,0 +1,57 @@
+"""
+Unit tests for the incremental import readers.
+"""
+import io
+import pytest
+from src.core.importer import ImportFileError, csv_rows, detect_format, ndjson_rows
+
+
+@pytest.mark.unit
+class TestImportReaders:
+    """Test cases for csv_rows, ndjson_rows and detect_format."""
+
+    def test_csv_rows(self):
+        """Test that CSV rows are numbered after the header and keep quoted newlines."""
+        data = '\ufeffdetail,status\r\nBuy milk,pending\r\n"Line one\nline two",completed\r\n'.encode('utf-8')
+
+        rows = list(csv_rows(io.BytesIO(data)))
+
+        assert rows == [
+            (1, {'detail': 'Buy milk', 'status': 'pending'}, None),
+            (2, {'detail': 'Line one\nline two', 'status': 'completed'}, None),
+        ]
+
+    def test_csv_requires_detail_column(self):
+        """Test that a CSV without a detail column is rejected before any row."""
+        with pytest.raises(ImportFileError):
+            list(csv_rows(io.BytesIO(b'title,status\r\nBuy milk,pending\r\n')))
+
+    def test_csv_invalid_encoding_ends_with_error(self):
+        """Test that undecodable bytes end the rows with one error."""
+        data = b'detail\n' + b'ok\n' * 3 + b'\xff\xfe broken\n'
+
+        rows = list(csv_rows(io.BytesIO(data)))
+
+        assert rows[-1] == (4, None, 'File is not valid UTF-8')
+
+    def test_ndjson_rows(self):
+        """Test that NDJSON skips blank lines and reports unparsable ones."""
+        data = (b'{"detail": "Buy milk"}\n\nnot json\n[1, 2]\n\xff\n'
+                b'{"detail": "Call mom", "status": "completed"}\n')
+
+        rows = list(ndjson_rows(io.BytesIO(data)))
+
+        assert rows == [
+            (1, {'detail': 'Buy milk'}, None),
+            (3, None, 'Invalid JSON'),
+            (4, None, 'Each line must be a JSON object'),
+            (5, None, 'Line is not valid UTF-8'),
+            (6, {'detail': 'Call mom', 'status': 'completed'}, None),
+        ]
+
+    def test_detect_format(self):
+        """Test that the format follows the file extension and defaults to CSV."""
+        assert detect_format('tasks.NDJSON') == 'ndjson'
+        assert detect_format('export.jsonl') == 'ndjson'
+        assert detect_format('tasks.csv') == 'csv'
+        assert detect_format('') == 'csv'
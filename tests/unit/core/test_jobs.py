@@ -0,0 +1,35 @@
+"""
+Unit tests for the background job registry.
+"""
+import pytest
+from types import SimpleNamespace
+from django.test import override_settings
+from src.core import jobs
+
+
+@pytest.mark.unit
+class TestJobs:
+    """Test cases for job registration, run and retry_delay."""
+
+    def test_registered_job_runs_with_its_row(self):
+        """Test that run calls the function registered under the job name."""
+        jobs.job('test.double')(lambda job: job.args['n'] * 2)
+        try:
+            assert jobs.run(SimpleNamespace(name='test.double', args={'n': 21})) == 42
+        finally:
+            jobs._jobs.pop('test.double')
+
+    def test_unknown_job(self):
+        """Test that running an unregistered job raises UnknownJob."""
+        with pytest.raises(jobs.UnknownJob):
+            jobs.run(SimpleNamespace(name='test.missing', args={}))
+
+    def test_builtin_jobs_registered(self):
+        """Test that the maintenance commands and imports are available as jobs."""
+        for name in ('erase_users', 'archive_tasks', 'index_tasks', 'import_tasks'):
+            assert jobs.get_job(name) is not None
+
+    @override_settings(JOB_RETRY_MAX_SECONDS=100)
+    def test_retry_delay(self):
+        """Test that retries back off exponentially up to the configured cap."""
+        assert [jobs.retry_delay(attempts) for attempts in (1, 2, 3, 4, 50)] == [30, 60, 100, 100, 100]
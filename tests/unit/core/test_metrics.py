@@ -0,0 +1,152 @@
+"""
+Unit tests for the metrics store and Prometheus rendering.
+"""
+import os
+import pytest
+from django.test import override_settings
+from src.core import metrics
+from src.core.metrics import MetricStore
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    """Start every test with an empty store."""
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.mark.unit
+class TestMetricStore:
+    """Test cases for MetricStore."""
+
+    def test_inc_accumulates(self):
+        """Test that increments add up per key."""
+        # Arrange
+        store = MetricStore()
+
+        # Act
+        store.inc('a')
+        store.inc('a', 2.5)
+        store.inc('b')
+
+        # Assert
+        assert dict(store.items()) == {'a': 3.5, 'b': 1.0}
+
+    def test_store_grows(self):
+        """Test that the mapping grows past its initial size."""
+        # Arrange
+        store = MetricStore()
+
+        # Act
+        for i in range(5000):
+            store.inc(f'key-with-a-fairly-long-name-{i}', i)
+
+        # Assert
+        values = dict(store.items())
+        assert len(values) == 5000
+        assert values['key-with-a-fairly-long-name-4999'] == 4999
+
+    def test_inc_many_accumulates(self):
+        """Test that several samples are added at once."""
+        # Arrange
+        store = MetricStore()
+        store.inc('a')
+
+        # Act
+        store.inc_many((('a', 1.0), ('b', 0.5), ('a', 2.0)))
+
+        # Assert
+        assert dict(store.items()) == {'a': 4.0, 'b': 0.5}
+
+    def test_file_store_readable_by_other_processes(self, tmp_path):
+        """Test that a file-backed store can be read from its file."""
+        # Arrange
+        path = str(tmp_path / 'metrics_1.db')
+        store = MetricStore(path)
+
+        # Act
+        store.inc('requests', 3)
+
+        # Assert
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        assert dict(metrics._read_entries(data)) == {'requests': 3.0}
+        store.close()
+
+
+@pytest.mark.unit
+class TestMetricsRendering:
+    """Test cases for metric families and exposition."""
+
+    def test_counter_and_histogram_render(self):
+        """Test the text exposition of counters and cumulative histogram buckets."""
+        # Arrange
+        metrics.http_requests.inc(('core:search_tasks', 'GET', '200'))
+        metrics.http_requests.inc(('core:search_tasks', 'GET', '200'))
+        metrics.http_request_duration.observe(0.003, ('core:search_tasks', 'GET'))
+        metrics.http_request_duration.observe(0.2, ('core:search_tasks', 'GET'))
+
+        # Act
+        output = metrics.render()
+
+        # Assert
+        assert '# TYPE todo_http_requests counter' in output
+        assert 'todo_http_requests_total{route="core:search_tasks",method="GET",status="200"} 2.0' in output
+        assert 'todo_http_request_duration_seconds_bucket{route="core:search_tasks",method="GET",le="0.005"} 1' in output
+        assert 'todo_http_request_duration_seconds_bucket{route="core:search_tasks",method="GET",le="0.1"} 1' in output
+        assert 'todo_http_request_duration_seconds_bucket{route="core:search_tasks",method="GET",le="0.25"} 2' in output
+        assert 'todo_http_request_duration_seconds_bucket{route="core:search_tasks",method="GET",le="+Inf"} 2' in output
+        assert 'todo_http_request_duration_seconds_count{route="core:search_tasks",method="GET"} 2' in output
+
+    def test_label_values_are_escaped(self):
+        """Test escaping of quotes and backslashes in label values."""
+        # Arrange
+        metrics.auth_failures.inc(('a"b\\c',))
+
+        # Act
+        output = metrics.render()
+
+        # Assert
+        assert 'todo_auth_failures_total{route="a\\"b\\\\c"} 1.0' in output
+
+    def test_collect_merges_worker_files(self, tmp_path):
+        """Test that samples from every worker file are summed at scrape time."""
+        # Arrange
+        with override_settings(METRICS_DIR=str(tmp_path)):
+            metrics.reset()
+            metrics.auth_failures.inc(('authentication:login',))
+            other_worker = MetricStore(os.path.join(str(tmp_path), 'metrics_999999.db'))
+            other_worker.inc(metrics.auth_failures._key('_total', ('authentication:login',)), 2)
+
+            # Act
+            output = metrics.render()
+
+            # Assert
+            assert 'todo_auth_failures_total{route="authentication:login"} 3.0' in output
+            other_worker.close()
+            metrics.reset()
+
+    def test_collect_folds_exited_worker_files(self, tmp_path):
+        """Test that files of exited workers are folded into the archive and keep counting."""
+        # Arrange
+        with override_settings(METRICS_DIR=str(tmp_path)):
+            metrics.reset()
+            metrics.auth_failures.inc(('authentication:login',))
+            key = metrics.auth_failures._key('_total', ('authentication:login',))
+            for name in ('metrics_999999_1.db', f'metrics_{os.getpid()}_1.db'):
+                exited = MetricStore(os.path.join(str(tmp_path), name))
+                exited.inc(key, 2)
+                exited.close()
+
+            # Act
+            first = metrics.render()
+            second = metrics.render()
+
+            # Assert
+            assert 'todo_auth_failures_total{route="authentication:login"} 5.0' in first
+            assert 'todo_auth_failures_total{route="authentication:login"} 5.0' in second
+            assert {path.name for path in tmp_path.glob('metrics_*.db')} == {
+                'metrics_archive.db', os.path.basename(metrics.get_store().path)
+            }
+            metrics.reset()
@@ -0,0 +1,62 @@
+"""
+Unit tests for the outbox handler registry.
+"""
+import pytest
+from types import SimpleNamespace
+from django.test import override_settings
+from src.core import outbox
+
+
+@pytest.mark.unit
+class TestOutboxRegistry:
+    """Test cases for register and dispatch."""
+
+    def setup_method(self):
+        self.calls = []
+
+    def teardown_method(self):
+        outbox.unregister(self.on_created)
+        outbox.unregister(self.on_any)
+
+    def on_created(self, event):
+        self.calls.append(('created', event.task_id))
+
+    def on_any(self, event):
+        self.calls.append(('any', event.task_id))
+
+    def test_dispatch_calls_matching_and_catch_all_handlers(self):
+        """Test that handlers run for their event types plus the catch-all ones."""
+        # Arrange
+        outbox.register('task.created')(self.on_created)
+        outbox.register()(self.on_any)
+
+        # Act
+        created = outbox.dispatch(SimpleNamespace(event_type='task.created', task_id=1))
+        deleted = outbox.dispatch(SimpleNamespace(event_type='task.deleted', task_id=2))
+
+        # Assert
+        assert created == 2
+        assert deleted == 1
+        assert self.calls == [('created', 1), ('any', 1), ('any', 2)]
+
+    def test_unregister(self):
+        """Test that an unregistered handler is no longer called."""
+        outbox.register('task.created')(self.on_created)
+        outbox.unregister(self.on_created)
+
+        assert outbox.dispatch(SimpleNamespace(event_type='task.created', task_id=1)) == 0
+
+
+@pytest.mark.unit
+class TestRetryDelay:
+    """Test cases for retry_delay."""
+
+    @override_settings(OUTBOX_RETRY_MAX_SECONDS=60, OUTBOX_MAX_ATTEMPTS=1000)
+    def test_exponential_and_capped(self):
+        """Test that retries back off exponentially up to the configured cap."""
+        assert [outbox.retry_delay(attempts) for attempts in (1, 2, 5, 6, 100)] == [2, 4, 32, 60, 60]
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=3)
+    def test_no_retry_after_max_attempts(self):
+        """Test that an event stops being retried once it used up its attempts."""
+        assert [outbox.retry_delay(attempts) for attempts in (2, 3, 4)] == [4, None, None]
@@ -0,0 +1,46 @@
+"""
+Unit tests for the estimated-count admin paginator.
+"""
+import pytest
+from unittest.mock import patch
+from src.core.models import Task
+from src.core.pagination import EstimatedCountPaginator, estimated_row_count
+from tests.factories import TaskFactory
+
+
+@pytest.mark.unit
+class TestEstimatedCountPaginator:
+    """Test cases for EstimatedCountPaginator and estimated_row_count."""
+
+    def test_unfiltered_list_uses_estimate(self, django_assert_num_queries):
+        """Test that an unfiltered list takes its count from the table statistics."""
+        paginator = EstimatedCountPaginator(Task.objects.order_by('-id'), 100)
+
+        with patch('src.core.pagination.estimated_row_count', return_value=5000000) as estimate:
+            with django_assert_num_queries(0):
+                assert paginator.count == 5000000
+
+        estimate.assert_called_once_with(Task, 'default')
+        assert paginator.num_pages == 50000
+
+    def test_small_estimate_counts_exactly(self):
+        """Test that rough estimates of small tables are replaced by a real count."""
+        TaskFactory.create_batch(3)
+
+        with patch('src.core.pagination.estimated_row_count', return_value=40):
+            assert EstimatedCountPaginator(Task.objects.all(), 100).count == 3
+
+    def test_filtered_count_stops_at_limit(self, django_assert_num_queries):
+        """Test that filtered lists ignore the estimate and count at most COUNT_LIMIT rows."""
+        TaskFactory.create_batch(5, status='pending')
+
+        with patch('src.core.pagination.estimated_row_count', return_value=5000000), \
+                patch('src.core.pagination.COUNT_LIMIT', 3):
+            with django_assert_num_queries(1) as captured:
+                assert EstimatedCountPaginator(Task.objects.filter(status='pending'), 100).count == 3
+
+        assert 'LIMIT 3' in captured.captured_queries[0]['sql']
+
+    def test_sqlite_has_no_estimate(self):
+        """Test that backends without table statistics fall back to counting."""
+        assert estimated_row_count(Task, 'default') is None
@@ -0,0 +1,94 @@
+"""
+Unit tests for request profiling helpers.
+"""
+import pytest
+from django.db import connection
+from src.core.profiling import RequestProfile, current_profile, profile_request, profiled
+
+
+class Worker:
+    @profiled
+    def outer(self):
+        return self.inner()
+
+    @profiled
+    def inner(self):
+        return 'done'
+
+
+@pytest.mark.unit
+class TestProfiling:
+    """Test cases for RequestProfile and the profiled decorator."""
+
+    def test_profiled_without_active_profile(self):
+        """Test that profiled methods run normally outside a request."""
+        # Act
+        result = Worker().outer()
+
+        # Assert
+        assert result == 'done'
+        assert current_profile() is None
+
+    def test_profiled_records_nested_calls(self):
+        """Test that nested service calls are listed but counted once in the total."""
+        # Act
+        with profile_request() as profile:
+            Worker().outer()
+
+        # Assert
+        assert profile.services['Worker.outer'][0] == 1
+        assert profile.services['Worker.inner'][0] == 1
+        assert profile.service_time == pytest.approx(profile.services['Worker.outer'][1])
+        assert current_profile() is None
+
+    def test_profile_request_counts_queries(self):
+        """Test that queries run inside the block are counted and timed."""
+        # Act
+        with profile_request() as profile:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.execute('SELECT 2')
+
+        # Assert
+        assert profile.db_count == 2
+        assert [sql for sql, _ in profile.queries] == ['SELECT 1', 'SELECT 2']
+
+    def test_profile_request_without_queries(self):
+        """Test that a counting profile times queries without keeping their SQL."""
+        # Act
+        with profile_request(keep_queries=False) as profile:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        # Assert
+        assert profile.db_count == 1
+        assert profile.db_time > 0
+        assert profile.queries == []
+
+    def test_nested_profile_request_shares_profile(self):
+        """Test that an inner activation reuses the outer profile."""
+        # Act
+        with profile_request() as outer:
+            with profile_request() as inner:
+                pass
+
+        # Assert
+        assert inner is outer
+
+    def test_server_timing_header(self):
+        """Test the Server-Timing header format."""
+        # Arrange
+        profile = RequestProfile()
+        profile.db_count = 3
+        profile.db_time = 0.0015
+        profile.record_service('TaskService.search_tasks', 0.004, outermost=True)
+
+        # Act
+        header = profile.server_timing()
+
+        # Assert
+        assert 'db;desc="3 queries";dur=1.50' in header
+        assert 'service;dur=4.00' in header
+        assert 'svc-TaskService.search_tasks;desc="1 calls";dur=4.00' in header
+        assert 'render;dur=' in header
+        assert 'total;dur=' in header
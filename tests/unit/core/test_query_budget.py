@@ -0,0 +1,64 @@
+"""
+Unit tests for the query budget helper.
+"""
+import pytest
+from django.db import connection, connections
+from tests.query_budget import QueryBudget, QueryBudgetExceeded
+
+
+@pytest.mark.unit
+class TestQueryBudget:
+    """Test cases for QueryBudget."""
+
+    def test_within_budget(self):
+        """Test that a block within budget passes and exposes its queries."""
+        # Act
+        with QueryBudget(max_queries=1) as budget:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+        # Assert
+        assert len(budget.queries) == 1
+
+    def test_exceeded_budget_lists_sql(self):
+        """Test that the failure message includes every captured statement."""
+        # Act / Assert
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            with QueryBudget(max_queries=1, label='GET /example/'):
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT 1')
+                    cursor.execute('SELECT 2')
+        message = str(exc_info.value)
+        assert 'GET /example/: 2 queries (budget 1)' in message
+        assert 'SELECT 1' in message
+        assert 'SELECT 2' in message
+
+    @pytest.mark.django_db(databases=['default', 'shard_1'])
+    def test_counts_every_alias(self):
+        """Test that queries on every captured alias count towards one budget."""
+        # Act / Assert
+        with pytest.raises(QueryBudgetExceeded) as exc_info:
+            with QueryBudget(max_queries=1, using=['default', 'shard_1']):
+                for alias in ('default', 'shard_1'):
+                    with connections[alias].cursor() as cursor:
+                        cursor.execute('SELECT 1')
+        assert '2 queries (budget 1)' in str(exc_info.value)
+        assert '[shard_1, ' in str(exc_info.value)
+
+    def test_time_budget(self):
+        """Test that the total query time is enforced."""
+        with pytest.raises(QueryBudgetExceeded, match='budget 0ms'):
+            with QueryBudget(max_queries=10, max_time_ms=0):
+                with connection.cursor() as cursor:
+                    cursor.execute('WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < 20000) SELECT count(*) FROM c')
+
+    @pytest.mark.query_budget(max_queries=1)
+    def test_marker_applies_to_client(self, client):
+        """Test that the marker wraps requests made through the test client."""
+        with pytest.raises(QueryBudgetExceeded):
+            client.post('/api/auth/register/', data={
+                'email': 'budget@example.com',
+                'password': 'testpass123',
+                'first_name': 'Budget',
+                'last_name': 'User'
+            }, content_type='application/json')
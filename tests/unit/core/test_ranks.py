@@ -0,0 +1,54 @@
+"""
+Unit tests for the fractional ranks of the manual task order.
+"""
+import pytest
+import random
+from src.core.ranks import MAX_LENGTH, rank_between, ranks_between
+
+
+@pytest.mark.unit
+class TestRanks:
+    """Test cases for rank_between and ranks_between."""
+
+    @pytest.mark.parametrize('before, after, expected', [
+        ('', None, 'i'),
+        ('i', None, 'r'),
+        ('', 'i', '9'),
+        ('a', 'b', 'ai'),
+        ('a', 'a1', 'a0i'),
+        ('az', 'b', 'azi'),
+        ('', '01', '00i'),
+    ])
+    def test_rank_between(self, before, after, expected):
+        """Test midpoints, including adjacent digits and prefixes."""
+        assert rank_between(before, after) == expected
+
+    @pytest.mark.parametrize('before, after', [('b', 'a'), ('a', 'a'), ('', '')])
+    def test_rank_between_requires_order(self, before, after):
+        """Test that there is no rank between unordered or equal ranks."""
+        with pytest.raises(ValueError):
+            rank_between(before, after)
+
+    def test_random_moves_keep_order(self):
+        """Test that ranks inserted anywhere stay strictly ordered and short."""
+        rng = random.Random(49)
+        keys = ranks_between('', None, 100)
+        for _ in range(5000):
+            position = rng.randrange(len(keys) + 1)
+            before = keys[position - 1] if position else ''
+            after = keys[position] if position < len(keys) else None
+            rank = rank_between(before, after)
+            assert before < rank and (after is None or rank < after)
+            assert not rank.endswith('0')
+            keys.insert(position, rank)
+
+        assert max(len(key) for key in keys) < MAX_LENGTH
+
+    def test_ranks_between_spreads_evenly(self):
+        """Test that many ranks fit in a gap with short, distinct keys."""
+        keys = ranks_between('a', 'b', 1000)
+
+        assert keys == sorted(set(keys))
+        assert len(keys) == 1000
+        assert 'a' < keys[0] and keys[-1] < 'b'
+        assert max(len(key) for key in keys) <= 5
@@ -0,0 +1,117 @@
+"""
+Unit tests for the replica database router.
+"""
+import pytest
+from unittest.mock import patch
+from django.contrib.contenttypes.models import ContentType
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+from src.authentication.models import User
+from src.core.models import Task
+from src.core.routers import ReplicaRouter, check_pin_cache, pin_user, routing_scope, set_current_user
+
+
+@pytest.fixture
+def router():
+    return ReplicaRouter(replicas=['replica'])
+
+
+@pytest.fixture(autouse=True)
+def no_pins():
+    """Pins are looked up in the cache; start every test without any."""
+    with patch('src.core.routers.cache') as cache:
+        cache.get.return_value = None
+        yield cache
+
+
+@pytest.fixture(autouse=True)
+def primary():
+    """The primary connection, outside any transaction."""
+    with patch('src.core.routers.connections') as connections:
+        connections.__getitem__.return_value.in_atomic_block = False
+        yield connections.__getitem__.return_value
+
+
+@pytest.mark.unit
+class TestReplicaRouter:
+    """Test cases for ReplicaRouter."""
+
+    def test_reads_outside_request_use_primary(self, router):
+        """Test that reads without a routing scope stay on the primary."""
+        assert router.db_for_read(Task) == 'default'
+
+    def test_authenticated_reads_use_replica(self, router):
+        """Test that reads for an authenticated user go to the replica."""
+        with routing_scope(['replica']):
+            set_current_user(7)
+            assert router.db_for_read(Task) == 'replica'
+            assert router.db_for_read(User) == 'replica'
+
+    def test_anonymous_reads_use_primary(self, router):
+        """Test that login and registration lookups stay on the primary."""
+        with routing_scope(['replica']):
+            assert router.db_for_read(User) == 'default'
+
+    def test_reads_in_transaction_use_primary(self, router, primary):
+        """Test that reads inside a write transaction see that transaction."""
+        primary.in_atomic_block = True
+        with routing_scope(['replica']):
+            set_current_user(7)
+            assert router.db_for_read(Task) == 'default'
+
+    def test_write_pins_user_to_primary(self, router, no_pins):
+        """Test that a write sends the rest of the user's reads to the primary."""
+        with routing_scope(['replica']):
+            set_current_user(7)
+
+            assert router.db_for_write(Task) == 'default'
+
+            assert router.db_for_read(Task) == 'default'
+        no_pins.set.assert_called_once_with('db:pin:7', 1, 5)
+
+    def test_recent_writer_starts_pinned(self, router, no_pins):
+        """Test that a pin stored by an earlier request is honoured."""
+        no_pins.get.return_value = 1
+        with routing_scope(['replica']):
+            set_current_user(7)
+            assert router.db_for_read(Task) == 'default'
+
+    def test_write_pins_instance_owner(self, router, no_pins):
+        """Test that writes outside a request pin the owner of the row."""
+        router.db_for_write(Task, instance=Task(user_id=9))
+        pin_user(None)
+        no_pins.set.assert_called_once_with('db:pin:9', 1, 5)
+
+    def test_other_apps_not_routed(self, router):
+        """Test that models outside users and tasks are left alone."""
+        with routing_scope(['replica']):
+            set_current_user(7)
+            assert router.db_for_read(ContentType) is None
+            assert router.db_for_write(ContentType) is None
+
+    def test_no_replicas_is_a_no_op(self):
+        """Test that the router defers to Django without replicas."""
+        router = ReplicaRouter(replicas=[])
+        with routing_scope([]):
+            set_current_user(7)
+            assert router.db_for_read(Task) is None
+            assert router.db_for_write(Task) is None
+
+    def test_never_migrates_replicas(self, router):
+        """Test that schema changes only run on the primary."""
+        assert router.allow_migrate('replica', 'core') is False
+        assert router.allow_migrate('default', 'core') is None
+
+    def test_replicas_need_a_shared_cache(self, settings):
+        """Test that replicas with a per-process cache are refused at startup."""
+        databases = {**settings.DATABASES, 'replica': {**settings.DATABASES['replica'], 'REPLICA': True}}
+        locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        shared = {'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'django_cache'}}
+
+        with override_settings(DATABASES=databases, CACHES=locmem):
+            with pytest.raises(ImproperlyConfigured):
+                check_pin_cache()
+        with override_settings(DATABASES=databases, CACHES=shared):
+            check_pin_cache()
+        with override_settings(CACHES=locmem):
+            check_pin_cache()
@@ -0,0 +1,46 @@
+"""
+Unit tests for typeahead tokenization.
+"""
+import pytest
+from src.core.search import MAX_TOKEN_LENGTH, normalize, prefix_range, tokenize
+
+
+@pytest.mark.unit
+class TestTokenize:
+    """Test cases for tokenize."""
+
+    def test_lowercases_and_strips_accents(self):
+        """Test that words are normalized so prefixes match regardless of case and accents."""
+        assert normalize('Revisar Documentación') == 'revisar documentacion'
+        assert tokenize('Revisar Documentación, ÁRBOL') == ['revisar', 'documentacion', 'arbol']
+
+    def test_words_are_distinct_in_order(self):
+        """Test that repeated words produce one token."""
+        assert tokenize('deploy api, then deploy web') == ['deploy', 'api', 'then', 'web']
+
+    def test_long_words_are_truncated(self):
+        """Test that tokens are capped at MAX_TOKEN_LENGTH characters."""
+        assert tokenize('a' * 100) == ['a' * MAX_TOKEN_LENGTH]
+
+    def test_token_limit(self):
+        """Test that at most `limit` tokens are produced."""
+        text = ' '.join(f'word{index}' for index in range(10))
+
+        assert tokenize(text, limit=3) == ['word0', 'word1', 'word2']
+        assert len(tokenize(text, limit=None)) == 10
+
+    def test_empty_text(self):
+        """Test that punctuation-only text has no tokens."""
+        assert tokenize(' -- !! ') == []
+
+
+@pytest.mark.unit
+class TestPrefixRange:
+    """Test cases for prefix_range."""
+
+    def test_range_covers_words_with_prefix(self):
+        """Test that the bounds include exactly the words starting with the prefix."""
+        low, high = prefix_range('rep')
+        words = ['rep', 'report', 'repz', 'reo', 'req', 're']
+
+        assert [word for word in words if low <= word < high] == ['rep', 'report', 'repz']
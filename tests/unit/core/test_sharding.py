@@ -0,0 +1,71 @@
+"""
+Unit tests for the task shard map and shard_key decorator.
+"""
+import pytest
+from collections import Counter
+from django.core.exceptions import ImproperlyConfigured
+from src.core.sharding import TASK_ID_RANGE, ShardMap, current_shard_user, shard_key
+
+
+@pytest.mark.unit
+class TestShardMap:
+    """Test cases for ShardMap."""
+
+    def test_single_shard(self):
+        """Test that one shard takes every user and is not sharded when it is default."""
+        shard_map = ShardMap(['default'])
+        assert shard_map.shard_for(42) == 'default'
+        assert shard_map.is_sharded is False
+
+    def test_hash_is_stable_and_spread(self):
+        """Test that hashing is deterministic and uses every shard."""
+        shard_map = ShardMap(['default', 'shard_1', 'shard_2'])
+
+        placements = Counter(shard_map.shard_for(user_id) for user_id in range(1, 3001))
+
+        assert shard_map.shard_for(17) == shard_map.shard_for(17)
+        assert set(placements) == {'default', 'shard_1', 'shard_2'}
+        assert min(placements.values()) > 800
+
+    def test_range(self):
+        """Test that range bounds are exclusive and the last range is open."""
+        shard_map = ShardMap(['default', 'shard_1'], 'range', [(100, 'default'), (None, 'shard_1')])
+        assert shard_map.shard_for(99) == 'default'
+        assert shard_map.shard_for(100) == 'shard_1'
+        assert shard_map.shard_for(10 ** 9) == 'shard_1'
+
+    def test_parse_ranges(self):
+        """Test the TASK_SHARD_RANGES format."""
+        assert ShardMap.parse_ranges('100:default, :shard_1') == [(100, 'default'), (None, 'shard_1')]
+
+    @pytest.mark.parametrize('kwargs', [
+        {'shards': []},
+        {'shards': ['default'], 'strategy': 'modulo'},
+        {'shards': ['default'], 'strategy': 'range', 'ranges': [(100, 'default')]},
+        {'shards': ['default'], 'strategy': 'range', 'ranges': [(None, 'shard_9')]},
+    ])
+    def test_invalid_configuration(self, kwargs):
+        """Test that broken maps fail at load time."""
+        with pytest.raises(ImproperlyConfigured):
+            ShardMap(**kwargs)
+
+    def test_id_ranges_follow_shard_order(self):
+        """Test that each shard owns a separate block of task ids."""
+        shard_map = ShardMap(['default', 'shard_1'])
+        assert shard_map.id_range_start('default') == 1
+        assert shard_map.id_range_start('shard_1') == TASK_ID_RANGE + 1
+
+
+@pytest.mark.unit
+class TestShardKey:
+    """Test cases for the shard_key decorator."""
+
+    def test_sets_user_for_the_call(self):
+        """Test that the user id is visible during the call only."""
+        @shard_key('user_id')
+        def lookup(task_id, user_id):
+            return current_shard_user()
+
+        assert lookup(1, 7) == 7
+        assert lookup(1, user_id=8) == 8
+        assert current_shard_user() is None
@@ -0,0 +1,29 @@
+"""
+Unit tests for the materialized paths of subtasks.
+"""
+import pytest
+from src.core.task_paths import child_path, depth, parent_id, path_ids, subtree_range
+
+
+@pytest.mark.unit
+class TestTaskPaths:
+    """Test cases for building and reading task paths."""
+
+    def test_child_path_and_ancestors(self):
+        """Test that paths list the ancestors root first."""
+        path = child_path(child_path('', 12), 40)
+
+        assert path == '12/40/'
+        assert path_ids(path) == [12, 40]
+        assert (parent_id(path), depth(path)) == (40, 2)
+        assert (path_ids(''), parent_id(''), depth('')) == ([], None, 0)
+
+    def test_subtree_range(self):
+        """Test that the range holds every descendant and nothing else."""
+        low, high = subtree_range('5/', 12)
+        inside = ['5/12/', '5/12/7/', '5/12/99999999999/3/']
+        outside = ['', '5/', '5/1/', '5/120/', '5/121/', '5/13/', '50/12/', '12/']
+
+        assert (low, high) == ('5/12/', '5/120')
+        assert all(low <= path < high for path in inside)
+        assert not any(low <= path < high for path in outside)
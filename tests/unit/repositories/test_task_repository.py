@@ -3,6 +3,7 @@ Unit tests for TaskRepository.
 """
 import pytest
 from unittest.mock import Mock, patch
+from django.utils import timezone
 from src.core.repositories.task_repository import TaskRepository
 from src.core.models import Task
 from tests.factories import TaskFactory, UserFactory
@@ -26,13 +27,16 @@ class TestTaskRepository:
         # Arrange
         user_id = 1
         mock_tasks = [Mock(), Mock()]
-        mock_objects.filter.return_value = mock_tasks
+        mock_objects.filter.return_value.defer.return_value = mock_tasks
         
         # Act
         result = self.repository.get_by_user(user_id)
         
         # Assert
         mock_objects.filter.assert_called_once_with(user_id=user_id)
+        mock_objects.filter.return_value.defer.assert_called_once_with(
+            'detail', 'detail_blob', 'status_changed_at', 'reminded_at', 'rank', 'insert_batch'
+        )
         assert result == mock_tasks
     
     @patch('src.core.repositories.task_repository.Task.objects')
@@ -57,16 +61,16 @@ class TestTaskRepository:
         # Arrange
         user_id = 1
         detail = "test task"
-        mock_tasks = [Mock(), Mock()]
-        mock_objects.filter.return_value.order_by.return_value = mock_tasks
+        mock_tasks = [Mock(detail_blob=None), Mock(detail_blob=None)]
+        mock_objects.filter.return_value.order_by.return_value.defer.return_value = mock_tasks
         
         # Act
         result = self.repository.search_by_detail(user_id, detail)
         
         # Assert
         mock_objects.filter.assert_called_once_with(
-            user_id=user_id,
-            detail__icontains=detail
+            TaskRepository.detail_matches(detail),
+            user_id=user_id
         )
         mock_objects.filter.return_value.order_by.assert_called_once_with('-created_at')
         assert result == mock_tasks
@@ -78,7 +82,7 @@ class TestTaskRepository:
         user_id = 1
         date = "2025-09-30"
         mock_tasks = [Mock()]
-        mock_objects.filter.return_value.order_by.return_value = mock_tasks
+        mock_objects.filter.return_value.order_by.return_value.defer.return_value = mock_tasks
         
         # Act
         result = self.repository.search_by_created_date(user_id, date)
@@ -98,54 +102,90 @@ class TestTaskRepository:
         user_id = 1
         detail = "test task"
         date = "2025-09-30"
-        mock_tasks = [Mock()]
-        mock_objects.filter.return_value.order_by.return_value = mock_tasks
+        mock_tasks = [Mock(detail_blob=None)]
+        mock_objects.filter.return_value.order_by.return_value.defer.return_value = mock_tasks
         
         # Act
         result = self.repository.search_by_detail_and_date(user_id, detail, date)
         
         # Assert
         mock_objects.filter.assert_called_once_with(
+            TaskRepository.detail_matches(detail),
             user_id=user_id,
-            detail__icontains=detail,
             created_at__date=date
         )
         mock_objects.filter.return_value.order_by.assert_called_once_with('-created_at')
         assert result == mock_tasks
     
+    @patch('src.core.repositories.task_repository.transaction')
     @patch('src.core.repositories.task_repository.Task.objects')
-    def test_update_status_success(self, mock_objects):
-        """Test updating task status successfully."""
+    def test_update_status_success(self, mock_objects, mock_transaction):
+        """Test updating task status successfully records a change event and counts it."""
         # Arrange
         task_id = 1
         user_id = 1
         new_status = "completed"
-        mock_task = Mock()
-        mock_objects.get.return_value = mock_task
+        mock_task = Mock(status="pending", user_id=user_id, status_changed_at=None, updated_at=timezone.now())
+        mock_objects.using.return_value.select_for_update.return_value.filter.return_value.first.return_value = mock_task
+        self.repository.outbox_repository = Mock()
+        self.repository.stats_repository = Mock()
         
         # Act
         result = self.repository.update_status(task_id, user_id, new_status)
         
         # Assert
-        mock_objects.get.assert_called_once_with(id=task_id, user_id=user_id)
+        mock_objects.using.return_value.select_for_update.return_value.filter.assert_called_once_with(
+            id=task_id, user_id=user_id
+        )
         assert mock_task.status == new_status
-        mock_task.save.assert_called_once()
+        mock_task.save.assert_called_once_with(
+            using='default', update_fields=['status', 'status_changed_at', 'updated_at']
+        )
+        self.repository.outbox_repository.record.assert_called_once_with(
+            'task.status_changed', user_id, [task_id], 'default',
+            {'status': new_status, 'previous': 'pending'}
+        )
+        self.repository.stats_repository.add.assert_called_once_with(
+            {(user_id, timezone.localdate(), 'completed'): 1}, 'default'
+        )
         assert result == mock_task
     
+    @patch('src.core.repositories.task_repository.transaction')
     @patch('src.core.repositories.task_repository.Task.objects')
-    def test_update_status_not_found(self, mock_objects):
+    def test_update_status_not_found(self, mock_objects, mock_transaction):
         """Test updating task status when task not found."""
         # Arrange
         task_id = 999
         user_id = 1
         new_status = "completed"
-        mock_objects.get.side_effect = Task.DoesNotExist()
+        mock_objects.using.return_value.select_for_update.return_value.filter.return_value.first.return_value = None
+        self.repository.outbox_repository = Mock()
         
         # Act
         result = self.repository.update_status(task_id, user_id, new_status)
         
         # Assert
         assert result is None
+        self.repository.outbox_repository.record.assert_not_called()
+    
+    @patch('src.core.repositories.task_repository.transaction')
+    @patch('src.core.repositories.task_repository.Task.objects')
+    def test_update_status_unchanged(self, mock_objects, mock_transaction):
+        """Test that setting the current status writes nothing and records no event."""
+        # Arrange
+        mock_task = Mock(status='completed', user_id=1)
+        mock_objects.using.return_value.select_for_update.return_value.filter.return_value.first.return_value = mock_task
+        self.repository.outbox_repository = Mock()
+        self.repository.stats_repository = Mock()
+        
+        # Act
+        result = self.repository.update_status(1, 1, 'completed')
+        
+        # Assert
+        assert result == mock_task
+        mock_task.save.assert_not_called()
+        self.repository.outbox_repository.record.assert_not_called()
+        self.repository.stats_repository.add.assert_not_called()
     
     @patch('src.core.repositories.task_repository.Task.objects')
     def test_get_by_id_and_user(self, mock_objects):
@@ -98,3 +98,37 @@ class TestUserRepository:
         # Assert
         mock_objects.filter.assert_called_once_with(email=email)
         assert result is False
+    
+    @patch('src.core.repositories.user_repository.transaction')
+    @patch('src.core.repositories.user_repository.User.objects')
+    def test_request_erasure(self, mock_objects, mock_transaction):
+        """Test that erasure deactivates the user only once and queues the erase job."""
+        # Arrange
+        mock_objects.filter.return_value.update.return_value = 1
+        self.repository.job_repository = Mock()
+        
+        # Act
+        result = self.repository.request_erasure(1)
+        
+        # Assert
+        mock_objects.filter.assert_called_once_with(pk=1, erasure_requested_at__isnull=True)
+        update_kwargs = mock_objects.filter.return_value.update.call_args.kwargs
+        assert update_kwargs['is_active'] is False
+        assert update_kwargs['erasure_requested_at'] is not None
+        self.repository.job_repository.enqueue.assert_called_once_with('erase_users', {'user_ids': '1'})
+        assert result is True
+    
+    @patch('src.core.repositories.user_repository.transaction')
+    @patch('src.core.repositories.user_repository.User.objects')
+    def test_request_erasure_already_requested(self, mock_objects, mock_transaction):
+        """Test that a repeated request queues nothing."""
+        # Arrange
+        mock_objects.filter.return_value.update.return_value = 0
+        self.repository.job_repository = Mock()
+        
+        # Act
+        result = self.repository.request_erasure(1)
+        
+        # Assert
+        self.repository.job_repository.enqueue.assert_not_called()
+        assert result is False
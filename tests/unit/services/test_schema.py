@@ -0,0 +1,183 @@
+"""
+Unit tests for the declarative service schemas.
+"""
+import pytest
+from datetime import date, datetime, timezone
+from src.core.services.schema import EMAIL_PATTERN, Field, Schema, SchemaValidationError
+from src.core.services.task_service import TaskService
+from src.core.services.user_service import UserService
+
+
+@pytest.mark.unit
+class TestSchema:
+    """Test cases for Schema and Field."""
+
+    def test_required_field_missing(self):
+        """Test that missing and empty required fields are reported together."""
+        # Arrange
+        schema = Schema(a=Field(required=True), b=Field(required=True), c=Field())
+
+        # Act
+        cleaned, errors = schema.validate({'b': ''})
+
+        # Assert
+        assert set(errors) == {'a', 'b'}
+        assert errors['a'] == ['This field is required.']
+        assert cleaned == {'c': None}
+
+    def test_trim_and_blank(self):
+        """Test trimming and the blank check on trimmed values."""
+        # Arrange
+        schema = Schema(name=Field(required=True, trim=True))
+
+        # Act
+        cleaned, errors = schema.validate({'name': '  value  '})
+        _, blank_errors = schema.validate({'name': '   '})
+
+        # Assert
+        assert cleaned == {'name': 'value'}
+        assert errors == {}
+        assert blank_errors == {'name': ['This field cannot be blank.']}
+
+    def test_optional_blank_uses_default(self):
+        """Test that an optional blank value falls back to the default."""
+        # Arrange
+        schema = Schema(detail=Field(trim=True, default=''))
+
+        # Act
+        cleaned, errors = schema.validate({'detail': '   '})
+
+        # Assert
+        assert cleaned == {'detail': ''}
+        assert errors == {}
+
+    def test_type_coercion(self):
+        """Test coercion of int, date and bool fields."""
+        # Arrange
+        schema = Schema(n=Field(int), d=Field(date), flag=Field(bool))
+
+        # Act
+        cleaned, errors = schema.validate({'n': '42', 'd': '2025-09-30', 'flag': 'true'})
+        _, bad = schema.validate({'n': 'x', 'd': '30/09/2025', 'flag': 'maybe'})
+
+        # Assert
+        assert cleaned == {'n': 42, 'd': date(2025, 9, 30), 'flag': True}
+        assert errors == {}
+        assert set(bad) == {'n', 'd', 'flag'}
+
+    def test_datetime_coercion(self):
+        """Test that ISO 8601 times keep their offset and naive ones get the current time zone."""
+        # Arrange
+        schema = Schema(at=Field(datetime))
+
+        # Act
+        with_offset, _ = schema.validate({'at': '2025-09-30T09:00:00Z'})
+        naive, _ = schema.validate({'at': '2025-09-30T09:00'})
+        _, bad = schema.validate({'at': 'tomorrow'})
+
+        # Assert
+        assert with_offset == {'at': datetime(2025, 9, 30, 9, 0, tzinfo=timezone.utc)}
+        assert naive['at'].tzinfo is not None
+        assert bad == {'at': ['Must be a valid date and time (ISO 8601).']}
+
+    def test_string_type_rejects_other_types(self):
+        """Test that non-string values fail a string field."""
+        # Arrange
+        schema = Schema(detail=Field(str, required=True))
+
+        # Act
+        _, errors = schema.validate({'detail': 123})
+
+        # Assert
+        assert errors == {'detail': ['Must be a valid string.']}
+
+    def test_choices_and_lengths(self):
+        """Test choices, min_length and max_length checks."""
+        # Arrange
+        schema = Schema(
+            status=Field(choices=['a', 'b']),
+            short=Field(max_length=3),
+            long=Field(min_length=3),
+        )
+
+        # Act
+        _, errors = schema.validate({'status': 'c', 'short': 'abcd', 'long': 'ab'})
+
+        # Assert
+        assert errors == {
+            'status': ['Must be one of: a, b.'],
+            'short': ['Ensure this field has at most 3 characters.'],
+            'long': ['Ensure this field has at least 3 characters.'],
+        }
+
+    def test_pattern(self):
+        """Test pattern matching with a compiled expression."""
+        # Arrange
+        schema = Schema(email=Field(pattern=EMAIL_PATTERN))
+
+        # Act
+        _, valid = schema.validate({'email': 'user@example.com'})
+        _, invalid = schema.validate({'email': 'invalid-email'})
+
+        # Assert
+        assert valid == {}
+        assert invalid == {'email': ['Invalid format.']}
+
+    def test_clean_raises_with_summary(self):
+        """Test that clean raises an error carrying the summary and field errors."""
+        # Arrange
+        schema = Schema(a=Field(required=True), b=Field(choices=['x']))
+
+        # Act / Assert
+        with pytest.raises(SchemaValidationError) as exc_info:
+            schema.clean({'b': 'y'})
+        assert str(exc_info.value) == 'Missing required fields: a'
+        assert exc_info.value.errors == {
+            'a': ['This field is required.'],
+            'b': ['Must be one of: x.'],
+        }
+
+    def test_unsupported_type(self):
+        """Test that unsupported field types are rejected at declaration time."""
+        with pytest.raises(ValueError):
+            Field(list)
+
+
+@pytest.mark.unit
+class TestServiceSchemas:
+    """Test cases for the schemas declared by the services."""
+
+    def test_task_status_schema_message(self):
+        """Test the status schema keeps the API error message."""
+        # Act
+        _, errors = TaskService.STATUS_SCHEMA.validate({'status': 'done'})
+
+        # Assert
+        assert errors == {'status': ['Invalid status. Must be one of: pending, completed, cancelled']}
+
+    def test_search_schema_invalid_date(self):
+        """Test that a malformed created_date is reported as a field error."""
+        # Act
+        result = TaskService().search_tasks(1, {'created_date': 'yesterday'})
+
+        # Assert
+        assert result['success'] is False
+        assert result['errors'] == {'created_date': ['Must be a valid date (YYYY-MM-DD).']}
+
+    def test_register_schema_collects_all_errors(self):
+        """Test that registration reports every invalid field at once."""
+        # Act
+        result = UserService().register_user({
+            'email': 'invalid-email',
+            'password': 'short',
+            'first_name': 'John',
+            'last_name': 'Doe'
+        })
+
+        # Assert
+        assert result['success'] is False
+        assert result['message'] == 'Invalid email format'
+        assert result['errors'] == {
+            'email': ['Invalid email format'],
+            'password': ['Password must be at least 8 characters long'],
+        }
@@ -2,8 +2,8 @@
 Unit tests for TaskService.
 """
 import pytest
+from datetime import date, datetime, timezone
 from unittest.mock import Mock, patch
-from django.core.exceptions import ValidationError
 from src.core.services.task_service import TaskService
 from tests.factories import TaskFactory, UserFactory
 
@@ -22,9 +22,8 @@ class TestTaskService:
         service = TaskService()
         assert hasattr(service, 'task_repository')
     
-    @patch('src.core.services.task_service.TaskService.validate_required_fields')
     @patch('src.core.services.task_service.TaskRepository')
-    def test_create_task_success(self, mock_repo_class, mock_validate_required):
+    def test_create_task_success(self, mock_repo_class):
         """Test successful task creation."""
         # Arrange
         user_id = 1
@@ -38,7 +37,6 @@ class TestTaskService:
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
-        mock_validate_required.return_value = None
         mock_repo.create.return_value = mock_task
         
         # Create service AFTER configuring mocks
@@ -55,13 +53,11 @@ class TestTaskService:
         assert result['data']['status'] == 'pending'
         mock_repo.create.assert_called_once()
     
-    @patch('src.core.services.task_service.TaskService.validate_required_fields')
-    def test_create_task_missing_detail(self, mock_validate_required):
+    def test_create_task_missing_detail(self):
         """Test task creation with missing detail field."""
         # Arrange
         user_id = 1
         task_data = {}
-        mock_validate_required.side_effect = ValidationError("Missing required fields")
         
         # Create service
         service = TaskService()
@@ -73,13 +69,11 @@ class TestTaskService:
         assert result['success'] is False
         assert 'Missing required fields' in result['message']
     
-    @patch('src.core.services.task_service.TaskService.validate_required_fields')
-    def test_create_task_empty_detail(self, mock_validate_required):
+    def test_create_task_empty_detail(self):
         """Test task creation with empty detail."""
         # Arrange
         user_id = 1
         task_data = {'detail': '   '}  # Empty/whitespace detail
-        mock_validate_required.return_value = None
         
         # Create service
         service = TaskService()
@@ -173,6 +167,7 @@ class TestTaskService:
             task.status = 'pending'
             task.created_at = '2025-09-30T10:00:00Z'
             task.updated_at = '2025-09-30T10:00:00Z'
+            task.label_mask = 0
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
@@ -203,6 +198,7 @@ class TestTaskService:
         mock_tasks[0].status = 'pending'
         mock_tasks[0].created_at = '2025-09-30T10:00:00Z'
         mock_tasks[0].updated_at = '2025-09-30T10:00:00Z'
+        mock_tasks[0].label_mask = 0
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
@@ -231,6 +227,7 @@ class TestTaskService:
         mock_tasks[0].status = 'pending'
         mock_tasks[0].created_at = '2025-09-30T10:00:00Z'
         mock_tasks[0].updated_at = '2025-09-30T10:00:00Z'
+        mock_tasks[0].label_mask = 0
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
@@ -245,7 +242,7 @@ class TestTaskService:
         # Assert
         assert result['success'] is True
         assert result['data']['total'] == 1
-        mock_repo.search_by_created_date.assert_called_once_with(user_id, '2025-09-30')
+        mock_repo.search_by_created_date.assert_called_once_with(user_id, date(2025, 9, 30))
     
     @patch('src.core.services.task_service.TaskRepository')
     def test_search_tasks_by_detail_and_date(self, mock_repo_class):
@@ -259,6 +256,7 @@ class TestTaskService:
         mock_tasks[0].status = 'pending'
         mock_tasks[0].created_at = '2025-09-30T10:00:00Z'
         mock_tasks[0].updated_at = '2025-09-30T10:00:00Z'
+        mock_tasks[0].label_mask = 0
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
@@ -273,4 +271,134 @@ class TestTaskService:
         # Assert
         assert result['success'] is True
         assert result['data']['total'] == 1
-        mock_repo.search_by_detail_and_date.assert_called_once_with(user_id, 'test', '2025-09-30')
+        mock_repo.search_by_detail_and_date.assert_called_once_with(user_id, 'test', date(2025, 9, 30))
+    
+    @patch('src.core.services.task_service.TaskArchiveRepository')
+    @patch('src.core.services.task_service.TaskRepository')
+    def test_search_tasks_by_due_range(self, mock_repo_class, mock_archive_class):
+        """Test that due filters search by due date, archived tasks included, soonest first."""
+        # Arrange
+        active = Mock(id=1, detail_preview='Active', status='pending', label_mask=0,
+                      due_at=datetime(2025, 10, 2, tzinfo=timezone.utc),
+                      created_at='2025-09-29T10:00:00Z', updated_at='2025-09-29T10:00:00Z')
+        archived = Mock(id=2, detail_preview='Archived', status='completed', label_mask=0,
+                        due_at=datetime(2025, 10, 1, tzinfo=timezone.utc),
+                        created_at='2025-09-28T10:00:00Z', updated_at='2025-09-30T10:00:00Z')
+        mock_repo_class.return_value.search.return_value = [active]
+        mock_archive_class.return_value.search.return_value = [archived]
+        service = TaskService()
+        
+        # Act
+        result = service.search_tasks(1, {'due_before': '2025-10-03T00:00:00Z', 'include_archived': 'true'})
+        
+        # Assert
+        due_before = datetime(2025, 10, 3, tzinfo=timezone.utc)
+        assert [task['id'] for task in result['data']['tasks']] == [2, 1]
+        mock_repo_class.return_value.search.assert_called_once_with(
+            1, detail='', created_date=None, due_before=due_before
+        )
+        mock_archive_class.return_value.search.assert_called_once_with(1, '', None, due_before=due_before)
+    
+    @patch('src.core.services.task_service.LabelRepository')
+    @patch('src.core.services.task_service.TaskRepository')
+    def test_search_tasks_by_any_label(self, mock_repo_class, mock_label_class):
+        """Test that label ids become one bitmask filter and the labels are read once."""
+        # Arrange
+        task = Mock(id=1, detail_preview='Labeled', status='pending', label_mask=0b101, due_at=None,
+                    created_at='2025-09-29T10:00:00Z', updated_at='2025-09-29T10:00:00Z')
+        mock_repo_class.return_value.search.return_value = [task]
+        labels = [Mock(slot=slot) for slot in range(3)]
+        for label, name in zip(labels, ('work', 'home', 'urgent')):
+            label.name = name
+        mock_label_class.return_value.get_by_user.return_value = labels
+        service = TaskService()
+        
+        # Act
+        result = service.search_tasks(1, {'labels': '2, 0', 'labels_match': 'any'})
+        
+        # Assert
+        assert result['data']['tasks'][0]['labels'] == [{'id': 0, 'name': 'work'}, {'id': 2, 'name': 'urgent'}]
+        mock_repo_class.return_value.search.assert_called_once_with(
+            1, detail='', created_date=None, label_mask=0b101, all_labels=False
+        )
+        mock_label_class.return_value.get_by_user.assert_called_once_with(1)
+    
+    @patch('src.core.services.task_service.TaskArchiveRepository')
+    @patch('src.core.services.task_service.TaskRepository')
+    def test_search_tasks_excludes_archived_by_default(self, mock_repo_class, mock_archive_class):
+        """Test that archived tasks are not searched unless asked for."""
+        # Arrange
+        mock_repo_class.return_value.get_by_user.return_value = []
+        service = TaskService()
+        
+        # Act
+        result = service.search_tasks(1, {})
+        
+        # Assert
+        assert result['success'] is True
+        mock_archive_class.return_value.search.assert_not_called()
+    
+    @patch('src.core.services.task_service.TaskArchiveRepository')
+    @patch('src.core.services.task_service.TaskRepository')
+    def test_search_tasks_include_archived(self, mock_repo_class, mock_archive_class):
+        """Test that archived tasks are merged newest first when requested."""
+        # Arrange
+        active = Mock(id=1, detail='Active', status='pending', label_mask=0,
+                      created_at='2025-09-29T10:00:00Z', updated_at='2025-09-29T10:00:00Z')
+        archived = Mock(id=2, detail='Archived', status='completed', label_mask=0,
+                        created_at='2025-09-30T10:00:00Z', updated_at='2025-09-30T10:00:00Z')
+        mock_repo_class.return_value.search_by_detail.return_value = [active]
+        mock_archive_class.return_value.search.return_value = [archived]
+        service = TaskService()
+        
+        # Act
+        result = service.search_tasks(1, {'detail': 'a', 'include_archived': 'true'})
+        
+        # Assert
+        assert result['data']['total'] == 2
+        assert [task['id'] for task in result['data']['tasks']] == [2, 1]
+        assert [task['archived'] for task in result['data']['tasks']] == [True, False]
+        mock_archive_class.return_value.search.assert_called_once_with(1, 'a', None)
+    
+    @patch('src.core.services.task_service.TaskArchiveRepository')
+    def test_restore_task_not_found(self, mock_archive_class):
+        """Test restoring a task that is not archived for the user."""
+        # Arrange
+        mock_archive_class.return_value.restore.return_value = None
+        service = TaskService()
+        
+        # Act
+        result = service.restore_task(1, 99)
+        
+        # Assert
+        assert result['success'] is False
+        assert 'Archived task not found' in result['message']
+        mock_archive_class.return_value.restore.assert_called_once_with(99, 1)
+    
+    @patch('src.core.services.task_service.TaskRepository')
+    def test_bulk_delete_tasks_validation(self, mock_repo_class):
+        """Test that bulk delete only accepts a bounded list of integer ids."""
+        # Arrange
+        service = TaskService()
+        
+        # Act / Assert
+        for data in ({}, {'ids': []}, {'ids': 'x'}, {'ids': [1, 'a']}, {'ids': [True]},
+                     {'ids': list(range(1001))}):
+            result = service.bulk_delete_tasks(1, data)
+            assert result['success'] is False, data
+        mock_repo_class.return_value.delete_many_by_user.assert_not_called()
+    
+    @patch('src.core.services.task_service.TaskRepository')
+    def test_bulk_delete_tasks_success(self, mock_repo_class):
+        """Test that bulk delete reports how many tasks were deleted."""
+        # Arrange
+        mock_repo_class.return_value.delete_many_by_user.return_value = 2
+        service = TaskService()
+        
+        # Act
+        result = service.bulk_delete_tasks(1, {'ids': [4, 5, 6]})
+        
+        # Assert
+        assert result['success'] is True
+        assert result['data']['deleted'] == 2
+        mock_repo_class.return_value.delete_many_by_user.assert_called_once_with([4, 5, 6], 1)
@@ -3,7 +3,6 @@ Unit tests for UserService.
 """
 import pytest
 from unittest.mock import Mock, patch
-from django.core.exceptions import ValidationError
 from src.core.services.user_service import UserService
 from tests.factories import UserFactory
 
@@ -22,12 +21,8 @@ class TestUserService:
         service = UserService()
         assert hasattr(service, 'user_repository')
     
-    @patch('src.core.services.user_service.UserService.validate_required_fields')
-    @patch('src.core.services.user_service.UserService.validate_email_format')
-    @patch('src.core.services.user_service.UserService.validate_password_strength')
     @patch('src.core.services.user_service.UserRepository')
-    def test_register_user_success(self, mock_repo_class, mock_validate_password, 
-                                 mock_validate_email, mock_validate_required):
+    def test_register_user_success(self, mock_repo_class):
         """Test successful user registration."""
         # Arrange
         user_data = {
@@ -44,9 +39,6 @@ class TestUserService:
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
-        mock_validate_required.return_value = None
-        mock_validate_email.return_value = True
-        mock_validate_password.return_value = True
         mock_repo.email_exists.return_value = False
         mock_repo.create_user.return_value = mock_user
         
@@ -64,12 +56,10 @@ class TestUserService:
         mock_repo.email_exists.assert_called_once_with('test@example.com')
         mock_repo.create_user.assert_called_once()
     
-    @patch('src.core.services.user_service.UserService.validate_required_fields')
-    def test_register_user_missing_fields(self, mock_validate_required):
+    def test_register_user_missing_fields(self):
         """Test user registration with missing required fields."""
         # Arrange
         user_data = {'email': 'test@example.com'}
-        mock_validate_required.side_effect = ValidationError("Missing required fields")
         
         # Create service
         service = UserService()
@@ -81,9 +71,7 @@ class TestUserService:
         assert result['success'] is False
         assert 'Missing required fields' in result['message']
     
-    @patch('src.core.services.user_service.UserService.validate_required_fields')
-    @patch('src.core.services.user_service.UserService.validate_email_format')
-    def test_register_user_invalid_email(self, mock_validate_email, mock_validate_required):
+    def test_register_user_invalid_email(self):
         """Test user registration with invalid email."""
         # Arrange
         user_data = {
@@ -92,8 +80,6 @@ class TestUserService:
             'first_name': 'John',
             'last_name': 'Doe'
         }
-        mock_validate_required.return_value = None
-        mock_validate_email.return_value = False
         
         # Create service
         service = UserService()
@@ -105,12 +91,8 @@ class TestUserService:
         assert result['success'] is False
         assert 'Invalid email format' in result['message']
     
-    @patch('src.core.services.user_service.UserService.validate_required_fields')
-    @patch('src.core.services.user_service.UserService.validate_email_format')
-    @patch('src.core.services.user_service.UserService.validate_password_strength')
     @patch('src.core.services.user_service.UserRepository')
-    def test_register_user_email_exists(self, mock_repo_class, mock_validate_password,
-                                      mock_validate_email, mock_validate_required):
+    def test_register_user_email_exists(self, mock_repo_class):
         """Test user registration when email already exists."""
         # Arrange
         user_data = {
@@ -122,9 +104,6 @@ class TestUserService:
         
         # Configure mocks BEFORE creating service
         mock_repo = mock_repo_class.return_value
-        mock_validate_required.return_value = None
-        mock_validate_email.return_value = True
-        mock_validate_password.return_value = True
         mock_repo.email_exists.return_value = True
         
         # Create service AFTER configuring mocks
@@ -137,9 +116,8 @@ class TestUserService:
         assert result['success'] is False
         assert 'User with this email already exists' in result['message']
     
-    @patch('src.core.services.user_service.UserService.validate_email_format')
     @patch('src.core.services.user_service.authenticate')
-    def test_authenticate_user_success(self, mock_authenticate, mock_validate_email):
+    def test_authenticate_user_success(self, mock_authenticate):
         """Test successful user authentication."""
         # Arrange
         email = 'test@example.com'
@@ -150,7 +128,6 @@ class TestUserService:
         mock_user.first_name = 'John'
         mock_user.last_name = 'Doe'
         
-        mock_validate_email.return_value = True
         mock_authenticate.return_value = mock_user
         
         # Create service
@@ -166,13 +143,11 @@ class TestUserService:
         assert result['data']['email'] == 'test@example.com'
         mock_authenticate.assert_called_once_with(username=email, password=password)
     
-    @patch('src.core.services.user_service.UserService.validate_email_format')
-    def test_authenticate_user_invalid_email(self, mock_validate_email):
+    def test_authenticate_user_invalid_email(self):
         """Test authentication with invalid email format."""
         # Arrange
         email = 'invalid-email'
         password = 'testpass123'
-        mock_validate_email.return_value = False
         
         # Create service
         service = UserService()
@@ -184,14 +159,12 @@ class TestUserService:
         assert result['success'] is False
         assert 'Invalid email format' in result['message']
     
-    @patch('src.core.services.user_service.UserService.validate_email_format')
     @patch('src.core.services.user_service.authenticate')
-    def test_authenticate_user_invalid_credentials(self, mock_authenticate, mock_validate_email):
+    def test_authenticate_user_invalid_credentials(self, mock_authenticate):
         """Test authentication with invalid credentials."""
         # Arrange
         email = 'test@example.com'
         password = 'wrongpassword'
-        mock_validate_email.return_value = True
         mock_authenticate.return_value = None
         
         # Create service